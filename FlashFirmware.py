@@ -14,9 +14,14 @@ in a background thread:
 
 1. **Check libraries** — compares ``ARDUINO_LIBS`` against the output of
    ``arduino-cli lib list``.  Any missing libraries are installed
-   automatically via ``arduino-cli lib install``.
-2. **Compile** — ``arduino-cli compile --fqbn <fqbn> hardware/arduino/acam3/``
-3. **Upload** — ``arduino-cli upload --fqbn <fqbn> --port <port> hardware/arduino/acam3/``
+   automatically via ``arduino-cli lib install``.  The board's FQBN is
+   detected with ``arduino-cli board list`` at the same time.
+2. **Compile** — ``arduino-cli compile --fqbn <fqbn> --output-dir <build>
+   hardware/arduino/acam3/``, skipped when :class:`FirmwareCache`
+   already holds a build of the same sketch for the same board and
+   library versions.
+3. **Upload** — ``arduino-cli upload --fqbn <fqbn> --port <port>
+   --input-dir <build> hardware/arduino/acam3/``
 
 Each step streams its output to the dialog's text area in real time.
 The flash button is re-enabled on completion, and a ``QMessageBox``
@@ -32,6 +37,21 @@ or::
 
     python -m QPolargraph.FlashFirmware
 
+Batch flashing
+--------------
+To provision several scanners at once, flash every attached Arduino
+from a terminal, without a display::
+
+    qpolargraph-flash-all                  # all detected boards
+    qpolargraph-flash-all /dev/ttyACM0 /dev/ttyACM1
+    qpolargraph-flash-all --list
+
+The firmware is compiled once for each kind of board and uploaded to
+all boards concurrently.  Each line of output is prefixed with its
+port, and a pass/fail summary follows; the exit status is non-zero if
+any board failed.  :class:`BatchFlashDialog` does the same from a GUI,
+and :func:`flash_boards` from Python.
+
 Integration into a QMainWindow application
 -------------------------------------------
 ``FlashDialog`` is a standard ``QDialog`` and can be wired to a menu
@@ -50,9 +70,15 @@ is only loaded when the user triggers the action.
 
 from __future__ import annotations
 
+from collections.abc import Callable, Iterable
+from concurrent.futures import ThreadPoolExecutor
+import argparse
+import hashlib
 import json
+import shutil
 import subprocess
 import sys
+import threading
 from pathlib import Path
 
 from qtpy import QtCore, QtWidgets
@@ -75,6 +101,8 @@ ARDUINO_LIBS = [
     'AccelStepper',
 ]
 
+#: Default location of :class:`FirmwareCache` builds.
+CACHE_DIR = Path('~/.QPolargraph/firmware').expanduser()
 
 
 def find_arduinos() -> list[QSerialPortInfo]:
@@ -83,8 +111,13 @@ def find_arduinos() -> list[QSerialPortInfo]:
             if p.vendorIdentifier() in ARDUINO_VIDS]
 
 
-def detect_fqbn(port_name: str) -> str:
-    '''Ask arduino-cli for the board FQBN; fall back to DEFAULT_FQBN.'''
+def detect_boards(port_names: Iterable[str]) -> dict[str, str]:
+    '''Ask arduino-cli for the FQBN of the board on each port.
+
+    A single ``arduino-cli board list`` call covers every port.  Ports
+    whose board is not recognized get ``DEFAULT_FQBN``.
+    '''
+    boards = dict.fromkeys(port_names, DEFAULT_FQBN)
     try:
         result = subprocess.run(
             ['arduino-cli', 'board', 'list', '--format', 'json'],
@@ -96,20 +129,272 @@ def detect_fqbn(port_name: str) -> str:
                  if isinstance(data, dict) else data)
         for entry in ports:
             address = entry.get('port', {}).get('address', '')
-            if address == port_name:
-                matching = entry.get('matching_boards', [])
-                if matching:
-                    return matching[0].get('fqbn', DEFAULT_FQBN)
+            matching = entry.get('matching_boards', [])
+            if address in boards and matching:
+                boards[address] = matching[0].get('fqbn', DEFAULT_FQBN)
     except Exception:
         pass
-    return DEFAULT_FQBN
+    return boards
+
+
+def detect_fqbn(port_name: str) -> str:
+    '''Ask arduino-cli for the board FQBN; fall back to DEFAULT_FQBN.'''
+    return detect_boards([port_name])[port_name]
+
+
+def _run_cli(args: list[str], log: Callable[[str], None],
+             timeout: int = 120) -> bool:
+    '''Run a subprocess; pass its output to *log*; return True on success.'''
+    try:
+        result = subprocess.run(
+            args, capture_output=True, text=True, timeout=timeout
+        )
+    except FileNotFoundError:
+        log('arduino-cli not found.\n'
+            'Install it from https://arduino.github.io/arduino-cli/')
+        return False
+    except subprocess.TimeoutExpired:
+        log('Operation timed out.')
+        return False
+    for line in (result.stdout + result.stderr).splitlines():
+        if line.strip():
+            log(line)
+    return result.returncode == 0
+
+
+def _installed_libraries() -> dict[str, str]:
+    '''Return the versions of installed arduino-cli libraries by name.'''
+    try:
+        result = subprocess.run(
+            ['arduino-cli', 'lib', 'list', '--format', 'json'],
+            capture_output=True, text=True, timeout=30
+        )
+        data = json.loads(result.stdout)
+        libs = (data.get('installed_libraries', [])
+                if isinstance(data, dict) else data)
+        return {entry['library']['name']:
+                entry['library'].get('version', '')
+                for entry in libs}
+    except Exception:
+        return {}
+
+
+def _ensure_libraries(log: Callable[[str], None]) -> dict[str, str] | None:
+    '''Install missing and upgrade outdated Arduino libraries.
+
+    Returns the installed library versions, or ``None`` if a library
+    could not be installed.
+    '''
+    log('Checking Arduino libraries...')
+    installed = _installed_libraries()
+    missing = [lib for lib in ARDUINO_LIBS if lib not in installed]
+    for lib in missing:
+        log(f'Installing {lib}...')
+        if not _run_cli(['arduino-cli', 'lib', 'install', lib], log,
+                        timeout=60):
+            return None
+    present = [lib for lib in ARDUINO_LIBS if lib in installed]
+    for lib in present:
+        log(f'Updating {lib}...')
+        _run_cli(['arduino-cli', 'lib', 'upgrade', lib], log, timeout=60)
+    if not missing:
+        log('All required libraries are up to date.')
+    return _installed_libraries()
+
+
+def _build(fqbn: str, libraries: dict[str, str], cache: FirmwareCache,
+           log: Callable[[str], None]) -> Path | None:
+    '''Return a build for *fqbn*, compiling it if it is not cached.'''
+    key = cache.key(fqbn, libraries)
+    if (build := cache.lookup(key)) is not None:
+        log(f'Using cached build {key} for {fqbn}.')
+        return build
+    log(f'Compiling for {fqbn}...')
+    try:
+        scratch = cache.scratch(key)
+    except OSError as ex:
+        log(f'Could not create build directory: {ex}')
+        return None
+    if not _run_cli(['arduino-cli', 'compile',
+                     '--fqbn', fqbn,
+                     '--output-dir', str(scratch),
+                     str(cache.sketch)], log):
+        return None
+    return cache.commit(key)
+
+
+def _upload(port: str, fqbn: str, build: Path, cache: FirmwareCache,
+            log: Callable[[str], None]) -> bool:
+    '''Upload the compiled firmware in *build* to *port*.'''
+    log(f'Uploading to {port}...')
+    return _run_cli(['arduino-cli', 'upload',
+                     '--fqbn', fqbn,
+                     '--port', port,
+                     '--input-dir', str(build),
+                     str(cache.sketch)], log, timeout=60)
+
+
+class FirmwareCache:
+    '''Compiled acam3 builds, keyed on everything that affects them.
+
+    A build is identified by a hash of the sketch sources, the board
+    FQBN, and the installed versions of the required libraries, so it
+    is reused only while none of them changes.  Each build lives in its
+    own directory under ``root``, suitable for ``arduino-cli compile
+    --output-dir`` and ``arduino-cli upload --input-dir``.  Builds are
+    compiled into a scratch directory and renamed into place on
+    success, so an interrupted compile never leaves a partial build
+    behind.
+
+    Parameters
+    ----------
+    root : str or pathlib.Path, optional
+        Cache directory.  Default: ``~/.QPolargraph/firmware``.
+    sketch : str or pathlib.Path, optional
+        Sketch directory.  Default: the bundled ``acam3`` sketch.
+
+    Methods
+    -------
+    key(fqbn, libraries)
+        Return the cache key of a build.
+    lookup(key)
+        Return the directory of a cached build, or ``None``.
+    scratch(key)
+        Return an empty directory to compile into.
+    commit(key)
+        Move a finished compile into the cache.
+    '''
+
+    def __init__(self,
+                 root: str | Path = CACHE_DIR,
+                 sketch: str | Path = SKETCH) -> None:
+        self.root = Path(root).expanduser()
+        self.sketch = Path(sketch)
+
+    def key(self, fqbn: str, libraries: dict[str, str]) -> str:
+        '''Return the cache key of a build.
+
+        Parameters
+        ----------
+        fqbn : str
+            Fully qualified board name.
+        libraries : dict
+            Installed version of each library in ``ARDUINO_LIBS``.
+        '''
+        digest = hashlib.sha256()
+        for path in sorted(self.sketch.rglob('*')):
+            if path.is_file():
+                digest.update(path.relative_to(self.sketch).as_posix()
+                              .encode())
+                digest.update(path.read_bytes())
+        digest.update(fqbn.encode())
+        for lib in ARDUINO_LIBS:
+            digest.update(f'{lib}={libraries.get(lib, "")}'.encode())
+        return digest.hexdigest()[:16]
+
+    def path(self, key: str) -> Path:
+        '''Return the directory of the build with *key*.'''
+        return self.root / key
+
+    def lookup(self, key: str) -> Path | None:
+        '''Return the directory of a cached build, or ``None``.'''
+        path = self.path(key)
+        if any(path.glob('*.hex')) or any(path.glob('*.bin')):
+            return path
+        return None
+
+    def scratch(self, key: str) -> Path:
+        '''Return an empty directory to compile the build with *key* into.'''
+        path = self.root / f'{key}.partial'
+        shutil.rmtree(path, ignore_errors=True)
+        path.mkdir(parents=True)
+        return path
+
+    def commit(self, key: str) -> Path:
+        '''Move a finished compile into the cache and return its directory.'''
+        path = self.path(key)
+        shutil.rmtree(path, ignore_errors=True)
+        (self.root / f'{key}.partial').replace(path)
+        return path
+
+
+def flash_boards(ports: Iterable[str],
+                 log: Callable[[str, str], None] | None = None,
+                 fqbn: str | None = None,
+                 cache: FirmwareCache | None = None,
+                 workers: int = 8) -> dict[str, bool]:
+    '''Flash acam3 onto several boards at once.
+
+    Checks the libraries while the boards are detected, compiles once
+    for each distinct FQBN (or reuses the :class:`FirmwareCache`), then
+    uploads to all ports concurrently.
+
+    Parameters
+    ----------
+    ports : iterable of str
+        Serial ports of the boards.
+    log : callable, optional
+        Called as ``log(port, line)`` with every line of output.
+        ``port`` is ``''`` for the steps shared by all boards.
+    fqbn : str, optional
+        Board FQBN for every port.  Default: detected per port.
+    cache : FirmwareCache, optional
+        Build cache.  Default: ``FirmwareCache()``.
+    workers : int, optional
+        Largest number of concurrent uploads.  Default: 8.
+
+    Returns
+    -------
+    dict
+        ``True`` or ``False`` for each port.
+    '''
+    ports = list(ports)
+    if not ports:
+        return {}
+    log = log or (lambda port, line: None)
+    cache = cache or FirmwareCache()
+
+    def shared(line: str) -> None:
+        log('', line)
+
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        boards = (pool.submit(detect_boards, ports)
+                  if fqbn is None else None)
+        libraries = _ensure_libraries(shared)
+        boards = boards.result() if boards else dict.fromkeys(ports, fqbn)
+    for port in ports:
+        log(port, f'Board: {boards[port]}')
+    if libraries is None:
+        return dict.fromkeys(ports, False)
+
+    # arduino-cli compiles one sketch in a shared build directory,
+    # so builds for different boards run one after another
+    builds = {board: _build(board, libraries, cache, shared)
+              for board in dict.fromkeys(boards.values())}
+
+    def upload(port: str) -> bool:
+        build = builds[boards[port]]
+        if build is None:
+            log(port, 'Firmware did not compile.')
+            return False
+        ok = _upload(port, boards[port], build, cache,
+                     lambda line: log(port, line))
+        log(port, 'Firmware installed successfully.' if ok else
+            'Upload failed.')
+        return ok
+
+    with ThreadPoolExecutor(max_workers=max(min(workers, len(ports)), 1),
+                            thread_name_prefix='flash') as pool:
+        return dict(zip(ports, pool.map(upload, ports)))
 
 
 class _FlashWorker(QtCore.QThread):
     '''Background thread that installs libraries, compiles, and uploads acam3.
 
-    Runs three steps in sequence: library check/install, ``arduino-cli
-    compile``, and ``arduino-cli upload``.  Progress is streamed line by
+    Runs three steps in sequence: library check/install (concurrently
+    with board detection when no ``fqbn`` is given), ``arduino-cli
+    compile`` unless the :class:`FirmwareCache` already holds the
+    build, and ``arduino-cli upload``.  Progress is streamed line by
     line via the ``output`` signal.  The ``finished`` signal carries
     ``True`` on success and ``False`` on any failure.
     '''
@@ -117,94 +402,71 @@ class _FlashWorker(QtCore.QThread):
     output = QtCore.Signal(str)
     finished = QtCore.Signal(bool)
 
-    def __init__(self, port: str, fqbn: str, parent=None):
+    def __init__(self, port: str, fqbn: str | None = None, parent=None,
+                 cache: FirmwareCache | None = None):
         super().__init__(parent)
         self._port = port
         self._fqbn = fqbn
-
-    def _run(self, *args, timeout: int = 120) -> bool:
-        '''Run a subprocess; emit its output; return True on success.'''
-        try:
-            result = subprocess.run(
-                args, capture_output=True, text=True, timeout=timeout
-            )
-        except FileNotFoundError:
-            self.output.emit(
-                'arduino-cli not found.\n'
-                'Install it from https://arduino.github.io/arduino-cli/'
-            )
-            return False
-        except subprocess.TimeoutExpired:
-            self.output.emit('Operation timed out.')
-            return False
-        for line in (result.stdout + result.stderr).splitlines():
-            if line.strip():
-                self.output.emit(line)
-        return result.returncode == 0
-
-    def _installed_libraries(self) -> set[str]:
-        '''Return the names of currently installed arduino-cli libraries.'''
-        try:
-            result = subprocess.run(
-                ['arduino-cli', 'lib', 'list', '--format', 'json'],
-                capture_output=True, text=True, timeout=30
-            )
-            data = json.loads(result.stdout)
-            libs = (data.get('installed_libraries', [])
-                    if isinstance(data, dict) else data)
-            return {entry['library']['name'] for entry in libs}
-        except Exception:
-            return set()
-
-    def _ensure_libraries(self) -> bool:
-        '''Install missing and upgrade outdated Arduino libraries.'''
-        self.output.emit('Checking Arduino libraries...')
-        installed = self._installed_libraries()
-        missing = [lib for lib in ARDUINO_LIBS if lib not in installed]
-        for lib in missing:
-            self.output.emit(f'Installing {lib}...')
-            if not self._run('arduino-cli', 'lib', 'install', lib, timeout=60):
-                return False
-        present = [lib for lib in ARDUINO_LIBS if lib in installed]
-        for lib in present:
-            self.output.emit(f'Updating {lib}...')
-            self._run('arduino-cli', 'lib', 'upgrade', lib, timeout=60)
-        if not missing:
-            self.output.emit('All required libraries are up to date.')
-        return True
+        self._cache = cache or FirmwareCache()
 
     def run(self) -> None:
-        if not self._ensure_libraries():
+        log = self.output.emit
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            board = (pool.submit(detect_fqbn, self._port)
+                     if self._fqbn is None else None)
+            libraries = _ensure_libraries(log)
+            if board is not None:
+                self._fqbn = board.result()
+                log(f'Board: {self._fqbn}')
+        if libraries is None:
             self.finished.emit(False)
             return
 
-        self.output.emit(f'Compiling for {self._fqbn}...')
-        ok = self._run('arduino-cli', 'compile',
-                       '--fqbn', self._fqbn, str(SKETCH))
-        if not ok:
+        build = _build(self._fqbn, libraries, self._cache, log)
+        if build is None:
             self.finished.emit(False)
             return
 
-        self.output.emit(f'Uploading to {self._port}...')
-        ok = self._run('arduino-cli', 'upload',
-                       '--fqbn', self._fqbn,
-                       '--port', self._port,
-                       str(SKETCH), timeout=60)
-        if not ok:
+        if not _upload(self._port, self._fqbn, build, self._cache, log):
             self.finished.emit(False)
             return
 
-        self.output.emit('Firmware installed successfully.')
+        log('Firmware installed successfully.')
         self.finished.emit(True)
 
 
+class _BatchFlashWorker(QtCore.QThread):
+    '''Background thread that runs :func:`flash_boards`.
+
+    The ``output`` signal carries each line of output with the port it
+    concerns (``''`` for shared steps).  The ``finished`` signal carries
+    the result for every port.
+    '''
+
+    output = QtCore.Signal(str, str)
+    finished = QtCore.Signal(dict)
+
+    def __init__(self, ports: list[str], parent=None,
+                 cache: FirmwareCache | None = None):
+        super().__init__(parent)
+        self._ports = ports
+        self._cache = cache
+
+    def run(self) -> None:
+        results = flash_boards(self._ports, log=self.output.emit,
+                               cache=self._cache)
+        self.finished.emit(results)
+
+
 class FlashDialog(QtWidgets.QDialog):
     '''Dialog to detect an attached Arduino and flash the acam3 firmware.
 
     Enumerates serial ports using ``QSerialPortInfo``, filters by known
     Arduino USB vendor IDs, and delegates the three-step flash sequence
     (library install, compile, upload) to a background
-    :class:`_FlashWorker` thread.  Requires ``arduino-cli`` to be
+    :class:`_FlashWorker` thread.  Board detection also runs in the
+    background, and compiled firmware is reused from a
+    :class:`FirmwareCache`.  Requires ``arduino-cli`` to be
     installed and on ``PATH``.
 
     Parameters
@@ -278,9 +540,7 @@ class FlashDialog(QtWidgets.QDialog):
         self._output.clear()
         display = self._port_combo.currentText().split(' — ')[0]
         self._output.appendPlainText(f'Detecting board on {display}...')
-        fqbn = detect_fqbn(port)
-        self._output.appendPlainText(f'Board: {fqbn}')
-        self._worker = _FlashWorker(port, fqbn, self)
+        self._worker = _FlashWorker(port, parent=self)
         self._worker.output.connect(self._output.appendPlainText)
         self._worker.finished.connect(self._on_finished)
         self._worker.start()
@@ -296,6 +556,179 @@ class FlashDialog(QtWidgets.QDialog):
             )
 
 
+class BatchFlashDialog(QtWidgets.QDialog):
+    '''Dialog to flash the acam3 firmware onto several Arduinos at once.
+
+    Lists every board found by :func:`find_arduinos`, all selected by
+    default, and runs :func:`flash_boards` on the selected ports in a
+    background thread.  Output of the shared steps (library check and
+    compile) appears on the *Summary* tab, and each port gets a tab of
+    its own for its upload.  When the batch is over, the summary lists
+    which ports passed and which failed.
+
+    Parameters
+    ----------
+    parent : QtWidgets.QWidget, optional
+        Parent widget.
+    '''
+
+    def __init__(self, parent: QtWidgets.QWidget | None = None):
+        super().__init__(parent)
+        self.setWindowTitle('Flash acam3 Firmware: All Boards')
+        self._worker: _BatchFlashWorker | None = None
+        self._logs: dict[str, QtWidgets.QPlainTextEdit] = {}
+        self._setup_ui()
+        self._populate()
+
+    def _setup_ui(self) -> None:
+        layout = QtWidgets.QVBoxLayout(self)
+        label = f'acam3 v{FIRMWARE_VERSION}' if FIRMWARE_VERSION else 'acam3'
+        layout.addWidget(QtWidgets.QLabel(f'Firmware: {label}'))
+
+        self._port_list = QtWidgets.QListWidget()
+        self._port_list.setMaximumHeight(120)
+        layout.addWidget(self._port_list)
+
+        self._tabs = QtWidgets.QTabWidget()
+        self._summary = QtWidgets.QPlainTextEdit()
+        self._summary.setReadOnly(True)
+        self._summary.setMinimumSize(520, 160)
+        self._tabs.addTab(self._summary, 'Summary')
+        layout.addWidget(self._tabs)
+
+        buttons = QtWidgets.QDialogButtonBox()
+        self._flash_btn = buttons.addButton(
+            'Flash Selected',
+            QtWidgets.QDialogButtonBox.ButtonRole.ActionRole
+        )
+        close_btn = buttons.addButton(
+            QtWidgets.QDialogButtonBox.StandardButton.Close
+        )
+        self._flash_btn.clicked.connect(self._flash)
+        close_btn.clicked.connect(self.reject)
+        layout.addWidget(buttons)
+
+    def _populate(self) -> None:
+        arduinos = find_arduinos()
+        if not arduinos:
+            self._summary.appendPlainText('No Arduino detected.')
+            self._flash_btn.setEnabled(False)
+            return
+        for port in arduinos:
+            desc = port.description() or 'Unknown board'
+            item = QtWidgets.QListWidgetItem(f'{port.portName()} — {desc}')
+            item.setData(QtCore.Qt.ItemDataRole.UserRole,
+                         port.systemLocation())
+            item.setFlags(item.flags() |
+                          QtCore.Qt.ItemFlag.ItemIsUserCheckable)
+            item.setCheckState(QtCore.Qt.CheckState.Checked)
+            self._port_list.addItem(item)
+
+    def selected(self) -> list[str]:
+        '''Return the system locations of the checked ports.'''
+        items = (self._port_list.item(n)
+                 for n in range(self._port_list.count()))
+        return [item.data(QtCore.Qt.ItemDataRole.UserRole)
+                for item in items
+                if item.checkState() == QtCore.Qt.CheckState.Checked]
+
+    def _flash(self) -> None:
+        ports = self.selected()
+        if not ports:
+            return
+        self._flash_btn.setEnabled(False)
+        self._summary.clear()
+        while self._tabs.count() > 1:
+            self._tabs.removeTab(1)
+        self._logs = {}
+        for port in ports:
+            log = QtWidgets.QPlainTextEdit()
+            log.setReadOnly(True)
+            self._logs[port] = log
+            self._tabs.addTab(log, Path(port).name)
+        self._summary.appendPlainText(f'Flashing {len(ports)} boards...')
+        self._worker = _BatchFlashWorker(ports, self)
+        self._worker.output.connect(self._on_output)
+        self._worker.finished.connect(self._on_finished)
+        self._worker.start()
+
+    @QtCore.Slot(str, str)
+    def _on_output(self, port: str, line: str) -> None:
+        self._logs.get(port, self._summary).appendPlainText(line)
+
+    @QtCore.Slot(dict)
+    def _on_finished(self, results: dict) -> None:
+        self._flash_btn.setEnabled(True)
+        for port, ok in results.items():
+            self._summary.appendPlainText(
+                f'{port}: {"passed" if ok else "FAILED"}')
+        failed = [port for port, ok in results.items() if not ok]
+        if failed:
+            QtWidgets.QMessageBox.warning(
+                self, 'Failed',
+                f'{len(failed)} of {len(results)} boards failed:\n'
+                + '\n'.join(failed))
+        else:
+            self.accept()
+
+
+def batch_main(argv: list[str] | None = None) -> int:
+    '''Entry point for the headless ``qpolargraph-flash-all`` script.
+
+    Flashes every attached Arduino, or the ports named on the command
+    line, and prints each port's output prefixed with its name followed
+    by a pass/fail summary.
+
+    Returns
+    -------
+    int
+        0 if every board was flashed, 1 if any failed, 2 if there were
+        no boards to flash.
+    '''
+    parser = argparse.ArgumentParser(
+        prog='qpolargraph-flash-all',
+        description='Flash acam3 firmware onto several Arduinos at once.')
+    parser.add_argument('ports', nargs='*',
+                        help='serial ports (default: all Arduinos)')
+    parser.add_argument('--fqbn',
+                        help='board FQBN (default: detect per port)')
+    parser.add_argument('--cache-dir', default=str(CACHE_DIR),
+                        help='directory of compiled builds')
+    parser.add_argument('--workers', type=int, default=8,
+                        help='largest number of concurrent uploads')
+    parser.add_argument('--list', action='store_true',
+                        help='list attached Arduinos and exit')
+    args = parser.parse_args(argv)
+
+    if args.list or not args.ports:
+        arduinos = find_arduinos()
+        if args.list:
+            for port in arduinos:
+                print(f'{port.systemLocation()}\t'
+                      f'{port.description() or "Unknown board"}')
+            return 0
+        args.ports = [port.systemLocation() for port in arduinos]
+    if not args.ports:
+        print('No Arduino detected.', file=sys.stderr)
+        return 2
+
+    lock = threading.Lock()
+
+    def log(port: str, line: str) -> None:
+        with lock:
+            print(f'[{port}] {line}' if port else line, flush=True)
+
+    results = flash_boards(args.ports, log=log, fqbn=args.fqbn,
+                           cache=FirmwareCache(args.cache_dir),
+                           workers=args.workers)
+    print()
+    for port, ok in results.items():
+        print(f'{port}: {"passed" if ok else "FAILED"}')
+    passed = sum(results.values())
+    print(f'{passed} of {len(results)} boards flashed.')
+    return 0 if passed == len(results) else 1
+
+
 def main() -> None:
     '''Entry point for the ``qpolargraph-flash`` GUI script.'''
     app = QtWidgets.QApplication.instance() or QtWidgets.QApplication(sys.argv)
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from typing import TYPE_CHECKING
 from qtpy import QtCore, QtGui, QtWidgets
 from QInstrument.lib.Configure import Configure
 from QPolargraph.hardware.QPolargraphWidget import QPolargraphWidget
@@ -8,10 +9,19 @@ from QPolargraph.patterns.QScanPatternWidget import QScanPatternWidget
 from QPolargraph.patterns.PolarScan import PolarScan
 from QPolargraph.patterns.RasterScan import RasterScan
 from QPolargraph.patterns.TarzanScan import TarzanScan
+from QPolargraph.patterns.ScanQueue import ScanQueue
+from QPolargraph.lib.SampleStore import SampleStore
+from QPolargraph.lib.DecimatedScatterItem import DecimatedScatterItem
+from QPolargraph.lib.GridAccumulator import GridAccumulator
+from QPolargraph.lib.ScanJournal import ScanJournal
 import pyqtgraph as pg
 import numpy as np
 import numpy.typing as npt
 import logging
+import time
+
+if TYPE_CHECKING:
+    from QPolargraph.hardware.Polargraph import Polargraph
 
 
 logger = logging.getLogger(__name__)
@@ -58,6 +68,22 @@ class QScanner(QtWidgets.QMainWindow):
         Directory for storing instrument configuration.
         Defaults to ``~/.<ClassName>`` where *ClassName* is the name of
         the concrete subclass: each subclass gets its own config directory.
+    samples : SampleStore
+        Full-resolution record of every row emitted by :attr:`dataReady`
+        during the current scan.  Cleared when a new scan starts.
+    grid : GridAccumulator
+        Running-mean image of the values passed to :meth:`plotImage`,
+        covering the scan rectangle with one pixel per scan ``step``.
+        Rebuilt whenever the scan geometry changes.
+    imageComponent : str
+        Part of a complex :attr:`grid` shown in the live image: one of
+        ``'abs'``, ``'phase'``, ``'real'``, or ``'imag'``.
+        Default: ``'abs'``.
+    decimate : bool
+        If ``True``, :meth:`plotData` keeps one spot per pixel-sized
+        bin, so the display stays bounded however long the scan runs.
+        If ``False``, every point is plotted at full resolution.
+        Changing the mode clears the data plot.  Default: ``True``.
 
     Methods
     -------
@@ -65,6 +91,19 @@ class QScanner(QtWidgets.QMainWindow):
         Display *message* on the status bar.
     plotData(x, y, hue)
         Add scatter points at ``(x, y)`` colored by *hue* in ``[0, 1]``.
+        With :attr:`decimate`, the display keeps one spot per
+        pixel-sized bin; see
+        :class:`~QPolargraph.lib.DecimatedScatterItem.DecimatedScatterItem`.
+    plotImage(x, y, value)
+        Accumulate samples into :attr:`grid` and display the running
+        mean as an image beneath the trajectory.
+    clearData()
+        Discard stored samples and clear the data plot and image.
+    resumeScan(rehome=None)
+        Continue a scan interrupted by a crash from its checkpoint.
+    runJobs(jobs)
+        Run a list of scan jobs back to back with a
+        :class:`~QPolargraph.patterns.ScanQueue.ScanQueue`.
 
     Signals
     -------
@@ -72,7 +111,10 @@ class QScanner(QtWidgets.QMainWindow):
         Emitted at each position during a scan.  The base class emits
         ``{'t': float, 'x': float, 'y': float}`` where ``t`` is a
         :func:`time.monotonic` timestamp [s] and ``x``, ``y`` are
-        Cartesian coordinates [m].  Subclasses may override
+        Cartesian coordinates [m].  When the scan pattern has a
+        :attr:`~QPolargraph.QScanPattern.QScanPattern.demodulator`, the
+        dict also carries the lock-in outputs ``'I'`` and ``'Q'``, and
+        ``I + iQ`` is added to the live image.  Subclasses may override
         :meth:`_onDataReady` to merge in additional measurement fields
         before emitting.  Because ``_onDataReady`` runs on the GUI
         thread, instrument reads there should be fast and non-blocking;
@@ -98,10 +140,23 @@ class QScanner(QtWidgets.QMainWindow):
     dataReady = QtCore.Signal(dict)
     _toggle = QtCore.Signal()
     _interruptClose = QtCore.Signal()
+    _startQueue = QtCore.Signal()
+    _abortQueue = QtCore.Signal()
+    _toggleQueue = QtCore.Signal()
+    _resumeCheckpoint = QtCore.Signal(bool)
 
     SCAN_PATTERN = PolarScan
     SCAN_WIDGET = QScanPatternWidget
 
+    #: Functions mapping a complex image to the displayed component.
+    IMAGE_COMPONENTS = {'abs': np.abs,
+                        'phase': np.angle,
+                        'real': np.real,
+                        'imag': np.imag}
+
+    #: Minimum interval between image refreshes [ms].
+    IMAGE_INTERVAL = 100
+
     def __init__(self, *args,
                  configdir: str | None = None,
                  fake: bool = False,
@@ -109,6 +164,10 @@ class QScanner(QtWidgets.QMainWindow):
                  **kwargs) -> None:
         super().__init__(*args, **kwargs)
         self._belt_pos = None
+        self.queue = None
+        self._failedJob = None
+        self.samples = SampleStore()
+        self._decimate = True
         self.setupPolargraph(fake)
         self.setupScanner(pattern)
         self.configure(configdir)
@@ -128,6 +187,8 @@ class QScanner(QtWidgets.QMainWindow):
     def configure(self, configdir: str | None) -> None:
         configdir = configdir or f'~/.{type(self).__name__}'
         self.config = Configure(configdir=configdir)
+        self.scanner.pattern.journal = ScanJournal(
+            self.config.configdir / 'checkpoint.json')
         self.restoreSettings()
 
     def setupUi(self) -> None:
@@ -195,6 +256,16 @@ class QScanner(QtWidgets.QMainWindow):
             axis.setPen('k')
             axis.setTextPen('k')
 
+        self.dataImage = pg.ImageItem(axisOrder='col-major')
+        self.dataImage.setColorMap(pg.colormap.get('viridis'))
+        self.plot.addItem(self.dataImage)
+        self._imageTimer = QtCore.QTimer(self)
+        self._imageTimer.setSingleShot(True)
+        self._imageTimer.setInterval(self.IMAGE_INTERVAL)
+        self._imageTimer.timeout.connect(self.refreshImage)
+        self._imageComponent = 'abs'
+        self.resetImage()
+
         pen = pg.mkPen('r', style=QtCore.Qt.PenStyle.DotLine)
         self.trajectoryPlot = pg.PlotDataItem(pen=pen)
         self.plot.addItem(self.trajectoryPlot)
@@ -205,7 +276,7 @@ class QScanner(QtWidgets.QMainWindow):
                                         symbolPen=pen, symbolBrush=brush)
         self.plot.addItem(self.beltPlot)
 
-        self.dataPlot = pg.ScatterPlotItem(pen=None)
+        self.dataPlot = DecimatedScatterItem(pen=None)
         self.plot.addItem(self.dataPlot)
 
         # Menu bar
@@ -217,6 +288,8 @@ class QScanner(QtWidgets.QMainWindow):
         self.actionSaveDataAs = fileMenu.addAction('Save Data As ...')
         self.actionLoadData = fileMenu.addAction('Load Data ...')
         fileMenu.addSeparator()
+        self.actionResumeScan = fileMenu.addAction('Resume Interrupted Scan')
+        fileMenu.addSeparator()
         self.actionQuit = fileMenu.addAction('Quit')
         self.actionQuit.triggered.connect(self.close)
 
@@ -224,22 +297,35 @@ class QScanner(QtWidgets.QMainWindow):
 
     def connectSignals(self) -> None:
         self.polargraph.propertyChanged.connect(self.updatePlot)
+        self.polargraph.propertyChanged.connect(self.resetImage)
+        self.polargraph.deviceChanged.connect(self._onDeviceChanged)
+        self.polargraph.status.connect(self.showStatus)
         self.scanner.patternChanged.connect(self.updatePlot)
+        self.scanner.patternChanged.connect(self.resetImage)
         self.scanner.pattern.dataReady.connect(self.plotBelt)
         self.scanner.pattern.dataReady.connect(self._onDataReady)
         self.scanner.pattern.stateChanged.connect(self._onStateChanged)
         self.scanner.pattern.closeRequested.connect(self._onCloseRequested)
+        self.scanner.pattern.linkDown.connect(self._onLinkDown)
+        self.scanner.pattern.linkRecovered.connect(self._onLinkRecovered)
+        self.scanner.pattern.stalled.connect(self._onStalled)
         self._toggle.connect(self.scanner.pattern.toggle)
         self._interruptClose.connect(self.scanner.pattern.interruptAndClose)
+        self._resumeCheckpoint.connect(
+            self.scanner.pattern.resumeFromCheckpoint)
+        self.dataReady.connect(self.samples.append)
 
         self.scan.clicked.connect(self.toggleScan)
         self.center.clicked.connect(self.scanner.pattern.center)
         self.home.clicked.connect(self.scanner.pattern.home)
 
         QtCore.QTimer.singleShot(0, self._syncPatternThread)
+        if self.polargraph.connecting:
+            self._setConnecting(True)
 
         self.actionSaveSettings.triggered.connect(self.saveSettings)
         self.actionRestoreSettings.triggered.connect(self.restoreSettings)
+        self.actionResumeScan.triggered.connect(self.resumeScan)
 
     @QtCore.Slot()
     def updatePlot(self) -> None:
@@ -293,6 +379,40 @@ class QScanner(QtWidgets.QMainWindow):
             self.scan.setText('Pause')
             self.scan.setEnabled(state == ScanState.SCANNING)
 
+    @QtCore.Slot()
+    def _onLinkDown(self) -> None:
+        self.showStatus('Polargraph disconnected: reconnecting ...')
+
+    @QtCore.Slot(float)
+    def _onLinkRecovered(self, elapsed: float) -> None:
+        self.showStatus(f'Polargraph reconnected: {elapsed:.1f} s lost')
+
+    @QtCore.Slot(str)
+    def _onStalled(self, reason: str) -> None:
+        action = self.scanner.pattern.stallAction
+        self.showStatus(f'Polargraph move failed ({reason}): {action}')
+
+    def _setConnecting(self, connecting: bool) -> None:
+        '''Disable motion controls while the hardware search runs.'''
+        for widget in (self.scan, self.center, self.home):
+            widget.setEnabled(not connecting)
+        self.actionResumeScan.setEnabled(not connecting)
+
+    @QtCore.Slot(object)
+    def _onDeviceChanged(self, device: Polargraph) -> None:
+        '''Drive the instrument found by the background search.
+
+        Points the scan pattern at *device* and pushes the saved
+        polargraph settings to it.  :meth:`_syncPatternThread` keeps
+        retrying while the search runs, and moves the pattern once the
+        widget has moved a serial device to its thread.
+        '''
+        self.scanner.pattern.polargraph = device
+        self.config.restore(self.polargraph)
+        self._setConnecting(False)
+        self.updatePlot()
+        self.resetImage()
+
     @QtCore.Slot()
     def toggleScan(self) -> None:
         '''Emit the toggle signal to start, pause, or resume the scan.
@@ -300,7 +420,14 @@ class QScanner(QtWidgets.QMainWindow):
         Routes through ``_toggle`` so the call is delivered as a
         ``QueuedConnection`` when the scan pattern lives in a worker
         thread (real hardware), or as a ``DirectConnection`` in tests.
+        Starting a new scan clears the previous scan's data.  While a
+        job queue runs, pauses or resumes its running job instead.
         '''
+        if self.queue is not None:
+            self._toggleQueue.emit()
+            return
+        if not self.scanner.pattern.active():
+            self.clearData()
         self._toggle.emit()
 
     def _syncPatternThread(self) -> None:
@@ -325,15 +452,27 @@ class QScanner(QtWidgets.QMainWindow):
     @QtCore.Slot(object)
     def _onDataReady(self, pos: np.ndarray) -> None:
         if self.scanner.pattern.scanning():
-            self.dataReady.emit({'t': float(pos[2]),
-                                 'x': float(pos[0]),
-                                 'y': float(pos[1])})
+            fields = self.scanner.pattern.fields
+            row = {'t': float(pos[2]),
+                   'x': float(pos[0]),
+                   'y': float(pos[1])}
+            row |= dict(zip(fields, map(float, pos[3:])))
+            if 'I' in row and np.isfinite(row['I']):
+                self.plotImage(row['x'], row['y'],
+                               complex(row['I'], row['Q']))
+            self.dataReady.emit(row)
 
     def plotData(self, x: npt.ArrayLike, y: npt.ArrayLike,
                  hue: npt.ArrayLike,
                  saturation: npt.ArrayLike = 1.0) -> None:
         '''Add scatter points to the data plot.
 
+        With :attr:`decimate`, points are folded into a spatially
+        decimated display that keeps one spot per pixel-sized bin, so
+        redraw cost does not grow with the length of the scan.
+        Otherwise every point is added to the plot.  Full-resolution
+        data are kept in :attr:`samples` either way.
+
         Parameters
         ----------
         x : array-like
@@ -347,6 +486,9 @@ class QScanner(QtWidgets.QMainWindow):
             Default: 1.0 (fully saturated).  Low saturation appears
             white, high saturation gives the pure hue color.
         '''
+        if self._decimate:
+            self.dataPlot.addSamples(x, y, hue, saturation)
+            return
         x = np.atleast_1d(x)
         y = np.atleast_1d(y)
         hue = np.atleast_1d(hue)
@@ -354,6 +496,219 @@ class QScanner(QtWidgets.QMainWindow):
         brush = [pg.hsvColor(h, sat=s) for h, s in zip(hue, saturation)]
         self.dataPlot.addPoints(x, y, brush=brush)
 
+    @property
+    def decimate(self) -> bool:
+        '''Whether :meth:`plotData` shows one spot per display bin.'''
+        return self._decimate
+
+    @decimate.setter
+    def decimate(self, value: bool) -> None:
+        value = bool(value)
+        if value != self._decimate:
+            self.dataPlot.clear()
+        self._decimate = value
+
+    def plotImage(self, x: npt.ArrayLike, y: npt.ArrayLike,
+                  value: npt.ArrayLike) -> None:
+        '''Accumulate samples into the live image.
+
+        Each sample is added to the running mean of the :attr:`grid`
+        pixel that contains it, at O(1) cost per sample.  The image is
+        refreshed at most once every :attr:`IMAGE_INTERVAL`
+        milliseconds, as a single texture upload.  Complex values are
+        displayed as the :attr:`imageComponent`.
+
+        Parameters
+        ----------
+        x : array-like
+            Horizontal coordinates [m].
+        y : array-like
+            Vertical coordinates [m].
+        value : array-like
+            Sample values.
+        '''
+        value = np.asarray(value)
+        if np.iscomplexobj(value) and not np.iscomplexobj(self.grid.total):
+            self.grid = GridAccumulator(self.grid.rect, self.grid.spacing,
+                                        dtype=complex)
+        if self.grid.add(x, y, value) and not self._imageTimer.isActive():
+            self._imageTimer.start()
+
+    @property
+    def imageComponent(self) -> str:
+        '''Part of a complex image that is displayed.'''
+        return self._imageComponent
+
+    @imageComponent.setter
+    def imageComponent(self, component: str) -> None:
+        if component not in self.IMAGE_COMPONENTS:
+            raise ValueError(f'unknown image component: {component!r}')
+        self._imageComponent = component
+        if self.grid.count.any():
+            self.refreshImage()
+
+    @QtCore.Slot()
+    def refreshImage(self) -> None:
+        '''Display the current running mean of :attr:`grid`.'''
+        if not self.grid.count.any():
+            self.dataImage.clear()
+            return
+        image = self.grid.mean
+        if np.iscomplexobj(image):
+            image = self.IMAGE_COMPONENTS[self.imageComponent](image)
+        self.dataImage.setImage(image, autoLevels=True)
+        self.dataImage.setRect(QtCore.QRectF(*self.grid.extent))
+
+    @QtCore.Slot()
+    def resetImage(self) -> None:
+        '''Rebuild :attr:`grid` for the current scan geometry.'''
+        self.grid = GridAccumulator.forPattern(self.scanner.pattern)
+        self.dataImage.clear()
+
+    @QtCore.Slot()
+    def clearData(self) -> None:
+        '''Discard stored samples and clear the data plot and image.'''
+        self.samples.clear()
+        self.dataPlot.clear()
+        self.grid.clear()
+        self.dataImage.clear()
+
+    @QtCore.Slot()
+    def resumeScan(self, rehome: bool | None = None) -> None:
+        '''Continue a scan interrupted by a crash from its checkpoint.
+
+        The scan settings are restored from the checkpoint and the
+        pattern carries on from the last waypoint it reached; see
+        :meth:`~QPolargraph.QScanPattern.QScanPattern.resumeFromCheckpoint`.
+
+        The step indexes stored in the checkpoint are those of the
+        last checkpoint written, which can be up to
+        :attr:`~QPolargraph.lib.ScanJournal.ScanJournal.interval`
+        seconds (5 s by default) older than the crash.  The payload has
+        usually moved since, so unless it has been returned to the home
+        position by hand the resumed scan is offset by that distance.
+
+        Parameters
+        ----------
+        rehome : bool, optional
+            ``True`` if the payload has been returned to the home
+            position by hand, so that the step counters are zeroed.
+            ``False`` to trust the stored indexes.  Default: ask.
+        '''
+        pattern = self.scanner.pattern
+        if pattern.active() or self.polargraph.connecting:
+            return
+        try:
+            state = pattern.journal.load()
+        except (AttributeError, OSError, ValueError):
+            self.showStatus('No interrupted scan to resume')
+            return
+        if state.get('pattern') != type(pattern).__name__:
+            self.showStatus(f"Interrupted scan used {state.get('pattern')}")
+            return
+        if rehome is None:
+            rehome = self._askRehome(state)
+            if rehome is None:
+                return
+        self.scanner.settings = state['geometry']
+        self.clearData()
+        self._resumeCheckpoint.emit(rehome)
+
+    def _askRehome(self, state: dict) -> bool | None:
+        '''Ask whether the payload was re-homed, or ``None`` to cancel.'''
+        buttons = QtWidgets.QMessageBox.StandardButton
+        age = ''
+        if 'time' in state:
+            age = (f' It was recorded {time.time() - state["time"]:.0f} s '
+                   'ago.')
+        answer = QtWidgets.QMessageBox.question(
+            self, 'Resume Interrupted Scan',
+            'Has the payload been returned to the home position by hand?'
+            '\n\nIf not, the scan resumes from the position stored in '
+            'the last checkpoint, which may be several seconds older '
+            f'than the interruption.{age}',
+            buttons.Yes | buttons.No | buttons.Cancel, buttons.Cancel)
+        if answer == buttons.Cancel:
+            return None
+        return answer == buttons.Yes
+
+    def runJobs(self, jobs: list[tuple[type, dict]],
+                returnHome: bool = True) -> ScanQueue:
+        '''Run a list of scan jobs back to back.
+
+        The jobs run on the polargraph, chained without homing, while
+        the display follows the current job.  Each job's samples are
+        recorded in the returned queue's ``results``; :attr:`samples`
+        holds those of the current job and :attr:`dataReady` is
+        emitted as for a single scan.
+
+        Parameters
+        ----------
+        jobs : iterable of (type, mapping)
+            Scan pattern classes and their constructor parameters.
+        returnHome : bool, optional
+            If ``True``, return home after the last job.
+            Default: ``True``.
+
+        Returns
+        -------
+        ScanQueue
+            The running queue.
+        '''
+        if self.scanner.pattern.active() or self.queue is not None:
+            raise RuntimeError('a scan is already running')
+        if self.polargraph.connecting:
+            raise RuntimeError('the polargraph is still connecting')
+        queue = ScanQueue(self.polargraph.device, jobs,
+                          returnHome=returnHome)
+        thread = self.scanner.pattern.thread()
+        if queue.thread() is not thread:
+            queue.moveToThread(thread)
+        queue.jobStarted.connect(self._onJobStarted)
+        queue.dataReady.connect(self._onJobData)
+        queue.stateChanged.connect(self._onStateChanged)
+        queue.jobFailed.connect(self._onJobFailed)
+        queue.finished.connect(self._onQueueFinished)
+        self._startQueue.connect(queue.start)
+        self._abortQueue.connect(queue.abort)
+        self._toggleQueue.connect(queue.toggle)
+        self.queue = queue
+        self._startQueue.emit()
+        return queue
+
+    @QtCore.Slot(int)
+    def _onJobStarted(self, index: int) -> None:
+        pattern = self.queue.patterns[index]
+        self.clearData()
+        self.grid = GridAccumulator.forPattern(pattern)
+        self.trajectoryPlot.setData(*pattern.trajectory())
+        self._onStateChanged(ScanState.MOVING)
+        self.showStatus(f'Job {index + 1} of {len(self.queue.patterns)}')
+
+    @QtCore.Slot(int, dict)
+    def _onJobData(self, index: int, row: dict) -> None:
+        self.plotBelt(np.array([row['x'], row['y']]))
+        if 'I' in row and np.isfinite(row['I']):
+            self.plotImage(row['x'], row['y'], complex(row['I'], row['Q']))
+        self.dataReady.emit(row)
+
+    @QtCore.Slot(int)
+    def _onJobFailed(self, index: int) -> None:
+        self._failedJob = index
+
+    @QtCore.Slot()
+    def _onQueueFinished(self) -> None:
+        self._startQueue.disconnect(self.queue.start)
+        self._abortQueue.disconnect(self.queue.abort)
+        self._toggleQueue.disconnect(self.queue.toggle)
+        self.queue = None
+        self._onStateChanged(ScanState.IDLE)
+        self.plotTrajectory()
+        if self._failedJob is not None:
+            self.showStatus(f'Job {self._failedJob + 1} failed: '
+                            'queue stopped')
+            self._failedJob = None
+
     @QtCore.Slot()
     def saveSettings(self) -> None:
         self.config.save(self.scanner)
@@ -375,6 +730,11 @@ class QScanner(QtWidgets.QMainWindow):
 
     def closeEvent(self, event: QtGui.QCloseEvent) -> None:
         logger.debug(f'Closing: {event.type()}')
+        if self.queue is not None:
+            self.queue.finished.connect(self.close)
+            self._abortQueue.emit()
+            event.ignore()
+            return
         if self.scanner.pattern.active():
             self._interruptClose.emit()
             event.ignore()
@@ -0,0 +1,341 @@
+'''ScanRunner — run a scan from a parameter file, without a GUI.
+
+:class:`~QPolargraph.QScanner.QScanner` builds a ``QMainWindow`` with
+live plots, which is wasted effort for scheduled batch jobs on a
+headless acquisition computer.  :class:`ScanRunner` drives a
+:class:`~QPolargraph.hardware.Polargraph.Polargraph` and a
+:class:`~QPolargraph.patterns.QScanPattern.QScanPattern` under a
+``QCoreApplication`` only, and streams the samples to a CSV file with
+:class:`~QPolargraph.lib.SampleWriter.SampleWriter`.  Neither
+``QtWidgets`` nor ``pyqtgraph`` is imported.
+
+Parameter file
+--------------
+A JSON object with these keys, all optional:
+
+``pattern``
+    Scan pattern class: the name of one of the bundled patterns
+    (``"RasterScan"``, ``"PolarScan"``, ``"TarzanScan"``,
+    ``"PointScan"``) or ``"module:Class"`` for a subclass defined
+    elsewhere.  Default: ``"PolarScan"``.
+``scan``
+    Keyword arguments for the pattern, e.g. ``width``, ``height``,
+    ``dx``, ``dy``, ``step``, ``sampleSpacing``, ``optimize``.
+``polargraph``
+    Polargraph geometry and motion settings: ``ell``, ``y0``,
+    ``pitch``, ``circumference``, ``steps``, ``speed``.  A simulated
+    polargraph also accepts ``step_delay``.
+``port``
+    Serial port of the polargraph.  Default: located with
+    :class:`~QPolargraph.hardware.PortScanner.PortScanner`.
+``journal``
+    Checkpoint file; see :class:`~QPolargraph.lib.ScanJournal.ScanJournal`.
+``publish``
+    Also stream the samples live to other processes, on a Unix socket
+    path or a ``[host, port]`` TCP address; see
+    :class:`~QPolargraph.lib.SamplePublisher.SamplePublisher`.
+
+For example::
+
+    {"pattern": "RasterScan",
+     "scan": {"width": 0.4, "height": 0.3, "step": 2},
+     "polargraph": {"ell": 1.2, "y0": 0.15}}
+
+Command line
+------------
+::
+
+    qpolargraph-scan params.json -o scan.csv
+    qpolargraph-scan params.json -o - --fake   # simulated, to stdout
+
+The exit status is 0 when the scan completes, 1 if it could not start
+(bad parameters or no hardware), and 2 if it was interrupted.
+'''
+
+from __future__ import annotations
+
+from pathlib import Path
+import argparse
+import importlib
+import json
+import logging
+import signal
+import sys
+from qtpy import QtCore
+from QPolargraph.geometry.PolargraphGeometry import PolargraphGeometry
+from QPolargraph.patterns.QScanPattern import QScanPattern, ScanState
+from QPolargraph.lib.SamplePublisher import SamplePublisher
+from QPolargraph.lib.SampleWriter import SampleWriter
+from QPolargraph.lib.ScanJournal import ScanJournal
+
+
+logger = logging.getLogger(__name__)
+
+
+class ScanRunner(QtCore.QObject):
+
+    '''Run one scan without any widgets and stream its samples to disk.
+
+    Every :attr:`~QPolargraph.patterns.QScanPattern.QScanPattern.dataReady`
+    array recorded while the pattern is SCANNING is written to the
+    ``writer``.  When the pattern returns to IDLE, the writer is closed
+    and :attr:`finished` is emitted with the exit status.
+
+    A headless run cannot be resumed by hand, so a scan that pauses,
+    for example because the :attr:`~QPolargraph.patterns.QScanPattern.QScanPattern.watchdog`
+    flagged a stall or the serial link could not be restored, is
+    abandoned.  If the pattern has a journal, its checkpoint is kept.
+
+    Parameters
+    ----------
+    pattern : QScanPattern
+        Configured scan pattern, with its polargraph.
+    writer : SampleWriter
+        Destination of the samples.
+    publisher : SamplePublisher, optional
+        Live stream of the samples, closed with the writer.
+
+    Properties
+    ----------
+    status : int
+        Exit status: :attr:`COMPLETE`, :attr:`FAILED`, or
+        :attr:`INTERRUPTED`.
+
+    Methods
+    -------
+    fromParameters(params, output, fake=False)
+        Build a runner from a parameter mapping.
+    start()
+        Start the scan once the event loop is running.
+    abort()
+        Stop the scan.
+
+    Signals
+    -------
+    finished(int)
+        Emitted with the exit status when the scan is over.
+    '''
+
+    finished = QtCore.Signal(int)
+
+    #: Exit status of a completed scan.
+    COMPLETE = 0
+    #: Exit status of a scan that could not start.
+    FAILED = 1
+    #: Exit status of a scan that was stopped before it completed.
+    INTERRUPTED = 2
+
+    #: Bundled scan patterns by name.
+    PATTERNS = ('RasterScan', 'PolarScan', 'TarzanScan', 'PointScan')
+
+    #: Polargraph settings accepted from a parameter file.
+    SETTINGS = PolargraphGeometry.SETTINGS
+
+    #: Further settings accepted for a simulated polargraph.
+    FAKE_SETTINGS = ('step_delay',)
+
+    def __init__(self,
+                 pattern: QScanPattern,
+                 writer: SampleWriter,
+                 publisher: SamplePublisher | None = None,
+                 parent: QtCore.QObject | None = None) -> None:
+        super().__init__(parent)
+        self.pattern = pattern
+        self.writer = writer
+        self.publisher = publisher
+        if publisher is not None:
+            publisher.attach(pattern)
+        self._status = self.COMPLETE
+        pattern.dataReady.connect(self._onDataReady)
+        pattern.stateChanged.connect(self._onStateChanged)
+        pattern.stalled.connect(self._onStalled)
+
+    @property
+    def status(self) -> int:
+        '''Exit status of the scan.'''
+        return self._status
+
+    @classmethod
+    def fromParameters(cls,
+                       params: dict,
+                       output: str | Path,
+                       fake: bool = False) -> ScanRunner:
+        '''Build a runner from a parameter mapping.
+
+        Parameters
+        ----------
+        params : dict
+            Contents of a parameter file; see the module documentation.
+        output : str or pathlib.Path
+            CSV file for the samples, or ``'-'`` for standard output.
+        fake : bool, optional
+            If ``True``, scan with a
+            :class:`~QPolargraph.hardware.fake.FakePolargraph`.
+
+        Raises
+        ------
+        ValueError
+            If the parameters are invalid.
+        RuntimeError
+            If no polargraph answers.
+        '''
+        cls_ = cls.patternClass(params.get('pattern', 'PolarScan'))
+        settings = params.get('polargraph', {})
+        known = cls.SETTINGS + (cls.FAKE_SETTINGS if fake else ())
+        for name in settings:
+            if name not in known:
+                raise ValueError(f'Unknown polargraph setting {name!r}')
+        polargraph = cls.openPolargraph(params.get('port'), fake)
+        for name, value in settings.items():
+            setattr(polargraph, name, value)
+        try:
+            pattern = cls_(polargraph=polargraph, **params.get('scan', {}))
+        except TypeError as ex:
+            raise ValueError(f'Invalid scan parameters: {ex}') from ex
+        if (journal := params.get('journal')) is not None:
+            pattern.journal = ScanJournal(journal)
+        publisher = None
+        if (address := params.get('publish')) is not None:
+            if isinstance(address, list):
+                address = tuple(address)
+            try:
+                publisher = SamplePublisher(address)
+            except (OSError, TypeError) as ex:
+                raise ValueError(
+                    f'Cannot publish on {address!r}: {ex}') from ex
+        writer = SampleWriter(output, ('x', 'y', 't', *pattern.fields))
+        return cls(pattern, writer, publisher)
+
+    @classmethod
+    def patternClass(cls, name: str) -> type:
+        '''Return the scan pattern class called *name*.
+
+        Parameters
+        ----------
+        name : str
+            Name of a bundled pattern or ``'module:Class'``.
+        '''
+        if ':' in name:
+            module, _, attr = name.partition(':')
+        elif name in cls.PATTERNS:
+            module, attr = f'QPolargraph.patterns.{name}', name
+        else:
+            raise ValueError(f'Unknown scan pattern {name!r}')
+        try:
+            pattern = getattr(importlib.import_module(module), attr)
+        except (ImportError, AttributeError) as ex:
+            raise ValueError(f'Cannot load scan pattern {name!r}') from ex
+        if not (isinstance(pattern, type) and
+                issubclass(pattern, QScanPattern)):
+            raise ValueError(f'{name!r} is not a QScanPattern')
+        return pattern
+
+    @staticmethod
+    def openPolargraph(port: str | None = None, fake: bool = False):
+        '''Return an open polargraph.
+
+        Parameters
+        ----------
+        port : str, optional
+            Serial port.  Default: search all ports.
+        fake : bool, optional
+            If ``True``, return a
+            :class:`~QPolargraph.hardware.fake.FakePolargraph`.
+
+        Raises
+        ------
+        RuntimeError
+            If no polargraph answers.
+        '''
+        if fake:
+            from QPolargraph.hardware.fake import FakePolargraph
+            return FakePolargraph()
+        from QPolargraph.hardware.Polargraph import Polargraph
+        if port:
+            device = Polargraph(portName=port)
+        else:
+            from QPolargraph.hardware.PortScanner import PortScanner
+            device = PortScanner(Polargraph).search()
+        if device is None or not device.isOpen():
+            raise RuntimeError('No polargraph found')
+        return device
+
+    @QtCore.Slot()
+    def start(self) -> None:
+        '''Start the scan once the event loop is running.'''
+        QtCore.QTimer.singleShot(0, self.pattern.scan)
+
+    @QtCore.Slot()
+    def abort(self) -> None:
+        '''Stop the scan.  The polargraph stays where it is.'''
+        self._status = self.INTERRUPTED
+        self.pattern.abandon()
+
+    @QtCore.Slot(object)
+    def _onDataReady(self, data) -> None:
+        if self.pattern.scanning():
+            self.writer.write(data)
+
+    @QtCore.Slot(str)
+    def _onStalled(self, reason: str) -> None:
+        logger.warning(f'Polargraph move failed: {reason}')
+        if self.pattern.stallAction == 'abort':
+            self._status = self.INTERRUPTED
+
+    @QtCore.Slot(object)
+    def _onStateChanged(self, state: ScanState) -> None:
+        if state == ScanState.PAUSED:
+            logger.error('Scan paused: abandoning')
+            self._status = self.INTERRUPTED
+            self.pattern.abandon()
+        elif state == ScanState.IDLE:
+            self.writer.close()
+            if self.publisher is not None:
+                self.publisher.close()
+            logger.info(f'{self.writer.count} samples written')
+            self.finished.emit(self._status)
+
+
+def main(argv: list[str] | None = None) -> int:
+    '''Entry point for the ``qpolargraph-scan`` console script.
+
+    Returns
+    -------
+    int
+        Exit status of the scan.
+    '''
+    parser = argparse.ArgumentParser(
+        prog='qpolargraph-scan',
+        description='Run a polargraph scan without a GUI.')
+    parser.add_argument('params', help='JSON parameter file')
+    parser.add_argument('-o', '--output', required=True,
+                        help="CSV file for the samples ('-' for stdout)")
+    parser.add_argument('-f', '--fake', action='store_true',
+                        help='use the simulated polargraph')
+    parser.add_argument('-v', '--verbose', action='store_true',
+                        help='report progress on stderr')
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO if args.verbose else
+                        logging.WARNING)
+
+    app = (QtCore.QCoreApplication.instance() or
+           QtCore.QCoreApplication(sys.argv[:1]))
+    try:
+        with open(args.params) as f:
+            params = json.load(f)
+        runner = ScanRunner.fromParameters(params, args.output, args.fake)
+    except (OSError, ValueError, RuntimeError) as ex:
+        print(f'qpolargraph-scan: {ex}', file=sys.stderr)
+        return ScanRunner.FAILED
+    previous = signal.signal(signal.SIGINT, lambda *_: runner.abort())
+    runner.finished.connect(app.exit)
+    runner.start()
+    try:
+        return app.exec()
+    finally:
+        signal.signal(signal.SIGINT, previous)
+        runner.pattern.polargraph.close()
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -11,15 +11,45 @@ _lazy = {
     'Polargraph':         'hardware.Polargraph',
     'FakeMotors':         'hardware.fake',
     'FakePolargraph':     'hardware.fake',
+    'PortScanner':        'hardware.PortScanner',
     'QPolargraphWidget':  'hardware.QPolargraphWidget',
     'QScanPatternWidget': 'patterns.QScanPatternWidget',
     'TarzanScanWidget':   'patterns.TarzanScanWidget',
+    'PointScanWidget':    'patterns.PointScanWidget',
     'QScanner':           'QScanner',
+    'ScanRunner':         'ScanRunner',
     'FlashDialog':        'FlashFirmware',
     'QScanPattern':       'patterns.QScanPattern',
     'RasterScan':         'patterns.RasterScan',
     'PolarScan':          'patterns.PolarScan',
     'TarzanScan':         'patterns.TarzanScan',
+    'PointScan':          'patterns.PointScan',
+    'ScanQueue':          'patterns.ScanQueue',
+    'AsyncScan':          'patterns.AsyncScan',
+    'scan_async':         'patterns.AsyncScan',
+    'ScanCoordinator':    'patterns.ScanCoordinator',
+    'PolargraphGeometry': 'geometry.PolargraphGeometry',
+    'ScanGeometry':       'geometry.ScanGeometry',
+    'RasterGeometry':     'geometry.RasterGeometry',
+    'PolarGeometry':      'geometry.PolarGeometry',
+    'TarzanGeometry':     'geometry.TarzanGeometry',
+    'PointGeometry':      'geometry.PointGeometry',
+    'SampleStore':        'lib.SampleStore',
+    'SampleWriter':       'lib.SampleWriter',
+    'SamplePublisher':    'lib.SamplePublisher',
+    'SampleSubscriber':   'lib.SamplePublisher',
+    'SampleRing':         'lib.SampleRing',
+    'SampleRingReader':   'lib.SampleRing',
+    'DecimatedScatterItem': 'lib.DecimatedScatterItem',
+    'GridAccumulator':    'lib.GridAccumulator',
+    'AcquisitionExecutor': 'lib.AcquisitionExecutor',
+    'ArcSampler':         'lib.ArcSampler',
+    'ScanJournal':        'lib.ScanJournal',
+    'MotionWatchdog':     'lib.MotionWatchdog',
+    'Resampler':          'processing.Resampler',
+    'AngularSpectrum':    'processing.AngularSpectrum',
+    'LockIn':             'processing.LockIn',
+    'TrackAligner':       'processing.TrackAligner',
 }
 
 
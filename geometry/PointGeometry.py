@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+import numpy as np
+from QPolargraph.geometry.ScanGeometry import ScanGeometry
+from QPolargraph.geometry.PolargraphGeometry import (
+    MotorMetric, PolargraphGeometry)
+from QPolargraph.lib.ordering import nearest_neighbour, two_opt
+
+
+class PointGeometry(ScanGeometry):
+
+    '''Grid nodes of a point scan in an optimized visiting order.
+
+    Geometry of :class:`~QPolargraph.patterns.PointScan.PointScan`.
+    The nodes are ordered by a nearest-neighbour tour from the home
+    position, refined with 2-opt, with costs measured in motor time.
+
+    Parameters
+    ----------
+    window : int, optional
+        Search window of the 2-opt refinement; see
+        :func:`~QPolargraph.lib.ordering.two_opt`.  Default: 64.
+
+    Methods
+    -------
+    points()
+        Grid nodes in row order.
+    '''
+
+    PARAMETERS = ScanGeometry.PARAMETERS + ('window',)
+
+    def __init__(self,
+                 polargraph: PolargraphGeometry,
+                 window: int = 64,
+                 **kwargs) -> None:
+        kwargs.setdefault('step', 20.)
+        super().__init__(polargraph, **kwargs)
+        self.window = int(window)
+
+    def points(self) -> np.ndarray:
+        '''Grid nodes covering the scan rectangle, in row order.
+
+        Returns
+        -------
+        numpy.ndarray
+            ``(npoints, 2)`` array of ``(x, y)`` nodes [m] spaced by
+            ``step``.
+        '''
+        x1, y1, x2, y2 = self.rect
+        h = self.step * 1e-3
+        nx = int(np.floor((x2 - x1) / h + 1e-9)) + 1
+        ny = int(np.floor((y2 - y1) / h + 1e-9)) + 1
+        x, y = np.meshgrid(x1 + h * np.arange(nx), y1 + h * np.arange(ny))
+        return np.column_stack([x.ravel(), y.ravel()])
+
+    def vertices(self) -> np.ndarray:
+        '''Grid nodes in visiting order, starting from home.
+
+        Returns
+        -------
+        numpy.ndarray
+            ``(npoints, 2)`` array of ``(x, y)`` nodes [m].
+        '''
+        points = self.points()
+        metric = MotorMetric(self.polargraph)
+        home = np.array([0., self.polargraph.y0])
+        order = nearest_neighbour(points, metric, start=home)
+        order = two_opt(points, order, metric, start=home,
+                        window=self.window)
+        return points[order]
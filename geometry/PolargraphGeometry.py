@@ -0,0 +1,345 @@
+from __future__ import annotations
+
+from collections.abc import Sequence
+from typing import TYPE_CHECKING
+import logging
+import numpy as np
+import numpy.typing as npt
+
+if TYPE_CHECKING:
+    from QPolargraph.hardware.Polargraph import Polargraph
+
+
+logger = logging.getLogger(__name__)
+
+
+def motor_time(v: float, n, a):
+    '''Move time for AccelStepper trapezoidal motion profile.
+
+    Uses triangular profile when *v* exceeds the natural peak speed
+    ``sqrt(a*n)``, otherwise trapezoidal.  Falls back to constant
+    speed when *a* is zero.  *n* and *a* may be arrays, in which case
+    the times are computed elementwise.
+    '''
+    n = np.asarray(n, dtype=float)
+    a = np.asarray(a, dtype=float)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        ramped = np.where(v >= np.sqrt(a * n),
+                          2. * np.sqrt(n / a),
+                          v / a + n / v)
+    t = np.where(a > 0., ramped, n / v)
+    return t if t.ndim else float(t)
+
+
+def sync_speed(v_fast: float, n_fast: float, n_slow: float,
+               a_fast: float, a_slow: float) -> float:
+    '''Speed for the slower motor that ensures simultaneous arrival.
+
+    Accounts for AccelStepper ramp times.  Falls back to proportional
+    speed when acceleration is unknown (zero).
+    '''
+    if a_fast <= 0. or a_slow <= 0.:
+        return v_fast * n_slow / n_fast
+    T = motor_time(v_fast, n_fast, a_fast)
+    disc = (a_slow * T) ** 2 - 4. * a_slow * n_slow
+    if disc < 0.:
+        return v_fast * n_slow / n_fast
+    v_slow = (a_slow * T - np.sqrt(disc)) / 2.
+    return max(v_slow, 1.)
+
+
+class PolargraphGeometry:
+
+    '''Belt-drive geometry and motion model of a polargraph.
+
+    Plain, picklable counterpart of
+    :class:`~QPolargraph.hardware.Polargraph.Polargraph` that needs
+    neither Qt nor a serial port.  It converts between motor step
+    indexes and Cartesian coordinates and predicts move times, so scan
+    planning can run in worker processes and scripts::
+
+        geometry = polargraph.geometry      # snapshot of an instrument
+        geometry = PolargraphGeometry(ell=1.2, y0=0.15)
+
+    :class:`~QPolargraph.hardware.Polargraph.Polargraph` delegates its
+    coordinate conversions to an instance of this class.
+
+    Parameters
+    ----------
+    pitch : float, optional
+        Tooth pitch of the GT2 timing belt [mm].  Default: 2.
+    circumference : int, optional
+        Number of belt teeth per revolution of the gear.  Default: 25.
+    steps : int, optional
+        Motor steps per revolution.  Default: 200.
+    ell : float, optional
+        Separation between the two motor pulleys [m].  Default: 1.
+    y0 : float, optional
+        Vertical distance from the pulleys to the home position [m].
+        Default: 0.1.
+    speed : float, optional
+        Maximum motor speed [steps/s].  Default: 100.
+    acceleration : sequence of float, optional
+        Motor accelerations ``(a1, a2)`` [steps/s²].  Zero means
+        constant speed.  Default: ``(0, 0)``.
+
+    Properties
+    ----------
+    ds : float
+        Distance travelled per motor step [m].  Read-only.
+    s0 : float
+        Belt length from pulley to payload at home position [m].
+        Read-only.
+    settings : dict
+        Constructor arguments, other than ``acceleration``.
+
+    Methods
+    -------
+    r2f(x, y)
+        Convert Cartesian coordinates to continuous step indexes.
+    r2i(x, y)
+        Convert Cartesian coordinates to integer step indexes.
+    i2r(m, n, *args)
+        Convert step indexes to Cartesian coordinates.
+    motorSpeeds(dm, dn)
+        Motor speeds that make both motors arrive together.
+    moveTime(p, q)
+        Predicted time to move between points.
+    '''
+
+    #: Names of the geometry and motion settings.
+    SETTINGS = ('pitch', 'circumference', 'steps', 'ell', 'y0', 'speed')
+
+    def __init__(self,
+                 pitch: float = 2.,
+                 circumference: int = 25,
+                 steps: int = 200,
+                 ell: float = 1.,
+                 y0: float = 0.1,
+                 speed: float = 100.,
+                 acceleration: Sequence[float] = (0., 0.)) -> None:
+        self.pitch = float(pitch)
+        self.circumference = int(circumference)
+        self.steps = int(steps)
+        self.ell = float(ell)
+        self.y0 = float(y0)
+        self.speed = float(speed)
+        self.acceleration = np.asarray(acceleration, dtype=float)
+
+    def __repr__(self) -> str:
+        args = ', '.join(f'{k}={v!r}' for k, v in self.settings.items())
+        return (f'{type(self).__name__}({args}, '
+                f'acceleration={self.acceleration.tolist()!r})')
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, PolargraphGeometry):
+            return NotImplemented
+        return (self.settings == other.settings and
+                np.array_equal(self.acceleration, other.acceleration))
+
+    @property
+    def settings(self) -> dict:
+        '''Geometry and motion settings, other than ``acceleration``.'''
+        return {name: getattr(self, name) for name in self.SETTINGS}
+
+    @property
+    def ds(self) -> float:
+        '''Distance travelled per motor step [m].'''
+        return 1e-3 * self.pitch * self.circumference / self.steps
+
+    @property
+    def s0(self) -> float:
+        '''Belt length from pulley to payload at the home position [m].'''
+        return np.hypot(self.ell/2., self.y0)
+
+    def r2f(self, x: float, y: float) -> tuple[float, float]:
+        '''Convert Cartesian coordinates to continuous step indexes.
+
+        This is the exact (non-rounded) inverse of :meth:`i2r`, useful
+        for trajectory interpolation.
+
+        Parameters
+        ----------
+        x : float
+            Horizontal coordinate [m].
+        y : float
+            Vertical coordinate [m].
+
+        Returns
+        -------
+        tuple
+            ``(m, n)`` step indexes as floats.
+        '''
+        sm = np.hypot(self.ell/2. + x, y)
+        sn = np.hypot(self.ell/2. - x, y)
+        m = (sm - self.s0) / self.ds
+        n = (self.s0 - sn) / self.ds
+        return m, n
+
+    def r2i(self, x: float, y: float) -> np.ndarray:
+        '''Convert Cartesian coordinates to integer motor step indexes.
+
+        Parameters
+        ----------
+        x : float
+            Horizontal coordinate [m].
+        y : float
+            Vertical coordinate [m].
+
+        Returns
+        -------
+        numpy.ndarray
+            ``(m, n)`` step indexes as integers.
+        '''
+        return np.rint(self.r2f(x, y)).astype(int)
+
+    def i2r(self, m: int | float, n: int | float, *args) -> np.ndarray:
+        '''Convert motor step indexes to Cartesian coordinates [m].
+
+        Works with scalar or array inputs for ``m`` and ``n``.
+        When called with arrays, ``*args`` must be empty or also
+        array-valued with a matching shape.
+
+        Parameters
+        ----------
+        m : int, float, or numpy.ndarray
+            Step index (or array of indexes) for motor 1.
+        n : int, float, or numpy.ndarray
+            Step index (or array of indexes) for motor 2.
+        *args
+            Extra values appended to the result array (e.g. running
+            flag).  ``len(result) == 2 + len(args)``.
+
+        Returns
+        -------
+        numpy.ndarray
+            ``[x, y, *args]`` Cartesian position [m] plus any extra
+            payload supplied via ``*args``.
+        '''
+        sm = self.s0 + m * self.ds
+        sn = self.s0 - n * self.ds
+        x = (sm + sn) * (sm - sn) / (2. * self.ell)
+        ysq = (sn*sn + sm*sm)/2. - (self.ell/2.)**2 - x*x
+        if np.any(ysq < 0):
+            logger.error('unphysical result: '
+                         f'{m} {n} {self.s0} {sm} {sn} {ysq}')
+        y = np.sqrt(np.maximum(ysq, 0.))
+        return np.array([x, y, *args])
+
+    def motorSpeeds(self, dm: float, dn: float) -> tuple[float, float]:
+        '''Motor speeds for a move of ``(dm, dn)`` steps.
+
+        The motor with the larger step count runs at :attr:`speed` and
+        the other is slowed so that both arrive at the same time,
+        accounting for the AccelStepper ramps.
+
+        Parameters
+        ----------
+        dm, dn : float
+            Step counts of the two motors.
+
+        Returns
+        -------
+        tuple of float
+            ``(vm, vn)`` [steps/s].
+        '''
+        if dm == 0. or dn == 0.:
+            return self.speed, self.speed
+        abs_dm, abs_dn = abs(dm), abs(dn)
+        am, an = self.acceleration
+        if abs_dm >= abs_dn:
+            return self.speed, sync_speed(self.speed, abs_dm, abs_dn, am, an)
+        return sync_speed(self.speed, abs_dn, abs_dm, an, am), self.speed
+
+    def moveTime(self, p: npt.ArrayLike, q: npt.ArrayLike) -> np.ndarray:
+        '''Predicted time to move from each point in *p* to *q* [s].
+
+        Parameters
+        ----------
+        p, q : array-like
+            ``(..., 2)`` arrays of ``(x, y)`` points [m], broadcast
+            against each other.
+        '''
+        return MotorMetric(self)(p, q)
+
+
+class MotorMetric:
+
+    '''Move time between points for a polargraph.
+
+    Mirrors :meth:`~QPolargraph.hardware.Polargraph.Polargraph.moveTo`:
+    the motor with the larger step count runs at
+    :attr:`~QPolargraph.hardware.Polargraph.Polargraph.speed` and the
+    other is slowed to arrive at the same time, so the move takes as
+    long as the faster motor's trapezoidal profile.
+
+    The geometry, speed, and acceleration are read once, when the
+    metric is created.
+
+    Parameters
+    ----------
+    polargraph : Polargraph or PolargraphGeometry
+        Geometry and motion parameters.  Pass
+        :attr:`~QPolargraph.hardware.Polargraph.Polargraph.geometry`
+        to plan without Qt, for example in a worker process.
+
+    Methods
+    -------
+    steps(points)
+        Return the continuous step indexes of *points*.
+    __call__(p, q)
+        Return the elementwise move time from *p* to *q* [s].
+    matrix(points, targets=None)
+        Return the pairwise move times between two point sets [s].
+    '''
+
+    def __init__(self,
+                 polargraph: Polargraph | PolargraphGeometry) -> None:
+        self.polargraph = polargraph
+        self.speed = float(polargraph.speed)
+        self.acceleration = np.asarray(polargraph.acceleration,
+                                       dtype=float)
+
+    def steps(self, points: npt.ArrayLike) -> np.ndarray:
+        '''Return the continuous step indexes ``(..., 2)`` of *points*.'''
+        points = np.asarray(points, dtype=float)
+        m, n = self.polargraph.r2f(points[..., 0], points[..., 1])
+        return np.stack([m, n], axis=-1)
+
+    def _time(self, dsteps: np.ndarray) -> np.ndarray:
+        dm = np.abs(dsteps[..., 0])
+        dn = np.abs(dsteps[..., 1])
+        am, an = self.acceleration
+        a = np.where(dm >= dn, am, an)
+        return motor_time(self.speed, np.maximum(dm, dn), a)
+
+    def __call__(self, p: npt.ArrayLike, q: npt.ArrayLike) -> np.ndarray:
+        '''Return the move time from each point in *p* to *q* [s].
+
+        Parameters
+        ----------
+        p, q : array-like
+            ``(..., 2)`` arrays of ``(x, y)`` points [m], broadcast
+            against each other.
+        '''
+        return np.asarray(self._time(self.steps(q) - self.steps(p)))
+
+    def matrix(self, points: npt.ArrayLike,
+               targets: npt.ArrayLike | None = None) -> np.ndarray:
+        '''Return the pairwise move times between two point sets.
+
+        Parameters
+        ----------
+        points : array-like
+            ``(n, 2)`` starting points [m].
+        targets : array-like, optional
+            ``(m, 2)`` destination points [m].  Default: *points*.
+
+        Returns
+        -------
+        numpy.ndarray
+            ``(n, m)`` move times [s].
+        '''
+        a = self.steps(points)
+        b = a if targets is None else self.steps(targets)
+        return np.asarray(self._time(b[None, :, :] - a[:, None, :]))
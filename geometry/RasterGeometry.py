@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+import numpy as np
+import numpy.typing as npt
+from QPolargraph.geometry.ScanGeometry import ScanGeometry
+
+
+class RasterGeometry(ScanGeometry):
+
+    '''Waypoints of a row-by-row raster scan.
+
+    Geometry of :class:`~QPolargraph.patterns.RasterScan.RasterScan`:
+    a zigzag path across the scan rectangle.  Odd columns scan
+    top-to-bottom, even columns scan bottom-to-top.
+    '''
+
+    #: Points sampled along each move by :meth:`trajectory`.
+    TRAJECTORY_POINTS = 20
+
+    def vertices(self) -> np.ndarray:
+        '''Return zigzag raster waypoints across the scan rectangle.
+
+        Returns
+        -------
+        numpy.ndarray
+            ``(nvertices, 2)`` array of ``(x, y)`` waypoints [m].
+        '''
+        x1, y1, x2, y2 = self.rect
+        x = np.arange(x1, x2, self.step * 1e-3)
+        y = np.full_like(x, y1)
+        y[1::2] = y2
+        return np.vstack([x, y]).T
+
+    def trajectory(self, vertices: npt.ArrayLike | None = None) -> np.ndarray:
+        '''Return the actual raster path as a ``(2, npts)`` array for plotting.
+
+        Because the polargraph geometry is nonlinear, moving between two
+        Cartesian waypoints traces a curve rather than a straight line.
+        This method samples each segment at :attr:`TRAJECTORY_POINTS`
+        points in step-index space and converts them back to Cartesian
+        coordinates, giving an accurate picture of the true scan path.
+
+        Parameters
+        ----------
+        vertices : array-like, optional
+            Waypoints to join.  Default: :meth:`vertices`.
+
+        Returns
+        -------
+        numpy.ndarray
+            ``(2, npts)`` array of ``(x, y)`` coordinates [m].
+        '''
+        pg = self.polargraph
+        v = self._vertices(vertices)
+        npts = self.TRAJECTORY_POINTS
+
+        all_x, all_y = [], []
+        for i in range(len(v) - 1):
+            m0, n0 = pg.r2i(*v[i])
+            m1, n1 = pg.r2i(*v[i + 1])
+            endpoint = (i == len(v) - 2)
+            t = np.linspace(0., 1., npts, endpoint=endpoint)
+            x, y = pg.i2r(m0 + t * (m1 - m0), n0 + t * (n1 - n0))
+            all_x.append(x)
+            all_y.append(y)
+
+        return np.vstack([np.concatenate(all_x), np.concatenate(all_y)])
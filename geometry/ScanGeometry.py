@@ -0,0 +1,230 @@
+from __future__ import annotations
+
+import numpy as np
+import numpy.typing as npt
+from QPolargraph.geometry.PolargraphGeometry import (
+    MotorMetric, PolargraphGeometry)
+from QPolargraph.lib.ordering import order_segments
+
+
+class ScanGeometry:
+
+    '''Waypoints and motion plan of a scan pattern, without Qt.
+
+    Holds the scan-area parameters of a
+    :class:`~QPolargraph.patterns.QScanPattern.QScanPattern` together
+    with a :class:`~QPolargraph.geometry.PolargraphGeometry.PolargraphGeometry`,
+    and computes everything that depends only on them: the bounding
+    rectangle, the waypoints, the display trajectory, the optimized
+    visiting order and its predicted duration.  Instances are cheap
+    and picklable, so parameter sweeps can fan out across processes::
+
+        from concurrent.futures import ProcessPoolExecutor
+
+        geometries = [RasterGeometry(polargraph, step=s) for s in steps]
+        with ProcessPoolExecutor() as pool:
+            durations = list(pool.map(RasterGeometry.duration, geometries))
+
+    Every scan pattern wraps the geometry class named by its
+    ``GEOMETRY`` attribute; its
+    :attr:`~QPolargraph.patterns.QScanPattern.QScanPattern.geometry`
+    property returns a snapshot of the current settings.  Subclasses
+    override :meth:`vertices`, and :meth:`trajectory` and
+    :meth:`segments` where needed, and list any extra constructor
+    arguments in :attr:`PARAMETERS`.
+
+    Parameters
+    ----------
+    polargraph : PolargraphGeometry
+        Geometry and motion model of the polargraph.
+    width : float, optional
+        Horizontal extent of the scan area [m].  Default: 0.6.
+    height : float, optional
+        Vertical extent of the scan area [m].  Default: 0.6.
+    dx : float, optional
+        Horizontal offset of the scan area center from the polargraph
+        centerline [m].  Default: 0.
+    dy : float, optional
+        Vertical offset of the scan area top edge below the home
+        position [m].  Default: 0.1.
+    step : float, optional
+        Spacing between scan lines [mm].  Default: 5.
+    optimize : bool, optional
+        If ``True``, :meth:`plan` reorders :meth:`segments` to minimize
+        the predicted motion time.  Default: ``False``.
+    nearestStart : bool, optional
+        If ``True``, :meth:`plan` may run the waypoints backwards.
+        Default: ``False``.
+
+    Properties
+    ----------
+    rect : list of float
+        Bounding rectangle ``[x1, y1, x2, y2]`` of the scan area [m].
+
+    Methods
+    -------
+    vertices()
+        Waypoints of the scan.
+    trajectory(vertices=None)
+        Coordinates along the scan path for display.
+    segments(vertices=None)
+        Pieces of the scan that may be visited in any order.
+    plan(start=None, vertices=None, segments=None)
+        Waypoints in visiting order.
+    duration(start=None)
+        Predicted motion time of the plan.
+    '''
+
+    #: Constructor arguments copied from the wrapping scan pattern.
+    PARAMETERS = ('width', 'height', 'dx', 'dy', 'step',
+                  'optimize', 'nearestStart')
+
+    def __init__(self,
+                 polargraph: PolargraphGeometry,
+                 width: float = 0.6,
+                 height: float = 0.6,
+                 dx: float = 0.,
+                 dy: float = 0.1,
+                 step: float = 5.,
+                 optimize: bool = False,
+                 nearestStart: bool = False) -> None:
+        self.polargraph = polargraph
+        self.width = float(width)
+        self.height = float(height)
+        self.dx = float(dx)
+        self.dy = float(dy)
+        self.step = float(step)
+        self.optimize = bool(optimize)
+        self.nearestStart = bool(nearestStart)
+
+    def __repr__(self) -> str:
+        args = ', '.join(f'{name}={getattr(self, name)!r}'
+                         for name in self.PARAMETERS)
+        return f'{type(self).__name__}({self.polargraph!r}, {args})'
+
+    @property
+    def rect(self) -> list:
+        '''Bounding rectangle ``[x1, y1, x2, y2]`` of the scan area [m].'''
+        x1 = self.dx - self.width / 2.
+        y1 = self.polargraph.y0 + self.dy
+        x2 = x1 + self.width
+        y2 = y1 + self.height
+        return [x1, y1, x2, y2]
+
+    def vertices(self) -> np.ndarray:
+        '''Vertices of the scan trajectory.
+
+        Returns
+        -------
+        numpy.ndarray
+            ``(nvertices, 2)`` array of ``(x, y)`` waypoints [m].
+        '''
+        x1, y1, x2, y2 = self.rect
+        return np.array([[x1, y1], [x2, y1], [x2, y2], [x1, y2], [x1, y1]])
+
+    def trajectory(self, vertices: npt.ArrayLike | None = None) -> np.ndarray:
+        '''Coordinates along the scan path for display.
+
+        Parameters
+        ----------
+        vertices : array-like, optional
+            Waypoints to join.  Default: :meth:`vertices`.
+
+        Returns
+        -------
+        numpy.ndarray
+            ``(2, npts)`` array of ``(x, y)`` coordinates [m].
+        '''
+        return self._vertices(vertices).T
+
+    def segments(self,
+                 vertices: npt.ArrayLike | None = None) -> list[np.ndarray]:
+        '''Pieces of the trajectory that may be visited in any order.
+
+        Each segment is traversed in one piece, in either direction.
+        The default treats all of the waypoints as a single segment.
+
+        Parameters
+        ----------
+        vertices : array-like, optional
+            Waypoints to split.  Default: :meth:`vertices`.
+
+        Returns
+        -------
+        list of numpy.ndarray
+            ``(npoints, 2)`` arrays of ``(x, y)`` waypoints [m].
+        '''
+        return [self._vertices(vertices)]
+
+    def _vertices(self, vertices: npt.ArrayLike | None) -> np.ndarray:
+        if vertices is None:
+            return self.vertices()
+        return np.asarray(vertices, dtype=float)
+
+    def plan(self,
+             start: npt.ArrayLike | None = None,
+             vertices: npt.ArrayLike | None = None,
+             segments: list[np.ndarray] | None = None) -> np.ndarray:
+        '''Waypoints in the order that a scan visits them.
+
+        Without :attr:`optimize` these are the *vertices*, reversed if
+        :attr:`nearestStart` is set and the last waypoint is closer to
+        *start* in motor time than the first.  With :attr:`optimize`
+        the *segments* are reordered and reversed to minimize the
+        predicted motion time from *start* and between segments; see
+        :func:`~QPolargraph.lib.ordering.order_segments`.
+
+        Parameters
+        ----------
+        start : array-like, optional
+            ``(x, y)`` position from which the scan begins [m].
+            Default: the home position.
+        vertices : array-like, optional
+            Waypoints.  Default: :meth:`vertices`.
+        segments : list of array-like, optional
+            Segments to order.  Default: :meth:`segments` of the
+            *vertices*.
+
+        Returns
+        -------
+        numpy.ndarray
+            ``(nvertices, 2)`` array of ``(x, y)`` waypoints [m].
+        '''
+        if start is None:
+            start = [0., self.polargraph.y0]
+        start = np.asarray(start, dtype=float)
+        metric = MotorMetric(self.polargraph)
+        if not self.optimize:
+            vertices = self._vertices(vertices)
+            if self.nearestStart and len(vertices) > 1:
+                first, last = metric(start, vertices[[0, -1]])
+                if last < first:
+                    return vertices[::-1].copy()
+            return vertices
+        if segments is None:
+            segments = self.segments(vertices)
+        order, flipped = order_segments(segments, metric, start=start)
+        return np.concatenate([segments[i][::-1] if f else segments[i]
+                               for i, f in zip(order, flipped)])
+
+    def duration(self, start: npt.ArrayLike | None = None) -> float:
+        '''Predicted motion time of :meth:`plan` from *start* [s].
+
+        Sums the move times between consecutive waypoints under the
+        polargraph's trapezoidal motion model, including the move from
+        *start* to the first waypoint.  Polling and communication
+        overheads are not included.
+
+        Parameters
+        ----------
+        start : array-like, optional
+            ``(x, y)`` starting position [m].  Default: the home
+            position.
+        '''
+        if start is None:
+            start = [0., self.polargraph.y0]
+        path = self.plan(start)
+        if len(path) == 0:
+            return 0.
+        path = np.vstack([np.asarray(start, dtype=float), path])
+        return float(MotorMetric(self.polargraph)(path[:-1], path[1:]).sum())
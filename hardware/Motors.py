@@ -48,7 +48,7 @@ from qtpy import QtCore
 import numpy as np
 from parse import parse
 from pathlib import Path
-from time import sleep
+import time
 import logging
 import re
 
@@ -84,6 +84,18 @@ class Motors(QSerialInstrument):
         ``(v1, v2)`` — maximum stepper motor speed [steps/s].
     acceleration : numpy.ndarray
         ``(a1, a2)`` — acceleration [steps/s²].
+    linkLost : bool
+        ``True`` if the serial link has stopped responding: the port
+        was closed underneath the instrument, or :attr:`MAX_FAILURES`
+        consecutive exchanges failed.  While the link is lost,
+        :attr:`indexes` reports the last known step indexes with the
+        running flag set, so that motion loops do not mistake a dead
+        link for arrival.
+    pollFailed : bool
+        ``True`` if the most recent read of :attr:`indexes` failed and
+        reported the last known step indexes instead of fresh ones.
+        Motion loops should skip such polls rather than sample or
+        time them.
 
     Methods
     -------
@@ -97,10 +109,21 @@ class Motors(QSerialInstrument):
         Stop motors and de-energise the windings.
     running()
         Return ``True`` if the motors are currently moving.
+    reconnect()
+        Reopen a lost serial link and restore the step indexes.
     '''
 
     FIRMWARE_VERSION = _firmware_version()
 
+    #: Consecutive failed exchanges after which the link is lost.
+    MAX_FAILURES = 3
+
+    #: Longest wait for the firmware to answer after the port opens [s].
+    BOOT_TIMEOUT = 3.
+
+    #: Read timeout for each identification query [ms].
+    QUERY_TIMEOUT = 250
+
     comm = dict(baudRate=QSerialInstrument.BaudRate.Baud115200,
                 dataBits=QSerialInstrument.DataBits.Data8,
                 stopBits=QSerialInstrument.StopBits.OneStop,
@@ -109,6 +132,11 @@ class Motors(QSerialInstrument):
                 eol='\n')
 
     def __init__(self, portName: str | None = None, **kwargs):
+        self._portName = None
+        self._failures = 0
+        self._pollFailed = False
+        self._indexes = np.array([0, 0, 0])
+        self._motor_speed = None
         super().__init__(portName, **(self.comm | kwargs))
         # Matches acam3.ino setup(): stepper1/2.setAcceleration(1000.0)
         self._acceleration = np.array([1000., 1000.])
@@ -127,14 +155,16 @@ class Motors(QSerialInstrument):
         (1) the port responds with the correct acam3 version string, and
         (2) the Adafruit Motor Shield is detected.
 
-        Waits 2 s after opening for the Arduino to reset, then sends ``Q``
-        and checks that the response is ``acam{FIRMWARE_VERSION}:OK``.
-        A response of ``acam{FIRMWARE_VERSION}:NOSHIELD`` indicates that the
+        Opening the port resets the Arduino, and the acam3 firmware
+        prints nothing when it boots.  Rather than waiting a fixed time
+        for the reset to finish, sends ``Q`` with a short read timeout
+        (:attr:`QUERY_TIMEOUT`) until the firmware answers or
+        :attr:`BOOT_TIMEOUT` elapses, then checks that the response is
+        ``acam{FIRMWARE_VERSION}:OK``.  A response of ``acam{FIRMWARE_VERSION}:NOSHIELD`` indicates that the
         Adafruit Motor Shield was not detected at I2C address ``0x60``.
         '''
         logger.info(f' Trying {self._interface.portName()}...')
-        sleep(2)
-        res = self.handshake('Q')
+        res = self._query()
         logger.debug(f' Received: {res}')
         if 'acam' not in res:
             return False
@@ -157,6 +187,90 @@ class Motors(QSerialInstrument):
         logger.info(f' Arduino running acam {fw_version}, motor shield OK')
         return True
 
+    def _query(self) -> str:
+        '''Poll the firmware with ``Q`` until it answers or boot times out.
+
+        Bytes that arrive while the bootloader is still running are
+        discarded before each query.
+        '''
+        interface = self._interface
+        timeout = interface.timeout
+        interface.timeout = self.QUERY_TIMEOUT
+        deadline = time.monotonic() + self.BOOT_TIMEOUT
+        try:
+            while True:
+                interface.clear()
+                res = self.handshake('Q')
+                if 'acam' in res or time.monotonic() > deadline:
+                    return res
+        finally:
+            interface.timeout = timeout
+
+    def open(self, portName: str) -> bool:
+        '''Open *portName* and remember it for :meth:`reconnect`.'''
+        ok = super().open(portName)
+        if ok:
+            self._portName = portName
+            self._failures = 0
+        return ok
+
+    def close(self) -> None:
+        '''Close the serial port.'''
+        self._portName = None
+        super().close()
+
+    @property
+    def linkLost(self) -> bool:
+        '''``True`` if an open serial link has stopped responding.'''
+        if self._portName is None:
+            return False
+        return self._failures >= self.MAX_FAILURES or not self.isOpen()
+
+    @property
+    def pollFailed(self) -> bool:
+        '''``True`` if the last read of :attr:`indexes` was stale.'''
+        return self._pollFailed
+
+    def _exchanged(self, ok: bool) -> None:
+        '''Count consecutive failed exchanges with the Arduino.'''
+        self._failures = 0 if ok else self._failures + 1
+
+    def reconnect(self) -> bool:
+        '''Reopen a lost serial link and restore the step indexes.
+
+        Reopens the last port, verifying the device with
+        :meth:`identify`.  If the Arduino has reappeared under a
+        different port name, all ports are searched.  Opening the port
+        resets the Arduino, so the last known step indexes, the
+        acceleration and the last maximum speeds are then written back.
+
+        The restored position is only as accurate as the last
+        successful poll of :attr:`indexes`: steps taken after that
+        poll, or while the Arduino was resetting, are not accounted
+        for.  A warning is logged to that effect.
+
+        Returns
+        -------
+        bool
+            ``True`` if the link was restored.
+        '''
+        port = self._portName
+        if port is None:
+            return False
+        n1, n2 = self._indexes[:2]
+        self._interface.close()
+        if not (self.open(port) or self.find().isOpen()):
+            self._portName = port
+            return False
+        self.indexes = (n1, n2)
+        self.acceleration = self._acceleration
+        if self._motor_speed is not None:
+            self.motor_speed = self._motor_speed
+        logger.warning(f' Reconnected on {self._portName}: position '
+                       f'restored to ({n1},{n2}) from the last '
+                       'successful poll')
+        return True
+
     def process(self, data: str) -> None:
         '''Log unsolicited serial data from the Arduino at DEBUG level.
 
@@ -184,6 +298,7 @@ class Motors(QSerialInstrument):
         '''
         logger.debug(f' goto {n1} {n2}')
         ok = self.expect(f'G:{n1}:{n2}', 'G')
+        self._exchanged(ok)
         if not ok:
             logger.error(f'Could not set target indexes: ({n1},{n2})')
 
@@ -194,12 +309,14 @@ class Motors(QSerialInstrument):
     def stop(self) -> None:
         '''Halt motor motion immediately.'''
         ok = self.expect('S', 'S')
+        self._exchanged(ok)
         if not ok:
             logger.error('Error stopping motion')
 
     def release(self) -> None:
         '''De-energise motor coils.'''
         ok = self.expect('X', 'X')
+        self._exchanged(ok)
         if not ok:
             logger.error('Error releasing stepper motors!')
 
@@ -217,20 +334,31 @@ class Motors(QSerialInstrument):
     def indexes(self) -> np.ndarray:
         '''Current step counts ``(n1, n2, status)`` for both motors.'''
         if not self.isOpen():
-            return np.array([0, 0, 0])
+            if self._portName is None:
+                return np.array([0, 0, 0])
+            self._pollFailed = True
+            return np.array([*self._indexes[:2], 1])
         try:
             _, n1, n2, running = self.handshake('P').split(':')
             indexes = [int(n1), int(n2), int(running)]
             logger.debug(f'{indexes}')
         except Exception as ex:
             logger.warning(f'Did not read position: {ex}')
-            indexes = [0, 0, 0]
-        return np.array(indexes)
+            self._exchanged(False)
+            self._pollFailed = True
+            return np.array([*self._indexes[:2], 1])
+        self._exchanged(True)
+        self._pollFailed = False
+        self._indexes = np.array(indexes)
+        return self._indexes.copy()
 
     @indexes.setter
     def indexes(self, n) -> None:
         n1, n2 = n
-        self.expect(f'P:{n1}:{n2}', 'P')
+        ok = self.expect(f'P:{n1}:{n2}', 'P')
+        self._exchanged(ok)
+        if ok:
+            self._indexes = np.array([int(n1), int(n2), 0])
 
     @property
     def motor_speed(self) -> np.ndarray:
@@ -246,6 +374,7 @@ class Motors(QSerialInstrument):
     @motor_speed.setter
     def motor_speed(self, v) -> None:
         v1, v2 = int(round(v[0])), int(round(v[1]))
+        self._motor_speed = (v1, v2)
         ok = self.expect(f'V:{v1}:{v2}', 'V')
         if not ok:
             logger.warning(f'Could not set maximum speed: ({v1},{v2})')
@@ -1,37 +1,13 @@
 from qtpy import QtCore
 from QPolargraph.hardware.Motors import Motors
+from QPolargraph.geometry.PolargraphGeometry import PolargraphGeometry
+# Former homes of the motion-time model, kept for existing imports.
+from QPolargraph.geometry.PolargraphGeometry import (  # noqa: F401
+    motor_time as _motor_time, sync_speed as _sync_speed)
 import numpy as np
 import logging
 
 
-def _motor_time(v: float, n: float, a: float) -> float:
-    '''Move time for AccelStepper trapezoidal motion profile.
-
-    Uses triangular profile when *v* exceeds the natural peak speed
-    ``sqrt(a*n)``, otherwise trapezoidal.
-    '''
-    if v >= np.sqrt(a * n):
-        return 2. * np.sqrt(n / a)
-    return v / a + n / v
-
-
-def _sync_speed(v_fast: float, n_fast: float, n_slow: float,
-                a_fast: float, a_slow: float) -> float:
-    '''Speed for the slower motor that ensures simultaneous arrival.
-
-    Accounts for AccelStepper ramp times.  Falls back to proportional
-    speed when acceleration is unknown (zero).
-    '''
-    if a_fast <= 0. or a_slow <= 0.:
-        return v_fast * n_slow / n_fast
-    T = _motor_time(v_fast, n_fast, a_fast)
-    disc = (a_slow * T) ** 2 - 4. * a_slow * n_slow
-    if disc < 0.:
-        return v_fast * n_slow / n_fast
-    v_slow = (a_slow * T - np.sqrt(disc)) / 2.
-    return max(v_slow, 1.)
-
-
 logger = logging.getLogger(__name__)
 
 
@@ -59,6 +35,9 @@ class Polargraph(Motors):
         Motor steps per revolution. Default: 200.
     speed : float
         Maximum translation speed [steps/s].
+    geometry : PolargraphGeometry
+        Picklable snapshot of the geometry and motion settings.
+        Read-only.
     ds : float
         Distance travelled per motor step [m]. Read-only.
     s0 : float
@@ -91,6 +70,7 @@ class Polargraph(Motors):
                  y0: float = 0.1,
                  speed: float = 100.,
                  **kwargs):
+        self._geometry = PolargraphGeometry()
         super().__init__(**kwargs)
         self.pitch = pitch
         self.circumference = circumference
@@ -101,76 +81,91 @@ class Polargraph(Motors):
 
     def _registerProperties(self) -> None:
         super()._registerProperties()
-        self.registerProperty('pitch', ptype=float)
-        self.registerProperty('circumference', ptype=int)
-        self.registerProperty('steps', ptype=int)
-        self.registerProperty('ell', ptype=float)
-        self.registerProperty('y0', ptype=float)
-        self.registerProperty('speed', ptype=float)
+        # Values live in self._geometry, not in _name attributes.
+        for name, ptype in (('pitch', float), ('circumference', int),
+                            ('steps', int), ('ell', float),
+                            ('y0', float), ('speed', float)):
+            self.registerProperty(
+                name, ptype=ptype,
+                getter=lambda name=name: getattr(self._geometry, name),
+                setter=lambda v, name=name: setattr(self, name, v))
 
     @property
     def pitch(self) -> float:
         '''Tooth pitch of the GT2 timing belt [mm].'''
-        return self._pitch
+        return self._geometry.pitch
 
     @pitch.setter
     def pitch(self, value: float) -> None:
-        self._pitch = float(value)
+        self._geometry.pitch = float(value)
 
     @property
     def circumference(self) -> int:
         '''Number of belt teeth per full revolution of the gear.'''
-        return self._circumference
+        return self._geometry.circumference
 
     @circumference.setter
     def circumference(self, value: int) -> None:
-        self._circumference = int(value)
+        self._geometry.circumference = int(value)
 
     @property
     def steps(self) -> int:
         '''Motor steps per revolution.'''
-        return self._steps
+        return self._geometry.steps
 
     @steps.setter
     def steps(self, value: int) -> None:
-        self._steps = int(value)
+        self._geometry.steps = int(value)
 
     @property
     def ell(self) -> float:
         '''Separation between the two motor pulleys [m].'''
-        return self._ell
+        return self._geometry.ell
 
     @ell.setter
     def ell(self, value: float) -> None:
-        self._ell = float(value)
+        self._geometry.ell = float(value)
 
     @property
     def y0(self) -> float:
         '''Vertical distance from the pulleys to the home position [m].'''
-        return self._y0
+        return self._geometry.y0
 
     @y0.setter
     def y0(self, value: float) -> None:
-        self._y0 = float(value)
+        self._geometry.y0 = float(value)
 
     @property
     def speed(self) -> float:
         '''Maximum translation speed [steps/s].'''
-        return self._speed
+        return self._geometry.speed
 
     @speed.setter
     def speed(self, value: float) -> None:
-        self._speed = float(value)
+        self._geometry.speed = float(value)
+
+    @property
+    def geometry(self) -> PolargraphGeometry:
+        '''Snapshot of the geometry and motion settings.
+
+        Returns a new, picklable
+        :class:`~QPolargraph.geometry.PolargraphGeometry.PolargraphGeometry`
+        with the current settings and :attr:`acceleration`, suitable
+        for planning scans without Qt, for example in worker processes.
+        Later changes to the instrument do not affect the snapshot.
+        '''
+        return PolargraphGeometry(**self._geometry.settings,
+                                  acceleration=self.acceleration)
 
     @property
     def ds(self) -> float:
         '''Distance travelled per motor step [m].'''
-        return 1e-3 * self.pitch * self.circumference / self.steps
+        return self._geometry.ds
 
     @property
     def s0(self) -> float:
         '''Belt length from pulley to payload at the home position [m].'''
-        return np.hypot(self.ell/2., self.y0)
+        return self._geometry.s0
 
     def r2f(self, x: float, y: float) -> tuple[float, float]:
         '''Convert Cartesian coordinates to continuous step indexes.
@@ -191,11 +186,7 @@ class Polargraph(Motors):
         tuple
             ``(m, n)`` step indexes as floats.
         '''
-        sm = np.hypot(self.ell/2. + x, y)
-        sn = np.hypot(self.ell/2. - x, y)
-        m = (sm - self.s0) / self.ds
-        n = (self.s0 - sn) / self.ds
-        return m, n
+        return self._geometry.r2f(x, y)
 
     def r2i(self, x: float, y: float) -> tuple[int, int]:
         '''Convert Cartesian coordinates to integer motor step indexes.
@@ -212,7 +203,7 @@ class Polargraph(Motors):
         tuple
             ``(m, n)`` step indexes as integers.
         '''
-        return np.rint(self.r2f(x, y)).astype(int)
+        return self._geometry.r2i(x, y)
 
     def i2r(self, m: int | float, n: int | float, *args) -> np.ndarray:
         '''Convert motor step indexes to Cartesian coordinates [m].
@@ -237,15 +228,7 @@ class Polargraph(Motors):
             ``[x, y, *args]`` Cartesian position [m] plus any extra
             payload supplied via ``*args``.
         '''
-        sm = self.s0 + m * self.ds
-        sn = self.s0 - n * self.ds
-        x = (sm + sn) * (sm - sn) / (2. * self.ell)
-        ysq = (sn*sn + sm*sm)/2. - (self.ell/2.)**2 - x*x
-        if np.any(ysq < 0):
-            logger.error('unphysical result: '
-                         f'{m} {n} {self.s0} {sm} {sn} {ysq}')
-        y = np.sqrt(np.maximum(ysq, 0.))
-        return np.array([x, y, *args])
+        return self._geometry.i2r(m, n, *args)
 
     @property
     def position(self) -> np.ndarray:
@@ -272,17 +255,7 @@ class Polargraph(Motors):
         dm = float(m1 - m0)
         dn = float(n1 - n0)
 
-        if dm == 0. or dn == 0.:
-            vm, vn = self.speed, self.speed
-        else:
-            abs_dm, abs_dn = abs(dm), abs(dn)
-            am, an = self.acceleration
-            if abs_dm >= abs_dn:
-                vm = self.speed
-                vn = _sync_speed(self.speed, abs_dm, abs_dn, am, an)
-            else:
-                vn = self.speed
-                vm = _sync_speed(self.speed, abs_dn, abs_dm, an, am)
+        vm, vn = self.geometry.motorSpeeds(dm, dn)
         logger.debug(f'Motor speeds: ({vm:.1f}, {vn:.1f})')
         self.motor_speed = [vm, vn]
         logger.debug(f'Path: ({m0}, {n0}) --> ({m1}, {n1})')
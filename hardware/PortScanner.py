@@ -0,0 +1,202 @@
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import threading
+import logging
+from qtpy import QtCore
+from qtpy.QtSerialPort import QSerialPortInfo
+from QInstrument.lib.Configure import Configure
+
+
+logger = logging.getLogger(__name__)
+
+
+class PortScanner(QtCore.QObject):
+
+    '''Locate a serial instrument by probing ports in parallel.
+
+    :meth:`QSerialInstrument.find` tries every serial port in turn, and
+    identifying an Arduino on each one means waiting for it to reset.
+    With several USB-serial devices attached, that adds up to many
+    seconds.  A port scanner instead:
+
+    1. tries the port where the instrument was last found, which is
+       usually right;
+    2. otherwise probes all remaining ports at once, each on its own
+       worker thread with its own instance of the instrument class.
+
+    The first instrument to identify itself is moved to the scanner's
+    thread and returned; later matches are closed.  The port is saved
+    through :class:`QInstrument.lib.Configure.Configure` for next time.
+
+    :meth:`search` blocks until the search is over.  :meth:`start` runs
+    the same search on a background thread and reports through signals,
+    so that a GUI stays responsive::
+
+        scanner = PortScanner(Polargraph)
+        scanner.progress.connect(statusBar.showMessage)
+        scanner.finished.connect(setDevice)
+        scanner.start()
+
+    Parameters
+    ----------
+    instrument : type
+        :class:`QSerialInstrument` subclass to look for.  It is
+        constructed without arguments and opened with ``open(port)``.
+    configdir : str or None, optional
+        Directory for the port cache.  Default: the
+        :class:`~QInstrument.lib.Configure.Configure` default.
+    workers : int, optional
+        Largest number of ports probed at once.  Default: 8.
+
+    Properties
+    ----------
+    lastPort : str or None
+        Port where the instrument was last found.
+    settings : dict
+        Last good port for each instrument class, as saved to disk.
+
+    Methods
+    -------
+    candidates()
+        Return the ports to probe, last good port first.
+    search()
+        Return the opened instrument, or ``None``.
+    start()
+        Run :meth:`search` on a background thread.
+
+    Signals
+    -------
+    progress(str)
+        Human-readable description of each step of the search.
+    finished(object)
+        Emitted by :meth:`start` with the opened instrument, or
+        ``None`` if none was found.
+    '''
+
+    progress = QtCore.Signal(str)
+    finished = QtCore.Signal(object)
+
+    def __init__(self,
+                 instrument: type,
+                 configdir: str | None = None,
+                 workers: int = 8,
+                 parent: QtCore.QObject | None = None) -> None:
+        super().__init__(parent)
+        self.instrument = instrument
+        self.workers = max(int(workers), 1)
+        self._configure = Configure(configdir=configdir)
+        self._ports = self._configure.read(self) or {}
+        self._lock = threading.Lock()
+        self._claimed = False
+        self._thread = None
+
+    @property
+    def settings(self) -> dict:
+        '''Last good port for each instrument class.'''
+        return dict(self._ports)
+
+    @property
+    def lastPort(self) -> str | None:
+        '''Port where the instrument was last found.'''
+        return self._ports.get(self.instrument.__name__)
+
+    def candidates(self) -> list[str]:
+        '''Return the ports to probe, last good port first.'''
+        ports = self._availablePorts()
+        last = self.lastPort
+        if last in ports:
+            ports.remove(last)
+            ports.insert(0, last)
+        return ports
+
+    @staticmethod
+    def _availablePorts() -> list[str]:
+        return [p.portName() for p in QSerialPortInfo.availablePorts()]
+
+    def search(self):
+        '''Find and open the instrument.
+
+        Returns
+        -------
+        QSerialInstrument or None
+            Opened instrument owned by the scanner's thread, or
+            ``None`` if no port answered.
+        '''
+        self._claimed = False
+        ports = self.candidates()
+        name = self.instrument.__name__
+        if ports and ports[0] == self.lastPort:
+            port = ports.pop(0)
+            self.progress.emit(f'Trying {name} on {port}...')
+            if (device := self._probe(port)) is not None:
+                return self._found(device, port)
+        if not ports:
+            self.progress.emit(f'No {name} found')
+            return None
+        self.progress.emit(f'Searching {len(ports)} ports for {name}...')
+        pool = ThreadPoolExecutor(max_workers=min(self.workers, len(ports)),
+                                  thread_name_prefix='portscan')
+        futures = {pool.submit(self._probe, port): port for port in ports}
+        pool.shutdown(wait=False)
+        for future in as_completed(futures):
+            port = futures[future]
+            try:
+                device = future.result()
+            except Exception as ex:
+                logger.warning(f'Probing {port} failed: {ex}')
+                continue
+            if device is not None:
+                return self._found(device, port)
+        self.progress.emit(f'No {name} found')
+        return None
+
+    def _probe(self, port: str):
+        '''Try to open the instrument on *port* from a worker thread.'''
+        device = self.instrument()
+        if not device.open(port):
+            device.close()
+            self.progress.emit(f'No {self.instrument.__name__} on {port}')
+            return None
+        with self._lock:
+            if self._claimed:
+                device.close()
+                return None
+            self._claimed = True
+        device.moveToThread(self.thread())
+        return device
+
+    def _found(self, device, port: str):
+        name = self.instrument.__name__
+        self.progress.emit(f'Found {name} on {port}')
+        if self._ports.get(name) != port:
+            self._ports[name] = port
+            try:
+                self._configure.save(self)
+            except OSError as ex:
+                logger.warning(f'Could not save port cache: {ex}')
+        return device
+
+    def start(self) -> None:
+        '''Run :meth:`search` on a background thread.
+
+        :attr:`finished` is emitted with the result.
+        '''
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._thread = threading.Thread(target=self._run,
+                                        name='portscan', daemon=True)
+        self._thread.start()
+
+    def _run(self) -> None:
+        try:
+            device = self.search()
+        except Exception as ex:
+            logger.error(f'Port search failed: {ex}')
+            device = None
+        try:
+            self.finished.emit(device)
+        except RuntimeError:
+            # The scanner was deleted while the search ran
+            if device is not None:
+                device.close()
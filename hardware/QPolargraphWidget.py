@@ -1,7 +1,7 @@
-import time
-from qtpy import QtWidgets
+from qtpy import QtCore, QtWidgets
 from QInstrument.lib.QInstrumentWidget import QInstrumentWidget
 from QPolargraph.hardware.Polargraph import Polargraph
+from QPolargraph.hardware.PortScanner import PortScanner
 from QPolargraph.FlashFirmware import FlashDialog, find_arduinos
 
 
@@ -11,45 +11,119 @@ class QPolargraphWidget(QInstrumentWidget):
 
     Connects a :class:`~QPolargraph.Polargraph.Polargraph` device to
     the ``PolargraphWidget.ui`` layout via :class:`QInstrumentWidget`.
-    Hardware is located automatically at startup; if none is found, the
-    widget offers to flash the acam3 firmware onto any detected Arduino
-    via :class:`~QPolargraph.FlashFirmware.FlashDialog`, then retries
-    the connection.  If no Arduino is present or the user declines, the
-    widget falls back to :class:`~QPolargraph.hardware.fake.FakePolargraph`.
+
+    Hardware is located in the background, so construction returns at
+    once.  Until the search is over the widget is *connecting*: it is
+    disabled and bound to an unopened
+    :class:`~QPolargraph.Polargraph.Polargraph`, whose default geometry
+    stands in for the real instrument.  A
+    :class:`~QPolargraph.hardware.PortScanner.PortScanner` tries the
+    last port that worked before probing the others in parallel.  If no
+    polargraph answers, the widget offers to flash the acam3 firmware
+    onto any detected Arduino via
+    :class:`~QPolargraph.FlashFirmware.FlashDialog` and searches again.
+    If no Arduino is present or the user declines, the widget falls
+    back to :class:`~QPolargraph.hardware.fake.FakePolargraph`.  Either
+    way the new device is swapped in and announced with
+    :attr:`deviceChanged`, so that owners can update their references.
+
     Pass a :class:`~QPolargraph.hardware.fake.FakePolargraph` instance as
     ``device`` to skip the hardware search and flash offer entirely.
+
+    Properties
+    ----------
+    connecting : bool
+        ``True`` while the hardware search is running.
+
+    Signals
+    -------
+    deviceChanged(object)
+        Emitted with the instrument found by the background search,
+        or with the fake fallback.
+    status(str)
+        Progress of the hardware search.
     '''
 
     UIFILE = 'PolargraphWidget.ui'
     INSTRUMENT = Polargraph
 
-    def __init__(self, *args, **kwargs) -> None:
-        super().__init__(*args, **kwargs)
-        if not self.device.isOpen():
-            self._tryFlash()
+    deviceChanged = QtCore.Signal(object)
+    status = QtCore.Signal(str)
+
+    def __init__(self, *args, device=None, **kwargs) -> None:
+        super().__init__(*args,
+                         device=device or self.INSTRUMENT(),
+                         **kwargs)
+        self._scanner = None
+        self._flashOffered = False
         if not self.device.isOpen():
-            self.device = self._fakeCls()()
+            self._search()
 
-    def _tryFlash(self) -> None:
+    @property
+    def connecting(self) -> bool:
+        '''``True`` while the hardware search is running.'''
+        return self._scanner is not None
+
+    def _search(self) -> None:
+        '''Start looking for hardware on a background thread.'''
+        self.setEnabled(False)
+        self._scanner = PortScanner(self.INSTRUMENT)
+        self._scanner.progress.connect(self.status)
+        self._scanner.finished.connect(self._onSearchFinished)
+        self._scanner.start()
+
+    @QtCore.Slot(object)
+    def _onSearchFinished(self, device: Polargraph | None) -> None:
+        self._scanner = None
+        if device is None and not self._flashOffered:
+            self._flashOffered = True
+            if self._tryFlash():
+                self._search()
+                return
+        if device is None:
+            device = self._fakeCls()()
+            self.status.emit('No polargraph found: using simulator')
+        self._setDevice(device)
+
+    def _setDevice(self, device) -> None:
+        '''Swap in *device* once the search is over.'''
+        self.device = device
+        self.setEnabled(True)
+        if self.isVisible() and not self._restored:
+            # Shown while connecting: reconcile now, as showEvent would
+            self._restored = True
+            QtCore.QTimer.singleShot(0, self._firstShow)
+        self.deviceChanged.emit(device)
+
+    def _tryFlash(self) -> bool:
         '''Offer to flash acam3 firmware if an Arduino is detected.
 
         Opens :class:`~QPolargraph.FlashFirmware.FlashDialog` when at
-        least one Arduino-like device is found on a serial port.  If the
-        flash succeeds the dialog accepts and this method attempts a new
-        :class:`~QPolargraph.Polargraph.Polargraph` connection after a
-        2-second boot delay; on success ``self.device`` is replaced with
-        the live instrument.
-        ''' 
+        least one Arduino-like device is found on a serial port.
+
+        Returns
+        -------
+        bool
+            ``True`` if the firmware was flashed, in which case the
+            caller searches for the instrument again.
+        '''
         if not find_arduinos():
-            return
+            return False
         message = ('acam3 firmware not detected on the connected Arduino. '
                    'Flash the firmware to connect.')
         dialog = FlashDialog(self, message=message)
-        if dialog.exec() == QtWidgets.QDialog.DialogCode.Accepted:
-            time.sleep(2)  # wait for Arduino to reboot after flashing
-            device = Polargraph()
-            if device.isOpen():
-                self.device = device
+        return dialog.exec() == QtWidgets.QDialog.DialogCode.Accepted
+
+    @classmethod
+    def example(cls) -> None:
+        '''Display the widget while it searches for hardware.'''
+        import sys
+        app = (QtWidgets.QApplication.instance() or
+               QtWidgets.QApplication(sys.argv))
+        widget = cls()
+        widget.status.connect(print)
+        widget.show()
+        sys.exit(app.exec())
 
 
 if __name__ == '__main__':
@@ -3,6 +3,7 @@ from collections import deque
 from QInstrument.lib.QFakeInstrument import QFakeInstrument
 from QPolargraph.hardware.Motors import Motors
 from QPolargraph.hardware.Polargraph import Polargraph
+from QPolargraph.geometry.PolargraphGeometry import PolargraphGeometry
 import numpy as np
 import logging
 
@@ -68,6 +69,17 @@ class FakeMotors(QFakeInstrument, Motors):
     def close(self) -> None:
         pass
 
+    @property
+    def linkLost(self) -> bool:
+        return False
+
+    @property
+    def pollFailed(self) -> bool:
+        return False
+
+    def reconnect(self) -> bool:
+        return True
+
 
 class FakePolargraph(FakeMotors, Polargraph):
     '''Fake polargraph scanner for development without hardware.
@@ -96,6 +108,8 @@ class FakePolargraph(FakeMotors, Polargraph):
                  speed: float = 100.,
                  step_delay: float = 0.033,
                  **kwargs) -> None:
+        # QFakeInstrument does not chain to Polargraph.__init__.
+        self._geometry = PolargraphGeometry()
         super().__init__(**kwargs)
         self.pitch = pitch
         self.circumference = circumference
@@ -0,0 +1,264 @@
+from __future__ import annotations
+
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from qtpy import QtCore
+import threading
+import time
+import logging
+
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class AcquisitionStats:
+    '''Snapshot of :class:`AcquisitionExecutor` throughput.
+
+    Parameters
+    ----------
+    submitted : int
+        Reads accepted by :meth:`AcquisitionExecutor.submit`.
+    completed : int
+        Reads that returned a value.
+    failed : int
+        Reads that raised an exception.
+    dropped : int
+        Polls rejected because the queue was full.
+    pending : int
+        Reads queued or running when the snapshot was taken.
+    peak_pending : int
+        Largest value of ``pending`` seen so far.
+    mean_delay : float
+        Mean time from the poll to the start of its read [s].
+    mean_latency : float
+        Mean time from the poll to the end of its read [s].
+    max_latency : float
+        Longest time from a poll to the end of its read [s].
+    blocked : float
+        Total time :meth:`AcquisitionExecutor.submit` spent waiting for
+        a free slot [s].  Always zero unless ``block=True``.
+    '''
+    submitted: int = 0
+    completed: int = 0
+    failed: int = 0
+    dropped: int = 0
+    pending: int = 0
+    peak_pending: int = 0
+    mean_delay: float = 0.
+    mean_latency: float = 0.
+    max_latency: float = 0.
+    blocked: float = 0.
+
+    @property
+    def saturated(self) -> bool:
+        '''``True`` if the instrument has failed to keep up.'''
+        return self.dropped > 0 or self.blocked > 0.
+
+
+class AcquisitionExecutor(QtCore.QObject):
+
+    '''Run instrument reads on a thread pool, paired with position polls.
+
+    A slow instrument read called inline from
+    :meth:`~QPolargraph.patterns.QScanPattern.QScanPattern._onMeasure`
+    stalls the polling loop, which lowers the position sample rate and
+    stretches the time between a position and its measurement.  The
+    executor instead hands each read to a worker thread and returns
+    immediately.  Every result is reported together with the poll that
+    triggered it, so the pairing survives out-of-order completion.
+
+    At most ``maxsize`` reads may be queued or running at once.  When
+    the instrument cannot keep up, further polls are dropped (the
+    default) or, with ``block=True``, :meth:`submit` waits for a free
+    slot.  Either way the shortfall is counted in :attr:`stats`.
+
+    Assign an executor to
+    :attr:`~QPolargraph.patterns.QScanPattern.QScanPattern.acquisition`
+    to move the pattern's ``_onMeasure`` calls off the polling thread::
+
+        pattern.acquisition = AcquisitionExecutor(workers=2, maxsize=8)
+        pattern.acquisition.dataReady.connect(rows.append)
+
+    Parameters
+    ----------
+    read : callable, optional
+        Default read function, called as ``read(t, x, y)`` with the
+        poll's timestamp [s] and position [m].  Its return value is
+        reported as ``'value'``.
+    workers : int, optional
+        Number of worker threads.  Use 1 for instruments that cannot
+        serve concurrent requests.  Default: 1.
+    maxsize : int, optional
+        Maximum number of reads queued or running.  Default: 4.
+    block : bool, optional
+        If ``True``, :meth:`submit` waits for a free slot instead of
+        dropping the poll.  Default: ``False``.
+
+    Properties
+    ----------
+    pending : int
+        Number of reads queued or running.
+    stats : AcquisitionStats
+        Throughput and backpressure statistics.
+
+    Methods
+    -------
+    submit(t, x, y, read=None)
+        Queue a read for the poll at time *t* and position ``(x, y)``.
+    resetStats()
+        Zero the statistics.
+    shutdown(wait=True)
+        Stop accepting reads and release the worker threads.
+
+    Signals
+    -------
+    dataReady(dict)
+        Emitted from the worker thread when a read finishes, with
+        ``{'t', 'x', 'y', 't_start', 't_end', 'value'}``: the poll's
+        timestamp and position, the :func:`time.monotonic` times at
+        which the read started and finished, and the value it returned.
+    '''
+
+    dataReady = QtCore.Signal(dict)
+
+    def __init__(self,
+                 read: Callable | None = None,
+                 workers: int = 1,
+                 maxsize: int = 4,
+                 block: bool = False,
+                 parent: QtCore.QObject | None = None) -> None:
+        super().__init__(parent)
+        self.read = read
+        self.block = bool(block)
+        self._maxsize = max(int(maxsize), 1)
+        self._slots = threading.BoundedSemaphore(self._maxsize)
+        self._lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(max_workers=max(int(workers), 1),
+                                        thread_name_prefix='acquisition')
+        self._pending = 0
+        self.resetStats()
+
+    @property
+    def maxsize(self) -> int:
+        '''Maximum number of reads queued or running.'''
+        return self._maxsize
+
+    @property
+    def pending(self) -> int:
+        '''Number of reads queued or running.'''
+        return self._pending
+
+    @property
+    def stats(self) -> AcquisitionStats:
+        '''Throughput and backpressure statistics.'''
+        with self._lock:
+            s = self._stats
+            n = s.completed + s.failed
+            return AcquisitionStats(
+                submitted=s.submitted,
+                completed=s.completed,
+                failed=s.failed,
+                dropped=s.dropped,
+                pending=self._pending,
+                peak_pending=s.peak_pending,
+                mean_delay=self._delay / n if n else 0.,
+                mean_latency=self._latency / n if n else 0.,
+                max_latency=s.max_latency,
+                blocked=s.blocked)
+
+    def resetStats(self) -> None:
+        '''Zero the statistics.'''
+        with self._lock:
+            self._stats = AcquisitionStats()
+            self._delay = 0.
+            self._latency = 0.
+
+    def submit(self, t: float, x: float, y: float,
+               read: Callable | None = None) -> bool:
+        '''Queue a read for one position poll.
+
+        Parameters
+        ----------
+        t : float
+            Timestamp of the poll [s].
+        x : float
+            Horizontal coordinate [m].
+        y : float
+            Vertical coordinate [m].
+        read : callable, optional
+            Read function for this poll.  Default: :attr:`read`.
+
+        Returns
+        -------
+        bool
+            ``True`` if the read was queued, ``False`` if the poll was
+            dropped because the queue was full.
+        '''
+        read = read or self.read
+        if read is None:
+            raise ValueError('no read function')
+        if not self._slots.acquire(blocking=False):
+            if not self.block:
+                with self._lock:
+                    self._stats.dropped += 1
+                return False
+            start = time.monotonic()
+            self._slots.acquire()
+            with self._lock:
+                self._stats.blocked += time.monotonic() - start
+        with self._lock:
+            self._pending += 1
+            self._stats.submitted += 1
+            self._stats.peak_pending = max(self._stats.peak_pending,
+                                           self._pending)
+        try:
+            self._pool.submit(self._run, read, t, x, y)
+        except RuntimeError:
+            self._release()
+            raise
+        return True
+
+    def _release(self) -> None:
+        with self._lock:
+            self._pending -= 1
+        self._slots.release()
+
+    def _run(self, read: Callable, t: float, x: float, y: float) -> None:
+        '''Perform one read in a worker thread.'''
+        t_start = time.monotonic()
+        try:
+            value = read(t, x, y)
+        except Exception as ex:
+            t_end = time.monotonic()
+            logger.warning(f'Instrument read failed: {ex}')
+            ok = False
+        else:
+            t_end = time.monotonic()
+            ok = True
+        with self._lock:
+            s = self._stats
+            if ok:
+                s.completed += 1
+            else:
+                s.failed += 1
+            self._delay += t_start - t
+            self._latency += t_end - t
+            s.max_latency = max(s.max_latency, t_end - t)
+        self._release()
+        if ok:
+            self.dataReady.emit({'t': t, 'x': x, 'y': y,
+                                 't_start': t_start, 't_end': t_end,
+                                 'value': value})
+
+    def shutdown(self, wait: bool = True) -> None:
+        '''Stop accepting reads and release the worker threads.
+
+        Parameters
+        ----------
+        wait : bool, optional
+            If ``True``, return only after queued reads have finished.
+            Default: ``True``.
+        '''
+        self._pool.shutdown(wait=wait)
@@ -0,0 +1,187 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+import numpy as np
+
+if TYPE_CHECKING:
+    from QPolargraph.hardware.Polargraph import Polargraph
+
+
+class ArcSampler:
+
+    '''Sample points at equal arc-length intervals along a polled path.
+
+    Position polls arrive at whatever rate the serial link allows, so
+    their spacing along the path varies with speed and latency.
+    :class:`ArcSampler` accumulates the path length traced by successive
+    polls and reports the points at which it crosses multiples of
+    :attr:`spacing`.
+
+    Between two polls both motors run at (nearly) constant speed, so
+    the payload moves along a straight line in motor-step space, which
+    is an arc in Cartesian space.  Crossings are located on that arc:
+    the segment is subdivided in step space, mapped through
+    :meth:`~QPolargraph.hardware.Polargraph.Polargraph.i2r`, and the
+    crossing times are interpolated from the poll timestamps.
+
+    :meth:`predict` extrapolates the latest step velocity to estimate
+    when and where the next crossing will occur, so that a caller can
+    trigger a measurement at the sample point itself instead of at the
+    next poll.  A predicted sample is claimed with :meth:`advance` and
+    is then not reported again by :meth:`update`.
+
+    Parameters
+    ----------
+    polargraph : Polargraph
+        Geometry used to convert between Cartesian and step coordinates.
+    spacing : float
+        Distance between sample points along the path [m].
+    subdivisions : int, optional
+        Number of sub-segments used to measure the arc between two
+        polls.  Default: 8.
+
+    Properties
+    ----------
+    length : float
+        Path length traced since :meth:`reset` [m].
+
+    Methods
+    -------
+    reset()
+        Start a new path.  The first poll is always a sample point.
+    restart()
+        Continue the path after a gap in the polls.
+    update(t, x, y)
+        Add a poll and return the sample points crossed since the last.
+    predict(limit)
+        Return the predicted time and position of the next crossing.
+    advance()
+        Claim the next sample point.
+    '''
+
+    def __init__(self,
+                 polargraph: Polargraph,
+                 spacing: float,
+                 subdivisions: int = 8) -> None:
+        if spacing <= 0.:
+            raise ValueError(f'spacing must be positive: {spacing}')
+        self.polargraph = polargraph
+        self.spacing = float(spacing)
+        self._subdivisions = max(int(subdivisions), 1)
+        self.reset()
+
+    @property
+    def length(self) -> float:
+        '''Path length traced since :meth:`reset` [m].'''
+        return self._length
+
+    def reset(self) -> None:
+        '''Start a new path.'''
+        self._last = None
+        self._interval = 0.
+        self._velocity = None
+        self._speed = 0.
+        self._length = 0.
+        self._next = 0.
+
+    def restart(self) -> None:
+        '''Continue the path after a gap in the polls.
+
+        Forgets the last poll but keeps the path length and the next
+        sample point, so that no crossings are interpolated across a
+        pause or an outage of the serial link.  The next poll picks up
+        the path where it left off.
+        '''
+        self._last = None
+        self._interval = 0.
+        self._velocity = None
+        self._speed = 0.
+
+    def update(self, t: float, x: float, y: float) -> np.ndarray:
+        '''Add a poll and return the sample points crossed since the last.
+
+        Parameters
+        ----------
+        t : float
+            Poll timestamp [s].
+        x : float
+            Horizontal coordinate [m].
+        y : float
+            Vertical coordinate [m].
+
+        Returns
+        -------
+        numpy.ndarray
+            ``(nsamples, 3)`` array of ``(x, y, t)`` sample points.
+        '''
+        m, n = self.polargraph.r2f(x, y)
+        if self._last is None:
+            self._last = (t, m, n)
+            if self._next > 0.:
+                return np.empty((0, 3))
+            self._next = self.spacing
+            return np.array([[x, y, t]])
+        t0, m0, n0 = self._last
+        self._last = (t, m, n)
+        dt = t - t0
+        self._interval = dt
+        self._velocity = ((m - m0) / dt, (n - n0) / dt) if dt > 0. else None
+        # Arc length along the straight step-space segment
+        u = np.linspace(0., 1., self._subdivisions + 1)
+        xs, ys = self.polargraph.i2r(m0 + u * (m - m0), n0 + u * (n - n0))
+        ds = np.hypot(np.diff(xs), np.diff(ys))
+        s = self._length + np.concatenate([[0.], np.cumsum(ds)])
+        self._length = s[-1]
+        self._speed = ds.sum() / dt if dt > 0. else 0.
+        if self._length < self._next:
+            return np.empty((0, 3))
+        targets = np.arange(self._next, self._length, self.spacing)
+        if np.isclose(self._next + len(targets) * self.spacing, self._length,
+                      rtol=0., atol=1e-12):
+            targets = np.append(targets, self._length)
+        self._next = targets[-1] + self.spacing
+        f = np.interp(targets, s, u)
+        xk, yk = self.polargraph.i2r(m0 + f * (m - m0), n0 + f * (n - n0))
+        return np.column_stack([xk, yk, t0 + f * dt])
+
+    def predict(self,
+                limit: float = np.inf) -> tuple[float, float, float] | None:
+        '''Return the predicted next crossing.
+
+        Extrapolates the step velocity between the last two polls.
+        Only crossings expected before the next poll, that is within
+        one poll interval of the last, are predicted.
+
+        Parameters
+        ----------
+        limit : float, optional
+            Largest distance ahead of the last poll at which to predict
+            a crossing [m], for example the distance to the current
+            target waypoint.  Default: no limit.
+
+        Returns
+        -------
+        tuple or None
+            ``(t, x, y)`` of the next sample point, or ``None`` if the
+            payload was stationary between the last two polls or the
+            next crossing is out of reach.
+        '''
+        if self._velocity is None or self._speed <= 0.:
+            return None
+        ahead = self._next - self._length
+        if ahead > limit:
+            return None
+        dt = ahead / self._speed
+        if dt > self._interval:
+            return None
+        t0, m0, n0 = self._last
+        vm, vn = self._velocity
+        x, y = self.polargraph.i2r(m0 + vm * dt, n0 + vn * dt)
+        return (t0 + dt, float(x), float(y))
+
+    def advance(self) -> None:
+        '''Claim the next sample point.
+
+        Call after taking a measurement at a predicted crossing.
+        '''
+        self._next += self.spacing
@@ -0,0 +1,210 @@
+from __future__ import annotations
+
+import pyqtgraph as pg
+import numpy as np
+import numpy.typing as npt
+import logging
+
+
+logger = logging.getLogger(__name__)
+
+
+class DecimatedScatterItem(pg.ScatterPlotItem):
+
+    '''Scatter plot that shows at most one spot per spatial bin.
+
+    Live scan data arrive at the position-poll rate, so a plain
+    :class:`pyqtgraph.ScatterPlotItem` grows without limit and redraws
+    slow down as a scan progresses.  This item divides the plane into
+    square bins of side :attr:`binSize` and keeps a single spot at the
+    center of each occupied bin.  New samples either add a spot (first
+    sample in a bin) or recolor the existing one, so the number of spots,
+    and therefore the cost of a redraw, is bounded by the number of bins
+    that the scan area covers rather than by the length of the scan.
+
+    Full-resolution data are not kept here; store them separately, for
+    example in a :class:`~QPolargraph.lib.SampleStore.SampleStore`.
+
+    Parameters
+    ----------
+    binSize : float, optional
+        Bin side length [m].  Default: ``None``, which sets the bin
+        size to one display pixel when the first samples arrive.
+    mode : str, optional
+        ``'latest'`` to color each bin by its most recent sample, or
+        ``'mean'`` to color it by the running mean of all samples in
+        the bin.  Default: ``'latest'``.
+
+    Methods
+    -------
+    addSamples(x, y, hue, saturation)
+        Fold new samples into the binned display.
+    clear()
+        Remove all spots and forget the bins.
+    '''
+
+    #: Bin size [m] used when the view cannot report its pixel size.
+    DEFAULT_BIN_SIZE = 1e-3
+
+    #: Number of quantization levels for hue and saturation.  Spots
+    #: share brushes, which keeps pyqtgraph's symbol atlas small.
+    COLOR_LEVELS = 256
+
+    MODES = ('latest', 'mean')
+
+    def __init__(self, *args,
+                 binSize: float | None = None,
+                 mode: str = 'latest',
+                 **kwargs) -> None:
+        self._binSize = None if binSize is None else float(binSize)
+        self._mode = 'latest'
+        self._resetBins()
+        self._brushes = dict()
+        super().__init__(*args, **kwargs)
+        self.mode = mode
+
+    def _resetBins(self) -> None:
+        self._slots = dict()
+        self._hue = np.zeros(0)
+        self._saturation = np.zeros(0)
+        self._count = np.zeros(0, dtype=int)
+
+    @property
+    def binSize(self) -> float | None:
+        '''Side length of the display bins [m].
+
+        Changing the bin size clears the display.
+        '''
+        return self._binSize
+
+    @binSize.setter
+    def binSize(self, value: float | None) -> None:
+        value = None if value is None else float(value)
+        if value != self._binSize:
+            self._binSize = value
+            self.clear()
+
+    @property
+    def mode(self) -> str:
+        '''Bin coloring mode: ``'latest'`` or ``'mean'``.'''
+        return self._mode
+
+    @mode.setter
+    def mode(self, value: str) -> None:
+        if value not in self.MODES:
+            raise ValueError(f'mode must be one of {self.MODES}: {value!r}')
+        self._mode = value
+
+    def nbins(self) -> int:
+        '''Return the number of occupied bins.'''
+        return len(self._slots)
+
+    def _defaultBinSize(self) -> float:
+        '''Return the size of one display pixel in data units [m].'''
+        view = self.getViewBox()
+        if view is not None:
+            try:
+                size = max(view.viewPixelSize())
+            except Exception as ex:
+                logger.debug(f'Could not read view pixel size: {ex}')
+            else:
+                if np.isfinite(size) and size > 0.:
+                    return size
+        return self.DEFAULT_BIN_SIZE
+
+    def _brush(self, hue: float, saturation: float):
+        '''Return a shared brush for quantized ``(hue, saturation)``.'''
+        n = self.COLOR_LEVELS - 1
+        key = (int(round(hue * n)), int(round(saturation * n)))
+        brush = self._brushes.get(key)
+        if brush is None:
+            color = pg.hsvColor(key[0] / n, sat=key[1] / n)
+            brush = self._brushes[key] = pg.mkBrush(color)
+        return brush
+
+    def _grow(self, nbins: int) -> None:
+        '''Extend the per-bin value arrays to hold *nbins* bins.'''
+        extra = nbins - len(self._hue)
+        if extra > 0:
+            self._hue = np.concatenate([self._hue, np.zeros(extra)])
+            self._saturation = np.concatenate(
+                [self._saturation, np.zeros(extra)])
+            self._count = np.concatenate(
+                [self._count, np.zeros(extra, dtype=int)])
+
+    def addSamples(self, x: npt.ArrayLike, y: npt.ArrayLike,
+                   hue: npt.ArrayLike,
+                   saturation: npt.ArrayLike = 1.0) -> None:
+        '''Fold samples into the binned display.
+
+        Parameters
+        ----------
+        x : array-like
+            Horizontal coordinates [m].
+        y : array-like
+            Vertical coordinates [m].
+        hue : array-like
+            Color values in ``[0, 1]`` (HSV hue).
+        saturation : array-like, optional
+            Saturation values in ``[0, 1]``.  Default: 1.0.
+        '''
+        x, y, hue, saturation = np.broadcast_arrays(
+            np.atleast_1d(np.asarray(x, dtype=float)),
+            np.atleast_1d(np.asarray(y, dtype=float)),
+            np.clip(np.atleast_1d(np.asarray(hue, dtype=float)), 0., 1.),
+            np.clip(np.atleast_1d(np.asarray(saturation, dtype=float)),
+                    0., 1.))
+        if x.size == 0:
+            return
+        if self._binSize is None:
+            self._binSize = self._defaultBinSize()
+        size = self._binSize
+        ii = np.floor(x / size).astype(np.int64)
+        jj = np.floor(y / size).astype(np.int64)
+
+        nold = len(self._slots)
+        slots = np.empty(len(ii), dtype=int)
+        added = []
+        for k, key in enumerate(zip(ii.tolist(), jj.tolist())):
+            slot = self._slots.get(key)
+            if slot is None:
+                slot = self._slots[key] = len(self._slots)
+                added.append(key)
+            slots[k] = slot
+        self._grow(len(self._slots))
+
+        if self._mode == 'mean':
+            hsum = self._hue * self._count
+            ssum = self._saturation * self._count
+            np.add.at(hsum, slots, hue)
+            np.add.at(ssum, slots, saturation)
+            np.add.at(self._count, slots, 1)
+            touched = np.unique(slots)
+            self._hue[touched] = hsum[touched] / self._count[touched]
+            self._saturation[touched] = (ssum[touched] /
+                                         self._count[touched])
+        else:
+            # Last occurrence of each slot in this batch wins.
+            rev = slots[::-1]
+            touched, first = np.unique(rev, return_index=True)
+            self._hue[touched] = hue[::-1][first]
+            self._saturation[touched] = saturation[::-1][first]
+            self._count[touched] += 1
+
+        brushes = np.empty(len(touched), dtype=object)
+        brushes[:] = [self._brush(h, s) for h, s in
+                      zip(self._hue[touched], self._saturation[touched])]
+        old = touched < nold
+        if np.any(old):
+            self.data['brush'][touched[old]] = brushes[old]
+            self.data['sourceRect'][touched[old]] = 0
+            self.updateSpots()
+        if added:
+            centers = (np.array(added, dtype=float) + 0.5) * size
+            self.addPoints(x=centers[:, 0], y=centers[:, 1],
+                           brush=list(brushes[~old]))
+
+    def clear(self) -> None:
+        '''Remove all spots and forget the bins.'''
+        self._resetBins()
+        super().clear()
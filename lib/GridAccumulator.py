@@ -0,0 +1,182 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+import numpy as np
+import numpy.typing as npt
+
+if TYPE_CHECKING:
+    from QPolargraph.patterns.QScanPattern import QScanPattern
+
+
+class GridAccumulator:
+
+    '''Running-mean image of scattered scan samples.
+
+    Divides the scan rectangle into square pixels and keeps, for each
+    pixel, the sum and the number of samples that fell inside it.
+    Adding a sample touches exactly one pixel, so the cost of an update
+    is O(1) per sample no matter how many samples have been collected,
+    and the running mean is available at any time as a fixed-size array
+    suitable for display as a single image.
+
+    Arrays are indexed ``[ix, iy]``: the first axis runs along ``x`` and
+    the second along ``y``, matching the column-major layout of
+    :class:`pyqtgraph.ImageItem`.
+
+    Parameters
+    ----------
+    rect : sequence of float
+        Bounding rectangle ``[x1, y1, x2, y2]`` of the grid [m].
+    spacing : float
+        Pixel side length [m].
+    dtype : numpy.dtype, optional
+        Data type of the accumulated values.  Use a complex type to
+        accumulate complex-valued (e.g. demodulated) samples.
+        Default: ``float``.
+
+    Properties
+    ----------
+    shape : tuple of int
+        ``(nx, ny)`` number of pixels along ``x`` and ``y``.
+    count : numpy.ndarray
+        Number of samples accumulated in each pixel.  Read-only view.
+    total : numpy.ndarray
+        Sum of the samples accumulated in each pixel.  Read-only view.
+    mean : numpy.ndarray
+        Running mean of each pixel; ``NaN`` where no samples landed.
+
+    Methods
+    -------
+    add(x, y, value)
+        Accumulate samples at positions ``(x, y)``.
+    clear()
+        Reset all pixels.
+    forPattern(pattern)
+        Build a grid over a scan pattern's rectangle with one pixel per
+        scan step.
+    '''
+
+    def __init__(self,
+                 rect: npt.ArrayLike,
+                 spacing: float,
+                 dtype: npt.DTypeLike = float) -> None:
+        x1, y1, x2, y2 = (float(v) for v in rect)
+        if spacing <= 0.:
+            raise ValueError(f'spacing must be positive: {spacing}')
+        self._rect = (x1, y1, x2, y2)
+        self._spacing = float(spacing)
+        # Tolerance keeps round-off from adding a spurious extra pixel.
+        nx = max(int(np.ceil((x2 - x1) / spacing - 1e-9)), 1)
+        ny = max(int(np.ceil((y2 - y1) / spacing - 1e-9)), 1)
+        self._total = np.zeros((nx, ny), dtype=dtype)
+        self._count = np.zeros((nx, ny), dtype=np.int64)
+
+    @classmethod
+    def forPattern(cls, pattern: QScanPattern,
+                   dtype: npt.DTypeLike = float) -> GridAccumulator:
+        '''Return a grid covering ``pattern.rect`` at ``pattern.step``.
+
+        Parameters
+        ----------
+        pattern : QScanPattern
+            Scan pattern whose rectangle and line spacing set the grid.
+        dtype : numpy.dtype, optional
+            Data type of the accumulated values.  Default: ``float``.
+        '''
+        return cls(pattern.rect, pattern.step * 1e-3, dtype=dtype)
+
+    @property
+    def rect(self) -> tuple[float, float, float, float]:
+        '''Bounding rectangle ``(x1, y1, x2, y2)`` of the grid [m].'''
+        return self._rect
+
+    @property
+    def spacing(self) -> float:
+        '''Pixel side length [m].'''
+        return self._spacing
+
+    @property
+    def shape(self) -> tuple[int, int]:
+        '''Number of pixels ``(nx, ny)`` along ``x`` and ``y``.'''
+        return self._count.shape
+
+    @property
+    def extent(self) -> tuple[float, float, float, float]:
+        '''Area ``(x, y, width, height)`` covered by the pixels [m].
+
+        The covered area can exceed :attr:`rect` by up to one pixel in
+        each direction because the pixel count is rounded up.
+        '''
+        nx, ny = self.shape
+        x1, y1, _, _ = self._rect
+        return (x1, y1, nx * self._spacing, ny * self._spacing)
+
+    @property
+    def count(self) -> np.ndarray:
+        '''Number of samples in each pixel.'''
+        view = self._count.view()
+        view.flags.writeable = False
+        return view
+
+    @property
+    def total(self) -> np.ndarray:
+        '''Sum of samples in each pixel.'''
+        view = self._total.view()
+        view.flags.writeable = False
+        return view
+
+    @property
+    def mean(self) -> np.ndarray:
+        '''Running mean of each pixel; ``NaN`` where the count is zero.'''
+        mean = np.full(self._total.shape, np.nan, dtype=self._total.dtype)
+        np.divide(self._total, self._count, out=mean,
+                  where=self._count > 0)
+        return mean
+
+    def index(self, x: npt.ArrayLike,
+              y: npt.ArrayLike) -> tuple[np.ndarray, np.ndarray]:
+        '''Return the pixel indexes ``(ix, iy)`` of positions ``(x, y)``.
+
+        Positions outside the grid yield indexes outside
+        ``[0, nx)`` × ``[0, ny)``.
+        '''
+        x1, y1, _, _ = self._rect
+        ix = np.floor((np.asarray(x) - x1) / self._spacing).astype(np.int64)
+        iy = np.floor((np.asarray(y) - y1) / self._spacing).astype(np.int64)
+        return ix, iy
+
+    def add(self, x: npt.ArrayLike, y: npt.ArrayLike,
+            value: npt.ArrayLike) -> int:
+        '''Accumulate samples into the grid.
+
+        Samples that fall outside the grid are ignored.
+
+        Parameters
+        ----------
+        x : array-like
+            Horizontal coordinates [m].
+        y : array-like
+            Vertical coordinates [m].
+        value : array-like
+            Sample values, broadcast against ``x`` and ``y``.
+
+        Returns
+        -------
+        int
+            Number of samples accumulated.
+        '''
+        x, y, value = np.broadcast_arrays(np.atleast_1d(x),
+                                          np.atleast_1d(y),
+                                          np.atleast_1d(value))
+        ix, iy = self.index(x, y)
+        nx, ny = self.shape
+        inside = (ix >= 0) & (ix < nx) & (iy >= 0) & (iy < ny)
+        flat = np.ravel_multi_index((ix[inside], iy[inside]), (nx, ny))
+        np.add.at(self._total.reshape(-1), flat, value[inside])
+        np.add.at(self._count.reshape(-1), flat, 1)
+        return int(flat.size)
+
+    def clear(self) -> None:
+        '''Reset all pixels to zero count.'''
+        self._total[...] = 0
+        self._count[...] = 0
@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+import numpy as np
+from QPolargraph.geometry.PolargraphGeometry import MotorMetric
+
+if TYPE_CHECKING:
+    from QPolargraph.hardware.Polargraph import Polargraph
+
+
+class MotionWatchdog:
+
+    '''Detect moves that take too long or stop making progress.
+
+    The polling loop in
+    :meth:`~QPolargraph.patterns.QScanPattern.QScanPattern._moveTo`
+    waits for the polargraph's running flag to clear.  A stuck motor, a
+    lost command, or a hung firmware would keep it waiting forever.
+    The watchdog follows one move at a time and flags two failures:
+
+    ``'timeout'``
+        The move has lasted longer than ``margin`` times the duration
+        predicted by the AccelStepper motion model (see
+        :class:`~QPolargraph.geometry.PolargraphGeometry.MotorMetric`),
+        plus ``slack``.
+    ``'stall'``
+        The reported step indexes have not come closer to the target
+        for ``window`` seconds, for example because a motor is
+        skipping steps against a jammed belt.
+
+    The prediction is made from the first poll after :meth:`start`, so
+    the watchdog needs no separate position query.
+
+    Parameters
+    ----------
+    polargraph : Polargraph
+        Geometry and motion parameters of the move.
+    margin : float, optional
+        Allowed ratio of actual to predicted move time.  Default: 2.
+    slack : float, optional
+        Additional time allowed for each move [s], covering serial
+        latency and short moves.  Default: 1.
+    window : float, optional
+        Longest time without progress toward the target [s].
+        Default: 1.
+
+    Properties
+    ----------
+    predicted : float
+        Predicted duration of the current move [s], or ``NaN`` before
+        the first poll.
+
+    Methods
+    -------
+    start(target)
+        Begin watching a move to ``target``.
+    check(t, x, y)
+        Return ``None`` or the failure detected at a poll.
+    '''
+
+    def __init__(self,
+                 polargraph: Polargraph,
+                 margin: float = 2.,
+                 slack: float = 1.,
+                 window: float = 1.) -> None:
+        self.polargraph = polargraph
+        self.margin = float(margin)
+        self.slack = float(slack)
+        self.window = float(window)
+        self._target = None
+        self._predicted = np.nan
+
+    @property
+    def predicted(self) -> float:
+        '''Predicted duration of the current move [s].'''
+        return self._predicted
+
+    def start(self, target: tuple[float, float]) -> None:
+        '''Begin watching a move.
+
+        Parameters
+        ----------
+        target : tuple of float
+            ``(x, y)`` destination of the move [m].
+        '''
+        self._target = np.asarray(
+            self.polargraph.r2f(*target), dtype=float)
+        self._xy = np.asarray(target, dtype=float)
+        self._predicted = np.nan
+        self._start = None
+
+    def check(self, t: float, x: float, y: float) -> str | None:
+        '''Check one position poll of a move in progress.
+
+        Parameters
+        ----------
+        t : float
+            Poll timestamp [s].
+        x : float
+            Horizontal coordinate [m].
+        y : float
+            Vertical coordinate [m].
+
+        Returns
+        -------
+        str or None
+            ``'timeout'`` or ``'stall'`` if the move has failed,
+            otherwise ``None``.
+        '''
+        if self._target is None:
+            return None
+        here = np.asarray(self.polargraph.r2f(x, y), dtype=float)
+        remaining = float(np.max(np.abs(self._target - here)))
+        if self._start is None:
+            metric = MotorMetric(self.polargraph)
+            self._predicted = float(metric([x, y], self._xy))
+            self._start = t
+            self._best = remaining
+            self._progress = t
+            return None
+        if remaining < self._best - 0.5:
+            self._best = remaining
+            self._progress = t
+        if t - self._start > self.margin * self._predicted + self.slack:
+            return 'timeout'
+        if t - self._progress > self.window:
+            return 'stall'
+        return None
@@ -0,0 +1,467 @@
+'''SamplePublisher — stream live scan samples to other processes.
+
+A :class:`SamplePublisher` listens on a local TCP port or Unix socket
+and sends every subscriber the samples of the running scan.  A
+:class:`SampleSubscriber` is the matching client::
+
+    publisher = SamplePublisher(('127.0.0.1', 5555))
+    publisher.attach(scanner.pattern)
+
+    # in another process
+    with SampleSubscriber(('127.0.0.1', 5555)) as feed:
+        print(feed.header['fields'])
+        for sequence, batch in feed:
+            process(batch)
+
+Wire format
+-----------
+All integers are little-endian.  On connection the publisher sends
+one header::
+
+    b'QPGH'  uint32 length  JSON object of that many bytes
+
+The JSON object has these keys:
+
+``version``
+    Version of the wire format, :data:`VERSION`.
+``fields``
+    Column names, for example ``["x", "y", "t", "I", "Q"]``.
+``dtype``
+    NumPy dtype string of every column, ``"<f8"``.
+``geometry``
+    Polargraph settings (``ell``, ``y0``, ``pitch``, ...), the scan
+    pattern class as ``pattern`` and its bounding ``rect`` [m], when
+    known.
+
+Samples follow in frames::
+
+    b'QPGD'  uint32 rows  uint64 sequence  rows * len(fields) values
+
+The values of a frame form a C-ordered ``(rows, len(fields))`` array.
+Sequence numbers count frames from zero and are shared by all
+subscribers, so a gap tells a subscriber how many frames it missed.
+'''
+
+from __future__ import annotations
+
+from collections import deque
+from collections.abc import Iterator, Mapping, Sequence
+from pathlib import Path
+import errno
+import json
+import logging
+import os
+import socket
+import stat
+import struct
+import threading
+import time
+import numpy as np
+import numpy.typing as npt
+from qtpy import QtCore
+
+
+logger = logging.getLogger(__name__)
+
+#: Version of the wire format.
+VERSION = 1
+HEADER = struct.Struct('<4sI')
+FRAME = struct.Struct('<4sIQ')
+DTYPE = np.dtype('<f8')
+
+Address = tuple[str, int] | str | Path
+
+
+def _remove_stale_socket(path: str) -> None:
+    '''Remove a Unix socket at *path* that nobody is listening on.
+
+    Raises
+    ------
+    FileExistsError
+        If *path* exists and is not a socket.
+    OSError
+        If another process is listening on the socket.
+    '''
+    try:
+        mode = os.stat(path).st_mode
+    except FileNotFoundError:
+        return
+    if not stat.S_ISSOCK(mode):
+        raise FileExistsError(errno.EEXIST, 'not a socket', path)
+    with socket.socket(socket.AF_UNIX) as probe:
+        try:
+            probe.connect(path)
+        except ConnectionRefusedError:
+            os.unlink(path)
+            return
+    raise OSError(errno.EADDRINUSE, 'socket is in use', path)
+
+
+class _Subscriber:
+
+    '''Bounded outbox and sender thread for one connection.'''
+
+    def __init__(self, connection: socket.socket, depth: int) -> None:
+        self.connection = connection
+        self.frames = deque(maxlen=depth)
+        self.dropped = 0
+        self.ready = threading.Condition()
+        self.closed = False
+        self.thread = threading.Thread(target=self._send,
+                                       name='publisher', daemon=True)
+
+    def put(self, frame: bytes) -> None:
+        with self.ready:
+            if len(self.frames) == self.frames.maxlen:
+                self.dropped += 1
+            self.frames.append(frame)
+            self.ready.notify()
+
+    def close(self) -> None:
+        with self.ready:
+            self.closed = True
+            self.ready.notify()
+
+    def _send(self) -> None:
+        try:
+            while True:
+                with self.ready:
+                    self.ready.wait_for(lambda: self.frames or self.closed)
+                    if self.closed and not self.frames:
+                        break
+                    frame = self.frames.popleft()
+                self.connection.sendall(frame)
+        except OSError:
+            pass
+        finally:
+            self.closed = True
+            self.connection.close()
+
+
+class SamplePublisher:
+
+    '''Publish scan samples on a local socket.
+
+    Rows are collected into batches of up to ``batch`` rows, or
+    ``latency`` seconds while rows keep arriving, and each batch is
+    sent to every subscriber as one binary frame.  An attached pattern
+    also flushes the batch whenever it reaches a waypoint, loses its
+    link or changes state, so rows do not wait while sampling stops; see the module documentation for the format.
+    Every subscriber has its own sender thread and an outbox of
+    ``depth`` frames.  When a subscriber falls behind, its oldest
+    frames are dropped, so :meth:`write` never waits on the network
+    and a slow consumer cannot stall the scan.
+
+    Parameters
+    ----------
+    address : tuple or str
+        ``(host, port)`` for TCP, or the path of a Unix socket.  Port
+        0 picks a free port; see :attr:`address`.  A socket left at
+        the path by a publisher that has exited is replaced.
+    fields : sequence of str, optional
+        Column names.  Default: ``('x', 'y', 't')``.
+        :meth:`attach` sets them from the pattern.
+    geometry : mapping, optional
+        Description of the scan geometry for the header.
+        :meth:`attach` fills it in from the pattern.
+    batch : int, optional
+        Largest number of rows per frame.  Default: 256.
+    latency : float, optional
+        Longest time between frames while rows keep arriving [s].
+        Default: 0.1.
+    depth : int, optional
+        Number of frames queued for each subscriber.  Default: 64.
+
+    Properties
+    ----------
+    address : tuple or str
+        Address the publisher is listening on.
+    subscribers : int
+        Number of connected subscribers.
+    sequence : int
+        Sequence number of the next frame.
+    dropped : int
+        Frames dropped for slow subscribers, in total.
+
+    Methods
+    -------
+    attach(pattern)
+        Publish the samples of a scan pattern.
+    write(row)
+        Add one row.
+    flush()
+        Send the buffered rows.
+    close()
+        Flush, disconnect all subscribers and stop listening.
+    '''
+
+    def __init__(self,
+                 address: Address,
+                 fields: Sequence[str] = ('x', 'y', 't'),
+                 geometry: Mapping | None = None,
+                 batch: int = 256,
+                 latency: float = 0.1,
+                 depth: int = 64) -> None:
+        self.fields = tuple(fields)
+        self.geometry = dict(geometry or {})
+        self.batch = max(int(batch), 1)
+        self.latency = float(latency)
+        self.depth = max(int(depth), 1)
+        self._rows = []
+        self._last = time.monotonic()
+        self._sequence = 0
+        self._dropped = 0
+        self._subscribers = []
+        self._lock = threading.Lock()
+        self._pattern = None
+        if isinstance(address, tuple):
+            self._socket = socket.create_server(address)
+        else:
+            address = os.fspath(address)
+            _remove_stale_socket(address)
+            self._socket = socket.socket(socket.AF_UNIX)
+            self._socket.bind(address)
+            self._socket.listen()
+        self._address = self._socket.getsockname()
+        self._listener = threading.Thread(target=self._accept,
+                                          args=(self._socket,),
+                                          name='publisher', daemon=True)
+        self._listener.start()
+
+    def __enter__(self) -> SamplePublisher:
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    @property
+    def address(self) -> tuple[str, int] | str:
+        '''Address the publisher is listening on.'''
+        return self._address
+
+    @property
+    def subscribers(self) -> int:
+        '''Number of connected subscribers.'''
+        with self._lock:
+            return sum(not s.closed for s in self._subscribers)
+
+    @property
+    def sequence(self) -> int:
+        '''Sequence number of the next frame.'''
+        return self._sequence
+
+    @property
+    def dropped(self) -> int:
+        '''Frames dropped for slow subscribers, in total.'''
+        with self._lock:
+            return self._dropped + sum(s.dropped for s in self._subscribers)
+
+    def header(self) -> bytes:
+        '''Return the header sent to each new subscriber.'''
+        info = json.dumps({'version': VERSION,
+                           'fields': list(self.fields),
+                           'dtype': DTYPE.str,
+                           'geometry': self.geometry}).encode()
+        return HEADER.pack(b'QPGH', len(info)) + info
+
+    def _accept(self, server: socket.socket) -> None:
+        while True:
+            try:
+                connection, _ = server.accept()
+            except OSError:
+                return
+            try:
+                connection.sendall(self.header())
+            except OSError:
+                connection.close()
+                continue
+            subscriber = _Subscriber(connection, self.depth)
+            with self._lock:
+                self._prune()
+                self._subscribers.append(subscriber)
+            subscriber.thread.start()
+
+    def _prune(self) -> None:
+        '''Forget disconnected subscribers.  Call with the lock held.'''
+        for subscriber in [s for s in self._subscribers if s.closed]:
+            self._dropped += subscriber.dropped
+            self._subscribers.remove(subscriber)
+
+    def attach(self, pattern) -> None:
+        '''Publish the samples that *pattern* records while SCANNING.
+
+        Samples are collected directly in the thread that runs the
+        scan.  The header describes the pattern's fields and geometry,
+        so attach before subscribers connect.
+
+        Parameters
+        ----------
+        pattern : QScanPattern
+            Scan pattern to publish.
+        '''
+        self.detach()
+        self.fields = ('x', 'y', 't', *pattern.fields)
+        self.geometry = {**pattern.polargraph.settings,
+                         'pattern': type(pattern).__name__,
+                         'rect': [float(v) for v in pattern.rect]}
+        direct = QtCore.Qt.ConnectionType.DirectConnection
+        pattern.dataReady.connect(self._onDataReady, direct)
+        pattern.stateChanged.connect(self._onBreak, direct)
+        pattern.vertexReached.connect(self._onBreak, direct)
+        pattern.linkDown.connect(self._onBreak, direct)
+        self._pattern = pattern
+
+    def detach(self) -> None:
+        '''Stop publishing the attached pattern.'''
+        if self._pattern is None:
+            return
+        self._pattern.dataReady.disconnect(self._onDataReady)
+        self._pattern.stateChanged.disconnect(self._onBreak)
+        self._pattern.vertexReached.disconnect(self._onBreak)
+        self._pattern.linkDown.disconnect(self._onBreak)
+        self._pattern = None
+
+    def _onDataReady(self, data: np.ndarray) -> None:
+        if self._pattern.scanning():
+            self.write(data)
+
+    def _onBreak(self, *args) -> None:
+        '''Flush at a waypoint, a link loss or a change of state.'''
+        self.flush()
+
+    def write(self, row: npt.ArrayLike) -> None:
+        '''Add one row.
+
+        Parameters
+        ----------
+        row : array-like
+            One value for each of :attr:`fields`.
+        '''
+        self._rows.append(row)
+        if (len(self._rows) >= self.batch or
+                time.monotonic() - self._last >= self.latency):
+            self.flush()
+
+    def flush(self) -> None:
+        '''Send the buffered rows to every subscriber as one frame.'''
+        self._last = time.monotonic()
+        if not self._rows:
+            return
+        rows = np.asarray(self._rows, dtype=DTYPE)[:, :len(self.fields)]
+        self._rows = []
+        frame = (FRAME.pack(b'QPGD', len(rows), self._sequence) +
+                 np.ascontiguousarray(rows).tobytes())
+        self._sequence += 1
+        with self._lock:
+            for subscriber in self._subscribers:
+                if not subscriber.closed:
+                    subscriber.put(frame)
+
+    def close(self) -> None:
+        '''Flush, disconnect all subscribers and stop listening.'''
+        if self._socket is None:
+            return
+        self.detach()
+        self.flush()
+        try:
+            self._socket.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        self._socket.close()
+        self._socket = None
+        if isinstance(self._address, str) and os.path.exists(self._address):
+            os.unlink(self._address)
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for subscriber in subscribers:
+            subscriber.close()
+        for subscriber in subscribers:
+            subscriber.thread.join(timeout=1.)
+
+
+class SampleSubscriber:
+
+    '''Receive samples from a :class:`SamplePublisher`.
+
+    Iterating yields ``(sequence, batch)`` pairs, where ``batch`` is a
+    ``(rows, len(fields))`` array, until the publisher closes.  Skipped
+    sequence numbers are frames that were dropped because this
+    subscriber fell behind; they are counted in :attr:`missed`.
+
+    Parameters
+    ----------
+    address : tuple or str
+        Address of the publisher.
+    timeout : float, optional
+        Socket timeout [s].  Default: no timeout.
+
+    Properties
+    ----------
+    header : dict
+        Header sent by the publisher.
+    fields : tuple of str
+        Column names.
+    missed : int
+        Number of frames dropped for this subscriber so far.
+    '''
+
+    def __init__(self,
+                 address: Address,
+                 timeout: float | None = None) -> None:
+        if isinstance(address, tuple):
+            self._socket = socket.create_connection(address, timeout)
+        else:
+            self._socket = socket.socket(socket.AF_UNIX)
+            self._socket.settimeout(timeout)
+            self._socket.connect(os.fspath(address))
+        self._file = self._socket.makefile('rb')
+        magic, length = HEADER.unpack(self._read(HEADER.size))
+        if magic != b'QPGH':
+            raise ValueError('not a QPolargraph sample stream')
+        self.header = json.loads(self._read(length))
+        self.fields = tuple(self.header['fields'])
+        self._dtype = np.dtype(self.header['dtype'])
+        self._expected = None
+        self.missed = 0
+
+    def __enter__(self) -> SampleSubscriber:
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def _read(self, n: int) -> bytes:
+        data = self._file.read(n)
+        if len(data) < n:
+            raise EOFError('sample stream closed')
+        return data
+
+    def receive(self) -> tuple[int, np.ndarray]:
+        '''Return the next ``(sequence, batch)`` pair.
+
+        Raises
+        ------
+        EOFError
+            If the publisher has closed the stream.
+        '''
+        magic, rows, sequence = FRAME.unpack(self._read(FRAME.size))
+        if magic != b'QPGD':
+            raise ValueError('corrupt sample stream')
+        size = rows * len(self.fields) * self._dtype.itemsize
+        batch = np.frombuffer(self._read(size), dtype=self._dtype)
+        if self._expected is not None:
+            self.missed += sequence - self._expected
+        self._expected = sequence + 1
+        return sequence, batch.reshape(rows, len(self.fields))
+
+    def __iter__(self) -> Iterator[tuple[int, np.ndarray]]:
+        while True:
+            try:
+                yield self.receive()
+            except EOFError:
+                return
+
+    def close(self) -> None:
+        '''Disconnect from the publisher.'''
+        self._file.close()
+        self._socket.close()
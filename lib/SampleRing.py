@@ -0,0 +1,342 @@
+from __future__ import annotations
+
+from collections.abc import Mapping, Sequence
+from multiprocessing import resource_tracker, shared_memory
+import json
+import sys
+import threading
+import numpy as np
+import numpy.typing as npt
+from qtpy import QtCore
+
+
+#: Bytes reserved at the start of the block for the ring's header.
+HEADER_SIZE = 4096
+MAGIC = 0x51504752  # 'QPGR'
+
+# Serializes the resource tracker patch in _attach with block creation
+_tracker_lock = threading.Lock()
+
+
+def _attach(name: str) -> shared_memory.SharedMemory:
+    '''Open an existing block without taking ownership of it.'''
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name, track=False)
+    # Before Python 3.13 every process that opens a block registers it
+    # with its resource tracker, which unlinks the block when that
+    # process exits even though the writer still owns it.  Unregistering
+    # afterwards would also drop the writer's registration when the two
+    # share a tracker, so skip registration instead.  The patch is
+    # process-wide, so hold the lock that block creation also takes.
+    with _tracker_lock:
+        register = resource_tracker.register
+        resource_tracker.register = lambda name, rtype: None
+        try:
+            return shared_memory.SharedMemory(name)
+        finally:
+            resource_tracker.register = register
+
+
+class _RingView:
+
+    '''Header and data arrays of a ring buffer in shared memory.
+
+    The header holds five ``int64`` values: a magic number, the
+    capacity in rows, the number of columns, the total number of rows
+    written, and the total number of rows being written, followed by
+    the length of the field names as JSON and the JSON itself.  The
+    data are a ``(capacity, columns)`` ``float64`` array.
+    '''
+
+    def __init__(self, shm: shared_memory.SharedMemory) -> None:
+        self.shm = shm
+        self.header = np.ndarray(5, dtype=np.int64, buffer=shm.buf)
+        if self.header[0] != MAGIC:
+            raise ValueError(f'{shm.name!r} is not a sample ring')
+        capacity, columns = int(self.header[1]), int(self.header[2])
+        size = int.from_bytes(shm.buf[40:44], 'little')
+        self.fields = tuple(json.loads(bytes(shm.buf[44:44 + size])))
+        self.data = np.ndarray((capacity, columns), dtype=np.float64,
+                               buffer=shm.buf, offset=HEADER_SIZE)
+
+    @property
+    def name(self) -> str:
+        '''Name of the shared memory block.'''
+        return self.shm.name
+
+    @property
+    def capacity(self) -> int:
+        '''Number of rows the ring holds.'''
+        return len(self.data)
+
+    @property
+    def written(self) -> int:
+        '''Total number of rows written so far.'''
+        return int(self.header[3])
+
+    def close(self) -> None:
+        '''Release this process's mapping of the block.'''
+        self.header = self.data = None
+        self.shm.close()
+
+
+class SampleRing(_RingView):
+
+    '''Ring buffer of scan samples in shared memory.
+
+    The scan thread writes rows into a
+    :class:`multiprocessing.shared_memory.SharedMemory` block, and
+    worker processes read them with :class:`SampleRingReader`, so the
+    samples reach other cores without being pickled or copied through
+    a pipe::
+
+        ring = SampleRing(fields=('t', 'x', 'y', *pattern.fields))
+        ring.attach(pattern)
+        pool.submit(grid_worker, ring.name)
+
+    Rows are ``(t, x, y, *fields)`` in ``float64``.  Every row has a
+    sequence number, its index in the stream of all rows written.  The
+    ring keeps the most recent ``capacity`` rows; older rows are
+    overwritten without waiting for readers, so the scan never stalls.
+
+    There is one writer per ring.  The writer owns the block: call
+    :meth:`unlink` when every process is done with it.
+
+    Parameters
+    ----------
+    fields : sequence of str, optional
+        Column names.  Default: ``('t', 'x', 'y')``.
+    capacity : int, optional
+        Number of rows the ring holds.  Default: 65536.
+    name : str, optional
+        Name of the shared memory block.  Default: chosen by the
+        system.
+
+    Properties
+    ----------
+    name : str
+        Name of the shared memory block, for readers.
+    fields : tuple of str
+        Column names.
+    capacity : int
+        Number of rows the ring holds.
+    written : int
+        Total number of rows written, which is also the sequence
+        number of the next row.
+
+    Methods
+    -------
+    write(rows)
+        Write one row or a block of rows.
+    append(row)
+        Write one row from a mapping of field name to value.
+    attach(pattern)
+        Write the samples that a scan pattern records.
+    detach()
+        Stop writing the attached pattern's samples.
+    close()
+        Detach and release the writer's mapping.
+    unlink()
+        Destroy the shared memory block.
+    '''
+
+    def __init__(self,
+                 fields: Sequence[str] = ('t', 'x', 'y'),
+                 capacity: int = 65536,
+                 name: str | None = None) -> None:
+        fields = tuple(fields)
+        info = json.dumps(fields).encode()
+        if 44 + len(info) > HEADER_SIZE:
+            raise ValueError('too many fields')
+        capacity = max(int(capacity), 1)
+        size = HEADER_SIZE + 8 * capacity * len(fields)
+        with _tracker_lock:
+            shm = shared_memory.SharedMemory(name, create=True, size=size)
+        header = np.ndarray(5, dtype=np.int64, buffer=shm.buf)
+        header[:] = (MAGIC, capacity, len(fields), 0, 0)
+        shm.buf[40:44] = len(info).to_bytes(4, 'little')
+        shm.buf[44:44 + len(info)] = info
+        del header
+        super().__init__(shm)
+        self._pattern = None
+        self._order = None
+
+    def __enter__(self) -> SampleRing:
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+        self.unlink()
+
+    def write(self, rows: npt.ArrayLike) -> None:
+        '''Write one row or a block of rows.
+
+        Parameters
+        ----------
+        rows : array-like
+            A row of ``len(fields)`` values, or an array of rows.
+        '''
+        rows = np.atleast_2d(np.asarray(rows, dtype=np.float64))
+        capacity = self.capacity
+        written = self.written
+        if len(rows) > capacity:
+            written += len(rows) - capacity
+            rows = rows[-capacity:]
+        # Claim the slots before overwriting them, so that readers can
+        # tell which rows they copied may be torn, and publish the new
+        # rows only once they are in place.
+        self.header[4] = written + len(rows)
+        start = written % capacity
+        n = min(len(rows), capacity - start)
+        self.data[start:start + n] = rows[:n]
+        self.data[:len(rows) - n] = rows[n:]
+        self.header[3] = written + len(rows)
+
+    def append(self, row: Mapping[str, float]) -> None:
+        '''Write one row.
+
+        Connects directly to :attr:`QPolargraph.QScanner.QScanner.dataReady`.
+
+        Parameters
+        ----------
+        row : mapping
+            Field name to value.  Missing fields are written as ``NaN``.
+        '''
+        self.write([row.get(name, np.nan) for name in self.fields])
+
+    def attach(self, pattern) -> None:
+        '''Write the samples that *pattern* records while SCANNING.
+
+        Samples are written directly in the thread that runs the scan.
+
+        Parameters
+        ----------
+        pattern : QScanPattern
+            Scan pattern whose :attr:`dataReady` arrays to write.
+        '''
+        self.detach()
+        names = ('x', 'y', 't', *pattern.fields)
+        self._order = [names.index(f) if f in names else None
+                       for f in self.fields]
+        pattern.dataReady.connect(self._onDataReady,
+                                  QtCore.Qt.ConnectionType.DirectConnection)
+        self._pattern = pattern
+
+    def detach(self) -> None:
+        '''Stop writing the attached pattern's samples.'''
+        if self._pattern is None:
+            return
+        self._pattern.dataReady.disconnect(self._onDataReady)
+        self._pattern = None
+
+    def _onDataReady(self, data: np.ndarray) -> None:
+        if self._pattern.scanning():
+            self.write([np.nan if n is None else data[n]
+                        for n in self._order])
+
+    def close(self) -> None:
+        '''Detach and release the writer's mapping.'''
+        self.detach()
+        super().close()
+
+    def unlink(self) -> None:
+        '''Destroy the shared memory block.'''
+        self.shm.unlink()
+
+
+class SampleRingReader(_RingView):
+
+    '''Read the samples of a :class:`SampleRing` from any process.
+
+    Each reader keeps its own position in the stream.  :meth:`read`
+    returns the rows written since the last call, with the sequence
+    number of the first one.  A reader that falls more than
+    :attr:`capacity` rows behind has been overrun: the rows it missed
+    are skipped and counted in :attr:`lost`, and reading continues
+    with the oldest row still in the ring.
+
+    Parameters
+    ----------
+    name : str
+        Name of the ring's shared memory block.
+    start : int, optional
+        Sequence number to start reading from.  Default: the next row
+        written.  Pass 0 to start with the oldest row available.
+
+    Properties
+    ----------
+    position : int
+        Sequence number of the next row to read.
+    lost : int
+        Number of rows overwritten before they were read.
+    available : int
+        Number of rows waiting to be read.
+
+    Methods
+    -------
+    read(limit=None)
+        Return ``(sequence, rows)`` for the rows not yet read.
+    columns(rows)
+        Split rows into a mapping of field name to column.
+    close()
+        Release this process's mapping of the block.
+    '''
+
+    def __init__(self, name: str, start: int | None = None) -> None:
+        super().__init__(_attach(name))
+        self.position = self.written if start is None else int(start)
+        self.lost = 0
+
+    def __enter__(self) -> SampleRingReader:
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    @property
+    def available(self) -> int:
+        '''Number of rows waiting to be read.'''
+        return min(self.written - self.position, self.capacity)
+
+    def _skip(self, oldest: int) -> None:
+        if self.position < oldest:
+            self.lost += oldest - self.position
+            self.position = oldest
+
+    def read(self, limit: int | None = None) -> tuple[int, np.ndarray]:
+        '''Return the rows written since the last read.
+
+        Parameters
+        ----------
+        limit : int, optional
+            Largest number of rows to return.  Default: all available.
+
+        Returns
+        -------
+        sequence : int
+            Sequence number of the first row returned.
+        rows : numpy.ndarray
+            ``(n, len(fields))`` copy of the rows.
+        '''
+        capacity = self.capacity
+        written = self.written
+        self._skip(written - capacity)
+        n = written - self.position
+        if limit is not None:
+            n = min(n, int(limit))
+        start = self.position % capacity
+        index = (start + np.arange(n)) % capacity
+        rows = self.data[index]
+        # Rows overwritten while they were being copied are lost too
+        overwritten = int(self.header[4]) - capacity - self.position
+        if overwritten > 0:
+            rows = rows[overwritten:]
+            self.lost += min(overwritten, n)
+            self.position += min(overwritten, n)
+        sequence = self.position
+        self.position += len(rows)
+        return sequence, rows
+
+    def columns(self, rows: np.ndarray) -> dict[str, np.ndarray]:
+        '''Split *rows* into a mapping of field name to column.'''
+        return dict(zip(self.fields, rows.T))
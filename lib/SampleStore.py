@@ -0,0 +1,171 @@
+from __future__ import annotations
+
+from collections.abc import Mapping, Sequence
+import numpy as np
+import numpy.typing as npt
+
+
+class SampleStore:
+
+    '''Growable, column-oriented store for scan samples.
+
+    Holds one record per sample in a NumPy structured array whose
+    capacity doubles as needed, so appending is amortised O(1) and the
+    stored data can be read back as contiguous arrays without copying.
+    Every field is stored as ``float64``.  Fields are named by the
+    ``fields`` argument or, if none are declared, by the records as
+    they arrive: a record that introduces a new field adds a column
+    whose earlier values are NaN, and fields missing from a record are
+    stored as NaN.
+
+    Rows emitted by :attr:`QPolargraph.QScanner.QScanner.dataReady`
+    can be stored directly::
+
+        store = SampleStore()
+        scanner.dataReady.connect(store.append)
+        # after scan:
+        x, y = store['x'], store['y']
+
+    Parameters
+    ----------
+    fields : sequence of str, optional
+        Field names.  Declared fields are kept by :meth:`clear`.
+        Default: inferred from the records.
+    capacity : int, optional
+        Initial number of records to allocate.  Default: 1024.
+
+    Properties
+    ----------
+    fields : tuple of str
+        Names of the stored fields.  Empty until the first record
+        arrives if ``fields`` was not given.
+    dtype : numpy.dtype or None
+        Structured dtype of the records.
+
+    Methods
+    -------
+    append(row)
+        Add one record from a mapping of field name to value.
+    extend(columns)
+        Add many records from a mapping of field name to array.
+    asarray()
+        Return the stored records as a structured array view.
+    clear()
+        Discard all records and any inferred fields.
+    '''
+
+    def __init__(self,
+                 fields: Sequence[str] | None = None,
+                 capacity: int = 1024) -> None:
+        self._capacity = max(int(capacity), 1)
+        self._declared = None if fields is None else tuple(fields)
+        self.clear()
+
+    def _allocate(self, names: Sequence[str]) -> None:
+        dtype = np.dtype([(name, np.float64) for name in names])
+        self._data = np.empty(self._capacity, dtype=dtype)
+
+    def _include(self, names: Sequence[str]) -> None:
+        '''Add columns for any *names* not yet stored.'''
+        if self._data is None:
+            self._allocate(names)
+            return
+        new = [name for name in names if name not in self.fields]
+        if not new:
+            return
+        old = self._data
+        dtype = np.dtype([(name, np.float64)
+                          for name in (*old.dtype.names, *new)])
+        self._data = np.full(len(old), np.nan, dtype=dtype)
+        for name in old.dtype.names:
+            self._data[name][:self._size] = old[name][:self._size]
+
+    def _reserve(self, n: int) -> None:
+        '''Ensure room for *n* more records, doubling capacity as needed.'''
+        needed = self._size + n
+        if needed <= len(self._data):
+            return
+        capacity = max(2 * len(self._data), needed)
+        data = np.empty(capacity, dtype=self._data.dtype)
+        data[:self._size] = self._data[:self._size]
+        self._data = data
+
+    @property
+    def fields(self) -> tuple[str, ...]:
+        '''Names of the stored fields.'''
+        if self._data is None:
+            return ()
+        return self._data.dtype.names
+
+    @property
+    def dtype(self) -> np.dtype | None:
+        '''Structured dtype of the stored records.'''
+        return None if self._data is None else self._data.dtype
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        '''Return a read-only view of the named column.'''
+        if self._data is None:
+            raise KeyError(name)
+        column = self._data[name][:self._size]
+        column.flags.writeable = False
+        return column
+
+    def append(self, row: Mapping[str, float]) -> None:
+        '''Add one record.
+
+        Parameters
+        ----------
+        row : mapping
+            Field name to scalar value.  Undeclared fields are ignored
+            if fields were declared, and otherwise added as columns.
+        '''
+        if self._declared is None:
+            self._include(tuple(row))
+        self._reserve(1)
+        record = self._data[self._size]
+        for name in self.fields:
+            record[name] = row.get(name, np.nan)
+        self._size += 1
+
+    def extend(self, columns: Mapping[str, npt.ArrayLike]) -> None:
+        '''Add a block of records.
+
+        Parameters
+        ----------
+        columns : mapping
+            Field name to 1-D array.  All arrays must have the same
+            length.
+        '''
+        columns = {name: np.atleast_1d(value)
+                   for name, value in columns.items()}
+        if not columns:
+            return
+        if self._declared is None:
+            self._include(tuple(columns))
+        n = len(next(iter(columns.values())))
+        self._reserve(n)
+        block = self._data[self._size:self._size + n]
+        for name in self.fields:
+            block[name] = columns.get(name, np.nan)
+        self._size += n
+
+    def asarray(self) -> np.ndarray:
+        '''Return the stored records as a structured array view.'''
+        if self._data is None:
+            return np.empty(0)
+        return self._data[:self._size]
+
+    def clear(self) -> None:
+        '''Discard all records and any fields inferred from them.
+
+        Declared fields are kept, so that a store declared for a scan
+        keeps its layout; otherwise the next record sets the layout
+        afresh.
+        '''
+        self._size = 0
+        self._data = None
+        if self._declared is not None:
+            self._allocate(self._declared)
@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+from collections.abc import Sequence
+from pathlib import Path
+import sys
+import numpy as np
+import numpy.typing as npt
+
+
+class SampleWriter:
+
+    '''Stream scan samples to a CSV file.
+
+    Each sample is one row of numbers, for example an array emitted by
+    :attr:`~QPolargraph.patterns.QScanPattern.QScanPattern.dataReady`.
+    Rows are buffered and written in chunks, so the cost per sample is
+    one list append; a crash loses at most one chunk.  Values are
+    written with 10 significant digits, except for a ``t`` column,
+    which is written with microsecond resolution so that monotonic
+    timestamps keep their precision however long the host has run.  The first line
+    of the file names the columns, so the result can be read back
+    with::
+
+        data = np.genfromtxt(path, delimiter=',', names=True)
+
+    Parameters
+    ----------
+    path : str or pathlib.Path
+        Output file, or ``'-'`` for standard output.
+    fields : sequence of str, optional
+        Column names.  Default: ``('x', 'y', 't')``.
+    chunk : int, optional
+        Number of rows buffered between writes.  Default: 1024.
+
+    Properties
+    ----------
+    count : int
+        Number of rows received.
+
+    Methods
+    -------
+    write(row)
+        Add one row.
+    flush()
+        Write buffered rows to the file.
+    close()
+        Flush and close the file.
+    '''
+
+    def __init__(self,
+                 path: str | Path,
+                 fields: Sequence[str] = ('x', 'y', 't'),
+                 chunk: int = 1024) -> None:
+        self.fields = tuple(fields)
+        self.chunk = max(int(chunk), 1)
+        self._count = 0
+        self._buffer = []
+        self._formats = ['%.6f' if name == 't' else '%.10g'
+                         for name in self.fields]
+        if str(path) == '-':
+            self._file = sys.stdout
+            self._owned = False
+        else:
+            path = Path(path).expanduser()
+            path.parent.mkdir(parents=True, exist_ok=True)
+            self._file = open(path, 'w')
+            self._owned = True
+        self._file.write(','.join(self.fields) + '\n')
+
+    def __enter__(self) -> SampleWriter:
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    @property
+    def count(self) -> int:
+        '''Number of rows received.'''
+        return self._count
+
+    def write(self, row: npt.ArrayLike) -> None:
+        '''Add one row.
+
+        Parameters
+        ----------
+        row : array-like
+            One value for each of :attr:`fields`.
+        '''
+        self._buffer.append(row)
+        self._count += 1
+        if len(self._buffer) >= self.chunk:
+            self.flush()
+
+    def flush(self) -> None:
+        '''Write buffered rows to the file.'''
+        if self._buffer:
+            rows = np.asarray(self._buffer, dtype=float)
+            np.savetxt(self._file, rows[:, :len(self.fields)],
+                       delimiter=',', fmt=self._formats)
+            self._buffer = []
+        self._file.flush()
+
+    def close(self) -> None:
+        '''Flush and close the file.'''
+        if self._file is None:
+            return
+        self.flush()
+        if self._owned:
+            self._file.close()
+        self._file = None
@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+from pathlib import Path
+import json
+import os
+import time
+import logging
+
+
+logger = logging.getLogger(__name__)
+
+
+class ScanJournal:
+
+    '''Small on-disk checkpoint of a running scan.
+
+    Pause and resume keep the remaining trajectory only in memory, so a
+    crash, a lost USB connection, or a power cut ends the scan.  A
+    journal assigned to
+    :attr:`~QPolargraph.patterns.QScanPattern.QScanPattern.journal`
+    records the scan's trajectory, the index of the last waypoint
+    reached, the scan geometry, and the polargraph's step indexes, so
+    that
+    :meth:`~QPolargraph.patterns.QScanPattern.QScanPattern.resumeFromCheckpoint`
+    can carry on from that waypoint.
+
+    Checkpoints are JSON files.  Each one is written to a temporary
+    file, flushed to disk, and renamed over the previous checkpoint, so
+    the journal always holds a complete record even if the process dies
+    while writing.  Routine checkpoints are written at most once per
+    :attr:`interval` to keep disk traffic low; pausing forces a write.
+
+    Parameters
+    ----------
+    path : str or pathlib.Path
+        Checkpoint file.
+    interval : float, optional
+        Minimum time between routine checkpoints [s].  Default: 5.
+
+    Methods
+    -------
+    due()
+        Return ``True`` if a routine checkpoint is due.
+    record(state, force=False)
+        Write *state* if a checkpoint is due.
+    load()
+        Return the last checkpoint.
+    exists()
+        Return ``True`` if a checkpoint is on disk.
+    clear()
+        Delete the checkpoint.
+    '''
+
+    def __init__(self, path: str | Path, interval: float = 5.) -> None:
+        self.path = Path(path).expanduser()
+        self.interval = float(interval)
+        self._last = -float('inf')
+
+    def due(self) -> bool:
+        '''Return ``True`` if :attr:`interval` has passed since the last write.
+
+        Lets callers skip gathering a state that :meth:`record` would
+        not write.
+        '''
+        return time.monotonic() - self._last >= self.interval
+
+    def record(self, state: dict, force: bool = False) -> bool:
+        '''Write a checkpoint if one is due.
+
+        Parameters
+        ----------
+        state : dict
+            JSON-serializable scan state.
+        force : bool, optional
+            If ``True``, write regardless of :attr:`interval`.
+            Default: ``False``.
+
+        Returns
+        -------
+        bool
+            ``True`` if the checkpoint was written.
+        '''
+        if not (force or self.due()):
+            return False
+        now = time.monotonic()
+        tmp = self.path.with_name(self.path.name + '.tmp')
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(tmp, 'w') as f:
+                json.dump(state, f)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp, self.path)
+        except OSError as ex:
+            logger.warning(f'Could not write checkpoint {self.path}: {ex}')
+            return False
+        self._last = now
+        return True
+
+    def load(self) -> dict:
+        '''Return the last checkpoint.
+
+        Raises
+        ------
+        FileNotFoundError
+            If there is no checkpoint.
+        '''
+        with open(self.path) as f:
+            return json.load(f)
+
+    def exists(self) -> bool:
+        '''Return ``True`` if a checkpoint is on disk.'''
+        return self.path.exists()
+
+    def clear(self) -> None:
+        '''Delete the checkpoint.'''
+        self._last = -float('inf')
+        self.path.unlink(missing_ok=True)
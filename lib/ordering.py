@@ -0,0 +1,277 @@
+'''Visit ordering for scan waypoints in motor-time units.
+
+A polargraph moves between two points in the time its busier motor
+needs to cover its step count, including the AccelStepper acceleration
+ramps, not in a time proportional to the Cartesian distance.  Moves
+that change both belt lengths equally are no faster than moves that
+change only one.  :class:`MotorMetric` measures the cost of a move in
+those units, and :func:`nearest_neighbour` and :func:`two_opt` build
+and refine a visiting order under any such metric::
+
+    metric = MotorMetric(polargraph)
+    order = nearest_neighbour(points, metric, start=home)
+    order = two_opt(points, order, metric, start=home)
+    tour = points[order]
+
+All functions accept any callable ``metric(p, q)`` that returns the
+elementwise cost of moving between the points in two ``(..., 2)``
+arrays, so they can be used with a Euclidean metric as well.
+
+:class:`MotorMetric` is defined in
+:mod:`QPolargraph.geometry.PolargraphGeometry`, so that the geometry
+does not depend on this module, and is re-exported here.
+'''
+
+from __future__ import annotations
+
+from collections.abc import Callable
+import numpy as np
+import numpy.typing as npt
+from QPolargraph.geometry.PolargraphGeometry import (  # noqa: F401
+    MotorMetric)
+
+
+Metric = Callable[[np.ndarray, np.ndarray], np.ndarray]
+
+
+def euclidean(p: npt.ArrayLike, q: npt.ArrayLike) -> np.ndarray:
+    '''Elementwise Cartesian distance between *p* and *q* [m].'''
+    d = np.asarray(q, dtype=float) - np.asarray(p, dtype=float)
+    return np.hypot(d[..., 0], d[..., 1])
+
+
+def path_cost(points: npt.ArrayLike, order: npt.ArrayLike,
+              metric: Metric, start: npt.ArrayLike | None = None) -> float:
+    '''Total cost of visiting *points* in *order*.
+
+    Parameters
+    ----------
+    points : array-like
+        ``(n, 2)`` points [m].
+    order : array-like
+        Visiting order, as indexes into *points*.
+    metric : callable
+        Elementwise cost ``metric(p, q)``.
+    start : array-like, optional
+        ``(x, y)`` position before the first point.  Default: the
+        first point in *order*.
+
+    Returns
+    -------
+    float
+        Sum of the costs of successive moves.
+    '''
+    path = np.asarray(points, dtype=float)[np.asarray(order)]
+    if start is not None:
+        path = np.vstack([np.asarray(start, dtype=float)[None, :], path])
+    if len(path) < 2:
+        return 0.
+    return float(np.sum(metric(path[:-1], path[1:])))
+
+
+def nearest_neighbour(points: npt.ArrayLike, metric: Metric,
+                      start: npt.ArrayLike | None = None) -> np.ndarray:
+    '''Greedy visiting order: always move to the cheapest unvisited point.
+
+    Each step evaluates the metric from the current point to all
+    remaining points at once, so the cost is O(n²) metric evaluations
+    but only O(n) memory.
+
+    Parameters
+    ----------
+    points : array-like
+        ``(n, 2)`` points [m].
+    metric : callable
+        Elementwise cost ``metric(p, q)``.
+    start : array-like, optional
+        ``(x, y)`` starting position.  Default: the first point.
+
+    Returns
+    -------
+    numpy.ndarray
+        Visiting order, as indexes into *points*.
+    '''
+    points = np.asarray(points, dtype=float)
+    n = len(points)
+    if n == 0:
+        return np.empty(0, dtype=int)
+    remaining = np.ones(n, dtype=bool)
+    order = np.empty(n, dtype=int)
+    if start is None:
+        current = points[0]
+        order[0] = 0
+        remaining[0] = False
+        first = 1
+    else:
+        current = np.asarray(start, dtype=float)
+        first = 0
+    for k in range(first, n):
+        candidates = np.flatnonzero(remaining)
+        cost = metric(current[None, :], points[candidates])
+        best = candidates[np.argmin(cost)]
+        order[k] = best
+        remaining[best] = False
+        current = points[best]
+    return order
+
+
+def two_opt(points: npt.ArrayLike, order: npt.ArrayLike, metric: Metric,
+            start: npt.ArrayLike | None = None,
+            window: int | None = None,
+            maxpasses: int = 20) -> np.ndarray:
+    '''Improve an open visiting path by 2-opt segment reversals.
+
+    Reversing the segment between two edges replaces edges ``(a, b)``
+    and ``(c, d)`` with ``(a, c)`` and ``(b, d)``.  For each first edge
+    the gain of every candidate second edge is evaluated at once, and
+    the best improving reversal is applied.  Passes repeat until no
+    reversal helps.  The metric is assumed to be symmetric.
+
+    Parameters
+    ----------
+    points : array-like
+        ``(n, 2)`` points [m].
+    order : array-like
+        Initial visiting order, as indexes into *points*.
+    metric : callable
+        Elementwise cost ``metric(p, q)``.
+    start : array-like, optional
+        Fixed ``(x, y)`` position before the first point.  If omitted,
+        the first point of *order* stays first.
+    window : int, optional
+        Only consider second edges at most this many positions after
+        the first.  Limits each pass to O(n × window) evaluations for
+        large point sets.  Default: no limit.
+    maxpasses : int, optional
+        Maximum number of passes.  Default: 20.
+
+    Returns
+    -------
+    numpy.ndarray
+        Improved visiting order.
+    '''
+    points = np.asarray(points, dtype=float)
+    order = np.array(order, dtype=int)
+    if start is None:
+        path = points[order]
+        offset = 0
+    else:
+        path = np.vstack([np.asarray(start, dtype=float)[None, :],
+                          points[order]])
+        offset = 1
+    idx = np.concatenate([[-1] * offset, order]).astype(int)
+    n = len(path)
+    if n < 3:
+        return order
+    span = n if window is None else max(int(window), 2)
+    for _ in range(maxpasses):
+        improved = False
+        for i in range(n - 2):
+            j = np.arange(i + 2, min(n, i + 1 + span))
+            if j.size == 0:
+                continue
+            a, b = path[i], path[i + 1]
+            c = path[j]
+            last = j == n - 1
+            d = path[np.minimum(j + 1, n - 1)]
+            old = metric(a, b) + np.where(last, 0., metric(c, d))
+            new = metric(a[None, :], c) + np.where(last, 0.,
+                                                   metric(b[None, :], d))
+            gain = old - new
+            k = np.argmax(gain)
+            if gain[k] > 1e-12 * max(float(old[k]), 1.):
+                jk = j[k]
+                path[i + 1:jk + 1] = path[i + 1:jk + 1][::-1].copy()
+                idx[i + 1:jk + 1] = idx[i + 1:jk + 1][::-1].copy()
+                improved = True
+        if not improved:
+            break
+    return idx[offset:]
+
+
+def order_segments(segments, metric: Metric,
+                   start: npt.ArrayLike | None = None,
+                   maxpasses: int = 20) -> tuple[np.ndarray, np.ndarray]:
+    '''Order and orient path segments to minimize the connecting moves.
+
+    Each segment is a sequence of waypoints that must be traversed in
+    one piece, in either direction.  Only the moves that connect the
+    end of one segment to the start of the next depend on the order, so
+    those are minimized.  The costs between all segment endpoints are
+    evaluated once as a matrix.  A greedy pass then picks the cheapest
+    next entry point, and 2-opt reversals of runs of segments refine
+    the result.  The metric is assumed to be symmetric.
+
+    Parameters
+    ----------
+    segments : sequence of array-like
+        Segments as ``(npoints, 2)`` arrays of ``(x, y)`` waypoints [m].
+    metric : callable
+        Elementwise cost ``metric(p, q)``.  If it has a ``matrix``
+        method, such as :class:`MotorMetric`, that is used for the
+        endpoint cost matrix.
+    start : array-like, optional
+        ``(x, y)`` position before the first segment.  Default: the
+        first segment may start anywhere at no cost.
+    maxpasses : int, optional
+        Maximum number of 2-opt passes.  Default: 20.
+
+    Returns
+    -------
+    order : numpy.ndarray
+        Segment indexes in visiting order.
+    flipped : numpy.ndarray
+        ``True`` for each segment, in visiting order, that is traversed
+        in reverse.
+    '''
+    ends = np.array([[np.asarray(s, dtype=float)[0],
+                      np.asarray(s, dtype=float)[-1]] for s in segments])
+    k = len(ends)
+    if k == 0:
+        return np.empty(0, dtype=int), np.empty(0, dtype=bool)
+    pts = ends.reshape(-1, 2)
+    if hasattr(metric, 'matrix'):
+        cost = metric.matrix(pts)
+    else:
+        cost = metric(pts[:, None, :], pts[None, :, :])
+    # Row 2k is the start position
+    c0 = (np.zeros(2 * k) if start is None else
+          metric(np.asarray(start, dtype=float)[None, :], pts))
+    cost = np.vstack([cost, c0])
+    cost = np.hstack([cost, np.zeros((2 * k + 1, 1))])
+    origin = 2 * k
+
+    # Greedy: endpoint 2i enters segment i forwards, 2i + 1 in reverse
+    entry = np.empty(k, dtype=int)
+    free = np.ones(2 * k, dtype=bool)
+    here = origin
+    for n in range(k):
+        candidates = np.flatnonzero(free)
+        e = candidates[np.argmin(cost[here, candidates])]
+        entry[n] = e
+        free[[e, e ^ 1]] = False
+        here = e ^ 1
+    exit_ = entry ^ 1
+
+    # 2-opt: reverse entry[i+1..j], flipping each segment in the run
+    for _ in range(maxpasses):
+        improved = False
+        for i in range(-1, k - 1):
+            prev = origin if i < 0 else exit_[i]
+            j = np.arange(i + 1, k)
+            nxt = np.append(entry[1:], origin)[j]
+            tail = np.where(j == k - 1, 0., cost[exit_[j], nxt])
+            new_tail = np.where(j == k - 1, 0., cost[entry[i + 1], nxt])
+            old = cost[prev, entry[i + 1]] + tail
+            new = cost[prev, exit_[j]] + new_tail
+            gain = old - new
+            m = np.argmax(gain)
+            if gain[m] > 1e-12 * max(float(old[m]), 1.):
+                jm = j[m]
+                run = slice(i + 1, jm + 1)
+                entry[run], exit_[run] = (exit_[run][::-1].copy(),
+                                          entry[run][::-1].copy())
+                improved = True
+        if not improved:
+            break
+    return entry // 2, (entry % 2).astype(bool)
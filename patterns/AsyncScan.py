@@ -0,0 +1,278 @@
+from __future__ import annotations
+
+import asyncio
+import time
+import numpy as np
+import numpy.typing as npt
+from qtpy import QtCore
+from QPolargraph.patterns.QScanPattern import QScanPattern, ScanState
+
+
+class _ScanThread(QtCore.QThread):
+
+    '''Thread that calls *target* instead of running an event loop.'''
+
+    def __init__(self, target) -> None:
+        super().__init__()
+        self._target = target
+
+    def run(self) -> None:
+        self._target()
+
+
+class AsyncScan:
+
+    '''Run a scan from asyncio and iterate over its samples.
+
+    :meth:`~QPolargraph.patterns.QScanPattern.QScanPattern.scan` blocks
+    until the scan is over and reports samples through Qt signals.  An
+    ``AsyncScan`` runs it on a ``QThread`` of its own, so the asyncio
+    event loop neither blocks nor runs a Qt event loop, and hands the
+    samples recorded while SCANNING to the event loop in batches::
+
+        async with scan_async(pattern) as scan:
+            async for batch in scan:
+                store.extend(dict(zip(['x', 'y', 't'], batch.T)))
+
+    Each batch is a ``(n, 3 + len(pattern.fields))`` array of the rows
+    that :attr:`~QPolargraph.patterns.QScanPattern.QScanPattern.dataReady`
+    would have emitted.  A batch is delivered when ``batch`` rows have
+    accumulated, or when a row arrives ``latency`` seconds or more after
+    the last delivery, so the cost of crossing threads is shared by many
+    samples.  Pending rows are also delivered whenever the pattern
+    reaches a waypoint, loses its link or changes state, so no row waits
+    past the end of the move that recorded it even when sampling stops,
+    for instance while a point scan dwells.  Iteration ends when the
+    pattern stops: IDLE after a complete or abandoned scan, or PAUSED.
+
+    Cancelling the task that is iterating, or leaving the ``async with``
+    block early, stops the pattern according to ``cancel``:
+    ``'abandon'`` stops the motors where they are, and ``'pause'``
+    keeps the remaining trajectory so that a later
+    ``scan_async(pattern, resume=True)`` can finish it.
+
+    The pattern and its polargraph must belong to the thread that runs
+    the asyncio event loop, and must not have a parent.  They are moved
+    to the scan thread while the scan runs, so that a serial port is
+    only used from the thread that owns it, and are moved back when it
+    stops.  They must not be driven from another thread in the
+    meantime.  Signal connections made by the facade are direct, so no
+    Qt event loop is needed at all.
+
+    Parameters
+    ----------
+    pattern : QScanPattern
+        Scan pattern to run.  It must be IDLE, or PAUSED if ``resume``
+        is ``True``.
+    vertices : array-like, optional
+        Waypoints to follow.  Default: the pattern's own plan.
+    batch : int, optional
+        Largest number of rows per batch.  Default: 256.
+    latency : float, optional
+        Longest time between deliveries while rows keep arriving [s].
+        Default: 0.1.
+    cancel : str, optional
+        ``'abandon'`` (default) or ``'pause'``.
+    resume : bool, optional
+        If ``True``, resume a paused scan instead of starting a new one.
+
+    Properties
+    ----------
+    state : ScanState
+        State of the pattern when the scan stopped, or ``None`` while
+        it runs.
+
+    Methods
+    -------
+    pause()
+        Pause the scan; iteration ends once the pattern has stopped.
+    abandon()
+        Abandon the scan; iteration ends once the pattern has stopped.
+    aclose()
+        Stop the scan according to ``cancel`` and wait for it.
+    '''
+
+    CANCEL_ACTIONS = ('abandon', 'pause')
+
+    def __init__(self,
+                 pattern: QScanPattern,
+                 vertices: npt.ArrayLike | None = None,
+                 batch: int = 256,
+                 latency: float = 0.1,
+                 cancel: str = 'abandon',
+                 resume: bool = False) -> None:
+        if cancel not in self.CANCEL_ACTIONS:
+            raise ValueError(f'cancel must be one of {self.CANCEL_ACTIONS}')
+        self.pattern = pattern
+        self.vertices = vertices
+        self.batch = max(int(batch), 1)
+        self.latency = float(latency)
+        self.cancel = cancel
+        self.resume = bool(resume)
+        self._state = None
+        self._queue = None
+        self._worker = None
+        self._thread = None
+        self._done = False
+        self._cancelled = False
+
+    @property
+    def state(self) -> ScanState | None:
+        '''State of the pattern when the scan stopped.'''
+        return self._state
+
+    def _start(self) -> None:
+        if self._worker is not None:
+            return
+        here = QtCore.QThread.currentThread()
+        objects = (self.pattern, self.pattern.polargraph)
+        for obj in objects:
+            if obj.thread() is not here or obj.parent() is not None:
+                raise RuntimeError(f'{type(obj).__name__} must belong to '
+                                   'the calling thread and have no parent')
+        loop = asyncio.get_running_loop()
+        self._queue = asyncio.Queue()
+        self._worker = loop.create_future()
+        self._thread = _ScanThread(lambda: self._run(loop, here))
+        for obj in objects:
+            obj.moveToThread(self._thread)
+        self._thread.start()
+
+    async def _join(self) -> None:
+        '''Wait for the scan thread to finish.'''
+        await asyncio.shield(self._worker)
+        self._thread.wait()
+
+    def _run(self, loop: asyncio.AbstractEventLoop,
+             home: QtCore.QThread) -> None:
+        '''Run the scan on the scan thread, then return the objects.'''
+        try:
+            self._scan(loop)
+        finally:
+            self.pattern.moveToThread(home)
+            self.pattern.polargraph.moveToThread(home)
+            loop.call_soon_threadsafe(self._worker.set_result, None)
+
+    def _scan(self, loop: asyncio.AbstractEventLoop) -> None:
+        pattern = self.pattern
+        rows = []
+        last = time.monotonic()
+
+        def post(item) -> None:
+            loop.call_soon_threadsafe(self._queue.put_nowait, item)
+
+        def flush() -> None:
+            nonlocal rows, last
+            if rows:
+                post(np.vstack(rows))
+                rows = []
+            last = time.monotonic()
+
+        def onData(data: np.ndarray) -> None:
+            if not pattern.scanning():
+                return
+            rows.append(data)
+            if (len(rows) >= self.batch or
+                    time.monotonic() - last >= self.latency):
+                flush()
+
+        def onState(state: ScanState) -> None:
+            self._state = state
+            flush()
+
+        def onStop(*args) -> None:
+            flush()
+
+        direct = QtCore.Qt.ConnectionType.DirectConnection
+        pattern.dataReady.connect(onData, direct)
+        pattern.stateChanged.connect(onState, direct)
+        pattern.vertexReached.connect(onStop, direct)
+        pattern.linkDown.connect(onStop, direct)
+        try:
+            if self._cancelled:
+                pass
+            elif self.resume:
+                pattern.resume()
+            else:
+                pattern.scan(self.vertices)
+        except Exception as ex:
+            flush()
+            post(ex)
+        else:
+            flush()
+            post(None)
+        finally:
+            pattern.dataReady.disconnect(onData)
+            pattern.stateChanged.disconnect(onState)
+            pattern.vertexReached.disconnect(onStop)
+            pattern.linkDown.disconnect(onStop)
+
+    def __aiter__(self) -> AsyncScan:
+        return self
+
+    async def __anext__(self) -> np.ndarray:
+        if self._done:
+            raise StopAsyncIteration
+        self._start()
+        try:
+            item = await self._queue.get()
+        except asyncio.CancelledError:
+            self._stop()
+            raise
+        if isinstance(item, np.ndarray):
+            return item
+        self._done = True
+        await self._join()
+        if isinstance(item, Exception):
+            raise item
+        raise StopAsyncIteration
+
+    async def __aenter__(self) -> AsyncScan:
+        self._start()
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await self.aclose()
+
+    def _stop(self) -> None:
+        # Also covers a worker that has not started the pattern yet
+        self._cancelled = True
+        if self.cancel == 'pause':
+            self.pause()
+        else:
+            self.abandon()
+
+    def pause(self) -> None:
+        '''Pause the scan at the end of the current move.'''
+        self.pattern.pause()
+
+    def abandon(self) -> None:
+        '''Abandon the scan.  The polargraph stops where it is.'''
+        self.pattern.abandon()
+
+    async def aclose(self) -> None:
+        '''Stop the scan according to ``cancel`` and wait for it.'''
+        if self._worker is None:
+            return
+        if not self._worker.done():
+            self._stop()
+        self._done = True
+        await self._join()
+
+
+def scan_async(pattern: QScanPattern, **kwargs) -> AsyncScan:
+    '''Run *pattern* from asyncio; see :class:`AsyncScan`.
+
+    Parameters
+    ----------
+    pattern : QScanPattern
+        Scan pattern to run.
+    **kwargs
+        Options of :class:`AsyncScan`.
+
+    Returns
+    -------
+    AsyncScan
+        Asynchronous iterator over batches of samples.
+    '''
+    return AsyncScan(pattern, **kwargs)
@@ -0,0 +1,219 @@
+'''PointScan — dwell-and-average scan over a grid of points.
+
+Continuous scans measure while the payload is moving.  Some
+measurements need the payload at rest: a point scan moves to each node
+of a regular grid, waits for vibrations to settle, averages several
+instrument reads, and moves on.
+
+Because every node is visited once and the time spent moving between
+nodes is dead time, the visiting order matters.  Nodes are ordered by
+a nearest-neighbour tour refined with 2-opt, with costs measured in
+motor time by
+:class:`~QPolargraph.geometry.PolargraphGeometry.MotorMetric` rather
+than by Cartesian distance.
+'''
+
+from __future__ import annotations
+
+from QPolargraph.patterns.QScanPattern import QScanPattern
+from QPolargraph.geometry.PointGeometry import PointGeometry
+import numpy as np
+import logging
+import time
+
+
+logger = logging.getLogger(__name__)
+
+
+class PointScan(QScanPattern):
+
+    '''Scan that stops at each grid point to take averaged readings.
+
+    Returns the grid nodes from
+    :meth:`~QPolargraph.QScanPattern.QScanPattern.vertices` in an
+    optimized visiting order computed by
+    :class:`~QPolargraph.geometry.PointGeometry.PointGeometry`.  While
+    SCANNING, position polls during moves are not sampled; instead,
+    each time the polargraph comes to rest on a node it waits
+    :attr:`dwell` seconds, calls
+    :meth:`~QPolargraph.QScanPattern.QScanPattern._onMeasure`
+    :attr:`averages` times, and emits one
+    :attr:`~QPolargraph.QScanPattern.QScanPattern.dataReady` array
+    with the mean reading.  Pausing, resuming, and abandoning work as
+    for continuous scans; a scan resumed after a pause re-visits the
+    node it was heading for.
+
+    Reads are taken inline even if an
+    :attr:`~QPolargraph.QScanPattern.QScanPattern.acquisition`
+    executor is set, because their mean is needed before moving on.
+
+    Parameters
+    ----------
+    dwell : float, optional
+        Settling time at each node before reading [s].  Default: 0.1.
+    averages : int, optional
+        Number of reads averaged at each node.  Default: 1.
+    window : int, optional
+        Search window of the 2-opt refinement; see
+        :func:`~QPolargraph.lib.ordering.two_opt`.  Default: 64.
+
+    Properties
+    ----------
+    fields : tuple of str
+        ``('I', 'Q')`` with a demodulator, otherwise ``('value',)``:
+        the mean of each read, averaged over the reads at a node.
+
+    Notes
+    -----
+    All parameters inherited from
+    :class:`~QPolargraph.QScanPattern.QScanPattern` are also accepted.
+    ``step`` sets the grid spacing and defaults to 20 mm.
+    ``sampleSpacing`` does not apply: point scans sample only at the
+    grid nodes.
+    '''
+
+    GEOMETRY = PointGeometry
+
+    JOURNAL_PROPERTIES = QScanPattern.JOURNAL_PROPERTIES + (
+        'dwell', 'averages', 'window')
+
+    def __init__(self, *args,
+                 dwell: float = 0.1,
+                 averages: int = 1,
+                 window: int = 64,
+                 **kwargs):
+        kwargs.setdefault('step', 20.)
+        super().__init__(*args, **kwargs)
+        self.dwell = dwell
+        self.averages = averages
+        self.window = window
+        self._tour_key = None
+        self._tour = None
+        self._revisit = True
+        self._complexReported = False
+
+    @property
+    def dwell(self) -> float:
+        '''Settling time at each node before reading [s].'''
+        return self._dwell
+
+    @dwell.setter
+    def dwell(self, value: float) -> None:
+        self._dwell = max(float(value), 0.)
+
+    @property
+    def averages(self) -> int:
+        '''Number of reads averaged at each node.'''
+        return self._averages
+
+    @averages.setter
+    def averages(self, value: int) -> None:
+        self._averages = max(int(value), 1)
+
+    @property
+    def sampleSpacing(self) -> float:
+        '''Always 0: point scans sample only at the grid nodes.'''
+        return 0.
+
+    @sampleSpacing.setter
+    def sampleSpacing(self, value: float) -> None:
+        pass
+
+    @property
+    def fields(self) -> tuple[str, ...]:
+        '''Names of the measurement values in :attr:`dataReady` arrays.'''
+        return super().fields or ('value',)
+
+    def points(self) -> np.ndarray:
+        '''Grid nodes covering the scan rectangle, in row order.
+
+        Returns
+        -------
+        numpy.ndarray
+            ``(npoints, 2)`` array of ``(x, y)`` nodes [m] spaced by
+            ``step``.
+        '''
+        return self.geometry.points()
+
+    def vertices(self) -> np.ndarray:
+        '''Grid nodes in visiting order.
+
+        The tour starts from the home position and is cached until the
+        scan geometry or the polargraph's motion parameters change.
+
+        Returns
+        -------
+        numpy.ndarray
+            ``(npoints, 2)`` array of ``(x, y)`` nodes [m].
+        '''
+        pg = self.polargraph
+        key = (tuple(self.rect), self.step, pg.ell, pg.y0, pg.speed,
+               tuple(np.asarray(pg.acceleration, dtype=float)), self.window)
+        if key != self._tour_key:
+            self._tour = self.geometry.vertices()
+            self._tour_key = key
+        return self._tour.copy()
+
+    def _scanFrom(self, vertices, first: int) -> None:
+        # A checkpoint records the last node measured, so only a scan
+        # that starts from the first node has an unmeasured start.
+        self._revisit = (first == 0)
+        self._complexReported = False
+        super()._scanFrom(vertices, first)
+
+    def _continueScan(self, remaining: list) -> None:
+        # The first node is reached while positioning; revisit it in
+        # place so that it is measured like the others.
+        if self._revisit:
+            here = np.asarray(self.polargraph.position[:2], dtype=float)
+            remaining = [here, *remaining]
+        super()._continueScan(remaining)
+
+    def _sample(self, t: float, x: float, y: float) -> None:
+        if not self.scanning():
+            super()._sample(t, x, y)
+
+    def _onVertex(self, t: float, x: float, y: float) -> bool | None:
+        '''Settle, average :attr:`averages` reads, and emit the result.
+
+        Returns ``False`` without reading if a pause or abandon request
+        arrives while settling, so that the node is measured on resume.
+        '''
+        if not self.scanning():
+            return None
+        if not self._waitUntil(time.monotonic() + self._dwell):
+            return False
+        times = np.empty(self._averages)
+        values = []
+        for k in range(self._averages):
+            times[k] = time.monotonic()
+            values.append(self._read(times[k], x, y))
+        value = np.nanmean(values) if np.isfinite(values).any() else np.nan
+        data = [x, y, float(times.mean())]
+        if self.demodulator is None:
+            data.append(value.real)
+        else:
+            data.extend([value.real, value.imag])
+        self.dataReady.emit(np.array(data))
+        return None
+
+    def _read(self, t: float, x: float, y: float) -> complex:
+        '''Take one read and reduce it to a scalar.
+
+        A complex read cannot be reported as ``value`` without a
+        :attr:`demodulator` to split it into ``I`` and ``Q``.  It is
+        reported as ``NaN``, and an error is logged once per scan.
+        '''
+        raw = self._onMeasure(t, x, y)
+        if raw is None:
+            return complex(np.nan, np.nan)
+        if self.demodulator is not None:
+            return self.demodulator.process(raw, t)
+        value = complex(np.mean(raw))
+        if value.imag != 0.:
+            if not self._complexReported:
+                logger.error(f'Complex read {value} without a '
+                             'demodulator: reporting NaN')
+                self._complexReported = True
+            return complex(np.nan, np.nan)
+        return value
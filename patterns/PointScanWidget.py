@@ -0,0 +1,39 @@
+from __future__ import annotations
+
+from QPolargraph.patterns.QScanPatternWidget import FieldSpec, QScanPatternWidget
+from QPolargraph.patterns.PointScan import PointScan
+
+
+class PointScanWidget(QScanPatternWidget):
+
+    '''Widget for controlling point scan parameters.
+
+    Extends :class:`~QPolargraph.QScanPatternWidget.QScanPatternWidget`
+    with spinboxes for the settling time and the number of averaged
+    reads at each grid point.  The sample-spacing field is omitted
+    because point scans sample only at the grid points.  The default
+    pattern is :class:`~QPolargraph.PointScan.PointScan`.
+    '''
+
+    _FIELD_SPECS = [
+        spec for spec in QScanPatternWidget._FIELD_SPECS
+        if spec.name != 'sampleSpacing'
+    ] + [
+        FieldSpec('dwell', 'dwell', ' s', 0.0, 10.0, 0.05, 0.1,
+                  tooltip='Settling time at each point before reading'),
+        FieldSpec('averages', 'N', '', 1, 1000, 1, 1, decimals=0,
+                  tooltip='Number of reads averaged at each point'),
+    ]
+
+    def __init__(self, *args, pattern=None, **kwargs):
+        super().__init__(*args, pattern=pattern, **kwargs)
+
+
+if __name__ == '__main__':
+    import sys
+    from qtpy import QtWidgets
+    from QPolargraph.hardware.fake import FakePolargraph
+    app = QtWidgets.QApplication.instance() or QtWidgets.QApplication(sys.argv)
+    w = PointScanWidget(pattern=PointScan(polargraph=FakePolargraph()))
+    w.show()
+    sys.exit(app.exec())
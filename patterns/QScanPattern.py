@@ -4,11 +4,18 @@ from typing import TYPE_CHECKING
 from qtpy import QtCore
 from qtpy.QtCore import QCoreApplication
 import numpy as np
+import numpy.typing as npt
 import time
 import logging
+from QPolargraph.lib.ArcSampler import ArcSampler
+from QPolargraph.lib.MotionWatchdog import MotionWatchdog
+from QPolargraph.geometry.ScanGeometry import ScanGeometry
 
 if TYPE_CHECKING:
     from QPolargraph.hardware.Polargraph import Polargraph
+    from QPolargraph.lib.AcquisitionExecutor import AcquisitionExecutor
+    from QPolargraph.lib.ScanJournal import ScanJournal
+    from QPolargraph.processing.LockIn import LockIn
 
 
 logger = logging.getLogger(__name__)
@@ -44,8 +51,11 @@ class QScanPattern(QtCore.QObject):
     '''Base class for polargraph scan-trajectory patterns.
 
     Manages the scan geometry and drives the polargraph through a
-    sequence of waypoints. Subclasses override :meth:`vertices` and
-    :meth:`trajectory` to define different scan patterns.
+    sequence of waypoints.  The waypoints are computed by a picklable
+    :class:`~QPolargraph.geometry.ScanGeometry.ScanGeometry`, named by
+    :attr:`GEOMETRY`; subclasses set :attr:`GEOMETRY` to define
+    different scan patterns, or override :meth:`vertices` and
+    :meth:`trajectory` directly.
 
     The motion controller is always in one of four states
     (:class:`ScanState`):
@@ -60,6 +70,11 @@ class QScanPattern(QtCore.QObject):
 
     Properties
     ----------
+    polargraph : Polargraph
+        Instrument driven by the pattern.  Assigning a new instrument,
+        for example when hardware is found after startup, also points
+        the :attr:`watchdog` at it.  Do not replace the instrument
+        while the pattern is :meth:`active`.
     width : float
         Horizontal extent of the scan area [m]. Default: 0.6.
     height : float
@@ -72,17 +87,104 @@ class QScanPattern(QtCore.QObject):
         position [m]. Default: 0.1.
     step : float
         Spacing between scan lines [mm]. Default: 5.
+    optimize : bool
+        If ``True``, :meth:`scan` follows :meth:`plan`, which reorders
+        and reverses the :meth:`segments` of the trajectory to minimize
+        the predicted motion time.  Default: ``False``.
+    nearestStart : bool
+        If ``True``, :meth:`plan` runs the trajectory backwards when its
+        last waypoint is closer in motor time to the starting position
+        than its first.  Default: ``False``.
+    geometry : ScanGeometry
+        Picklable snapshot of the scan geometry, for planning without
+        Qt.  Read-only.
+    returnHome : bool
+        If ``True``, the payload returns home after each scan.  Set to
+        ``False`` for back-to-back scans, which then start from where
+        the previous scan ended.  Default: ``True``.
+    sampleSpacing : float
+        Distance between samples along the scan path [mm].  When
+        positive, :attr:`dataReady` is emitted at equal arc-length
+        intervals while SCANNING instead of at every position poll;
+        see :class:`~QPolargraph.lib.ArcSampler.ArcSampler`.
+        Default: 0 (one sample per poll).
+    demodulator : LockIn or None
+        Optional pipeline stage that demodulates the raw samples
+        returned by :meth:`_onMeasure`.  When set, every
+        :attr:`dataReady` array carries the demodulated ``I`` and ``Q``
+        after the timestamp.  Default: ``None``.
+    fields : tuple of str
+        Names of the measurement values that follow ``(x, y, t)`` in
+        each :attr:`dataReady` array: ``('I', 'Q')`` with a
+        :attr:`demodulator`, otherwise empty.  Read-only.
+    acquisition : AcquisitionExecutor or None
+        Optional executor that runs :meth:`_onMeasure` on a worker
+        thread instead of inline in the polling loop.  Results are
+        reported by the executor's own ``dataReady`` signal, paired
+        with the poll that triggered them; the :attr:`demodulator`
+        applies only to inline reads.  Default: ``None``.
+    journal : ScanJournal or None
+        Optional checkpoint file.  While a scan runs, the trajectory,
+        the index of the last waypoint reached, the scan geometry, and
+        the polargraph's step indexes are recorded periodically and
+        whenever the scan pauses, so that :meth:`resumeFromCheckpoint`
+        can continue after a crash.  The checkpoint is deleted when the
+        scan completes.  Default: ``None``.
+    reconnectTimeout : float
+        How long to keep trying to restore a lost serial link before
+        pausing the scan [s].  Default: 30.
+    recoveryTime : float
+        Time spent restoring lost serial links since the last scan
+        started [s].  Read-only.
+    completed : bool
+        ``True`` if the last scan followed its trajectory to the final
+        waypoint, ``False`` while it runs or if it was abandoned or
+        failed.  Read-only.
+    missedSamples : int
+        Sample points of the last scan that were passed before they
+        could be measured, and were reported without a reading; see
+        :meth:`_sampleArc`.  Read-only.
+    stallAction : str or None
+        What to do when the :attr:`watchdog` reports that a move has
+        timed out or stalled: ``'retry'`` re-issues the move up to
+        :attr:`STALL_RETRIES` times and then pauses, ``'pause'`` pauses
+        the trajectory, and ``'abort'`` abandons it.  ``None`` disables
+        the watchdog.  Default: ``'pause'``.
+    watchdog : MotionWatchdog
+        Monitors each move against the predicted motion time.  Adjust
+        its ``margin``, ``slack``, and ``window`` to suit the hardware.
 
     Signals
     -------
     dataReady(numpy.ndarray)
-        Emitted with ``(x, y, t)`` — Cartesian position [m] and a
-        :func:`time.monotonic` timestamp [s] — at every position poll
+        Emitted with ``(x, y, t, *fields)`` — Cartesian position [m], a
+        :func:`time.monotonic` timestamp [s], and any values named in
+        :attr:`fields` — at every position poll
         during motion (MOVING and SCANNING states).  ``t`` allows
         post-processing correlation with independently sampled
         instruments.  Connect to belt animation and, gated on
         :meth:`scanning`, to instrument data collection.  (Callers that
-        only need ``x, y`` may ignore ``data[2]``.)
+        only need ``x, y`` may ignore ``data[2:]``.)
+    vertexReached(float)
+        Emitted with the :func:`time.monotonic` timestamp [s] of the
+        position poll at which the polargraph came to rest on a
+        waypoint.  Between this poll and the first poll of the next
+        move the payload is stationary, so the timestamps delimit the
+        motion segments of the trajectory; see
+        :class:`~QPolargraph.processing.TrackAligner.TrackAligner`.
+    linkDown()
+        Emitted when the serial link to the polargraph is lost during
+        motion.  Motion stops, data are not collected, and the pattern
+        tries to reconnect.
+    stalled(str)
+        Emitted with ``'timeout'`` or ``'stall'`` when the
+        :attr:`watchdog` flags a move, before the :attr:`stallAction`
+        is taken.
+    linkRecovered(float)
+        Emitted with the time taken [s] when a lost link has been
+        restored and motion has resumed.  If the link cannot be
+        restored within :attr:`reconnectTimeout`, the scan pauses
+        instead.
     stateChanged(ScanState)
         Emitted on every state-machine transition.  Subsumes the former
         ``moveFinished`` and ``scanFinished`` signals.
@@ -94,16 +196,48 @@ class QScanPattern(QtCore.QObject):
     '''
 
     dataReady = QtCore.Signal(np.ndarray)
+    vertexReached = QtCore.Signal(float)
+    linkDown = QtCore.Signal()
+    linkRecovered = QtCore.Signal(float)
+    stalled = QtCore.Signal(str)
     stateChanged = QtCore.Signal(object)
     closeRequested = QtCore.Signal()
 
+    #: Qt-free geometry class that computes the waypoints.
+    GEOMETRY = ScanGeometry
+
+    #: Properties recorded in checkpoints and restored on resume.
+    JOURNAL_PROPERTIES = ('width', 'height', 'dx', 'dy', 'step',
+                          'sampleSpacing')
+
+    #: Longest uninterrupted wait for a predicted sample point [s].
+    WAIT_INTERVAL = 0.01
+
+    #: Delay between reconnection attempts [s].
+    RECONNECT_INTERVAL = 1.
+
+    #: Responses to a stalled move.
+    STALL_ACTIONS = ('retry', 'pause', 'abort')
+
+    #: Number of times a stalled move is re-issued before pausing.
+    STALL_RETRIES = 2
+
     def __init__(self, *args,
                  width: float = 0.6,
                  height: float = 0.6,
                  dx: float = 0.,
                  dy: float = 0.1,
                  step: float = 5,
+                 sampleSpacing: float = 0.,
+                 optimize: bool = False,
+                 nearestStart: bool = False,
+                 returnHome: bool = True,
                  polargraph: Polargraph,
+                 demodulator: LockIn | None = None,
+                 acquisition: AcquisitionExecutor | None = None,
+                 journal: ScanJournal | None = None,
+                 reconnectTimeout: float = 30.,
+                 stallAction: str | None = 'pause',
                  **kwargs):
         super().__init__(**kwargs)
         self._width = width
@@ -111,7 +245,23 @@ class QScanPattern(QtCore.QObject):
         self._dx = dx
         self._dy = dy
         self._step = step
+        self._sampleSpacing = sampleSpacing
+        self.optimize = optimize
+        self.nearestStart = nearestStart
+        self.returnHome = returnHome
+        self._arc = None
         self.polargraph = polargraph
+        self.demodulator = demodulator
+        self.acquisition = acquisition
+        self.journal = journal
+        self.reconnectTimeout = reconnectTimeout
+        self._recoveryTime = 0.
+        self._missedSamples = 0
+        self._completed = False
+        self.stallAction = stallAction
+        self.watchdog = MotionWatchdog(polargraph)
+        self._plan = None
+        self._cursor = -1
         self._state = ScanState.IDLE
         self._paused = False
         self._abandon = False
@@ -120,6 +270,17 @@ class QScanPattern(QtCore.QObject):
         self._pre_pause_state = None
         self._continuation = None
 
+    @property
+    def polargraph(self) -> Polargraph:
+        '''Instrument driven by the pattern.'''
+        return self._polargraph
+
+    @polargraph.setter
+    def polargraph(self, polargraph: Polargraph) -> None:
+        self._polargraph = polargraph
+        if (watchdog := getattr(self, 'watchdog', None)) is not None:
+            watchdog.polargraph = polargraph
+
     @property
     def width(self) -> float:
         '''Horizontal extent of the scan area [m].'''
@@ -165,18 +326,131 @@ class QScanPattern(QtCore.QObject):
     def step(self, value: float) -> None:
         self._step = float(value)
 
+    @property
+    def optimize(self) -> bool:
+        '''Whether :meth:`scan` follows the optimized :meth:`plan`.'''
+        return self._optimize
+
+    @optimize.setter
+    def optimize(self, value: bool) -> None:
+        self._optimize = bool(value)
+
+    @property
+    def nearestStart(self) -> bool:
+        '''Whether :meth:`plan` may run the trajectory backwards.'''
+        return self._nearestStart
+
+    @nearestStart.setter
+    def nearestStart(self, value: bool) -> None:
+        self._nearestStart = bool(value)
+
+    @property
+    def returnHome(self) -> bool:
+        '''Whether the payload returns home after each scan.'''
+        return self._returnHome
+
+    @returnHome.setter
+    def returnHome(self, value: bool) -> None:
+        self._returnHome = bool(value)
+
+    @property
+    def sampleSpacing(self) -> float:
+        '''Distance between samples along the scan path [mm].'''
+        return self._sampleSpacing
+
+    @sampleSpacing.setter
+    def sampleSpacing(self, value: float) -> None:
+        self._sampleSpacing = max(float(value), 0.)
+
+    @property
+    def demodulator(self) -> LockIn | None:
+        '''Lock-in stage applied to raw samples from :meth:`_onMeasure`.'''
+        return self._demodulator
+
+    @demodulator.setter
+    def demodulator(self, value: LockIn | None) -> None:
+        self._demodulator = value
+
+    @property
+    def fields(self) -> tuple[str, ...]:
+        '''Names of the measurement values in :attr:`dataReady` arrays.'''
+        return () if self._demodulator is None else ('I', 'Q')
+
+    @property
+    def acquisition(self) -> AcquisitionExecutor | None:
+        '''Executor that runs :meth:`_onMeasure` off the polling thread.'''
+        return self._acquisition
+
+    @acquisition.setter
+    def acquisition(self, value: AcquisitionExecutor | None) -> None:
+        self._acquisition = value
+
+    @property
+    def journal(self) -> ScanJournal | None:
+        '''Checkpoint file for crash recovery.'''
+        return self._journal
+
+    @journal.setter
+    def journal(self, value: ScanJournal | None) -> None:
+        self._journal = value
+
+    @property
+    def reconnectTimeout(self) -> float:
+        '''Time allowed to restore a lost serial link [s].'''
+        return self._reconnectTimeout
+
+    @reconnectTimeout.setter
+    def reconnectTimeout(self, value: float) -> None:
+        self._reconnectTimeout = max(float(value), 0.)
+
+    @property
+    def recoveryTime(self) -> float:
+        '''Time spent restoring lost serial links during this scan [s].'''
+        return self._recoveryTime
+
+    @property
+    def completed(self) -> bool:
+        '''``True`` if the last scan reached its final waypoint.'''
+        return self._completed
+
+    @property
+    def missedSamples(self) -> int:
+        '''Sample points passed before they could be measured.'''
+        return self._missedSamples
+
+    @property
+    def stallAction(self) -> str | None:
+        '''Response to a move flagged by the :attr:`watchdog`.'''
+        return self._stallAction
+
+    @stallAction.setter
+    def stallAction(self, value: str | None) -> None:
+        if value is not None and value not in self.STALL_ACTIONS:
+            raise ValueError(f'unknown stall action: {value!r}')
+        self._stallAction = value
+
     def isOpen(self) -> bool:
         '''Return ``True`` — scan patterns are always available.'''
         return True
 
+    @property
+    def geometry(self) -> ScanGeometry:
+        '''Picklable snapshot of the scan geometry.
+
+        Returns a new instance of :attr:`GEOMETRY` built from the
+        current scan-area settings and the polargraph's
+        :attr:`~QPolargraph.hardware.Polargraph.Polargraph.geometry`.
+        The snapshot needs no Qt, so it can plan and time scans in
+        worker processes.
+        '''
+        return self.GEOMETRY(self.polargraph.geometry,
+                             **{name: getattr(self, name)
+                                for name in self.GEOMETRY.PARAMETERS})
+
     @property
     def rect(self) -> list:
         '''Bounding rectangle ``[x1, y1, x2, y2]`` of the scan area [m].'''
-        x1 = self.dx - self.width / 2.
-        y1 = self.polargraph.y0 + self.dy
-        x2 = x1 + self.width
-        y2 = y1 + self.height
-        return [x1, y1, x2, y2]
+        return self.geometry.rect
 
     def vertices(self) -> np.ndarray:
         '''Vertices of the scan trajectory.
@@ -186,8 +460,7 @@ class QScanPattern(QtCore.QObject):
         numpy.ndarray
             ``(nvertices, 2)`` array of ``(x, y)`` waypoints [m].
         '''
-        x1, y1, x2, y2 = self.rect
-        return np.array([[x1, y1], [x2, y1], [x2, y2], [x1, y2], [x1, y1]])
+        return self.geometry.vertices()
 
     def trajectory(self) -> np.ndarray:
         '''Coordinates along the scan path for display.
@@ -197,7 +470,49 @@ class QScanPattern(QtCore.QObject):
         numpy.ndarray
             ``(2, npts)`` array of ``(x, y)`` coordinates [m].
         '''
-        return self.vertices().T
+        return self.geometry.trajectory(self.vertices())
+
+    def segments(self) -> list[np.ndarray]:
+        '''Pieces of the trajectory that may be visited in any order.
+
+        Each segment is traversed in one piece, in either direction.
+        The default treats the whole of :meth:`vertices` as a single
+        segment.  Patterns whose data lines are independent, such as
+        the arcs of
+        :class:`~QPolargraph.patterns.PolarScan.PolarScan`, override
+        this to let :meth:`plan` reorder them.
+
+        Returns
+        -------
+        list of numpy.ndarray
+            ``(npoints, 2)`` arrays of ``(x, y)`` waypoints [m].
+        '''
+        return self.geometry.segments(self.vertices())
+
+    def plan(self, start: npt.ArrayLike | None = None) -> np.ndarray:
+        '''Waypoints in the order that :meth:`scan` will visit them.
+
+        Without :attr:`optimize` this is :meth:`vertices`, reversed if
+        :attr:`nearestStart` is set and the last waypoint is closer to
+        *start* in motor time than the first.  With :attr:`optimize`
+        the :meth:`segments` are reordered and reversed to minimize the
+        predicted motion time from *start* and between segments under
+        the polargraph's trapezoidal motion model; see
+        :func:`~QPolargraph.lib.ordering.order_segments`.
+
+        Parameters
+        ----------
+        start : array-like, optional
+            ``(x, y)`` position from which the scan begins [m].
+            Default: the home position.
+
+        Returns
+        -------
+        numpy.ndarray
+            ``(nvertices, 2)`` array of ``(x, y)`` waypoints [m].
+        '''
+        segments = self.segments() if self._optimize else None
+        return self.geometry.plan(start, self.vertices(), segments)
 
     def scanning(self) -> bool:
         '''Return ``True`` if the scanner is actively collecting data.'''
@@ -228,10 +543,16 @@ class QScanPattern(QtCore.QObject):
         self._paused_vertices = None
         self._pre_pause_state = None
         self._continuation = None
+        self._plan = None
 
     def _moveTo(self, vertices) -> _MoveResult:
         '''Move through a sequence of waypoints.
 
+        If a measurement or the polargraph raises an exception, the
+        motors are stopped and released and the pattern returns to
+        IDLE before the exception propagates, so that it can be
+        scanned again.  The :attr:`journal` keeps the last checkpoint.
+
         Parameters
         ----------
         vertices : list of array-like
@@ -240,10 +561,26 @@ class QScanPattern(QtCore.QObject):
         Returns
         -------
         _MoveResult
-            ``COMPLETE`` or ``PAUSED``.
+            ``COMPLETE``, ``PAUSED`` or ``ABANDONED``.
         '''
+        try:
+            return self._follow(vertices)
+        except Exception:
+            logger.error('Scan failed: stopping motors')
+            try:
+                self.polargraph.stop()
+                self.polargraph.release()
+            finally:
+                self._resetTrajectory()
+                self._setIdle()
+            raise
+
+    def _follow(self, vertices) -> _MoveResult:
+        '''Move through *vertices*; see :meth:`_moveTo`.'''
         for i, vertex in enumerate(vertices):
             self.polargraph.moveTo(*vertex)
+            self.watchdog.start(vertex)
+            retries = 0
             while True:
                 QCoreApplication.processEvents()
                 if self._abandon:
@@ -255,24 +592,220 @@ class QScanPattern(QtCore.QObject):
                     self.polargraph.stop()
                     self._paused_vertices = [vertices[j]
                                              for j in range(i, len(vertices))]
+                    self._checkpoint(force=True)
                     return _MoveResult.PAUSED
                 x, y, moving = self.polargraph.position
                 t = time.monotonic()
-                self._onMeasure(t, x, y)
-                self.dataReady.emit(np.array([x, y, t]))
+                if getattr(self.polargraph, 'linkLost', False):
+                    if self._recover():
+                        if self._arc is not None:
+                            self._arc.restart()
+                        self.polargraph.moveTo(*vertex)
+                        self.watchdog.start(vertex)
+                    elif not self._abandon:
+                        self._paused = True
+                    continue
+                if getattr(self.polargraph, 'pollFailed', False):
+                    continue
+                failure = None
+                if moving and self._stallAction is not None:
+                    failure = self.watchdog.check(t, x, y)
+                if failure is not None:
+                    logger.warning(f'Move to ({vertex[0]:.3f}, '
+                                   f'{vertex[1]:.3f}) failed: {failure}')
+                    self.stalled.emit(failure)
+                    if (self._stallAction == 'retry' and
+                            retries < self.STALL_RETRIES):
+                        retries += 1
+                        self.polargraph.stop()
+                        self.polargraph.moveTo(*vertex)
+                        self.watchdog.start(vertex)
+                    elif self._stallAction == 'abort':
+                        self._abandon = True
+                    else:
+                        self._paused = True
+                    continue
+                if self._arc is not None and self.scanning():
+                    self._sampleArc(t, x, y, vertex if moving else None)
+                else:
+                    self._sample(t, x, y)
                 if not moving:
+                    if self._onVertex(t, x, y) is False:
+                        continue
+                    self.vertexReached.emit(t)
+                    self._advance(vertex)
                     break
         self.polargraph.release()
         return _MoveResult.COMPLETE
 
-    def _onMeasure(self, t: float, x: float, y: float) -> None:
+    def _recover(self) -> bool:
+        '''Try to restore a lost serial link.
+
+        Returns ``True`` if the link was restored within
+        :attr:`reconnectTimeout`, or ``False`` if it was not or the
+        trajectory was paused or abandoned in the meantime.
+        '''
+        start = time.monotonic()
+        logger.warning('Serial link to polargraph lost: reconnecting')
+        self.linkDown.emit()
+        while True:
+            QCoreApplication.processEvents()
+            if self._abandon or self._paused:
+                return False
+            if self.polargraph.reconnect():
+                break
+            if time.monotonic() - start > self._reconnectTimeout:
+                logger.error('Could not restore serial link: pausing')
+                return False
+            time.sleep(self.RECONNECT_INTERVAL)
+        elapsed = time.monotonic() - start
+        self._recoveryTime += elapsed
+        logger.warning(f'Serial link restored after {elapsed:.1f} s')
+        self.linkRecovered.emit(elapsed)
+        return True
+
+    def _advance(self, vertex: npt.ArrayLike) -> None:
+        '''Track progress along the scan trajectory.'''
+        plan = self._plan
+        if plan is None or self._cursor + 1 >= len(plan):
+            return
+        if np.allclose(vertex, plan[self._cursor + 1]):
+            self._cursor += 1
+            self._checkpoint()
+
+    def _checkpoint(self, force: bool = False) -> None:
+        '''Record the scan's progress in the :attr:`journal`.'''
+        if self._journal is None or self._plan is None:
+            return
+        if not (force or self._journal.due()):
+            return
+        n1, n2 = self.polargraph.indexes[:2]
+        state = {'pattern': type(self).__name__,
+                 'geometry': {name: getattr(self, name)
+                              for name in self.JOURNAL_PROPERTIES},
+                 'vertices': self._plan.tolist(),
+                 'cursor': self._cursor,
+                 'indexes': [int(n1), int(n2)],
+                 'time': time.time()}
+        self._journal.record(state, force=force)
+
+    def _sample(self, t: float, x: float, y: float) -> None:
+        '''Measure at ``(x, y)`` and emit :attr:`dataReady`.'''
+        if self._acquisition is None:
+            raw = self._onMeasure(t, x, y)
+        else:
+            self._acquisition.submit(t, x, y, self._onMeasure)
+            raw = None
+        self.dataReady.emit(self._measurement(t, x, y, raw))
+
+    def _sampleArc(self, t: float, x: float, y: float,
+                   vertex: np.ndarray | None) -> None:
+        '''Sample at the arc-length crossings around a position poll.
+
+        Every crossing predicted to occur before the next poll, and
+        short of the target *vertex*, is waited for in turn so that
+        its measurement is taken at the sample point.  The waits are
+        broken into slices of :attr:`WAIT_INTERVAL` so that a pause or
+        abandon request takes effect promptly.
+
+        Crossings that were not predicted, for example because the
+        payload sped up, are only found at the next poll, after the
+        payload has passed them.  Their positions and times are
+        interpolated on the path and reported in :attr:`dataReady`, but
+        :meth:`_onMeasure` is not called for them, so that a reading
+        taken at the poll is not attributed to an earlier point.  With
+        a :attr:`demodulator` they report ``NaN`` for ``I`` and ``Q``.
+        They are counted in :attr:`missedSamples`.
+        '''
+        for xk, yk, tk in self._arc.update(t, x, y):
+            if tk < t:
+                self._missedSamples += 1
+                self.dataReady.emit(self._measurement(tk, xk, yk, None))
+            else:
+                self._sample(tk, xk, yk)
+        if vertex is None:
+            return
+        limit = np.hypot(vertex[0] - x, vertex[1] - y)
+        while (prediction := self._arc.predict(limit)) is not None:
+            tp, xp, yp = prediction
+            if not self._waitUntil(tp):
+                return
+            self._arc.advance()
+            self._sample(tp, xp, yp)
+
+    def _waitUntil(self, deadline: float) -> bool:
+        '''Wait until :func:`time.monotonic` reaches *deadline*.
+
+        The wait is broken into slices of :attr:`WAIT_INTERVAL`,
+        between which Qt events are processed.
+
+        Returns
+        -------
+        bool
+            ``False`` if a pause or abandon request cut the wait short.
+        '''
+        while (wait := deadline - time.monotonic()) > 0.:
+            QCoreApplication.processEvents()
+            if self._abandon or self._paused:
+                return False
+            time.sleep(min(wait, self.WAIT_INTERVAL))
+        return True
+
+    def _measurement(self, t: float, x: float, y: float,
+                     raw: np.ndarray | None) -> np.ndarray:
+        '''Return the :attr:`dataReady` array for one position poll.
+
+        Passes *raw* through the :attr:`demodulator`, if any.  Polls
+        without raw samples report ``NaN`` for ``I`` and ``Q``.
+        '''
+        if self._demodulator is None:
+            return np.array([x, y, t])
+        if raw is None:
+            iq = complex(np.nan, np.nan)
+        else:
+            iq = self._demodulator.process(raw, t)
+        return np.array([x, y, t, iq.real, iq.imag])
+
+    def _onVertex(self, t: float, x: float,
+                  y: float) -> bool | None:
+        '''Called when the polargraph comes to rest on a waypoint.
+
+        Runs in the polargraph device thread after the final position
+        poll of each move, before :attr:`vertexReached` is emitted.
+        Override in subclasses that act at the waypoints themselves.
+        An override that is interrupted by :meth:`pause` or
+        :meth:`abandon` returns ``False``: the waypoint is then not
+        counted as reached, and a resumed scan visits it again.  The
+        default implementation is a no-op.
+
+        Parameters
+        ----------
+        t : float
+            Timestamp of the final poll [s].
+        x : float
+            Horizontal coordinate [m].
+        y : float
+            Vertical coordinate [m].
+        '''
+
+    def _onMeasure(self, t: float, x: float,
+                   y: float) -> np.ndarray | None:
         '''Called at each position poll, before :attr:`dataReady` is emitted.
 
-        Runs in the polargraph device thread.  Override in subclasses to
-        trigger a synchronous instrument read that should be associated
-        with position ``(x, y)`` at time ``t``.  The default
+        Runs in the polargraph device thread, or on a worker thread of
+        the :attr:`acquisition` executor if one is set.  Override in
+        subclasses to trigger an instrument read that should be
+        associated with position ``(x, y)`` at time ``t``.  The default
         implementation is a no-op.
 
+        When a :attr:`demodulator` is set, the override should return
+        the block of raw instrument samples acquired starting at time
+        ``t``; the demodulated ``I`` and ``Q`` are then appended to the
+        :attr:`dataReady` array in place of the raw data::
+
+            def _onMeasure(self, t, x, y):
+                return self.instrument.read(nsamples=500)
+
         Parameters
         ----------
         t : float
@@ -281,6 +814,11 @@ class QScanPattern(QtCore.QObject):
             Current horizontal coordinate [m].
         y : float
             Current vertical coordinate [m].
+
+        Returns
+        -------
+        numpy.ndarray or None
+            Raw samples for the :attr:`demodulator`, or ``None``.
         '''
 
     @QtCore.Slot()
@@ -305,24 +843,86 @@ class QScanPattern(QtCore.QObject):
         self._setIdle()
 
     @QtCore.Slot()
-    def scan(self) -> None:
+    def scan(self, vertices: npt.ArrayLike | None = None) -> None:
         '''Execute a full scan, then return home.
 
         State transitions during a normal scan:
 
         ``IDLE → MOVING`` (positioning to start)
         ``→ SCANNING`` (collecting data)
-        ``→ MOVING`` (returning home)
+        ``→ MOVING`` (returning home, unless :attr:`returnHome` is
+        ``False``)
         ``→ IDLE``
 
         The scan may be paused at any point via :meth:`pause` and
         resumed via :meth:`resume`.  Calling :meth:`home`,
         :meth:`center`, or :meth:`abandon` while paused discards the
         saved trajectory.
+
+        Parameters
+        ----------
+        vertices : array-like, optional
+            ``(nvertices, 2)`` waypoints to follow, for example a
+            :meth:`plan` computed in advance.  Default: :meth:`plan`
+            from the current position.
         '''
         if self._state != ScanState.IDLE:
             return
-        vertices = list(self.vertices())
+        if vertices is None:
+            here = self.polargraph.position[:2]
+            vertices = self.plan(start=here)
+        self._scanFrom(vertices, 0)
+
+    @QtCore.Slot()
+    @QtCore.Slot(bool)
+    def resumeFromCheckpoint(self, rehome: bool = False) -> None:
+        '''Continue a scan recorded in the :attr:`journal`.
+
+        Restores the scan geometry, moves to the last waypoint that the
+        interrupted scan reached, and scans the rest of its trajectory.
+
+        Parameters
+        ----------
+        rehome : bool, optional
+            If ``True``, the payload has been returned to the home
+            position by hand, and the step counters are zeroed.
+            Otherwise the counters are set to the step indexes stored
+            in the checkpoint, which assumes that the payload has not
+            moved since.  Checkpoints are written at most every
+            :attr:`~QPolargraph.lib.ScanJournal.ScanJournal.interval`
+            seconds, so after a crash the stored indexes usually lag
+            the payload.  Default: ``False``.
+
+        Raises
+        ------
+        ValueError
+            If there is no :attr:`journal` or the checkpoint belongs to
+            a different type of scan pattern.
+        FileNotFoundError
+            If there is no checkpoint.
+        '''
+        if self._state != ScanState.IDLE:
+            return
+        if self._journal is None:
+            raise ValueError('no journal to resume from')
+        state = self._journal.load()
+        if state['pattern'] != type(self).__name__:
+            raise ValueError(f"checkpoint is for {state['pattern']}, "
+                             f'not {type(self).__name__}')
+        for name, value in state['geometry'].items():
+            setattr(self, name, value)
+        self.polargraph.indexes = (0, 0) if rehome else state['indexes']
+        self._resetTrajectory()
+        self._scanFrom(state['vertices'], max(state['cursor'], 0))
+
+    def _scanFrom(self, vertices: npt.ArrayLike, first: int) -> None:
+        '''Scan *vertices*, starting with waypoint *first*.'''
+        self._plan = np.asarray(vertices, dtype=float)
+        self._cursor = first - 1
+        self._recoveryTime = 0.
+        self._missedSamples = 0
+        self._completed = False
+        vertices = list(self._plan[first:])
         self._setState(ScanState.MOVING)
         result = self._moveTo([vertices[0]])
         if result == _MoveResult.COMPLETE:
@@ -335,6 +935,10 @@ class QScanPattern(QtCore.QObject):
             self._setIdle()
 
     def _continueScan(self, remaining: list) -> None:
+        self._arc = None
+        if self.sampleSpacing > 0.:
+            self._arc = ArcSampler(self.polargraph,
+                                   self.sampleSpacing * 1e-3)
         self._setState(ScanState.SCANNING)
         result = self._moveTo(remaining)
         if result == _MoveResult.COMPLETE:
@@ -347,6 +951,13 @@ class QScanPattern(QtCore.QObject):
             self._setIdle()
 
     def _homeAfterScan(self) -> None:
+        self._completed = True
+        self._plan = None
+        if self._journal is not None:
+            self._journal.clear()
+        if not self._returnHome:
+            self._setIdle()
+            return
         self._setState(ScanState.MOVING)
         result = self._moveTo([[0., self.polargraph.y0]])
         if result == _MoveResult.COMPLETE:
@@ -387,6 +998,8 @@ class QScanPattern(QtCore.QObject):
         self._continuation = None
 
         self._setState(saved_state)
+        if self._arc is not None:
+            self._arc.restart()
         result = self._moveTo(saved_vertices)
 
         if result == _MoveResult.COMPLETE:
@@ -73,6 +73,10 @@ class QScanPatternWidget(QtWidgets.QWidget):
         FieldSpec('dy',     'Δy',      ' m', -1.0,  1.0, 0.01, 0.1),
         FieldSpec('step',   'step',    ' mm', 1.0, 100.0, 1.0,  5.0,
                   decimals=1),
+        FieldSpec('sampleSpacing', 'Δs', ' mm', 0.0, 100.0, 0.5, 0.0,
+                  decimals=1,
+                  tooltip='Distance between samples along the scan path '
+                          '(0: sample at every position poll)'),
     ]
 
     def __init__(self, *args,
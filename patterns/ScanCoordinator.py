@@ -0,0 +1,282 @@
+from __future__ import annotations
+
+from collections.abc import Iterable
+import logging
+import time
+import numpy as np
+from qtpy import QtCore
+from QPolargraph.patterns.QScanPattern import QScanPattern, ScanState
+from QPolargraph.lib.SampleStore import SampleStore
+
+
+logger = logging.getLogger(__name__)
+
+
+class ScanCoordinator(QtCore.QObject):
+
+    '''Run several polargraphs at once from one process.
+
+    Each scan pattern drives its own polargraph through the blocking
+    move loop of
+    :meth:`~QPolargraph.patterns.QScanPattern.QScanPattern.scan`, so
+    one thread can only run one scanner.  The coordinator gives every
+    pattern a device thread of its own and starts them together::
+
+        coordinator = ScanCoordinator([RasterScan(polargraph=left),
+                                       PolarScan(polargraph=right)])
+        coordinator.throughput.connect(statusBar.showMessage)
+        coordinator.finished.connect(app.quit)
+        coordinator.start()
+
+    A polargraph that already lives on a worker thread, such as the
+    device thread of a
+    :class:`~QPolargraph.hardware.QPolargraphWidget.QPolargraphWidget`,
+    keeps it and its pattern joins it there.  Otherwise the coordinator
+    moves both to a new ``QThread``.  Two patterns must not share one
+    polargraph.
+
+    Samples recorded while each pattern is SCANNING are delivered to the
+    coordinator's thread and appended to one :attr:`store`, with the
+    index of their scanner in the ``scanner`` column.  Timestamps are
+    measured from one origin, :attr:`t0`, taken when :meth:`start` is
+    called, so rows from different scanners can be compared directly.
+    Fields that a pattern does not record are ``NaN``.
+
+    The coordinator must live in a thread with a running event loop.
+
+    Parameters
+    ----------
+    patterns : iterable of QScanPattern, optional
+        Scan patterns, each with its own polargraph.
+    interval : int, optional
+        Period of the :attr:`throughput` reports [ms].  Default: 1000.
+
+    Properties
+    ----------
+    patterns : list of QScanPattern
+        Coordinated scan patterns.
+    store : SampleStore
+        Rows ``{'scanner', 't', 'x', 'y', *fields}`` from every scanner.
+    t0 : float
+        :func:`time.monotonic` origin of the shared timebase [s].
+    counts : list of int
+        Number of samples recorded by each scanner.
+    rate : float
+        Aggregate sample rate since :meth:`start` [samples/s].
+
+    Methods
+    -------
+    add(pattern)
+        Add a scan pattern.
+    start()
+        Start every scan.
+    running()
+        Return ``True`` while any scanner is active.
+    pause()
+        Pause every scan at the end of its current move.
+    resume()
+        Resume every paused scan.
+    abort()
+        Abandon every scan.
+    close()
+        Stop the device threads created by the coordinator.
+
+    Signals
+    -------
+    dataReady(int, dict)
+        Emitted with the scanner index and one row for every sample.
+    scannerFinished(int)
+        Emitted with the index of each scanner that returns to IDLE.
+    throughput(str)
+        Periodic report of the aggregate and per-scanner sample rates.
+    finished()
+        Emitted when every scanner is IDLE again.
+    '''
+
+    dataReady = QtCore.Signal(int, dict)
+    scannerFinished = QtCore.Signal(int)
+    throughput = QtCore.Signal(str)
+    finished = QtCore.Signal()
+
+    def __init__(self,
+                 patterns: Iterable[QScanPattern] = (),
+                 interval: int = 1000,
+                 parent: QtCore.QObject | None = None) -> None:
+        super().__init__(parent)
+        self.patterns = []
+        self._threads = []
+        self._active = set()
+        self._counts = []
+        self._t0 = None
+        self.store = SampleStore()
+        self._timer = QtCore.QTimer(self)
+        self._timer.setInterval(int(interval))
+        self._timer.timeout.connect(self._report)
+        self._last = (0., [])
+        for pattern in patterns:
+            self.add(pattern)
+
+    @property
+    def t0(self) -> float | None:
+        '''Origin of the shared timebase [s].'''
+        return self._t0
+
+    @property
+    def counts(self) -> list[int]:
+        '''Number of samples recorded by each scanner.'''
+        return list(self._counts)
+
+    @property
+    def rate(self) -> float:
+        '''Aggregate sample rate since :meth:`start` [samples/s].'''
+        if self._t0 is None:
+            return 0.
+        elapsed = time.monotonic() - self._t0
+        return sum(self._counts) / elapsed if elapsed > 0 else 0.
+
+    @property
+    def fields(self) -> tuple[str, ...]:
+        '''Columns of :attr:`store`.'''
+        names = []
+        for pattern in self.patterns:
+            names += [f for f in pattern.fields if f not in names]
+        return ('scanner', 't', 'x', 'y', *names)
+
+    def add(self, pattern: QScanPattern) -> None:
+        '''Add a scan pattern.
+
+        Parameters
+        ----------
+        pattern : QScanPattern
+            Scan pattern with a polargraph that no other coordinated
+            pattern uses.
+        '''
+        if self.running():
+            raise RuntimeError('cannot add a scanner while scanning')
+        if not isinstance(pattern, QScanPattern):
+            raise TypeError(f'{pattern!r} is not a QScanPattern')
+        if any(p.polargraph is pattern.polargraph for p in self.patterns):
+            raise ValueError('each pattern needs its own polargraph')
+        self.patterns.append(pattern)
+        self._counts.append(0)
+
+    def running(self) -> bool:
+        '''Return ``True`` while any scanner is active.'''
+        return bool(self._active)
+
+    def _deviceThread(self, pattern: QScanPattern) -> QtCore.QThread:
+        '''Return the worker thread that runs *pattern*.'''
+        polargraph = pattern.polargraph
+        thread = polargraph.thread()
+        if thread is self.thread():
+            thread = QtCore.QThread(self)
+            thread.setObjectName(f'scanner{len(self._threads)}')
+            polargraph.moveToThread(thread)
+            self._threads.append(thread)
+        if pattern.thread() is not thread:
+            pattern.moveToThread(thread)
+        if not thread.isRunning():
+            thread.start()
+        return thread
+
+    @QtCore.Slot()
+    def start(self) -> None:
+        '''Start every scan on its device thread.'''
+        if self.running() or not self.patterns:
+            return
+        self.store = SampleStore(self.fields)
+        self._counts = [0] * len(self.patterns)
+        self._t0 = time.monotonic()
+        self._last = (self._t0, list(self._counts))
+        for pattern in self.patterns:
+            self._deviceThread(pattern)
+            pattern.dataReady.connect(self._onDataReady)
+            pattern.stateChanged.connect(self._onStateChanged)
+        self._active = set(range(len(self.patterns)))
+        self._timer.start()
+        for pattern in self.patterns:
+            self._invoke(pattern, 'scan')
+
+    @staticmethod
+    def _invoke(pattern: QScanPattern, slot: str) -> None:
+        '''Call *slot* of *pattern* in the pattern's own thread.'''
+        QtCore.QMetaObject.invokeMethod(
+            pattern, slot, QtCore.Qt.ConnectionType.QueuedConnection)
+
+    def _index(self) -> int:
+        return self.patterns.index(self.sender())
+
+    @QtCore.Slot(object)
+    def _onDataReady(self, data: np.ndarray) -> None:
+        n = self._index()
+        pattern = self.patterns[n]
+        if not pattern.scanning():
+            return
+        row = dict.fromkeys(self.store.fields, np.nan)
+        row |= {'scanner': n,
+                't': float(data[2]) - self._t0,
+                'x': float(data[0]),
+                'y': float(data[1])}
+        row |= dict(zip(pattern.fields, map(float, data[3:])))
+        self.store.append(row)
+        self._counts[n] += 1
+        self.dataReady.emit(n, row)
+
+    @QtCore.Slot(object)
+    def _onStateChanged(self, state: ScanState) -> None:
+        if state != ScanState.IDLE:
+            return
+        n = self._index()
+        if n not in self._active:
+            return
+        pattern = self.patterns[n]
+        pattern.dataReady.disconnect(self._onDataReady)
+        pattern.stateChanged.disconnect(self._onStateChanged)
+        self._active.discard(n)
+        self.scannerFinished.emit(n)
+        if not self._active:
+            self._timer.stop()
+            self._report()
+            self.finished.emit()
+
+    @QtCore.Slot()
+    def _report(self) -> None:
+        now = time.monotonic()
+        then, counts = self._last
+        elapsed = max(now - then, 1e-9)
+        rates = [(c - p) / elapsed for c, p in zip(self._counts, counts)]
+        self._last = (now, list(self._counts))
+        each = ', '.join(f'{r:.0f}' for r in rates)
+        message = (f'{sum(self._counts)} samples, '
+                   f'{sum(rates):.0f} samples/s ({each})')
+        logger.debug(message)
+        self.throughput.emit(message)
+
+    @QtCore.Slot()
+    def pause(self) -> None:
+        '''Pause every scan at the end of its current move.'''
+        for n in self._active:
+            self._invoke(self.patterns[n], 'pause')
+
+    @QtCore.Slot()
+    def resume(self) -> None:
+        '''Resume every paused scan.'''
+        for n in self._active:
+            self._invoke(self.patterns[n], 'resume')
+
+    @QtCore.Slot()
+    def abort(self) -> None:
+        '''Abandon every scan.  The polargraphs stop where they are.'''
+        for n in self._active:
+            self._invoke(self.patterns[n], 'abandon')
+
+    def close(self) -> None:
+        '''Stop the device threads created by the coordinator.
+
+        The patterns and polargraphs stay on their stopped threads, so
+        the coordinator cannot be started again afterwards.
+        '''
+        self.abort()
+        for thread in self._threads:
+            thread.quit()
+            thread.wait()
@@ -0,0 +1,270 @@
+from __future__ import annotations
+
+from collections.abc import Iterable, Mapping
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import TYPE_CHECKING
+from qtpy import QtCore
+import numpy as np
+import logging
+from QPolargraph.patterns.QScanPattern import QScanPattern, ScanState
+from QPolargraph.lib.SampleStore import SampleStore
+
+if TYPE_CHECKING:
+    from QPolargraph.hardware.Polargraph import Polargraph
+
+
+logger = logging.getLogger(__name__)
+
+
+class ScanQueue(QtCore.QObject):
+
+    '''Run a list of scan jobs back to back.
+
+    Each job is a :class:`~QPolargraph.patterns.QScanPattern.QScanPattern`
+    subclass and a mapping of constructor parameters::
+
+        queue = ScanQueue(polargraph, [(RasterScan, {'dy': 0.1}),
+                                       (RasterScan, {'dy': 0.4}),
+                                       (PolarScan, {'step': 2.})])
+        queue.finished.connect(app.quit)
+        queue.start()
+
+    :meth:`start` builds every pattern up front, so that bad parameters
+    are reported before anything moves.  Jobs are chained without
+    homing: every job except the last runs with ``returnHome=False``
+    and, unless its parameters say otherwise, ``nearestStart=True``.
+    Each job's :meth:`~QPolargraph.patterns.QScanPattern.QScanPattern.plan`
+    is computed on a background thread from the position where the
+    previous job will end, so planning an optimized pattern overlaps
+    with the motion of the job before it.
+
+    Rows collected while each job is SCANNING are kept separately in
+    :attr:`results`.
+
+    A job that stops before reaching its final waypoint, because the
+    stall watchdog aborted it, its serial link could not be restored,
+    or a measurement failed, is reported with :attr:`jobFailed`, and
+    the queue stops without starting the jobs after it.
+
+    The queue drives its patterns from its own thread.  With a serial
+    polargraph, move the queue to the device thread and start it with a
+    queued signal, as :meth:`QPolargraph.QScanner.QScanner.runJobs`
+    does.
+
+    Parameters
+    ----------
+    polargraph : Polargraph
+        Polargraph shared by all jobs.
+    jobs : iterable of (type, mapping), optional
+        Scan pattern classes and their constructor parameters.
+    returnHome : bool, optional
+        If ``True``, return home after the last job.  Default: ``True``.
+
+    Properties
+    ----------
+    jobs : list of (type, dict)
+        Queued jobs.  Changes take effect at the next :meth:`start`.
+    patterns : list of QScanPattern
+        Patterns built by :meth:`start`, one per job.
+    results : list of SampleStore
+        Rows ``{'t', 'x', 'y', *fields}`` recorded during each job.
+    current : int
+        Index of the running job, or -1.
+    pattern : QScanPattern or None
+        Pattern of the running job.
+
+    Methods
+    -------
+    append(cls, **params)
+        Add a job to the end of the queue.
+    start()
+        Build, plan, and run all jobs.
+    running()
+        Return ``True`` while jobs remain.
+    toggle()
+        Pause or resume the running job.
+    abort()
+        Abandon the running job and drop the rest.
+
+    Signals
+    -------
+    jobStarted(int)
+        Emitted with the index of each job as it starts.
+    jobFinished(int)
+        Emitted with the index of each job that completes.
+    jobFailed(int)
+        Emitted with the index of a job that stopped before completing.
+    stateChanged(ScanState)
+        Emitted with the state of the running job when it moves,
+        scans, or pauses.
+    dataReady(int, dict)
+        Emitted with the job index and one row for every sample the
+        running job collects.
+    finished()
+        Emitted when the queue stops, whether complete or aborted.
+    '''
+
+    jobStarted = QtCore.Signal(int)
+    jobFinished = QtCore.Signal(int)
+    jobFailed = QtCore.Signal(int)
+    stateChanged = QtCore.Signal(object)
+    dataReady = QtCore.Signal(int, dict)
+    finished = QtCore.Signal()
+
+    def __init__(self,
+                 polargraph: Polargraph,
+                 jobs: Iterable[tuple[type, Mapping]] = (),
+                 returnHome: bool = True,
+                 parent: QtCore.QObject | None = None) -> None:
+        super().__init__(parent)
+        self.polargraph = polargraph
+        self.returnHome = bool(returnHome)
+        self._jobs = []
+        for cls, params in jobs:
+            self.append(cls, **params)
+        self.patterns = []
+        self.results = []
+        self._plans = []
+        self._current = -1
+        self._aborted = False
+        self._planner = None
+
+    @property
+    def jobs(self) -> list[tuple[type, dict]]:
+        '''Queued jobs as ``(cls, params)`` pairs.'''
+        return self._jobs
+
+    @property
+    def current(self) -> int:
+        '''Index of the running job, or -1.'''
+        return self._current
+
+    @property
+    def pattern(self) -> QScanPattern | None:
+        '''Pattern of the running job.'''
+        if 0 <= self._current < len(self.patterns):
+            return self.patterns[self._current]
+        return None
+
+    def append(self, cls: type, **params) -> None:
+        '''Add a job to the end of the queue.
+
+        Parameters
+        ----------
+        cls : type
+            :class:`~QPolargraph.patterns.QScanPattern.QScanPattern`
+            subclass.
+        **params
+            Keyword arguments for *cls*, other than ``polargraph``.
+        '''
+        if not issubclass(cls, QScanPattern):
+            raise TypeError(f'{cls!r} is not a QScanPattern')
+        self._jobs.append((cls, dict(params)))
+
+    def running(self) -> bool:
+        '''Return ``True`` while jobs remain.'''
+        return self._current >= 0
+
+    @QtCore.Slot()
+    def start(self) -> None:
+        '''Build, plan, and run all jobs.'''
+        if self.running() or not self._jobs:
+            return
+        last = len(self._jobs) - 1
+        patterns = []
+        for n, (cls, params) in enumerate(self._jobs):
+            params = dict(params)
+            params.setdefault('nearestStart', True)
+            params['returnHome'] = self.returnHome if n == last else False
+            patterns.append(cls(polargraph=self.polargraph, **params))
+        self.patterns = patterns
+        self.results = [SampleStore() for _ in patterns]
+        self._aborted = False
+        self._planner = ThreadPoolExecutor(max_workers=1,
+                                           thread_name_prefix='planner')
+        start = np.asarray(self.polargraph.position[:2], dtype=float)
+        self._plans = []
+        for pattern in patterns:
+            self._plans.append(self._planner.submit(
+                self._plan, pattern, self._plans[-1:], start))
+        self._planner.shutdown(wait=False)
+        self._startJob(0)
+
+    @staticmethod
+    def _plan(pattern: QScanPattern,
+              previous: list[Future],
+              start: np.ndarray) -> np.ndarray:
+        '''Plan *pattern* from the end of the previous job's plan.'''
+        if previous:
+            start = previous[0].result()[-1]
+        return pattern.plan(start=start)
+
+    def _startJob(self, n: int) -> None:
+        if self._aborted or n >= len(self.patterns):
+            self._finish()
+            return
+        try:
+            vertices = self._plans[n].result()
+        except Exception as ex:
+            logger.error(f'Could not plan job {n}: {ex}')
+            self._finish()
+            return
+        self._current = n
+        pattern = self.patterns[n]
+        pattern.dataReady.connect(self._onDataReady)
+        pattern.stateChanged.connect(self._onStateChanged)
+        self.jobStarted.emit(n)
+        pattern.scan(vertices)
+
+    @QtCore.Slot(object)
+    def _onDataReady(self, data: np.ndarray) -> None:
+        pattern = self.pattern
+        if pattern is None or not pattern.scanning():
+            return
+        row = {'t': float(data[2]), 'x': float(data[0]), 'y': float(data[1])}
+        row |= dict(zip(pattern.fields, map(float, data[3:])))
+        self.results[self._current].append(row)
+        self.dataReady.emit(self._current, row)
+
+    @QtCore.Slot(object)
+    def _onStateChanged(self, state: ScanState) -> None:
+        if state != ScanState.IDLE:
+            self.stateChanged.emit(state)
+            return
+        n = self._current
+        pattern = self.patterns[n]
+        pattern.dataReady.disconnect(self._onDataReady)
+        pattern.stateChanged.disconnect(self._onStateChanged)
+        if self._aborted:
+            self._finish()
+            return
+        if not pattern.completed:
+            logger.error(f'Job {n} stopped before completing: '
+                         'stopping the queue')
+            self.jobFailed.emit(n)
+            self._finish()
+            return
+        self.jobFinished.emit(n)
+        # Let the finished job unwind before starting the next
+        QtCore.QTimer.singleShot(0, lambda: self._startJob(n + 1))
+
+    def _finish(self) -> None:
+        self._current = -1
+        self.finished.emit()
+
+    @QtCore.Slot()
+    def toggle(self) -> None:
+        '''Pause or resume the running job.'''
+        if self.pattern is not None and self.pattern.active():
+            self.pattern.toggle()
+
+    @QtCore.Slot()
+    def abort(self) -> None:
+        '''Abandon the running job and drop the rest.
+
+        The polargraph stops where it is.
+        '''
+        if not self.running():
+            return
+        self._aborted = True
+        self.pattern.abandon()
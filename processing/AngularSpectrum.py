@@ -0,0 +1,261 @@
+'''AngularSpectrum — FFT-based propagation of measured wavefields.
+
+A continuous-wave hologram recorded by the scanner is the complex
+amplitude ``ψ(x, y, 0)`` of the pressure field in the scan plane.  The
+field in any parallel plane a distance ``z`` away follows from the
+angular-spectrum representation
+
+.. math::
+
+    ψ(x, y, z) = \\mathcal{F}^{-1}\\left\\{
+        \\mathcal{F}\\{ψ(x, y, 0)\\}\\, H(k_x, k_y; z) \\right\\},
+    \\qquad
+    H = \\exp\\left(i z \\sqrt{k^2 - k_x^2 - k_y^2}\\right),
+
+where ``k = 2π/λ``.  Negative ``z`` back-propagates toward the source.
+Evanescent components (``k_x² + k_y² > k²``) are discarded so that
+back-propagation does not amplify noise.
+
+:class:`AngularSpectrum` caches ``H`` for each plane, so refocusing the
+same geometry repeatedly costs one multiply and one inverse FFT.  A
+depth stack reuses a single forward FFT of the hologram for all planes
+and evaluates the inverse transforms in batches.
+
+The hologram typically comes from gridding a scan::
+
+    grid = Resampler.forPattern(pattern, dtype=complex)
+    grid.add(x, y, amplitude * np.exp(1j * phase))
+    propagator = AngularSpectrum.forGrid(grid, wavelength=c / f)
+    volume = propagator.stack(grid.image, np.linspace(-0.2, 0., 41))
+'''
+
+from __future__ import annotations
+
+from collections import OrderedDict
+import numpy as np
+import numpy.typing as npt
+
+
+class AngularSpectrum:
+
+    '''Angular-spectrum propagator for a fixed sampling geometry.
+
+    Parameters
+    ----------
+    shape : tuple of int
+        ``(nx, ny)`` shape of the holograms to be propagated.
+    spacing : float
+        Pixel spacing of the holograms [m].
+    wavelength : float
+        Wavelength in the propagation medium [m].
+    padding : int, optional
+        Number of zero-valued pixels added on every side of the hologram
+        before transforming, to suppress wrap-around from the periodic
+        FFT.  Default: 0.
+    cachesize : int, optional
+        Maximum number of transfer functions kept in the cache.
+        Default: 64.
+
+    Properties
+    ----------
+    k : float
+        Wavenumber ``2π/λ`` [1/m].
+    padded_shape : tuple of int
+        Shape of the padded arrays used for the transforms.
+
+    Methods
+    -------
+    transfer(z)
+        Return the (cached) transfer function for displacement ``z``.
+    spectrum(hologram)
+        Return the angular spectrum of a hologram.
+    propagate(hologram, z)
+        Return the field in the plane at displacement ``z``.
+    stack(hologram, zs)
+        Return the fields in a sequence of planes.
+    '''
+
+    def __init__(self,
+                 shape: tuple[int, int],
+                 spacing: float,
+                 wavelength: float,
+                 padding: int = 0,
+                 cachesize: int = 64) -> None:
+        if spacing <= 0. or wavelength <= 0.:
+            raise ValueError('spacing and wavelength must be positive')
+        self._shape = tuple(int(n) for n in shape)
+        self._spacing = float(spacing)
+        self._wavelength = float(wavelength)
+        self._padding = max(int(padding), 0)
+        self._cachesize = max(int(cachesize), 1)
+        self._cache = OrderedDict()
+        nx, ny = self.padded_shape
+        kx = 2. * np.pi * np.fft.fftfreq(nx, d=self._spacing)
+        ky = 2. * np.pi * np.fft.fftfreq(ny, d=self._spacing)
+        kzsq = self.k**2 - kx[:, None]**2 - ky[None, :]**2
+        self._propagating = kzsq > 0.
+        self._kz = np.sqrt(np.where(self._propagating, kzsq, 0.))
+
+    @classmethod
+    def forGrid(cls, grid, wavelength: float,
+                **kwargs) -> AngularSpectrum:
+        '''Return a propagator matching a gridded hologram.
+
+        Parameters
+        ----------
+        grid : Resampler or GridAccumulator
+            Any object with ``shape`` and ``spacing`` attributes.
+        wavelength : float
+            Wavelength in the propagation medium [m].
+        **kwargs
+            ``padding`` and ``cachesize``.
+        '''
+        return cls(grid.shape, grid.spacing, wavelength, **kwargs)
+
+    @property
+    def shape(self) -> tuple[int, int]:
+        '''Shape ``(nx, ny)`` of the holograms.'''
+        return self._shape
+
+    @property
+    def spacing(self) -> float:
+        '''Pixel spacing [m].'''
+        return self._spacing
+
+    @property
+    def wavelength(self) -> float:
+        '''Wavelength in the propagation medium [m].'''
+        return self._wavelength
+
+    @property
+    def padding(self) -> int:
+        '''Zero padding added on every side [pixels].'''
+        return self._padding
+
+    @property
+    def k(self) -> float:
+        '''Wavenumber [1/m].'''
+        return 2. * np.pi / self._wavelength
+
+    @property
+    def padded_shape(self) -> tuple[int, int]:
+        '''Shape of the padded transform arrays.'''
+        nx, ny = self._shape
+        p = 2 * self._padding
+        return (nx + p, ny + p)
+
+    def transfer(self, z: float) -> np.ndarray:
+        '''Return the transfer function for displacement *z*.
+
+        Results are cached, least recently used first out, so repeated
+        propagation to the same plane does not recompute the
+        exponential.
+
+        Parameters
+        ----------
+        z : float
+            Displacement from the hologram plane [m].  Negative values
+            back-propagate toward the source.
+
+        Returns
+        -------
+        numpy.ndarray
+            Complex transfer function with shape :attr:`padded_shape`.
+        '''
+        z = float(z)
+        h = self._cache.get(z)
+        if h is not None:
+            self._cache.move_to_end(z)
+            return h
+        h = np.where(self._propagating, np.exp(1j * z * self._kz), 0.)
+        h.flags.writeable = False
+        self._cache[z] = h
+        if len(self._cache) > self._cachesize:
+            self._cache.popitem(last=False)
+        return h
+
+    def spectrum(self, hologram: npt.ArrayLike) -> np.ndarray:
+        '''Return the angular spectrum of *hologram*.
+
+        ``NaN`` pixels, such as unvisited grid nodes, are treated as
+        zero.  The hologram is zero-padded by :attr:`padding` on every
+        side before transforming.
+
+        Parameters
+        ----------
+        hologram : array-like
+            Complex field with shape :attr:`shape`.
+
+        Returns
+        -------
+        numpy.ndarray
+            Two-dimensional FFT with shape :attr:`padded_shape`.
+        '''
+        hologram = np.asarray(hologram)
+        if hologram.shape != self._shape:
+            raise ValueError(f'hologram shape {hologram.shape} does not '
+                             f'match propagator shape {self._shape}')
+        field = np.nan_to_num(hologram.astype(complex))
+        p = self._padding
+        if p:
+            field = np.pad(field, p)
+        return np.fft.fft2(field)
+
+    def _crop(self, fields: np.ndarray) -> np.ndarray:
+        p = self._padding
+        if p:
+            return fields[..., p:-p, p:-p]
+        return fields
+
+    def propagate(self, hologram: npt.ArrayLike, z: float) -> np.ndarray:
+        '''Return the field in the plane at displacement *z*.
+
+        Parameters
+        ----------
+        hologram : array-like
+            Complex field with shape :attr:`shape`.
+        z : float
+            Displacement from the hologram plane [m].
+
+        Returns
+        -------
+        numpy.ndarray
+            Complex field with shape :attr:`shape`.
+        '''
+        spectrum = self.spectrum(hologram)
+        return self._crop(np.fft.ifft2(spectrum * self.transfer(z)))
+
+    def stack(self, hologram: npt.ArrayLike, zs: npt.ArrayLike,
+              batch: int = 8) -> np.ndarray:
+        '''Return the fields in a sequence of planes.
+
+        The hologram is transformed once; each batch of planes is then
+        evaluated with a single multiply and a single batched inverse
+        FFT.
+
+        Parameters
+        ----------
+        hologram : array-like
+            Complex field with shape :attr:`shape`.
+        zs : array-like
+            Plane displacements [m].
+        batch : int, optional
+            Number of planes transformed together.  Larger batches are
+            faster but use proportionally more memory.  Default: 8.
+
+        Returns
+        -------
+        numpy.ndarray
+            ``(nz, nx, ny)`` complex fields.
+        '''
+        zs = np.atleast_1d(np.asarray(zs, dtype=float))
+        spectrum = self.spectrum(hologram)
+        nx, ny = self._shape
+        volume = np.empty((len(zs), nx, ny), dtype=complex)
+        batch = max(int(batch), 1)
+        for start in range(0, len(zs), batch):
+            planes = zs[start:start + batch]
+            h = np.stack([self.transfer(z) for z in planes])
+            fields = np.fft.ifft2(spectrum * h, axes=(-2, -1))
+            volume[start:start + len(planes)] = self._crop(fields)
+        return volume
@@ -0,0 +1,269 @@
+'''Resampler — regrid scattered scan samples onto a Cartesian grid.
+
+Samples from :class:`~QPolargraph.patterns.PolarScan.PolarScan` and
+:class:`~QPolargraph.patterns.TarzanScan.TarzanScan` lie along arcs, not
+on a regular grid.  :class:`Resampler` estimates the value at each node
+of a regular grid as the Gaussian-weighted mean of the samples within a
+fixed radius of the node.
+
+Rather than searching for the samples near each node, every sample is
+*splatted* onto the few grid nodes inside its radius.  Because the grid
+is regular, those nodes follow directly from the sample position, so the
+grid acts as its own spatial index: the cost is proportional to the
+number of samples times the (small, fixed) number of nodes per kernel,
+independent of the grid size.  Weighted sums are additive, so samples
+can be processed in chunks of bounded size — for example, slices of a
+:class:`numpy.memmap` holding a scan that does not fit in memory::
+
+    data = np.load('scan.npy', mmap_mode='r')
+    image = resample(data['x'], data['y'], data['value'],
+                     rect=pattern.rect, spacing=2e-3)
+
+Node ``(ix, iy)`` sits at the center of the corresponding
+:class:`~QPolargraph.lib.GridAccumulator.GridAccumulator` pixel, so
+both classes produce arrays with the same shape and layout for the same
+rectangle and spacing.
+'''
+
+from __future__ import annotations
+
+from collections.abc import Iterable
+from typing import TYPE_CHECKING
+import numpy as np
+import numpy.typing as npt
+
+if TYPE_CHECKING:
+    from QPolargraph.patterns.QScanPattern import QScanPattern
+
+
+class Resampler:
+
+    '''Chunked Gaussian-kernel gridding of scattered samples.
+
+    Parameters
+    ----------
+    rect : sequence of float
+        Bounding rectangle ``[x1, y1, x2, y2]`` of the grid [m].
+    spacing : float
+        Grid node spacing [m].
+    radius : float, optional
+        Radius of influence of each sample [m].  Nodes farther than
+        this from every sample are ``NaN`` in the result.
+        Default: ``spacing``.
+    sigma : float, optional
+        Standard deviation of the Gaussian weight [m].
+        Default: ``radius / 2``.
+    dtype : numpy.dtype, optional
+        Data type of the sample values; may be complex.
+        Default: ``float``.
+
+    Properties
+    ----------
+    shape : tuple of int
+        ``(nx, ny)`` number of grid nodes along ``x`` and ``y``.
+    weight : numpy.ndarray
+        Accumulated kernel weight at each node.
+    image : numpy.ndarray
+        Weighted mean at each node; ``NaN`` where the weight is zero.
+
+    Methods
+    -------
+    add(x, y, value)
+        Splat a chunk of samples onto the grid.
+    addChunks(chunks)
+        Splat every ``(x, y, value)`` chunk from an iterable.
+    nodes()
+        Return the node coordinates.
+    clear()
+        Discard all accumulated samples.
+    '''
+
+    def __init__(self,
+                 rect: npt.ArrayLike,
+                 spacing: float,
+                 radius: float | None = None,
+                 sigma: float | None = None,
+                 dtype: npt.DTypeLike = float) -> None:
+        if spacing <= 0.:
+            raise ValueError(f'spacing must be positive: {spacing}')
+        x1, y1, x2, y2 = (float(v) for v in rect)
+        self._rect = (x1, y1, x2, y2)
+        self._spacing = float(spacing)
+        self._radius = float(radius or spacing)
+        self._sigma = float(sigma or self._radius / 2.)
+        nx = max(int(np.ceil((x2 - x1) / spacing - 1e-9)), 1)
+        ny = max(int(np.ceil((y2 - y1) / spacing - 1e-9)), 1)
+        self._shape = (nx, ny)
+        self._dtype = np.dtype(dtype)
+        self._weight = np.zeros(nx * ny)
+        self._total = np.zeros(nx * ny, dtype=self._dtype)
+        # Node offsets that can lie within the kernel radius
+        k = int(np.ceil(self._radius / self._spacing))
+        di, dj = np.mgrid[-k:k + 1, -k:k + 1]
+        self._di = di.ravel()
+        self._dj = dj.ravel()
+
+    @classmethod
+    def forPattern(cls, pattern: QScanPattern,
+                   spacing: float | None = None,
+                   **kwargs) -> Resampler:
+        '''Return a resampler covering ``pattern.rect``.
+
+        Parameters
+        ----------
+        pattern : QScanPattern
+            Scan pattern whose rectangle sets the grid.
+        spacing : float, optional
+            Grid node spacing [m].  Default: ``pattern.step``.
+        **kwargs
+            Passed to the constructor.
+        '''
+        spacing = spacing or pattern.step * 1e-3
+        return cls(pattern.rect, spacing, **kwargs)
+
+    @property
+    def rect(self) -> tuple[float, float, float, float]:
+        '''Bounding rectangle ``(x1, y1, x2, y2)`` of the grid [m].'''
+        return self._rect
+
+    @property
+    def spacing(self) -> float:
+        '''Grid node spacing [m].'''
+        return self._spacing
+
+    @property
+    def radius(self) -> float:
+        '''Radius of influence of each sample [m].'''
+        return self._radius
+
+    @property
+    def shape(self) -> tuple[int, int]:
+        '''Number of grid nodes ``(nx, ny)`` along ``x`` and ``y``.'''
+        return self._shape
+
+    @property
+    def weight(self) -> np.ndarray:
+        '''Accumulated kernel weight at each node.'''
+        return self._weight.reshape(self._shape).copy()
+
+    @property
+    def image(self) -> np.ndarray:
+        '''Weighted mean at each node; ``NaN`` where the weight is zero.'''
+        image = np.full(self._total.shape, np.nan, dtype=self._dtype)
+        np.divide(self._total, self._weight, out=image,
+                  where=self._weight > 0.)
+        return image.reshape(self._shape)
+
+    def nodes(self) -> tuple[np.ndarray, np.ndarray]:
+        '''Return the node coordinates ``(x, y)`` [m].
+
+        Returns
+        -------
+        tuple of numpy.ndarray
+            1-D arrays of length ``nx`` and ``ny``.
+        '''
+        x1, y1, _, _ = self._rect
+        nx, ny = self._shape
+        h = self._spacing
+        return (x1 + (np.arange(nx) + 0.5) * h,
+                y1 + (np.arange(ny) + 0.5) * h)
+
+    def add(self, x: npt.ArrayLike, y: npt.ArrayLike,
+            value: npt.ArrayLike) -> None:
+        '''Splat a chunk of samples onto the grid.
+
+        Memory use is proportional to the chunk length times the number
+        of nodes within the kernel radius.
+
+        Parameters
+        ----------
+        x : array-like
+            Horizontal coordinates [m].
+        y : array-like
+            Vertical coordinates [m].
+        value : array-like
+            Sample values, broadcast against ``x`` and ``y``.
+        '''
+        x, y, value = np.broadcast_arrays(
+            np.atleast_1d(np.asarray(x, dtype=float)),
+            np.atleast_1d(np.asarray(y, dtype=float)),
+            np.atleast_1d(np.asarray(value, dtype=self._dtype)))
+        if x.size == 0:
+            return
+        x1, y1, _, _ = self._rect
+        nx, ny = self._shape
+        h = self._spacing
+        # Fractional node coordinates of each sample
+        u = (x - x1) / h - 0.5
+        v = (y - y1) / h - 0.5
+        ii = np.rint(u).astype(np.int64)[:, None] + self._di
+        jj = np.rint(v).astype(np.int64)[:, None] + self._dj
+        d2 = ((ii - u[:, None])**2 + (jj - v[:, None])**2) * h * h
+        valid = ((d2 <= self._radius**2) &
+                 (ii >= 0) & (ii < nx) & (jj >= 0) & (jj < ny))
+        w = np.exp(-d2[valid] / (2. * self._sigma**2))
+        flat = ii[valid] * ny + jj[valid]
+        wv = w * np.broadcast_to(value[:, None], valid.shape)[valid]
+        n = nx * ny
+        self._weight += np.bincount(flat, w, minlength=n)
+        if np.iscomplexobj(self._total):
+            self._total.real += np.bincount(flat, wv.real, minlength=n)
+            self._total.imag += np.bincount(flat, wv.imag, minlength=n)
+        else:
+            self._total += np.bincount(flat, wv, minlength=n)
+
+    def addChunks(self, chunks: Iterable[tuple]) -> None:
+        '''Splat every ``(x, y, value)`` chunk from an iterable.
+
+        Suitable for streaming scans that are larger than memory, or for
+        folding in data as it is acquired.
+        '''
+        for x, y, value in chunks:
+            self.add(x, y, value)
+
+    def clear(self) -> None:
+        '''Discard all accumulated samples.'''
+        self._weight[...] = 0.
+        self._total[...] = 0
+
+
+def resample(x: npt.ArrayLike, y: npt.ArrayLike, value: npt.ArrayLike,
+             rect: npt.ArrayLike, spacing: float,
+             chunksize: int = 1 << 16,
+             **kwargs) -> np.ndarray:
+    '''Grid scattered samples onto a regular Cartesian grid.
+
+    The inputs are read ``chunksize`` samples at a time, so they may be
+    memory-mapped arrays larger than the available RAM.
+
+    Parameters
+    ----------
+    x, y : array-like
+        Sample coordinates [m].
+    value : array-like
+        Sample values; may be complex.
+    rect : sequence of float
+        Bounding rectangle ``[x1, y1, x2, y2]`` of the grid [m].
+    spacing : float
+        Grid node spacing [m].
+    chunksize : int, optional
+        Number of samples processed at a time.  Default: 65536.
+    **kwargs
+        ``radius``, ``sigma``, and ``dtype`` for :class:`Resampler`.
+        ``dtype`` defaults to that of *value*.
+
+    Returns
+    -------
+    numpy.ndarray
+        ``(nx, ny)`` gridded values, ``NaN`` where no sample is within
+        ``radius`` of a node.
+    '''
+    value = value if hasattr(value, 'dtype') else np.asarray(value)
+    kwargs.setdefault('dtype', np.result_type(value.dtype, float))
+    resampler = Resampler(rect, spacing, **kwargs)
+    n = len(x)
+    resampler.addChunks((x[i:i + chunksize],
+                         y[i:i + chunksize],
+                         value[i:i + chunksize])
+                        for i in range(0, n, chunksize))
+    return resampler.image
@@ -0,0 +1,344 @@
+'''TrackAligner — place independently timed samples on the scan path.
+
+The scanner reports its position as a track of ``(x, y, t)`` polls
+through :attr:`~QPolargraph.patterns.QScanPattern.QScanPattern.dataReady`.
+An instrument that samples on its own clock produces ``(t, value)``
+records whose timestamps fall between those polls.  :class:`TrackAligner`
+interpolates the track at the instrument timestamps.
+
+A polargraph moves each belt at a steady rate between waypoints, so the
+payload follows a curve in Cartesian coordinates but a straight line in
+motor-step coordinates.  When the aligner is given the polargraph, it
+interpolates in step space and converts back with
+:meth:`~QPolargraph.hardware.Polargraph.Polargraph.i2r`, which places
+samples on the true arc instead of on the chord between polls.  The
+timestamps emitted by
+:attr:`~QPolargraph.patterns.QScanPattern.QScanPattern.vertexReached`
+mark where the payload came to rest on a waypoint.  Samples timed
+between such a rest and the start of the next move are held at the
+waypoint rather than interpolated across the corner.
+
+Both streams may arrive in chunks.  Instrument samples are queued until
+the track covers their timestamps, and :meth:`TrackAligner.aligned`
+returns the ones that can be placed.  Track history that is no longer
+needed is discarded, so memory use stays bounded during a live scan::
+
+    aligner = TrackAligner(polargraph)
+    pattern.dataReady.connect(aligner.addPosition)
+    pattern.vertexReached.connect(aligner.addBoundary)
+    # whenever the instrument delivers a block:
+    aligner.addSamples(t_block, values_block)
+    t, x, y, values = aligner.aligned()
+'''
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+import numpy as np
+import numpy.typing as npt
+
+if TYPE_CHECKING:
+    from QPolargraph.hardware.Polargraph import Polargraph
+
+
+class TrackAligner:
+
+    '''Streaming interpolation of a position track at instrument times.
+
+    Parameters
+    ----------
+    polargraph : Polargraph, optional
+        Geometry used to interpolate in motor-step space.  If omitted,
+        the track is interpolated linearly in Cartesian coordinates.
+
+    Properties
+    ----------
+    span : tuple of float
+        Timestamps ``(first, last)`` of the retained track [s], or
+        ``(nan, nan)`` when the track is empty.
+    pending : int
+        Number of queued instrument samples not yet returned by
+        :meth:`aligned`.
+
+    Methods
+    -------
+    addPosition(data)
+        Append one ``(x, y, t, ...)`` poll; slot for ``dataReady``.
+    addTrack(t, x, y)
+        Append a chunk of position polls.
+    addBoundary(t)
+        Mark the end of a motion segment; slot for ``vertexReached``.
+    interpolate(t)
+        Return the position at each timestamp in *t*.
+    addSamples(t, values)
+        Queue a chunk of instrument samples.
+    aligned(flush=False)
+        Return the queued samples that the track now covers.
+    clear()
+        Discard the track, boundaries, and queued samples.
+    '''
+
+    def __init__(self, polargraph: Polargraph | None = None) -> None:
+        self.polargraph = polargraph
+        self.clear()
+
+    @property
+    def span(self) -> tuple[float, float]:
+        '''Timestamps of the first and last retained polls [s].'''
+        self._joinTrack()
+        if len(self._t) == 0:
+            return (np.nan, np.nan)
+        return (float(self._t[0]), float(self._t[-1]))
+
+    @property
+    def pending(self) -> int:
+        '''Number of queued instrument samples.'''
+        return len(self._pending_t) + sum(len(t) for t, _ in self._chunks)
+
+    def clear(self) -> None:
+        '''Discard the track, boundaries, and queued samples.'''
+        self._t = np.empty(0)
+        self._u = np.empty((0, 2))
+        # Chunks are joined when read, so that appending stays O(1)
+        self._polls = []
+        self._last = -np.inf
+        self._bounds = np.empty(0)
+        self._pending_t = np.empty(0)
+        self._pending_v = None
+        self._chunks = []
+
+    def _toTrack(self, x: np.ndarray, y: np.ndarray) -> np.ndarray:
+        '''Map Cartesian positions to interpolation coordinates.'''
+        if self.polargraph is None:
+            return np.column_stack([x, y])
+        return np.column_stack(self.polargraph.r2f(x, y))
+
+    def _fromTrack(self, u: np.ndarray) -> np.ndarray:
+        '''Map interpolation coordinates back to Cartesian ``(2, n)``.'''
+        if self.polargraph is None:
+            return u.T.copy()
+        xy = np.full((2, len(u)), np.nan)
+        ok = np.isfinite(u[:, 0])
+        xy[:, ok] = self.polargraph.i2r(u[ok, 0], u[ok, 1])
+        return xy
+
+    def addPosition(self, data: npt.ArrayLike) -> None:
+        '''Append one position poll.
+
+        Parameters
+        ----------
+        data : array-like
+            ``(x, y, t, ...)`` as emitted by
+            :attr:`~QPolargraph.patterns.QScanPattern.QScanPattern.dataReady`.
+            Values after ``t`` are ignored.
+        '''
+        x, y, t = data[:3]
+        self.addTrack(t, x, y)
+
+    def addTrack(self, t: npt.ArrayLike, x: npt.ArrayLike,
+                 y: npt.ArrayLike) -> None:
+        '''Append a chunk of position polls.
+
+        Polls must arrive in time order.  Polls that are not later than
+        the last retained poll are ignored.
+
+        Parameters
+        ----------
+        t : array-like
+            Poll timestamps [s].
+        x : array-like
+            Horizontal coordinates [m].
+        y : array-like
+            Vertical coordinates [m].
+        '''
+        t, x, y = np.broadcast_arrays(
+            np.atleast_1d(np.asarray(t, dtype=float)),
+            np.atleast_1d(np.asarray(x, dtype=float)),
+            np.atleast_1d(np.asarray(y, dtype=float)))
+        keep = t > self._last
+        t, x, y = t[keep], x[keep], y[keep]
+        if t.size == 0:
+            return
+        self._polls.append((t, self._toTrack(x, y)))
+        self._last = t[-1]
+
+    def _joinTrack(self) -> None:
+        '''Append the polls received since the last read to the track.'''
+        if not self._polls:
+            return
+        t, u = zip(*self._polls)
+        self._t = np.concatenate([self._t, *t])
+        self._u = np.concatenate([self._u, *u])
+        self._polls = []
+
+    def addBoundary(self, t: float) -> None:
+        '''Mark the end of a motion segment.
+
+        Parameters
+        ----------
+        t : float
+            Timestamp [s] of the poll at which the payload came to rest.
+            Samples between this poll and the next are held at its
+            position.
+        '''
+        self._bounds = np.append(self._bounds, float(t))
+
+    def interpolate(self, t: npt.ArrayLike) -> np.ndarray:
+        '''Return the position at each timestamp.
+
+        Parameters
+        ----------
+        t : array-like
+            Timestamps [s].
+
+        Returns
+        -------
+        numpy.ndarray
+            ``(2, n)`` array of ``(x, y)`` positions [m].  Timestamps
+            outside :attr:`span` yield ``NaN``.
+        '''
+        t = np.atleast_1d(np.asarray(t, dtype=float))
+        u = np.full((len(t), 2), np.nan)
+        self._joinTrack()
+        tt = self._t
+        if len(tt) == 0:
+            return u.T.copy()
+        inside = (t >= tt[0]) & (t <= tt[-1])
+        if len(tt) == 1:
+            u[inside] = self._u[0]
+            return self._fromTrack(u)
+        i = np.clip(np.searchsorted(tt, t, side='right') - 1,
+                    0, len(tt) - 2)
+        j = i + 1
+        frac = np.clip((t - tt[i]) / (tt[j] - tt[i]), 0., 1.)
+        # Hold position across the rest at the end of a segment
+        rest = (np.searchsorted(self._bounds, tt[i]) !=
+                np.searchsorted(self._bounds, tt[j]))
+        frac[rest] = 0.
+        ui = self._u[i] + frac[:, None] * (self._u[j] - self._u[i])
+        u[inside] = ui[inside]
+        return self._fromTrack(u)
+
+    def addSamples(self, t: npt.ArrayLike, values: npt.ArrayLike) -> None:
+        '''Queue a chunk of instrument samples.
+
+        Parameters
+        ----------
+        t : array-like
+            Sample timestamps [s] on the :func:`time.monotonic` clock.
+        values : array-like
+            Sample values.  The first axis must match *t*; later chunks
+            must have the same trailing shape.
+        '''
+        t = np.atleast_1d(np.asarray(t, dtype=float))
+        values = np.asarray(values)
+        if values.ndim == 0:
+            values = np.broadcast_to(values, t.shape)
+        if len(values) != len(t):
+            raise ValueError(f'got {len(values)} values for '
+                             f'{len(t)} timestamps')
+        if self._chunks:
+            shape = self._chunks[-1][1].shape[1:]
+        elif self._pending_v is not None and len(self._pending_v):
+            shape = self._pending_v.shape[1:]
+        else:
+            shape = values.shape[1:]
+        if values.shape[1:] != shape:
+            raise ValueError(f'got values of shape {values.shape[1:]} '
+                             f'after {shape}')
+        self._chunks.append((t, values.copy()))
+
+    def _joinSamples(self) -> None:
+        '''Append the samples queued since the last read to the queue.'''
+        if not self._chunks:
+            return
+        t, values = zip(*self._chunks)
+        if self._pending_v is not None and len(self._pending_v):
+            values = (self._pending_v, *values)
+        self._pending_t = np.concatenate([self._pending_t, *t])
+        self._pending_v = np.concatenate(values)
+        self._chunks = []
+
+    def aligned(self, flush: bool = False) -> tuple[np.ndarray, ...]:
+        '''Return the queued samples that the track now covers.
+
+        Samples timed at or before the last poll are positioned and
+        removed from the queue; later samples wait for more of the
+        track.  Track history older than the remaining queue is then
+        discarded.
+
+        Parameters
+        ----------
+        flush : bool, optional
+            If ``True``, return every queued sample.  Samples beyond
+            the end of the track are given ``NaN`` positions.
+            Use after the scan has finished.  Default: ``False``.
+
+        Returns
+        -------
+        tuple of numpy.ndarray
+            ``(t, x, y, values)`` for the returned samples, in the order
+            they were queued.
+        '''
+        self._joinSamples()
+        t = self._pending_t
+        if flush or not np.isfinite(self._last):
+            ready = np.full(len(t), flush)
+        else:
+            ready = t <= self._last
+        values = self._pending_v
+        if values is None:
+            values = np.empty(0)
+        x, y = self.interpolate(t[ready])
+        result = (t[ready], x, y, values[ready])
+        self._pending_t = t[~ready]
+        self._pending_v = values[~ready]
+        self._trim()
+        return result
+
+    def _trim(self) -> None:
+        '''Drop polls and boundaries older than any queued sample.'''
+        if len(self._t) < 2:
+            return
+        if len(self._pending_t):
+            tmin = min(self._pending_t.min(), self._t[-1])
+        else:
+            tmin = self._t[-1]
+        start = max(np.searchsorted(self._t, tmin, side='right') - 1, 0)
+        if start:
+            self._t = self._t[start:]
+            self._u = self._u[start:]
+            self._bounds = self._bounds[self._bounds >= self._t[0]]
+
+
+def align(track_t: npt.ArrayLike, track_x: npt.ArrayLike,
+          track_y: npt.ArrayLike, t: npt.ArrayLike,
+          boundaries: npt.ArrayLike = (),
+          polargraph: Polargraph | None = None) -> np.ndarray:
+    '''Interpolate a recorded position track at instrument timestamps.
+
+    Parameters
+    ----------
+    track_t, track_x, track_y : array-like
+        Poll timestamps [s] and positions [m] of a completed scan, for
+        example the ``'t'``, ``'x'``, and ``'y'`` columns of
+        :attr:`QPolargraph.QScanner.QScanner.samples`.
+    t : array-like
+        Instrument timestamps [s].
+    boundaries : array-like, optional
+        Timestamps of
+        :attr:`~QPolargraph.patterns.QScanPattern.QScanPattern.vertexReached`.
+    polargraph : Polargraph, optional
+        Geometry used to interpolate in motor-step space.
+
+    Returns
+    -------
+    numpy.ndarray
+        ``(2, n)`` array of ``(x, y)`` positions [m], ``NaN`` outside
+        the recorded track.
+    '''
+    aligner = TrackAligner(polargraph)
+    aligner.addTrack(track_t, track_x, track_y)
+    for b in np.atleast_1d(np.asarray(boundaries, dtype=float)):
+        aligner.addBoundary(b)
+    return aligner.interpolate(t)
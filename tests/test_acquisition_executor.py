@@ -0,0 +1,100 @@
+import threading
+import time
+import pytest
+from QPolargraph.lib.AcquisitionExecutor import (AcquisitionExecutor,
+                                                 AcquisitionStats)
+from QPolargraph.patterns.QScanPattern import QScanPattern
+
+
+@pytest.fixture
+def executor():
+    ex = AcquisitionExecutor(read=lambda t, x, y: x + y, maxsize=2)
+    yield ex
+    ex.shutdown()
+
+
+def wait_idle(ex, timeout=2.):
+    deadline = time.monotonic() + timeout
+    while ex.pending and time.monotonic() < deadline:
+        time.sleep(1e-3)
+
+
+def test_result_paired_with_poll(executor, qtbot):
+    rows = []
+    executor.dataReady.connect(rows.append)
+    assert executor.submit(1.5, 0.1, 0.2)
+    wait_idle(executor)
+    qtbot.waitUntil(lambda: len(rows) == 1, timeout=1000)
+    row = rows[0]
+    assert (row['t'], row['x'], row['y']) == (1.5, 0.1, 0.2)
+    assert row['value'] == pytest.approx(0.3)
+    assert row['t_start'] <= row['t_end']
+
+
+def test_full_queue_drops_polls():
+    release = threading.Event()
+    ex = AcquisitionExecutor(read=lambda t, x, y: release.wait(),
+                             maxsize=2)
+    results = [ex.submit(time.monotonic(), 0., 0.) for _ in range(5)]
+    release.set()
+    ex.shutdown()
+    assert results == [True, True, False, False, False]
+    stats = ex.stats
+    assert stats.dropped == 3
+    assert stats.completed == 2
+    assert stats.peak_pending == 2
+    assert stats.saturated
+
+
+def test_block_waits_for_free_slot():
+    ex = AcquisitionExecutor(read=lambda t, x, y: time.sleep(0.01),
+                             maxsize=1, block=True)
+    for _ in range(3):
+        assert ex.submit(time.monotonic(), 0., 0.)
+    ex.shutdown()
+    stats = ex.stats
+    assert stats.completed == 3
+    assert stats.dropped == 0
+    assert stats.blocked > 0.
+
+
+def test_failed_read_is_counted():
+    def read(t, x, y):
+        raise IOError('timeout')
+    ex = AcquisitionExecutor(read=read)
+    ex.submit(time.monotonic(), 0., 0.)
+    ex.shutdown()
+    assert ex.stats.failed == 1
+    assert ex.pending == 0
+
+
+def test_latency_statistics(executor):
+    executor.submit(time.monotonic() - 1., 0., 0.)
+    wait_idle(executor)
+    stats = executor.stats
+    assert stats.mean_latency >= 1.
+    assert stats.max_latency >= stats.mean_latency
+    executor.resetStats()
+    assert executor.stats == AcquisitionStats()
+
+
+def test_submit_without_read_raises():
+    ex = AcquisitionExecutor()
+    with pytest.raises(ValueError):
+        ex.submit(0., 0., 0.)
+    ex.shutdown()
+
+
+def test_pattern_measures_off_polling_thread(polargraph):
+    threads = set()
+
+    class MeasuringScan(QScanPattern):
+        def _onMeasure(self, t, x, y):
+            threads.add(threading.current_thread())
+
+    executor = AcquisitionExecutor(maxsize=1000)
+    pattern = MeasuringScan(polargraph=polargraph, acquisition=executor)
+    pattern.scan()
+    executor.shutdown()
+    assert executor.stats.completed > 0
+    assert threading.current_thread() not in threads
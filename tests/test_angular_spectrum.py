@@ -0,0 +1,107 @@
+import numpy as np
+import pytest
+from QPolargraph.processing.AngularSpectrum import AngularSpectrum
+from QPolargraph.processing.Resampler import Resampler
+
+
+SHAPE = (64, 48)
+SPACING = 2e-3
+WAVELENGTH = 8e-3
+
+
+@pytest.fixture
+def propagator():
+    return AngularSpectrum(SHAPE, SPACING, WAVELENGTH)
+
+
+def plane_wave(theta: float) -> np.ndarray:
+    '''Plane wave tilted by *theta* in x, periodic on the grid.'''
+    nx, _ = SHAPE
+    k = 2. * np.pi / WAVELENGTH
+    kx = 2. * np.pi * np.round(k * np.sin(theta) * nx * SPACING /
+                               (2. * np.pi)) / (nx * SPACING)
+    x = np.arange(nx) * SPACING
+    return np.exp(1j * kx * x)[:, None] * np.ones(SHAPE), kx
+
+
+def test_zero_distance_is_identity(propagator):
+    h, _ = plane_wave(0.3)
+    field = propagator.propagate(h, 0.)
+    np.testing.assert_allclose(field, h, atol=1e-12)
+
+
+def test_plane_wave_phase(propagator):
+    h, kx = plane_wave(0.3)
+    z = 0.05
+    kz = np.sqrt(propagator.k**2 - kx**2)
+    field = propagator.propagate(h, z)
+    np.testing.assert_allclose(field, h * np.exp(1j * kz * z), atol=1e-9)
+
+
+def test_back_propagation_inverts_forward(propagator):
+    h, _ = plane_wave(0.2)
+    forward = propagator.propagate(h, 0.03)
+    back = propagator.propagate(forward, -0.03)
+    np.testing.assert_allclose(back, h, atol=1e-9)
+
+
+def test_evanescent_components_removed(propagator):
+    nx, ny = SHAPE
+    x = np.arange(nx)
+    h = np.exp(1j * np.pi * x)[:, None] * np.ones(SHAPE)  # Nyquist kx > k
+    field = propagator.propagate(h, -0.01)
+    assert np.abs(field).max() < 1e-12
+
+
+def test_transfer_cached(propagator):
+    a = propagator.transfer(0.01)
+    b = propagator.transfer(0.01)
+    assert a is b
+
+
+def test_transfer_cache_bounded():
+    p = AngularSpectrum(SHAPE, SPACING, WAVELENGTH, cachesize=2)
+    first = p.transfer(0.01)
+    p.transfer(0.02)
+    p.transfer(0.03)
+    assert p.transfer(0.01) is not first
+
+
+def test_transfer_read_only(propagator):
+    with pytest.raises(ValueError):
+        propagator.transfer(0.01)[0, 0] = 0.
+
+
+def test_stack_matches_single_planes(propagator):
+    rng = np.random.default_rng(1)
+    h = rng.normal(size=SHAPE) + 1j * rng.normal(size=SHAPE)
+    zs = np.linspace(-0.05, 0., 11)
+    volume = propagator.stack(h, zs, batch=4)
+    assert volume.shape == (11,) + SHAPE
+    for z, plane in zip(zs, volume):
+        np.testing.assert_allclose(plane, propagator.propagate(h, z),
+                                   atol=1e-12)
+
+
+def test_padding_shape():
+    p = AngularSpectrum(SHAPE, SPACING, WAVELENGTH, padding=8)
+    assert p.padded_shape == (80, 64)
+    h, _ = plane_wave(0.)
+    assert p.propagate(h, 0.01).shape == SHAPE
+
+
+def test_nan_pixels_treated_as_zero(propagator):
+    h = np.full(SHAPE, np.nan, dtype=complex)
+    assert np.all(propagator.propagate(h, 0.01) == 0.)
+
+
+def test_shape_mismatch_raises(propagator):
+    with pytest.raises(ValueError):
+        propagator.propagate(np.zeros((10, 10)), 0.01)
+
+
+def test_for_grid():
+    grid = Resampler([0., 0., 0.2, 0.1], 5e-3, dtype=complex)
+    p = AngularSpectrum.forGrid(grid, WAVELENGTH, padding=4)
+    assert p.shape == grid.shape
+    assert p.spacing == pytest.approx(grid.spacing)
@@ -0,0 +1,146 @@
+import numpy as np
+import pytest
+import time
+from QPolargraph.hardware.fake import FakePolargraph
+from QPolargraph.lib.ArcSampler import ArcSampler
+from QPolargraph.patterns.QScanPattern import QScanPattern, ScanState
+from QPolargraph.patterns.RasterScan import RasterScan
+
+
+@pytest.fixture
+def geometry():
+    return FakePolargraph(step_delay=0.)
+
+
+def polls(geometry, times, m, n):
+    '''Position polls with the motors at step offsets (m, n) from the
+    middle of the working area.'''
+    x, y = geometry.i2r(800. + np.asarray(m, float),
+                        -800. + np.asarray(n, float))
+    return zip(times, x, y)
+
+
+def test_first_poll_is_a_sample(geometry):
+    sampler = ArcSampler(geometry, 0.01)
+    x, y = geometry.i2r(100., -100.)
+    np.testing.assert_allclose(sampler.update(0., x, y), [[x, y, 0.]])
+
+
+def test_uniform_spacing_with_irregular_polls(geometry):
+    sampler = ArcSampler(geometry, 0.005)
+    times = np.cumsum([0., 0.01, 0.07, 0.02, 0.11, 0.03, 0.05])
+    m = np.interp(times, [0., times[-1]], [0., 400.])
+    n = np.interp(times, [0., times[-1]], [0., -150.])
+    samples = np.concatenate([sampler.update(*p)
+                              for p in polls(geometry, times, m, n)])
+    ds = np.hypot(np.diff(samples[:, 0]), np.diff(samples[:, 1]))
+    np.testing.assert_allclose(ds, 0.005, rtol=1e-3)
+    assert len(samples) > 2 * len(times)
+    assert len(samples) == int(sampler.length / 0.005) + 1
+
+
+def test_samples_lie_on_motor_path(geometry):
+    sampler = ArcSampler(geometry, 0.01)
+    p = list(polls(geometry, [0., 1.], [0., 400.], [0., 0.]))
+    sampler.update(*p[0])
+    samples = sampler.update(*p[1])
+    m, n = geometry.r2f(samples[:, 0], samples[:, 1])
+    np.testing.assert_allclose(n, -800., atol=1e-6)
+    np.testing.assert_allclose(samples[:, 2], (m - 800.) / 400., atol=1e-6)
+
+
+def test_predict_next_crossing(geometry):
+    sampler = ArcSampler(geometry, 0.01)
+    for p in polls(geometry, [0., 0.1], [0., 30.], [0., 0.]):
+        sampler.update(*p)
+    t, x, y = sampler.predict()
+    assert t > 0.1
+    ahead = ArcSampler(geometry, 0.01)
+    for p in polls(geometry, [0., 0.1, 0.2], [0., 30., 60.], [0., 0., 0.]):
+        expected = ahead.update(*p)
+    np.testing.assert_allclose([x, y, t], expected[-1], rtol=1e-4)
+
+
+def test_predict_respects_limit_and_horizon(geometry):
+    sampler = ArcSampler(geometry, 0.01)
+    for p in polls(geometry, [0., 0.1], [0., 30.], [0., 0.]):
+        sampler.update(*p)
+    assert sampler.predict(limit=1e-4) is None
+    sampler.spacing = 1.
+    sampler.advance()
+    assert sampler.predict() is None
+
+
+def test_advance_claims_predicted_sample(geometry):
+    sampler = ArcSampler(geometry, 0.01)
+    p = list(polls(geometry, [0., 0.1, 0.2], [0., 30., 60.], [0.] * 3))
+    sampler.update(*p[0])
+    sampler.update(*p[1])
+    sampler.advance()
+    assert len(sampler.update(*p[2])) == 0
+
+
+def test_restart_does_not_bridge_gap(geometry):
+    sampler = ArcSampler(geometry, 0.01)
+    p = list(polls(geometry, [0., 0.1, 5., 5.1],
+                   [0., 30., 300., 330.], [0., 0., 0., 0.]))
+    sampler.update(*p[0])
+    sampler.update(*p[1])
+    length = sampler.length
+    sampler.restart()
+    assert sampler.predict() is None
+    assert len(sampler.update(*p[2])) == 0
+    assert sampler.length == pytest.approx(length)
+    samples = sampler.update(*p[3])
+    assert np.all(samples[:, 2] >= 5.)
+
+
+def test_pause_interrupts_wait_for_prediction(geometry):
+    class Sampler:
+        def update(self, t, x, y):
+            return []
+
+        def predict(self, limit):
+            return (time.monotonic() + 10., 0., 0.2)
+
+    pattern = QScanPattern(polargraph=geometry)
+    pattern._arc = Sampler()
+    pattern._paused = True
+    rows = []
+    pattern.dataReady.connect(rows.append)
+    start = time.monotonic()
+    pattern._sampleArc(0., 0., 0.2, np.array([0.1, 0.2]))
+    assert time.monotonic() - start < 1.
+    assert rows == []
+
+
+def test_scan_samples_at_fixed_spacing(geometry):
+    pattern = QScanPattern(polargraph=geometry, sampleSpacing=20.)
+    rows = []
+    pattern.dataReady.connect(
+        lambda data: rows.append(data) if pattern.scanning() else None)
+    pattern.scan()
+    xy = np.array(rows)[:, :2]
+    ds = np.hypot(*np.diff(xy, axis=0).T)
+    x1, y1, x2, y2 = pattern.rect
+    perimeter = 2. * ((x2 - x1) + (y2 - y1))
+    assert len(rows) == pytest.approx(perimeter / 0.02 + 1, abs=2)
+    assert np.median(ds) == pytest.approx(0.02, rel=1e-2)
+    assert pattern._state == ScanState.IDLE
+
+
+def test_reads_are_taken_at_sample_points():
+    class Timed(RasterScan):
+        def _onMeasure(self, t, x, y):
+            if self.scanning():
+                lags.append(time.monotonic() - t)
+
+    lags, rows = [], []
+    pattern = Timed(polargraph=FakePolargraph(), width=0.02, height=0.02,
+                    step=10., sampleSpacing=0.3)
+    pattern.dataReady.connect(
+        lambda data: rows.append(data) if pattern.scanning() else None)
+    pattern.scan()
+    assert len(lags) + pattern.missedSamples == len(rows)
+    assert len(lags) > len(rows) / 2
+    assert max(lags) < 0.008
@@ -0,0 +1,130 @@
+import asyncio
+import threading
+import numpy as np
+import pytest
+from qtpy import QtCore
+from QPolargraph.hardware.fake import FakePolargraph
+from QPolargraph.patterns.AsyncScan import AsyncScan, scan_async
+from QPolargraph.patterns.QScanPattern import ScanState
+from QPolargraph.patterns.RasterScan import RasterScan
+
+
+@pytest.fixture
+def pattern():
+    return RasterScan(polargraph=FakePolargraph(step_delay=0.),
+                      width=0.1, height=0.1, step=20.)
+
+
+def collect(scan):
+    async def run():
+        return [batch async for batch in scan]
+    return asyncio.run(run())
+
+
+def test_rejects_unknown_cancel_action(pattern):
+    with pytest.raises(ValueError):
+        AsyncScan(pattern, cancel='stop')
+
+
+def test_yields_batches_of_samples(pattern):
+    batches = collect(scan_async(pattern, batch=64))
+    assert batches
+    assert all(b.ndim == 2 and b.shape[1] == 3 for b in batches)
+    assert all(len(b) <= 64 for b in batches)
+    assert sum(map(len, batches)) > 64
+    assert not pattern.active()
+
+
+def test_samples_match_data_ready(pattern):
+    expected = []
+    pattern.dataReady.connect(
+        lambda d: pattern.scanning() and expected.append(d.copy()),
+        QtCore.Qt.ConnectionType.DirectConnection)
+    batches = collect(scan_async(pattern, batch=32))
+    np.testing.assert_array_equal(np.vstack(batches), np.vstack(expected))
+
+
+def test_rows_are_delivered_at_waypoints(pattern):
+    reached = []
+    pattern.vertexReached.connect(
+        lambda *args: pattern.scanning() and reached.append(True),
+        QtCore.Qt.ConnectionType.DirectConnection)
+    batches = collect(scan_async(pattern, batch=10 ** 6, latency=1e6))
+    assert len(batches) >= len(reached) > 1
+
+
+def test_scan_thread_owns_pattern_and_polargraph(pattern):
+    home = pattern.thread()
+    owned = []
+    pattern.dataReady.connect(
+        lambda d: owned.append(
+            QtCore.QThread.currentThread() is pattern.thread() is
+            pattern.polargraph.thread() is not home),
+        QtCore.Qt.ConnectionType.DirectConnection)
+    collect(scan_async(pattern))
+    assert owned and all(owned)
+    assert pattern.thread() is home
+    assert pattern.polargraph.thread() is home
+
+
+def test_rejects_pattern_owned_by_another_thread(pattern):
+    thread = QtCore.QThread()
+    pattern.polargraph.moveToThread(thread)
+    with pytest.raises(RuntimeError):
+        collect(scan_async(pattern))
+    assert not pattern.active()
+
+
+def test_event_loop_stays_responsive(pattern):
+    ticks = []
+
+    async def run():
+        async def tick():
+            while True:
+                ticks.append(threading.current_thread())
+                await asyncio.sleep(0.001)
+        ticker = asyncio.create_task(tick())
+        async for _ in scan_async(pattern):
+            pass
+        ticker.cancel()
+
+    asyncio.run(run())
+    assert len(ticks) > 1
+    assert set(ticks) == {threading.main_thread()}
+
+
+def test_cancel_abandons_scan(pattern):
+    async def run():
+        scan = scan_async(pattern, batch=8)
+
+        async def consume():
+            async for _ in scan:
+                await asyncio.sleep(0)
+        task = asyncio.create_task(consume())
+        while scan.state is None:
+            await asyncio.sleep(0.001)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        await scan.aclose()
+        return scan
+
+    scan = asyncio.run(run())
+    assert scan.state == ScanState.IDLE
+    assert not pattern.active()
+
+
+def test_pause_then_resume(pattern):
+    async def run():
+        first = []
+        async with scan_async(pattern, batch=8, cancel='pause') as scan:
+            async for batch in scan:
+                first.append(batch)
+                break
+        rest = [b async for b in scan_async(pattern, batch=8, resume=True)]
+        return scan, first, rest
+
+    scan, first, rest = asyncio.run(run())
+    assert scan.state == ScanState.PAUSED
+    assert first and rest
+    assert not pattern.active()
@@ -0,0 +1,75 @@
+import numpy as np
+import pytest
+from QPolargraph.lib.DecimatedScatterItem import DecimatedScatterItem
+
+
+@pytest.fixture
+def item():
+    return DecimatedScatterItem(pen=None, binSize=0.01)
+
+
+def test_empty_initially(item):
+    assert item.nbins() == 0
+    assert len(item.data) == 0
+
+
+def test_one_spot_per_bin(item):
+    x = np.full(50, 0.005)
+    y = np.full(50, 0.005)
+    item.addSamples(x, y, np.linspace(0., 1., 50))
+    assert item.nbins() == 1
+    assert len(item.data) == 1
+
+
+def test_spot_count_bounded_by_bins(item):
+    rng = np.random.default_rng(0)
+    for _ in range(20):
+        x, y = rng.random((2, 500)) * 0.1
+        item.addSamples(x, y, rng.random(500))
+    assert item.nbins() <= 100
+    assert len(item.data) == item.nbins()
+
+
+def test_spots_at_bin_centers(item):
+    item.addSamples(0.012, 0.037, 0.5)
+    assert item.data['x'][0] == pytest.approx(0.015)
+    assert item.data['y'][0] == pytest.approx(0.035)
+
+
+def test_latest_mode_keeps_last_value(item):
+    item.addSamples([0.001, 0.002], [0.001, 0.002], [0.1, 0.6])
+    item.addSamples(0.003, 0.003, 0.3)
+    hue = item.data['brush'][0].color().hueF()
+    assert hue == pytest.approx(0.3, abs=0.01)
+
+
+def test_mean_mode_averages(item):
+    item.mode = 'mean'
+    item.addSamples([0.001, 0.002], [0.001, 0.002], [0.2, 0.4])
+    item.addSamples(0.003, 0.003, 0.6)
+    hue = item.data['brush'][0].color().hueF()
+    assert hue == pytest.approx(0.4, abs=0.01)
+
+
+def test_invalid_mode_raises(item):
+    with pytest.raises(ValueError):
+        item.mode = 'median'
+
+
+def test_clear_forgets_bins(item):
+    item.addSamples([0.001, 0.05], [0.001, 0.05], [0.2, 0.4])
+    item.clear()
+    assert item.nbins() == 0
+    assert len(item.data) == 0
+
+
+def test_bin_size_change_clears(item):
+    item.addSamples(0.001, 0.001, 0.2)
+    item.binSize = 0.02
+    assert item.nbins() == 0
+
+
+def test_default_bin_size_positive():
+    item = DecimatedScatterItem(pen=None)
+    item.addSamples(0.1, 0.2, 0.5)
+    assert item.binSize > 0.
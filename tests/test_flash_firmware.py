@@ -0,0 +1,217 @@
+import json
+import subprocess
+import pytest
+from QPolargraph import FlashFirmware
+from QPolargraph.FlashFirmware import (ARDUINO_LIBS, FirmwareCache,
+                                      _FlashWorker, batch_main,
+                                      detect_boards, flash_boards)
+
+
+LIBS = {lib: '1.0.0' for lib in ARDUINO_LIBS}
+BOARDS = {'ttyACM0': 'arduino:avr:uno',
+          'ttyACM1': 'arduino:avr:uno',
+          'ttyACM2': 'arduino:avr:mega'}
+
+
+@pytest.fixture
+def sketch(tmp_path):
+    path = tmp_path / 'acam3'
+    path.mkdir()
+    (path / 'acam3.ino').write_text('void setup() {}\n')
+    return path
+
+
+@pytest.fixture
+def cache(tmp_path, sketch):
+    return FirmwareCache(tmp_path / 'cache', sketch)
+
+
+class Calls(list):
+    pass
+
+
+@pytest.fixture
+def cli(monkeypatch):
+    '''Record arduino-cli invocations and fake their results.'''
+    calls = Calls()
+    bad = set()
+
+    def run(args, **kwargs):
+        calls.append(list(args))
+        stdout = ''
+        if args[1:3] == ['lib', 'list']:
+            stdout = json.dumps({'installed_libraries': [
+                {'library': {'name': n, 'version': v}}
+                for n, v in LIBS.items()]})
+        elif args[1:3] == ['board', 'list']:
+            stdout = json.dumps({'detected_ports': [
+                {'port': {'address': port},
+                 'matching_boards': [{'fqbn': fqbn}]}
+                for port, fqbn in BOARDS.items()]})
+        elif args[1] == 'upload' and args[args.index('--port') + 1] in bad:
+            return subprocess.CompletedProcess(args, 1, '', 'no sync')
+        elif args[1] == 'compile':
+            out = args[args.index('--output-dir') + 1]
+            (FlashFirmware.Path(out) / 'acam3.ino.hex').write_text(':00')
+        return subprocess.CompletedProcess(args, 0, stdout, '')
+
+    monkeypatch.setattr(subprocess, 'run', run)
+    monkeypatch.setattr(FlashFirmware, 'detect_fqbn',
+                        lambda port: 'arduino:avr:uno')
+    calls.bad = bad
+    return calls
+
+
+def _flash(cache):
+    worker = _FlashWorker('ttyACM0', cache=cache)
+    results = []
+    worker.finished.connect(results.append)
+    worker.run()
+    return results
+
+
+def _commands(calls):
+    return [args[1] for args in calls]
+
+
+# --- cache ---
+
+def test_key_depends_on_board_libraries_and_sketch(cache, sketch):
+    key = cache.key('arduino:avr:uno', LIBS)
+    assert cache.key('arduino:avr:uno', dict(LIBS)) == key
+    assert cache.key('arduino:avr:mega', LIBS) != key
+    newer = LIBS | {ARDUINO_LIBS[0]: '1.1.0'}
+    assert cache.key('arduino:avr:uno', newer) != key
+    (sketch / 'acam3.ino').write_text('void setup() { }\n')
+    assert cache.key('arduino:avr:uno', LIBS) != key
+
+
+def test_lookup_ignores_unfinished_builds(cache):
+    key = cache.key('arduino:avr:uno', LIBS)
+    assert cache.lookup(key) is None
+    scratch = cache.scratch(key)
+    (scratch / 'acam3.ino.hex').write_text(':00')
+    assert cache.lookup(key) is None
+    path = cache.commit(key)
+    assert cache.lookup(key) == path
+
+
+# --- worker ---
+
+def test_first_flash_compiles(cache, cli):
+    assert _flash(cache) == [True]
+    assert 'compile' in _commands(cli)
+    upload = next(args for args in cli if args[1] == 'upload')
+    build = upload[upload.index('--input-dir') + 1]
+    assert cache.lookup(cache.key('arduino:avr:uno', LIBS)) == \
+        FlashFirmware.Path(build)
+
+
+def test_unchanged_flash_uploads_cached_build(cache, cli):
+    _flash(cache)
+    cli.clear()
+    assert _flash(cache) == [True]
+    assert 'compile' not in _commands(cli)
+    assert 'upload' in _commands(cli)
+
+
+def test_library_upgrade_recompiles(cache, cli, monkeypatch):
+    _flash(cache)
+    cli.clear()
+    monkeypatch.setitem(LIBS, ARDUINO_LIBS[1], '2.0.0')
+    _flash(cache)
+    assert 'compile' in _commands(cli)
+
+
+def test_failed_compile_is_not_cached(cache, cli, monkeypatch):
+    def fail(args, **kwargs):
+        return subprocess.CompletedProcess(args, 1, '', 'error')
+
+    _run = subprocess.run
+    monkeypatch.setattr(subprocess, 'run',
+                        lambda args, **kw: fail(args) if args[1] == 'compile'
+                        else _run(args, **kw))
+    assert _flash(cache) == [False]
+    assert cache.lookup(cache.key('arduino:avr:uno', LIBS)) is None
+
+
+# --- batch ---
+
+def test_detect_boards_uses_one_query(cli):
+    assert detect_boards(['ttyACM2', 'ttyUSB9']) == {
+        'ttyACM2': 'arduino:avr:mega', 'ttyUSB9': 'arduino:avr:uno'}
+    assert _commands(cli) == ['board']
+
+
+def test_batch_compiles_once_per_board_type(cache, cli):
+    lines = []
+    results = flash_boards(BOARDS, log=lambda *a: lines.append(a),
+                           cache=cache)
+    assert results == dict.fromkeys(BOARDS, True)
+    compiles = [args[args.index('--fqbn') + 1]
+                for args in cli if args[1] == 'compile']
+    assert sorted(compiles) == ['arduino:avr:mega', 'arduino:avr:uno']
+    uploads = [args[args.index('--port') + 1]
+               for args in cli if args[1] == 'upload']
+    assert sorted(uploads) == sorted(BOARDS)
+    for port in BOARDS:
+        assert (port, 'Firmware installed successfully.') in lines
+
+
+def test_batch_reports_each_port(cache, cli):
+    cli.bad.add('ttyACM1')
+    lines = []
+    results = flash_boards(BOARDS, log=lambda *a: lines.append(a),
+                           cache=cache)
+    assert results == {'ttyACM0': True, 'ttyACM1': False, 'ttyACM2': True}
+    assert ('ttyACM1', 'no sync') in lines
+    assert ('ttyACM1', 'Upload failed.') in lines
+
+
+def test_batch_cli_exit_status(cli, tmp_path, capsys):
+    ports = ['ttyACM0', 'ttyACM2', '--cache-dir', str(tmp_path)]
+    assert batch_main(ports) == 0
+    out = capsys.readouterr().out
+    assert '[ttyACM0] Uploading to ttyACM0...' in out
+    assert '2 of 2 boards flashed.' in out
+    cli.bad.add('ttyACM2')
+    assert batch_main(ports) == 1
+    assert 'ttyACM2: FAILED' in capsys.readouterr().out
+
+
+def test_batch_cli_without_boards(monkeypatch):
+    monkeypatch.setattr(FlashFirmware, 'find_arduinos', lambda: [])
+    assert batch_main([]) == 2
+
+
+class FakePortInfo:
+    def __init__(self, name):
+        self.name = name
+
+    def portName(self):
+        return self.name
+
+    def systemLocation(self):
+        return f'/dev/{self.name}'
+
+    def description(self):
+        return 'Arduino Uno'
+
+
+def test_batch_dialog_logs_each_port(qtbot, monkeypatch):
+    from qtpy import QtCore
+    from QPolargraph.FlashFirmware import BatchFlashDialog
+    monkeypatch.setattr(FlashFirmware, 'find_arduinos',
+                        lambda: [FakePortInfo(p) for p in BOARDS])
+    dialog = BatchFlashDialog()
+    qtbot.addWidget(dialog)
+    dialog._port_list.item(1).setCheckState(QtCore.Qt.CheckState.Unchecked)
+    assert dialog.selected() == ['/dev/ttyACM0', '/dev/ttyACM2']
+    monkeypatch.setattr(FlashFirmware._BatchFlashWorker, 'start',
+                        lambda self: None)
+    dialog._flash()
+    assert dialog._tabs.count() == 3
+    dialog._on_output('/dev/ttyACM2', 'Uploading...')
+    dialog._on_output('', 'Compiling...')
+    assert dialog._logs['/dev/ttyACM2'].toPlainText() == 'Uploading...'
+    assert 'Compiling...' in dialog._summary.toPlainText()
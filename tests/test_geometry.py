@@ -0,0 +1,141 @@
+import pickle
+import subprocess
+import sys
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pytest
+from QPolargraph.hardware.fake import FakePolargraph
+from QPolargraph.patterns.QScanPattern import QScanPattern
+from QPolargraph.patterns.RasterScan import RasterScan
+from QPolargraph.patterns.PolarScan import PolarScan
+from QPolargraph.patterns.TarzanScan import TarzanScan
+from QPolargraph.patterns.PointScan import PointScan
+from QPolargraph.geometry.PolargraphGeometry import PolargraphGeometry
+from QPolargraph.geometry.RasterGeometry import RasterGeometry
+from QPolargraph.geometry.PolarGeometry import PolarGeometry
+
+
+@pytest.fixture
+def pg():
+    return FakePolargraph(step_delay=0.)
+
+
+def patterns(pg):
+    tarzan = TarzanScan(polargraph=pg)
+    tarzan.x0 = tarzan.rect[0] + 0.02
+    return [QScanPattern(polargraph=pg),
+            RasterScan(polargraph=pg, step=20.),
+            PolarScan(polargraph=pg, step=20., optimize=True),
+            tarzan,
+            PointScan(polargraph=pg, step=100.)]
+
+
+def test_polargraph_geometry_snapshot(pg):
+    pg.ell = 1.2
+    geometry = pg.geometry
+    assert isinstance(geometry, PolargraphGeometry)
+    assert geometry.settings == {name: getattr(pg, name)
+                                 for name in PolargraphGeometry.SETTINGS}
+    assert np.array_equal(geometry.acceleration, pg.acceleration)
+    pg.ell = 1.5
+    assert geometry.ell == pytest.approx(1.2)
+    assert pg.geometry != geometry
+
+
+def test_polargraph_delegates_conversions(pg):
+    geometry = pg.geometry
+    assert pg.r2f(0.1, 0.3) == pytest.approx(geometry.r2f(0.1, 0.3))
+    assert np.array_equal(pg.r2i(0.1, 0.3), geometry.r2i(0.1, 0.3))
+    assert pg.i2r(40, -30, 1) == pytest.approx(geometry.i2r(40, -30, 1))
+
+
+def test_polargraph_geometry_round_trip():
+    geometry = PolargraphGeometry(ell=1.2, y0=0.15)
+    x, y = geometry.i2r(*geometry.r2f(0.1, 0.4))
+    assert (x, y) == pytest.approx((0.1, 0.4))
+
+
+def test_motor_speeds_arrive_together():
+    geometry = PolargraphGeometry(acceleration=(1000., 1000.))
+    vm, vn = geometry.motorSpeeds(400., -100.)
+    assert vm == geometry.speed
+    assert 0. < vn < vm
+    assert geometry.motorSpeeds(0., 50.) == (geometry.speed, geometry.speed)
+
+
+def test_pattern_geometry_matches_pattern(pg):
+    for pattern in patterns(pg):
+        geometry = pattern.geometry
+        assert isinstance(geometry, pattern.GEOMETRY)
+        assert geometry.rect == pytest.approx(pattern.rect)
+        assert np.allclose(geometry.vertices(), pattern.vertices())
+        assert np.allclose(geometry.trajectory(), pattern.trajectory())
+        assert np.allclose(geometry.plan(), pattern.plan())
+
+
+def test_geometry_pickles(pg):
+    for pattern in patterns(pg):
+        geometry = pickle.loads(pickle.dumps(pattern.geometry))
+        assert type(geometry) is pattern.GEOMETRY
+        assert geometry.polargraph == pg.geometry
+        assert np.allclose(geometry.plan(), pattern.plan())
+
+
+def test_duration_is_positive(pg):
+    scan = RasterScan(polargraph=pg, step=20.)
+    assert scan.geometry.duration() > 0.
+    coarse = RasterScan(polargraph=pg, step=40.)
+    assert coarse.geometry.duration() < scan.geometry.duration()
+
+
+def test_polar_segments_are_arcs(pg):
+    geometry = PolarGeometry(pg.geometry, step=20.)
+    segments = geometry.segments()
+    assert len(segments) == len(geometry.radii())
+    assert all(s.shape == (2, 2) for s in segments)
+
+
+def test_sweep_in_process_pool(pg):
+    geometries = [RasterGeometry(pg.geometry, step=s)
+                  for s in (20., 40.)]
+    with ProcessPoolExecutor(max_workers=2) as pool:
+        durations = list(pool.map(RasterGeometry.duration, geometries))
+    assert durations == pytest.approx([g.duration() for g in geometries])
+
+
+def test_geometry_does_not_import_qt():
+    code = '\n'.join([
+        'import sys',
+        'from QPolargraph.geometry.PolargraphGeometry '
+        'import PolargraphGeometry',
+        'from QPolargraph.geometry.TarzanGeometry import TarzanGeometry',
+        'from QPolargraph.geometry.PointGeometry import PointGeometry',
+        'pg = PolargraphGeometry()',
+        'TarzanGeometry(pg, x0=-0.28).trajectory()',
+        'PointGeometry(pg, step=100., optimize=True).duration()',
+        "qt = ('qtpy', 'PyQt5', 'PyQt6', 'PySide2', 'PySide6',",
+        "      'QInstrument')",
+        'print(sorted(m for m in sys.modules if m.split(".")[0] in qt))',
+    ])
+    result = subprocess.run([sys.executable, '-c', code],
+                            capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == '[]'
+
+
+def test_polargraph_geometry_does_not_import_ordering():
+    code = '\n'.join([
+        'import sys',
+        'from QPolargraph.geometry.PolargraphGeometry '
+        'import PolargraphGeometry',
+        'PolargraphGeometry().moveTime((0., 0.3), (0.1, 0.4))',
+        "print('QPolargraph.lib.ordering' in sys.modules)",
+    ])
+    result = subprocess.run([sys.executable, '-c', code],
+                            capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == 'False'
+
+
+def test_ordering_reexports_motor_metric():
+    from QPolargraph.geometry.PolargraphGeometry import MotorMetric
+    from QPolargraph.lib import ordering
+    assert ordering.MotorMetric is MotorMetric
@@ -0,0 +1,77 @@
+import numpy as np
+import pytest
+from QPolargraph.lib.GridAccumulator import GridAccumulator
+from QPolargraph.patterns.RasterScan import RasterScan
+
+
+@pytest.fixture
+def grid():
+    return GridAccumulator([0., 0., 1., 0.5], 0.1)
+
+
+def test_shape(grid):
+    assert grid.shape == (10, 5)
+
+
+def test_shape_not_inflated_by_roundoff():
+    grid = GridAccumulator([-0.3, 0.2, 0.3, 0.8], 0.005)
+    assert grid.shape == (120, 120)
+
+
+def test_invalid_spacing_raises():
+    with pytest.raises(ValueError):
+        GridAccumulator([0., 0., 1., 1.], 0.)
+
+
+def test_mean_nan_when_empty(grid):
+    assert np.isnan(grid.mean).all()
+
+
+def test_running_mean(grid):
+    grid.add([0.05, 0.06, 0.07], [0.05, 0.05, 0.05], [1., 2., 6.])
+    assert grid.count[0, 0] == 3
+    assert grid.mean[0, 0] == pytest.approx(3.)
+
+
+def test_samples_land_in_correct_pixel(grid):
+    grid.add(0.55, 0.25, 4.)
+    assert grid.count[5, 2] == 1
+    assert grid.count.sum() == 1
+
+
+def test_outside_samples_ignored(grid):
+    n = grid.add([-0.1, 0.5, 1.2], [0.1, 0.6, 0.1], 1.)
+    assert n == 0
+    assert grid.count.sum() == 0
+
+
+def test_add_is_incremental(grid):
+    grid.add(0.05, 0.05, 2.)
+    grid.add(0.05, 0.05, 4.)
+    assert grid.mean[0, 0] == pytest.approx(3.)
+
+
+def test_complex_values():
+    grid = GridAccumulator([0., 0., 1., 1.], 0.5, dtype=complex)
+    grid.add([0.1, 0.2], [0.1, 0.2], [1. + 1j, 1. - 1j])
+    assert grid.mean[0, 0] == pytest.approx(1. + 0j)
+
+
+def test_clear(grid):
+    grid.add(0.05, 0.05, 2.)
+    grid.clear()
+    assert grid.count.sum() == 0
+    assert np.isnan(grid.mean).all()
+
+
+def test_count_is_read_only(grid):
+    with pytest.raises(ValueError):
+        grid.count[0, 0] = 1
+
+
+def test_for_pattern_uses_rect_and_step(polargraph):
+    pattern = RasterScan(polargraph=polargraph, step=10.)
+    grid = GridAccumulator.forPattern(pattern)
+    assert grid.rect == pytest.approx(tuple(pattern.rect))
+    assert grid.spacing == pytest.approx(0.01)
+    assert grid.shape == (60, 60)
@@ -0,0 +1,73 @@
+import numpy as np
+import pytest
+from QPolargraph.processing.LockIn import LockIn
+
+
+FREQUENCY = 1000.
+SAMPLERATE = 50_000.
+
+
+def signal(amplitude: float, phase: float, t0: float, n: int) -> np.ndarray:
+    t = t0 + np.arange(n) / SAMPLERATE
+    return amplitude * np.cos(2. * np.pi * FREQUENCY * t + phase)
+
+
+@pytest.fixture
+def lockin():
+    return LockIn(FREQUENCY, SAMPLERATE, timeconstant=5e-3)
+
+
+def test_recovers_amplitude_and_phase(lockin):
+    iq = lockin.process(signal(0.5, 0.7, 0., 20_000), 0.)
+    assert abs(iq) == pytest.approx(0.5, rel=1e-3)
+    assert np.angle(iq) == pytest.approx(0.7, abs=1e-3)
+
+
+def test_blockwise_matches_whole_record(lockin):
+    data = signal(1., 0.3, 0., 10_000)
+    whole = lockin.filter(data, 0.)
+    lockin.reset()
+    parts = [lockin.filter(data[i:i + 777], i / SAMPLERATE)
+             for i in range(0, len(data), 777)]
+    np.testing.assert_allclose(np.concatenate(parts), whole, atol=1e-10)
+
+
+def test_gaps_between_blocks_keep_phase(lockin):
+    for t0 in np.arange(0., 0.2, 0.01):
+        iq = lockin.process(signal(1., -1.2, t0, 400), t0)
+    assert np.angle(iq) == pytest.approx(-1.2, abs=1e-2)
+
+
+def test_rejects_off_frequency_signal(lockin):
+    t = np.arange(20_000) / SAMPLERATE
+    iq = lockin.process(np.cos(2. * np.pi * 3. * FREQUENCY * t), 0.)
+    assert abs(iq) < 1e-2
+
+
+def test_long_block_stays_finite():
+    lockin = LockIn(FREQUENCY, SAMPLERATE, timeconstant=2e-3, order=4)
+    iq = lockin.process(signal(1., 0., 0., 100_000), 0.)
+    assert np.isfinite(iq)
+    assert abs(iq) == pytest.approx(1., rel=1e-2)
+
+
+def test_empty_block_returns_current_output(lockin):
+    iq = lockin.process(signal(1., 0., 0., 5000), 0.)
+    assert lockin.process([], 0.1) == iq
+    assert lockin.filter([], 0.1).size == 0
+
+
+def test_reset_clears_state(lockin):
+    lockin.process(signal(1., 0., 0., 1000), 0.)
+    lockin.reset()
+    np.testing.assert_array_equal(lockin.state, np.zeros(lockin.order))
+
+
+@pytest.mark.parametrize('kwargs', [dict(samplerate=0.),
+                                    dict(timeconstant=-1.),
+                                    dict(order=0)])
+def test_invalid_parameters_raise(kwargs):
+    args = dict(frequency=FREQUENCY, samplerate=SAMPLERATE,
+                timeconstant=1e-3) | kwargs
+    with pytest.raises(ValueError):
+        LockIn(**args)
@@ -0,0 +1,81 @@
+import numpy as np
+import pytest
+from QPolargraph.hardware.fake import FakePolargraph
+from QPolargraph.lib.MotionWatchdog import MotionWatchdog
+from QPolargraph.lib.ordering import MotorMetric
+
+
+@pytest.fixture
+def pg():
+    return FakePolargraph(step_delay=0.)
+
+
+@pytest.fixture
+def watchdog(pg):
+    return MotionWatchdog(pg, margin=2., slack=0.5, window=1.)
+
+
+def path(pg, start, end, n):
+    '''Positions at n equal steps in motor space from start to end.'''
+    m0, n0 = pg.r2f(*start)
+    m1, n1 = pg.r2f(*end)
+    u = np.linspace(0., 1., n)
+    return np.array(pg.i2r(m0 + u * (m1 - m0), n0 + u * (n1 - n0))).T
+
+
+def test_idle_watchdog_passes(watchdog):
+    assert watchdog.check(0., 0., 0.5) is None
+
+
+def test_prediction_matches_motor_model(pg, watchdog):
+    start, end = (0., 0.3), (0.2, 0.4)
+    watchdog.start(end)
+    assert np.isnan(watchdog.predicted)
+    watchdog.check(0., *start)
+    assert watchdog.predicted == pytest.approx(
+        float(MotorMetric(pg)(start, end)))
+
+
+def test_normal_move_passes(pg, watchdog):
+    start, end = (0., 0.3), (0.2, 0.4)
+    watchdog.start(end)
+    watchdog.check(0., *start)
+    T = watchdog.predicted
+    for t, (x, y) in zip(np.linspace(0., T, 50), path(pg, start, end, 50)):
+        assert watchdog.check(t, x, y) is None
+
+
+def test_slow_move_times_out(pg, watchdog):
+    start, end = (0., 0.3), (0.2, 0.4)
+    watchdog.start(end)
+    watchdog.check(0., *start)
+    T = watchdog.predicted
+    times = np.linspace(0., 3. * T + 1., 500)
+    results = [watchdog.check(t, x, y)
+               for t, (x, y) in zip(times, path(pg, start, end, 500))]
+    assert 'timeout' in results
+    first = times[results.index('timeout')]
+    assert first == pytest.approx(2. * T + 0.5, abs=times[1])
+
+
+def test_no_progress_stalls(pg, watchdog):
+    start, end = (0., 0.3), (0.2, 0.4)
+    watchdog.start(end)
+    watchdog.check(0., *start)
+    assert watchdog.check(0.9, *start) is None
+    assert watchdog.check(1.1, *start) == 'stall'
+
+
+def test_moving_away_stalls(pg, watchdog):
+    start, end = (0., 0.3), (0.2, 0.4)
+    watchdog.start(end)
+    watchdog.check(0., *start)
+    assert watchdog.check(1.1, -0.05, 0.28) == 'stall'
+
+
+def test_start_resets(pg, watchdog):
+    start, end = (0., 0.3), (0.2, 0.4)
+    watchdog.start(end)
+    watchdog.check(0., *start)
+    watchdog.start(end)
+    assert watchdog.check(5., *start) is None
@@ -75,3 +75,124 @@ def test_close_does_not_raise(motors):
 
 def test_firmware_version():
     assert FakeMotors.FIRMWARE_VERSION == Motors.FIRMWARE_VERSION
+
+
+# --- link loss ---
+
+@pytest.fixture
+def serial(monkeypatch):
+    '''Motors with a simulated open port and scripted responses.'''
+    m = Motors()
+    m._portName = 'ttyFAKE'
+    monkeypatch.setattr(m, 'isOpen', lambda: True)
+    m.responses = []
+    monkeypatch.setattr(m, 'handshake',
+                        lambda cmd, **kw: m.responses.pop(0)
+                        if m.responses else '')
+    return m
+
+
+def test_unconnected_link_is_not_lost():
+    assert not Motors().linkLost
+
+
+def test_indexes_are_cached(serial):
+    serial.responses = ['P:10:20:1']
+    np.testing.assert_array_equal(serial.indexes, [10, 20, 1])
+    assert not serial.linkLost
+
+
+def test_failed_read_reports_last_position_running(serial):
+    serial.responses = ['P:10:20:0']
+    serial.indexes
+    np.testing.assert_array_equal(serial.indexes, [10, 20, 1])
+
+
+def test_failed_read_is_flagged(serial):
+    serial.responses = ['P:10:20:0']
+    serial.indexes
+    assert not serial.pollFailed
+    serial.indexes
+    assert serial.pollFailed
+    serial.responses = ['P:10:20:0']
+    serial.indexes
+    assert not serial.pollFailed
+
+
+def test_consecutive_failures_lose_link(serial):
+    for _ in range(Motors.MAX_FAILURES - 1):
+        serial.indexes
+    assert not serial.linkLost
+    serial.indexes
+    assert serial.linkLost
+    serial.responses = ['P:1:2:0']
+    serial.indexes
+    assert not serial.linkLost
+
+
+def test_closed_port_loses_link(serial, monkeypatch):
+    monkeypatch.setattr(serial, 'isOpen', lambda: False)
+    assert serial.linkLost
+
+
+def test_reconnect_restores_indexes(serial, monkeypatch):
+    serial.responses = ['P:10:20:1']
+    serial.indexes
+    for _ in range(Motors.MAX_FAILURES):
+        serial.indexes
+    opened, sent = [], []
+    monkeypatch.setattr(serial, 'open',
+                        lambda port: opened.append(port) or True)
+    monkeypatch.setattr(serial, 'expect',
+                        lambda cmd, resp, **kw: sent.append(cmd) or True)
+    assert serial.reconnect()
+    assert opened == ['ttyFAKE']
+    assert sent == ['P:10:20']
+    assert not serial.linkLost
+
+
+def test_reconnect_restores_motor_settings(serial, monkeypatch):
+    sent = []
+    monkeypatch.setattr(serial, 'expect',
+                        lambda cmd, resp, **kw: sent.append(cmd) or True)
+    monkeypatch.setattr(serial, 'handshake',
+                        lambda cmd, **kw: sent.append(cmd) or '')
+    serial.acceleration = (500, 600)
+    serial.motor_speed = (100., 200.)
+    monkeypatch.setattr(serial, 'open', lambda port: True)
+    sent.clear()
+    assert serial.reconnect()
+    assert sent == ['P:0:0', 'A:500:600', 'V:100:200']
+
+
+def test_reconnect_failure_keeps_port(serial, monkeypatch):
+    monkeypatch.setattr(serial, 'open', lambda port: False)
+    monkeypatch.setattr(serial, 'find', lambda: serial)
+    monkeypatch.setattr(serial, 'isOpen', lambda: False)
+    assert not serial.reconnect()
+    assert serial.linkLost
+
+
+def test_close_forgets_port(serial, monkeypatch):
+    monkeypatch.setattr(serial._interface, 'close', lambda: None)
+    serial.close()
+    assert not serial.linkLost
+
+
+# --- identification ---
+
+def test_identify_polls_until_firmware_answers(serial, monkeypatch):
+    monkeypatch.setattr(serial._interface, 'clear', lambda: True)
+    monkeypatch.setattr(serial._interface, 'portName', lambda: 'ttyFAKE')
+    ok = f'acam{Motors.FIRMWARE_VERSION}:OK'
+    serial.responses = ['', '', ok]
+    assert serial.identify()
+    assert serial.responses == []
+    assert serial._interface.timeout != Motors.QUERY_TIMEOUT
+
+
+def test_identify_gives_up_after_boot_timeout(serial, monkeypatch):
+    monkeypatch.setattr(serial._interface, 'clear', lambda: True)
+    monkeypatch.setattr(serial._interface, 'portName', lambda: 'ttyFAKE')
+    monkeypatch.setattr(Motors, 'BOOT_TIMEOUT', 0.05)
+    assert not serial.identify()
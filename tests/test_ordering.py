@@ -0,0 +1,106 @@
+import numpy as np
+import pytest
+from QPolargraph.hardware.fake import FakePolargraph
+from QPolargraph.hardware.Polargraph import _motor_time
+from QPolargraph.lib.ordering import (MotorMetric, euclidean, path_cost,
+                                      nearest_neighbour, order_segments,
+                                      two_opt)
+
+
+@pytest.fixture
+def geometry():
+    pg = FakePolargraph(step_delay=0.)
+    pg.acceleration = [500., 500.]
+    return pg
+
+
+def test_motor_time_vectorized_matches_scalar():
+    n = np.array([0., 10., 1000., 1e5])
+    t = _motor_time(200., n, 500.)
+    assert t.shape == n.shape
+    for ni, ti in zip(n, t):
+        assert _motor_time(200., ni, 500.) == pytest.approx(ti)
+
+
+def test_motor_time_without_acceleration():
+    assert _motor_time(100., 250., 0.) == pytest.approx(2.5)
+
+
+def test_metric_uses_busier_motor(geometry):
+    metric = MotorMetric(geometry)
+    p = geometry.i2r(0., 0.)
+    q = geometry.i2r(400., -100.)
+    assert metric(p, q) == pytest.approx(
+        _motor_time(geometry.speed, 400., 500.))
+
+
+def test_metric_is_symmetric(geometry):
+    metric = MotorMetric(geometry)
+    rng = np.random.default_rng(1)
+    p = np.column_stack([rng.uniform(-0.2, 0.2, 20),
+                         rng.uniform(0.2, 0.6, 20)])
+    matrix = metric.matrix(p)
+    np.testing.assert_allclose(matrix, matrix.T, atol=1e-12)
+    np.testing.assert_allclose(np.diag(matrix), 0., atol=1e-12)
+    np.testing.assert_allclose(matrix[3], metric(p[3], p))
+
+
+def test_nearest_neighbour_visits_every_point_once():
+    points = np.random.default_rng(2).uniform(size=(50, 2))
+    order = nearest_neighbour(points, euclidean, start=[0., 0.])
+    assert sorted(order) == list(range(50))
+
+
+def test_nearest_neighbour_on_a_line():
+    points = np.array([[3., 0.], [1., 0.], [2., 0.], [0., 0.]])
+    np.testing.assert_array_equal(nearest_neighbour(points, euclidean),
+                                  [0, 2, 1, 3])
+
+
+def test_two_opt_removes_crossing():
+    points = np.array([[0., 0.], [1., 1.], [1., 0.], [0., 1.]])
+    order = [0, 1, 2, 3]
+    improved = two_opt(points, order, euclidean)
+    assert improved[0] == 0
+    assert (path_cost(points, improved, euclidean) <
+            path_cost(points, order, euclidean))
+
+
+def test_two_opt_never_worsens(geometry):
+    metric = MotorMetric(geometry)
+    rng = np.random.default_rng(3)
+    points = np.column_stack([rng.uniform(-0.3, 0.3, 80),
+                              rng.uniform(0.2, 0.8, 80)])
+    home = [0., geometry.y0]
+    order = nearest_neighbour(points, metric, start=home)
+    improved = two_opt(points, order, metric, start=home, window=16)
+    assert sorted(improved) == list(range(80))
+    assert (path_cost(points, improved, metric, start=home) <=
+            path_cost(points, order, metric, start=home) + 1e-12)
+
+
+def test_order_segments_reverses_to_shorten_connections():
+    segments = [np.array([[0., 0.], [0., 1.]]),
+                np.array([[2., 1.], [2., 0.]]),
+                np.array([[1., 0.], [1., 1.]])]
+    order, flipped = order_segments(segments, euclidean, start=[0., 0.])
+    np.testing.assert_array_equal(order, [0, 2, 1])
+    np.testing.assert_array_equal(flipped, [False, True, True])
+
+
+def test_order_segments_with_motor_metric(geometry):
+    metric = MotorMetric(geometry)
+    rng = np.random.default_rng(4)
+    x = rng.permutation(np.linspace(-0.3, 0.3, 25))
+    segments = [np.array([[xi, 0.3], [xi, 0.7]]) for xi in x]
+    home = [0., geometry.y0]
+    order, flipped = order_segments(segments, metric, start=home)
+    assert sorted(order) == list(range(25))
+
+    def cost(segs):
+        path = np.concatenate(segs)
+        return path_cost(path, np.arange(len(path)), metric, start=home)
+
+    planned = [segments[i][::-1] if f else segments[i]
+               for i, f in zip(order, flipped)]
+    assert cost(planned) < 0.5 * cost(segments)
@@ -24,3 +24,64 @@ def test_fake_device_is_fake_polargraph(widget):
 
 def test_widget_has_property_changed_signal(widget):
     assert hasattr(widget, 'propertyChanged')
+
+
+# --- background discovery ---
+
+@pytest.fixture
+def search(monkeypatch):
+    '''Script the background hardware search.'''
+    from QPolargraph.hardware.PortScanner import PortScanner
+    result = {'device': None}
+    monkeypatch.setattr(PortScanner, 'search',
+                        lambda self: result['device'])
+    monkeypatch.setattr(QPolargraphWidget, '_tryFlash', lambda self: False)
+    return result
+
+
+def test_construction_returns_while_connecting(qtbot, search):
+    w = QPolargraphWidget()
+    qtbot.addWidget(w)
+    assert w.connecting
+    assert not w.isEnabled()
+    assert not w.device.isOpen()
+    qtbot.waitUntil(lambda: not w.connecting, timeout=5000)
+
+
+def test_found_device_is_swapped_in(qtbot, search):
+    found = FakePolargraph()
+    search['device'] = found
+    w = QPolargraphWidget()
+    qtbot.addWidget(w)
+    with qtbot.waitSignal(w.deviceChanged, timeout=5000) as blocker:
+        pass
+    assert blocker.args == [found]
+    assert w.device is found
+    assert w.isEnabled()
+
+
+def test_falls_back_to_fake_when_nothing_found(qtbot, search):
+    w = QPolargraphWidget()
+    qtbot.addWidget(w)
+    messages = []
+    w.status.connect(messages.append)
+    with qtbot.waitSignal(w.deviceChanged, timeout=5000):
+        pass
+    assert isinstance(w.device, FakePolargraph)
+    assert messages[-1] == 'No polargraph found: using simulator'
+
+
+def test_flash_triggers_second_search(qtbot, search, monkeypatch):
+    found = FakePolargraph()
+    offers = []
+
+    def flash(self):
+        offers.append(True)
+        search['device'] = found
+        return True
+
+    monkeypatch.setattr(QPolargraphWidget, '_tryFlash', flash)
+    w = QPolargraphWidget()
+    qtbot.addWidget(w)
+    qtbot.waitUntil(lambda: w.device is found, timeout=5000)
+    assert offers == [True]
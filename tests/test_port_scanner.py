@@ -0,0 +1,109 @@
+import threading
+import time
+import pytest
+from qtpy import QtCore
+from QPolargraph.hardware.PortScanner import PortScanner
+
+
+class FakeInstrument(QtCore.QObject):
+    '''Instrument that answers on ``GOOD`` ports after *delay* seconds.'''
+
+    delay = 0.2
+    good = {'GOOD'}
+    opened = []
+
+    def __init__(self):
+        super().__init__()
+        self.port = None
+
+    def open(self, port):
+        type(self).opened.append((port, threading.current_thread().name))
+        time.sleep(self.delay)
+        if port in self.good:
+            self.port = port
+            return True
+        return False
+
+    def isOpen(self):
+        return self.port is not None
+
+    def close(self):
+        self.port = None
+
+
+@pytest.fixture
+def scanner(tmp_path, monkeypatch):
+    FakeInstrument.opened = []
+    FakeInstrument.good = {'GOOD'}
+    ports = ['A', 'B', 'C', 'GOOD']
+    monkeypatch.setattr(PortScanner, '_availablePorts',
+                        staticmethod(lambda: list(ports)))
+    s = PortScanner(FakeInstrument, configdir=str(tmp_path))
+    s.ports = ports
+    return s
+
+
+def test_probes_ports_concurrently(scanner):
+    t0 = time.monotonic()
+    device = scanner.search()
+    elapsed = time.monotonic() - t0
+    assert device.port == 'GOOD'
+    assert elapsed < 2 * FakeInstrument.delay
+    threads = {name for _, name in FakeInstrument.opened}
+    assert len(threads) > 1
+
+
+def test_found_device_belongs_to_scanner_thread(scanner):
+    device = scanner.search()
+    assert device.thread() is scanner.thread()
+
+
+def test_caches_last_good_port(scanner, tmp_path):
+    scanner.search()
+    assert scanner.lastPort == 'GOOD'
+    again = PortScanner(FakeInstrument, configdir=str(tmp_path))
+    assert again.lastPort == 'GOOD'
+
+
+def test_tries_last_good_port_first(scanner, tmp_path):
+    scanner.search()
+    FakeInstrument.opened = []
+    again = PortScanner(FakeInstrument, configdir=str(tmp_path))
+    assert again.candidates()[0] == 'GOOD'
+    assert again.search().port == 'GOOD'
+    assert [port for port, _ in FakeInstrument.opened] == ['GOOD']
+
+
+def test_stale_cache_falls_back_to_search(scanner):
+    scanner.search()
+    FakeInstrument.good = {'B'}
+    assert scanner.search().port == 'B'
+    assert scanner.lastPort == 'B'
+
+
+def test_only_one_match_is_kept(scanner):
+    FakeInstrument.good = {'A', 'GOOD'}
+    device = scanner.search()
+    assert device.port in FakeInstrument.good
+    assert scanner.lastPort == device.port
+
+
+def test_nothing_found(scanner):
+    FakeInstrument.good = set()
+    assert scanner.search() is None
+    assert scanner.lastPort is None
+
+
+def test_no_ports(scanner):
+    scanner.ports.clear()
+    assert scanner.search() is None
+
+
+def test_start_reports_progress(qtbot, scanner):
+    messages = []
+    scanner.progress.connect(messages.append)
+    with qtbot.waitSignal(scanner.finished, timeout=5000) as blocker:
+        scanner.start()
+    assert blocker.args[0].port == 'GOOD'
+    qtbot.waitUntil(lambda: any('Found' in m for m in messages))
+    assert any('Searching' in m for m in messages)
@@ -0,0 +1,107 @@
+import numpy as np
+import pytest
+from QPolargraph.processing.Resampler import Resampler, resample
+from QPolargraph.patterns.PolarScan import PolarScan
+
+
+@pytest.fixture
+def resampler():
+    return Resampler([0., 0., 1., 0.5], 0.1)
+
+
+def test_shape(resampler):
+    assert resampler.shape == (10, 5)
+
+
+def test_nodes_at_pixel_centers(resampler):
+    x, y = resampler.nodes()
+    assert x[0] == pytest.approx(0.05)
+    assert y[-1] == pytest.approx(0.45)
+
+
+def test_empty_image_is_nan(resampler):
+    assert np.isnan(resampler.image).all()
+
+
+def test_sample_on_node(resampler):
+    resampler.add(0.05, 0.05, 2.)
+    assert resampler.image[0, 0] == pytest.approx(2.)
+
+
+def test_nodes_beyond_radius_are_nan(resampler):
+    resampler.add(0.05, 0.05, 2.)
+    assert np.isnan(resampler.image[2, 2])
+
+
+def test_constant_field_reproduced():
+    rng = np.random.default_rng(1)
+    x, y = rng.random((2, 20000))
+    image = resample(x, y, np.full_like(x, 3.), [0., 0., 1., 1.], 0.05)
+    assert np.nanmax(np.abs(image - 3.)) < 1e-12
+
+
+def test_linear_field_approximated():
+    rng = np.random.default_rng(2)
+    x, y = rng.random((2, 50000))
+    r = Resampler([0., 0., 1., 1.], 0.05)
+    r.add(x, y, x)
+    xn, _ = r.nodes()
+    interior = r.image[2:-2, 2:-2]
+    assert np.abs(interior - xn[2:-2, None]).max() < 5e-3
+
+
+def test_chunked_matches_single_pass():
+    rng = np.random.default_rng(3)
+    x, y = rng.random((2, 5000))
+    value = np.sin(5. * x) * y
+    a = resample(x, y, value, [0., 0., 1., 1.], 0.05, chunksize=len(x))
+    b = resample(x, y, value, [0., 0., 1., 1.], 0.05, chunksize=97)
+    np.testing.assert_allclose(a, b, equal_nan=True)
+
+
+def test_memmap_input(tmp_path):
+    rng = np.random.default_rng(4)
+    data = np.lib.format.open_memmap(tmp_path / 'scan.npy', mode='w+',
+                                     dtype=float, shape=(3, 4000))
+    data[:2] = rng.random((2, 4000))
+    data[2] = 1.
+    data.flush()
+    data = np.load(tmp_path / 'scan.npy', mmap_mode='r')
+    image = resample(data[0], data[1], data[2], [0., 0., 1., 1.], 0.1,
+                     chunksize=500)
+    assert np.nanmax(np.abs(image - 1.)) < 1e-12
+
+
+def test_complex_values():
+    r = Resampler([0., 0., 1., 1.], 0.5, dtype=complex)
+    r.add([0.25, 0.25], [0.25, 0.25], [1. + 2j, 3. - 2j])
+    assert r.image[0, 0] == pytest.approx(2. + 0j)
+
+
+def test_add_chunks(resampler):
+    resampler.addChunks([([0.05], [0.05], [1.]), ([0.05], [0.05], [3.])])
+    assert resampler.image[0, 0] == pytest.approx(2.)
+
+
+def test_clear(resampler):
+    resampler.add(0.05, 0.05, 2.)
+    resampler.clear()
+    assert np.isnan(resampler.image).all()
+
+
+def test_for_pattern(polargraph):
+    pattern = PolarScan(polargraph=polargraph, step=10.)
+    r = Resampler.forPattern(pattern)
+    assert r.rect == pytest.approx(tuple(pattern.rect))
+    assert r.spacing == pytest.approx(0.01)
+
+
+def test_polar_scan_samples_cover_grid(polargraph):
+    pattern = PolarScan(polargraph=polargraph, step=20.)
+    x, y = pattern.trajectory()
+    s = np.concatenate([[0.], np.cumsum(np.hypot(np.diff(x), np.diff(y)))])
+    t = np.linspace(0., s[-1], 20000)
+    xs, ys = np.interp(t, s, x), np.interp(t, s, y)
+    r = Resampler.forPattern(pattern, radius=0.03)
+    r.add(xs, ys, 1.)
+    assert np.isfinite(r.image).mean() > 0.9
@@ -0,0 +1,154 @@
+import socket
+import threading
+import time
+import numpy as np
+import pytest
+from QPolargraph.hardware.fake import FakePolargraph
+from QPolargraph.lib.SamplePublisher import SamplePublisher, SampleSubscriber
+from QPolargraph.patterns.RasterScan import RasterScan
+
+
+@pytest.fixture(params=['unix', 'tcp'])
+def address(request, tmp_path):
+    if request.param == 'unix':
+        return str(tmp_path / 'samples.sock')
+    return ('127.0.0.1', 0)
+
+
+def subscribe(publisher, n=1, **kwargs):
+    feeds = [SampleSubscriber(publisher.address, **kwargs)
+             for _ in range(n)]
+    deadline = time.monotonic() + 5.
+    while publisher.subscribers < n and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert publisher.subscribers == n
+    return feeds
+
+
+def test_header_describes_stream(address):
+    with SamplePublisher(address, fields=('x', 'y', 't', 'I'),
+                         geometry={'ell': 1.}) as publisher:
+        feed, = subscribe(publisher)
+        assert feed.fields == ('x', 'y', 't', 'I')
+        assert feed.header['dtype'] == '<f8'
+        assert feed.header['geometry'] == {'ell': 1.}
+        feed.close()
+
+
+def test_batches_reach_every_subscriber(address):
+    rows = np.arange(30.).reshape(10, 3)
+    with SamplePublisher(address, batch=4, latency=10.) as publisher:
+        feeds = subscribe(publisher, 2, timeout=5.)
+        for row in rows:
+            publisher.write(row)
+    for feed in feeds:
+        frames = list(feed)
+        assert [s for s, _ in frames] == [0, 1, 2]
+        assert [len(b) for _, b in frames] == [4, 4, 2]
+        np.testing.assert_array_equal(np.vstack([b for _, b in frames]),
+                                      rows)
+        assert feed.missed == 0
+        feed.close()
+
+
+def test_latency_bounds_batch(address):
+    with SamplePublisher(address, batch=1000, latency=0.) as publisher:
+        feed, = subscribe(publisher, timeout=5.)
+        publisher.write([1., 2., 3.])
+        publisher.write([4., 5., 6.])
+        sequence, batch = feed.receive()
+        assert len(batch) == 1
+        feed.close()
+
+
+def test_slow_subscriber_does_not_stall_writer(address):
+    row = np.zeros(3)
+    with SamplePublisher(address, batch=1, depth=4) as publisher:
+        feed, = subscribe(publisher, timeout=5.)
+        t0 = time.monotonic()
+        for _ in range(20000):
+            publisher.write(row)
+        assert time.monotonic() - t0 < 5.
+        assert publisher.dropped > 0
+    sequences = [s for s, _ in feed]
+    assert sequences[-1] == 19999
+    assert feed.missed == sequences[-1] - sequences[0] + 1 - len(sequences)
+    assert feed.missed > 0
+    feed.close()
+
+
+def test_disconnected_subscriber_is_forgotten(address):
+    with SamplePublisher(address, batch=1) as publisher:
+        feed, other = subscribe(publisher, 2)
+        feed.close()
+        deadline = time.monotonic() + 5.
+        while publisher.subscribers > 1 and time.monotonic() < deadline:
+            publisher.write(np.zeros(3))
+            time.sleep(0.01)
+        assert publisher.subscribers == 1
+        other.close()
+
+
+def test_refuses_to_replace_regular_file(tmp_path):
+    path = tmp_path / 'notasocket.csv'
+    path.write_text('data')
+    with pytest.raises(FileExistsError):
+        SamplePublisher(str(path))
+    assert path.read_text() == 'data'
+
+
+def test_refuses_socket_in_use(tmp_path):
+    path = str(tmp_path / 'samples.sock')
+    with SamplePublisher(path):
+        with pytest.raises(OSError):
+            SamplePublisher(path)
+
+
+def test_replaces_stale_socket(tmp_path):
+    path = str(tmp_path / 'samples.sock')
+    stale = socket.socket(socket.AF_UNIX)
+    stale.bind(path)
+    stale.close()
+    with SamplePublisher(path) as publisher:
+        assert publisher.address == path
+
+
+def test_attach_publishes_scan(tmp_path):
+    pattern = RasterScan(polargraph=FakePolargraph(step_delay=0.),
+                         width=0.1, height=0.1, step=20.)
+    expected = []
+    pattern.dataReady.connect(
+        lambda d: pattern.scanning() and expected.append(d.copy()))
+    received = []
+    with SamplePublisher(str(tmp_path / 'scan.sock')) as publisher:
+        publisher.attach(pattern)
+        feed, = subscribe(publisher, timeout=10.)
+        assert feed.header['geometry']['pattern'] == 'RasterScan'
+        assert feed.header['geometry']['ell'] == pattern.polargraph.ell
+        reader = threading.Thread(
+            target=lambda: received.extend(b for _, b in feed))
+        reader.start()
+        pattern.scan()
+    reader.join(timeout=10.)
+    np.testing.assert_array_equal(np.vstack(received), np.vstack(expected))
+    feed.close()
+
+
+def test_attached_rows_are_sent_at_waypoints(tmp_path):
+    pattern = RasterScan(polargraph=FakePolargraph(step_delay=0.),
+                         width=0.1, height=0.1, step=20.)
+    reached = []
+    pattern.vertexReached.connect(
+        lambda t: pattern.scanning() and reached.append(t))
+    received = []
+    with SamplePublisher(str(tmp_path / 'scan.sock'), batch=10 ** 6,
+                         latency=1e6) as publisher:
+        publisher.attach(pattern)
+        feed, = subscribe(publisher, timeout=10.)
+        reader = threading.Thread(
+            target=lambda: received.extend(b for _, b in feed))
+        reader.start()
+        pattern.scan()
+    reader.join(timeout=10.)
+    assert len(received) >= len(reached) > 1
+    feed.close()
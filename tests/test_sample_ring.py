@@ -0,0 +1,150 @@
+import multiprocessing
+import threading
+from multiprocessing import resource_tracker
+import numpy as np
+import pytest
+from QPolargraph.hardware.fake import FakePolargraph
+from QPolargraph.lib.SampleRing import SampleRing, SampleRingReader
+from QPolargraph.patterns.RasterScan import RasterScan
+
+
+@pytest.fixture
+def ring():
+    ring = SampleRing(capacity=8)
+    yield ring
+    ring.close()
+    ring.unlink()
+
+
+def rows(start, n):
+    return np.arange(start, start + n, dtype=float)[:, None] * [1., 2., 3.]
+
+
+def test_reader_sees_layout(ring):
+    with SampleRingReader(ring.name) as reader:
+        assert reader.fields == ('t', 'x', 'y')
+        assert reader.capacity == 8
+
+
+def test_reads_rows_in_order(ring):
+    reader = SampleRingReader(ring.name)
+    ring.write(rows(0, 5))
+    sequence, data = reader.read()
+    assert sequence == 0
+    np.testing.assert_array_equal(data, rows(0, 5))
+    ring.write(rows(5, 6))
+    sequence, data = reader.read()
+    assert sequence == 5
+    np.testing.assert_array_equal(data, rows(5, 6))
+    assert reader.read()[1].shape == (0, 3)
+    assert reader.lost == 0
+    reader.close()
+
+
+def test_read_limit(ring):
+    reader = SampleRingReader(ring.name)
+    ring.write(rows(0, 6))
+    assert reader.read(limit=4)[1].shape == (4, 3)
+    assert reader.available == 2
+    sequence, data = reader.read()
+    assert sequence == 4
+    np.testing.assert_array_equal(data, rows(4, 2))
+    reader.close()
+
+
+def test_overrun_is_detected(ring):
+    reader = SampleRingReader(ring.name)
+    ring.write(rows(0, 3))
+    reader.read()
+    ring.write(rows(3, 20))
+    sequence, data = reader.read()
+    assert reader.lost == 12
+    assert sequence == 15
+    np.testing.assert_array_equal(data, rows(15, 8))
+    reader.close()
+
+
+def test_oversized_block_keeps_newest(ring):
+    reader = SampleRingReader(ring.name, start=0)
+    ring.write(rows(0, 20))
+    assert ring.written == 20
+    sequence, data = reader.read()
+    assert (sequence, reader.lost) == (12, 12)
+    np.testing.assert_array_equal(data, rows(12, 8))
+    reader.close()
+
+
+def test_append_mapping(ring):
+    reader = SampleRingReader(ring.name)
+    ring.append({'x': 1., 'y': 2., 't': 3.})
+    np.testing.assert_array_equal(reader.read()[1], [[3., 1., 2.]])
+    reader.close()
+
+
+def test_attach_writes_scan_samples():
+    pattern = RasterScan(polargraph=FakePolargraph(step_delay=0.),
+                         width=0.1, height=0.1, step=20.)
+    expected = []
+    pattern.dataReady.connect(
+        lambda d: pattern.scanning() and expected.append(d.copy()))
+    with SampleRing(fields=('t', 'x', 'y', 'I'), capacity=100000) as ring:
+        reader = SampleRingReader(ring.name)
+        ring.attach(pattern)
+        pattern.scan()
+        _, data = reader.read()
+        reader.close()
+    expected = np.vstack(expected)
+    np.testing.assert_array_equal(data[:, :3], expected[:, [2, 0, 1]])
+    assert np.all(np.isnan(data[:, 3]))
+
+
+def test_concurrent_attach_keeps_writer_registrations(monkeypatch):
+    registered = []
+    monkeypatch.setattr(resource_tracker, 'register',
+                        lambda name, rtype: registered.append(name))
+    monkeypatch.setattr(resource_tracker, 'unregister',
+                        lambda name, rtype: None)
+    rings = []
+
+    def churn():
+        for _ in range(20):
+            ring = SampleRing(capacity=4)
+            rings.append(ring)
+            SampleRingReader(ring.name).close()
+
+    threads = [threading.Thread(target=churn) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    for ring in rings:
+        ring.close()
+        ring.unlink()
+    assert sorted(registered) == sorted('/' + r.name for r in rings)
+
+
+def _consume(name, total, results):
+    with SampleRingReader(name, start=0) as reader:
+        count, checksum = 0, 0.
+        while count + reader.lost < total:
+            _, data = reader.read()
+            count += len(data)
+            checksum += data[:, 0].sum()
+        results.put((count, reader.lost, checksum))
+
+
+def test_reader_in_another_process():
+    total = 5000
+    context = multiprocessing.get_context('fork')
+    results = context.Queue()
+    with SampleRing(capacity=total) as ring:
+        worker = context.Process(target=_consume,
+                                 args=(ring.name, total, results))
+        worker.start()
+        for n in range(0, total, 100):
+            ring.write(rows(n, 100))
+        count, lost, checksum = results.get(timeout=30)
+        worker.join(timeout=30)
+    assert (count, lost) == (total, 0)
+    assert checksum == sum(range(total))
+    assert worker.exitcode == 0
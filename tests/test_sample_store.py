@@ -0,0 +1,95 @@
+import numpy as np
+import pytest
+from QPolargraph.lib.SampleStore import SampleStore
+
+
+@pytest.fixture
+def store():
+    return SampleStore(capacity=2)
+
+
+def test_empty_initially(store):
+    assert len(store) == 0
+    assert store.fields == ()
+
+
+def test_append_infers_fields(store):
+    store.append({'t': 0.5, 'x': 0.1, 'y': 0.2})
+    assert store.fields == ('t', 'x', 'y')
+    assert len(store) == 1
+
+
+def test_append_grows_past_capacity(store):
+    for n in range(100):
+        store.append({'t': float(n), 'x': 0., 'y': 0.})
+    assert len(store) == 100
+    np.testing.assert_array_equal(store['t'], np.arange(100.))
+
+
+def test_extend_appends_block(store):
+    store.append({'t': 0., 'x': 0., 'y': 0.})
+    store.extend({'t': [1., 2., 3.], 'x': [1., 1., 1.], 'y': [2., 2., 2.]})
+    assert len(store) == 4
+    np.testing.assert_array_equal(store['y'], [0., 2., 2., 2.])
+
+
+def test_declared_fields(store):
+    s = SampleStore(fields=['t', 'x', 'y', 'value'])
+    assert s.fields == ('t', 'x', 'y', 'value')
+    s.append({'t': 0., 'x': 0., 'y': 0., 'value': 3.})
+    assert s['value'][0] == pytest.approx(3.)
+
+
+def test_column_is_read_only(store):
+    store.append({'t': 0., 'x': 0., 'y': 0.})
+    with pytest.raises(ValueError):
+        store['x'][0] = 1.
+
+
+def test_asarray_is_structured(store):
+    store.append({'t': 0., 'x': 0.1, 'y': 0.2})
+    data = store.asarray()
+    assert data.dtype.names == ('t', 'x', 'y')
+    assert data['x'][0] == pytest.approx(0.1)
+
+
+def test_clear_keeps_declared_fields():
+    s = SampleStore(fields=['t', 'x', 'y'])
+    s.append({'t': 0., 'x': 0., 'y': 0.})
+    s.clear()
+    assert len(s) == 0
+    assert s.fields == ('t', 'x', 'y')
+
+
+def test_clear_forgets_inferred_fields(store):
+    store.append({'t': 0., 'x': 0., 'y': 0.})
+    store.clear()
+    assert len(store) == 0
+    assert store.fields == ()
+    store.append({'t': 0., 'x': 0., 'y': 0., 'I': 1., 'Q': 2.})
+    assert store.fields == ('t', 'x', 'y', 'I', 'Q')
+
+
+def test_new_field_adds_column(store):
+    store.append({'t': 0., 'x': 0., 'y': 0.})
+    store.append({'t': 1., 'x': 0., 'y': 0., 'I': 3.})
+    assert store.fields == ('t', 'x', 'y', 'I')
+    np.testing.assert_array_equal(store['t'], [0., 1.])
+    np.testing.assert_array_equal(store['I'], [np.nan, 3.])
+
+
+def test_missing_field_is_nan(store):
+    store.append({'t': 0., 'x': 0., 'y': 0., 'I': 1.})
+    store.append({'t': 1., 'x': 0., 'y': 0.})
+    assert np.isnan(store['I'][1])
+
+
+def test_values_are_float(store):
+    store.append({'t': 1, 'x': 0, 'y': 0})
+    store.append({'t': 1.7, 'x': 0., 'y': 0.})
+    assert store['t'][1] == pytest.approx(1.7)
+
+
+def test_unknown_column_raises(store):
+    with pytest.raises(KeyError):
+        store['x']
@@ -0,0 +1,129 @@
+import numpy as np
+import pytest
+from qtpy import QtCore
+from QPolargraph.hardware.fake import FakePolargraph
+from QPolargraph.patterns.PolarScan import PolarScan
+from QPolargraph.patterns.QScanPattern import QScanPattern, ScanState
+from QPolargraph.patterns.RasterScan import RasterScan
+from QPolargraph.patterns.ScanCoordinator import ScanCoordinator
+
+
+def make(cls=RasterScan, step_delay=0.0002, **kwargs):
+    params = dict(width=0.1, height=0.1, step=50.) | kwargs
+    polargraph = FakePolargraph(speed=2000., step_delay=step_delay)
+    return cls(polargraph=polargraph, **params)
+
+
+@pytest.fixture
+def coordinator(qtbot):
+    coordinator = ScanCoordinator([make(), make(), make(PolarScan)],
+                                  interval=50)
+    yield coordinator
+    coordinator.close()
+
+
+def run(qtbot, coordinator, timeout=30000):
+    with qtbot.waitSignal(coordinator.finished, timeout=timeout):
+        coordinator.start()
+
+
+def test_rejects_shared_polargraph():
+    pattern = make()
+    coordinator = ScanCoordinator([pattern])
+    with pytest.raises(ValueError):
+        coordinator.add(RasterScan(polargraph=pattern.polargraph))
+    with pytest.raises(TypeError):
+        coordinator.add(object())
+
+
+def test_each_scanner_runs_on_its_own_thread(qtbot, coordinator):
+    threads = []
+    for pattern in coordinator.patterns:
+        pattern.stateChanged.connect(
+            lambda s: threads.append(QtCore.QThread.currentThread()),
+            QtCore.Qt.ConnectionType.DirectConnection)
+    run(qtbot, coordinator)
+    main = QtCore.QThread.currentThread()
+    assert len(set(threads)) == len(coordinator.patterns)
+    assert main not in threads
+    for pattern in coordinator.patterns:
+        assert pattern.thread() is pattern.polargraph.thread()
+
+
+def test_shares_one_store_and_timebase(qtbot, coordinator):
+    run(qtbot, coordinator)
+    store = coordinator.store
+    scanner = store['scanner']
+    assert set(scanner) == {0, 1, 2}
+    assert len(store) == sum(coordinator.counts)
+    t = store['t']
+    assert np.all(t >= 0.)
+    spans = [(t[scanner == n].min(), t[scanner == n].max())
+             for n in range(3)]
+    # The scans overlap in time rather than running back to back
+    assert max(a for a, _ in spans) < min(b for _, b in spans)
+
+
+def test_reports_throughput(qtbot, coordinator):
+    messages = []
+    coordinator.throughput.connect(messages.append)
+    run(qtbot, coordinator)
+    assert messages
+    assert 'samples/s' in messages[-1]
+    assert coordinator.rate > 0.
+
+
+def test_missing_fields_are_nan(qtbot):
+    class Lockin(RasterScan):
+        fields = ('I', 'Q')
+
+        def _measurement(self, t, x, y, raw):
+            return np.array([x, y, t, 1., 2.])
+
+    coordinator = ScanCoordinator([make(), make(Lockin)], interval=50)
+    run(qtbot, coordinator)
+    coordinator.close()
+    store = coordinator.store
+    assert store.fields == ('scanner', 't', 'x', 'y', 'I', 'Q')
+    first = store['scanner'] == 0
+    assert np.all(np.isnan(store['I'][first]))
+    assert np.all(store['I'][~first] == 1.)
+
+
+def test_abort_stops_every_scanner(qtbot):
+    coordinator = ScanCoordinator([make(step_delay=0.01),
+                                   make(step_delay=0.01)])
+    finished = []
+    coordinator.scannerFinished.connect(finished.append)
+    coordinator.start()
+    qtbot.waitUntil(lambda: len(coordinator.store) > 0, timeout=10000)
+    with qtbot.waitSignal(coordinator.finished, timeout=10000):
+        coordinator.abort()
+    assert sorted(finished) == [0, 1]
+    assert not any(p.active() for p in coordinator.patterns)
+    coordinator.close()
+
+
+def test_pause_runs_in_each_scanner_thread(qtbot):
+    threads = []
+
+    class Recorder(RasterScan):
+        @QtCore.Slot()
+        def pause(self):
+            threads.append(QtCore.QThread.currentThread())
+            super().pause()
+
+    coordinator = ScanCoordinator([make(Recorder, step_delay=0.01),
+                                   make(Recorder, step_delay=0.01)])
+    coordinator.start()
+    qtbot.waitUntil(lambda: len(coordinator.store) > 0, timeout=10000)
+    coordinator.pause()
+    qtbot.waitUntil(lambda: all(p._state == ScanState.PAUSED
+                                for p in coordinator.patterns),
+                    timeout=10000)
+    main = QtCore.QThread.currentThread()
+    assert len(threads) == 2
+    assert main not in threads
+    with qtbot.waitSignal(coordinator.finished, timeout=10000):
+        coordinator.abort()
+    coordinator.close()
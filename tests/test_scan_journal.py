@@ -0,0 +1,64 @@
+import json
+import pytest
+from QPolargraph.lib.ScanJournal import ScanJournal
+
+
+@pytest.fixture
+def journal(tmp_path):
+    return ScanJournal(tmp_path / 'scan.json', interval=60.)
+
+
+def test_empty_journal(journal):
+    assert not journal.exists()
+    with pytest.raises(FileNotFoundError):
+        journal.load()
+
+
+def test_record_and_load(journal):
+    assert journal.record({'cursor': 3})
+    assert journal.exists()
+    assert journal.load() == {'cursor': 3}
+
+
+def test_record_is_throttled(journal):
+    assert journal.record({'cursor': 1})
+    assert not journal.record({'cursor': 2})
+    assert journal.load() == {'cursor': 1}
+
+
+def test_due_follows_interval(journal):
+    assert journal.due()
+    journal.record({'cursor': 1})
+    assert not journal.due()
+    journal.clear()
+    assert journal.due()
+
+
+def test_force_bypasses_interval(journal):
+    journal.record({'cursor': 1})
+    assert journal.record({'cursor': 2}, force=True)
+    assert journal.load() == {'cursor': 2}
+
+
+def test_no_temporary_file_left(journal):
+    journal.record({'cursor': 1})
+    assert [p.name for p in journal.path.parent.iterdir()] == ['scan.json']
+
+
+def test_file_is_json(journal):
+    journal.record({'vertices': [[0., 1.]]})
+    assert json.loads(journal.path.read_text()) == {'vertices': [[0., 1.]]}
+
+
+def test_clear(journal):
+    journal.record({'cursor': 1})
+    journal.clear()
+    assert not journal.exists()
+    journal.clear()
+    assert journal.record({'cursor': 2})
+
+
+def test_creates_directory(tmp_path):
+    journal = ScanJournal(tmp_path / 'new' / 'scan.json')
+    assert journal.record({})
+    assert journal.exists()
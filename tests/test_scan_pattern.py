@@ -1,10 +1,12 @@
 import numpy as np
 import pytest
+import time
 from QPolargraph.hardware.fake import FakePolargraph
 from QPolargraph.patterns.QScanPattern import QScanPattern, ScanState
 from QPolargraph.patterns.RasterScan import RasterScan
 from QPolargraph.patterns.PolarScan import PolarScan
 from QPolargraph.patterns.TarzanScan import TarzanScan
+from QPolargraph.patterns.PointScan import PointScan
 
 
 @pytest.fixture
@@ -500,6 +502,43 @@ def test_onMeasure_subclass_override_called_during_scan(pg):
     assert isinstance(y, float)
 
 
+# --- demodulator ---
+
+def test_fields_empty_without_demodulator(scan):
+    assert scan.demodulator is None
+    assert scan.fields == ()
+
+
+def test_demodulator_appends_iq(pg):
+    from QPolargraph.processing.LockIn import LockIn
+
+    class CWScan(QScanPattern):
+        def _onMeasure(self, t: float, x: float, y: float) -> np.ndarray:
+            n = np.arange(500)
+            return 0.5 * np.cos(2. * np.pi * 100. * (t + n / 1e4) + 0.4)
+
+    lockin = LockIn(100., 1e4, timeconstant=2e-2)
+    s = CWScan(polargraph=pg, demodulator=lockin)
+    received = []
+    s.dataReady.connect(received.append)
+    s.scan()
+    assert s.fields == ('I', 'Q')
+    x, y, t, i, q = received[-1]
+    assert np.hypot(i, q) == pytest.approx(0.5, rel=1e-2)
+    assert np.arctan2(q, i) == pytest.approx(0.4, abs=1e-2)
+
+
+def test_demodulator_without_raw_samples_reports_nan(pg):
+    from QPolargraph.processing.LockIn import LockIn
+    s = QScanPattern(polargraph=pg,
+                     demodulator=LockIn(100., 1e4, timeconstant=1e-3))
+    received = []
+    s.dataReady.connect(received.append)
+    s.scan()
+    assert len(received[0]) == 5
+    assert np.isnan(received[0][3:]).all()
+
+
 # --- interruptAndClose / closeRequested ---
 
 def test_interrupt_and_close_from_idle_emits_close_requested(scan, qtbot):
@@ -524,3 +563,542 @@ def test_interrupt_and_close_during_scan_emits_close_requested(scan, qtbot):
     with qtbot.waitSignal(scan.closeRequested, timeout=5000):
         scan.scan()
     assert scan._state == ScanState.IDLE
+
+
+# --- PointScan ---
+
+@pytest.fixture
+def points(pg):
+    scan = PointScan(polargraph=pg, width=0.1, height=0.08, step=20.,
+                     dwell=0.)
+    return scan
+
+
+def test_point_scan_grid_covers_rect(points):
+    p = points.points()
+    assert p.shape == (6 * 5, 2)
+    x1, y1, x2, y2 = points.rect
+    assert p[:, 0].min() == pytest.approx(x1)
+    assert p[:, 0].max() == pytest.approx(x2)
+    assert p[:, 1].max() == pytest.approx(y2)
+
+
+def test_point_scan_vertices_are_a_tour(points):
+    v = points.vertices()
+    p = points.points()
+    assert len(v) == len(p)
+    assert {tuple(r) for r in np.round(v, 9)} == \
+        {tuple(r) for r in np.round(p, 9)}
+
+
+def test_point_scan_measures_each_point(pg):
+    class Counting(PointScan):
+        def _onMeasure(self, t, x, y):
+            return np.array([x + y])
+
+    scan = Counting(polargraph=pg, width=0.1, height=0.08, dwell=0.,
+                    averages=3)
+    rows = []
+    scan.dataReady.connect(
+        lambda data: rows.append(data) if scan.scanning() else None)
+    scan.scan()
+    rows = np.array(rows)
+    assert scan.fields == ('value',)
+    assert len(rows) == len(scan.points())
+    np.testing.assert_allclose(rows[:, 3], rows[:, 0] + rows[:, 1],
+                               atol=1e-12)
+    assert scan._state == ScanState.IDLE
+
+
+def test_point_scan_pause_resume_measures_all(pg):
+    scan = PointScan(polargraph=pg, width=0.1, height=0.08, dwell=0.)
+    rows = []
+    scan.dataReady.connect(
+        lambda data: rows.append(data) if scan.scanning() else None)
+    from qtpy.QtCore import QTimer
+    QTimer.singleShot(0, scan.pause)
+    scan.scan()
+    assert scan._state == ScanState.PAUSED
+    scan.resume()
+    assert scan._state == ScanState.IDLE
+    assert len(rows) == len(scan.points())
+
+
+def test_point_scan_pause_during_dwell_remeasures_node(pg):
+    from qtpy.QtCore import QTimer
+
+    class Interrupted(PointScan):
+        interrupted = 0
+
+        def _onVertex(self, t, x, y):
+            if self.scanning() and len(rows) == 2 and not self.interrupted:
+                QTimer.singleShot(0, self.pause)
+            result = super()._onVertex(t, x, y)
+            self.interrupted += result is False
+            return result
+
+    scan = Interrupted(polargraph=pg, width=0.1, height=0.08, step=50.,
+                       dwell=0.05)
+    rows = []
+    scan.dataReady.connect(
+        lambda data: rows.append(data) if scan.scanning() else None)
+    scan.scan()
+    assert scan._state == ScanState.PAUSED
+    assert scan.interrupted == 1
+    scan.resume()
+    assert scan._state == ScanState.IDLE
+    nodes = {tuple(r) for r in np.round(np.array(rows)[:, :2], 3)}
+    assert len(rows) == len(scan.points()) == len(nodes)
+
+
+def test_point_scan_abandon_interrupts_dwell(pg):
+    from qtpy.QtCore import QTimer
+    scan = PointScan(polargraph=pg, step=100., dwell=10.)
+    QTimer.singleShot(50, scan.abandon)
+    start = time.monotonic()
+    scan.scan()
+    assert time.monotonic() - start < 5.
+    assert scan._state == ScanState.IDLE
+
+
+def test_point_scan_resume_does_not_repeat_node(pg, journal):
+    scan = PointScan(polargraph=pg, width=0.1, height=0.08, dwell=0.,
+                     journal=journal)
+    rows = []
+    scan.dataReady.connect(
+        lambda data: rows.append(data) if scan.scanning() else None)
+    stop = scan.vertexReached.connect(
+        lambda t: scan.abandon() if len(rows) == 4 else None)
+    scan.scan()
+    scan.vertexReached.disconnect(stop)
+    assert journal.load()['cursor'] == 3
+    scan.resumeFromCheckpoint()
+    assert scan._state == ScanState.IDLE
+    nodes = {tuple(r) for r in np.round(np.array(rows)[:, :2], 3)}
+    assert len(rows) == len(scan.points()) == len(nodes)
+
+
+def test_point_scan_reports_complex_reads_as_nan(pg, caplog):
+    class Complex(PointScan):
+        def _onMeasure(self, t, x, y):
+            return np.array([1. + 2.j])
+
+    scan = Complex(polargraph=pg, step=100., dwell=0.)
+    rows = []
+    scan.dataReady.connect(lambda d: scan.scanning() and rows.append(d))
+    with caplog.at_level('ERROR'):
+        scan.scan()
+    assert scan._state == ScanState.IDLE
+    assert rows and all(np.isnan(row[3]) for row in rows)
+    assert sum('Complex read' in r.message for r in caplog.records) == 1
+
+
+def test_failed_measurement_returns_to_idle(pg):
+    class Failing(PointScan):
+        fail = True
+
+        def _onMeasure(self, t, x, y):
+            if self.fail:
+                raise RuntimeError('instrument error')
+            return np.array([1.])
+
+    scan = Failing(polargraph=pg, step=100., dwell=0.)
+    states = []
+    scan.stateChanged.connect(states.append)
+    with pytest.raises(RuntimeError):
+        scan.scan()
+    assert scan._state == ScanState.IDLE
+    assert not scan.active()
+    assert states[-1] == ScanState.IDLE
+    scan.fail = False
+    rows = []
+    scan.dataReady.connect(lambda d: scan.scanning() and rows.append(d))
+    scan.scan()
+    assert scan._state == ScanState.IDLE
+    assert len(rows) == len(scan.vertices())
+
+
+def test_point_scan_ignores_sample_spacing(points):
+    points.sampleSpacing = 5.
+    assert points.sampleSpacing == 0.
+
+
+# --- plan / optimize ---
+
+def test_plan_defaults_to_vertices(polar):
+    np.testing.assert_array_equal(polar.plan(), polar.vertices())
+
+
+def test_polar_segments_are_arcs(polar):
+    segments = polar.segments()
+    np.testing.assert_array_equal(np.concatenate(segments), polar.vertices())
+    assert all(s.shape == (2, 2) for s in segments)
+
+
+def test_optimized_plan_reorders_segments(pg):
+    class Shuffled(QScanPattern):
+        def segments(self):
+            x = np.array([0.2, -0.2, 0.1, -0.1, 0.])
+            return [np.array([[xi, 0.3], [xi, 0.5]]) for xi in x]
+
+        def vertices(self):
+            return np.concatenate(self.segments())
+
+    from QPolargraph.lib.ordering import MotorMetric, path_cost
+    scan = Shuffled(polargraph=pg, optimize=True)
+    plan = scan.plan()
+    assert plan.shape == scan.vertices().shape
+    metric = MotorMetric(pg)
+    home = [0., pg.y0]
+    n = len(plan)
+    assert (path_cost(plan, np.arange(n), metric, home) <
+            path_cost(scan.vertices(), np.arange(n), metric, home))
+
+
+def test_optimized_scan_completes(polar):
+    polar.optimize = True
+    polar.scan()
+    assert polar._state == ScanState.IDLE
+
+
+# --- nearestStart / returnHome ---
+
+def test_plan_keeps_direction_by_default(raster):
+    v = raster.vertices()
+    np.testing.assert_array_equal(raster.plan(start=v[-1]), v)
+
+
+def test_nearest_start_reverses_plan(raster):
+    raster.nearestStart = True
+    v = raster.vertices()
+    np.testing.assert_array_equal(raster.plan(start=v[-1]), v[::-1])
+    np.testing.assert_array_equal(raster.plan(start=v[0]), v)
+
+
+def test_return_home_false_stays_at_end(raster):
+    raster.returnHome = False
+    end = raster.vertices()[-1]
+    raster.scan()
+    assert raster._state == ScanState.IDLE
+    x, y, _ = raster.polargraph.position
+    assert (x, y) == pytest.approx(tuple(end), abs=1e-3)
+
+
+def test_back_to_back_scans_start_nearby(raster):
+    raster.returnHome = False
+    raster.nearestStart = True
+    raster.scan()
+    here = raster.polargraph.position[:2]
+    plan = raster.plan(start=here)
+    assert np.hypot(*(plan[0] - here)) < 1e-3
+    raster.scan()
+    assert raster._state == ScanState.IDLE
+
+
+# --- checkpoint journal ---
+
+@pytest.fixture
+def journal(tmp_path):
+    from QPolargraph.lib.ScanJournal import ScanJournal
+    return ScanJournal(tmp_path / 'scan.json', interval=0.)
+
+
+def test_completed_scan_clears_checkpoint(raster, journal):
+    raster.journal = journal
+    raster.scan()
+    assert not journal.exists()
+
+
+def test_pause_writes_checkpoint(raster, journal):
+    raster.journal = journal
+    raster.stateChanged.connect(
+        lambda s: raster.pause() if s == ScanState.SCANNING else None)
+    raster.scan()
+    assert raster._state == ScanState.PAUSED
+    state = journal.load()
+    assert state['pattern'] == 'RasterScan'
+    assert state['cursor'] == 0
+    assert state['geometry']['step'] == raster.step
+    np.testing.assert_allclose(state['vertices'], raster.vertices())
+    assert state['indexes'] == list(raster.polargraph.indexes[:2])
+
+
+def test_checkpoint_tracks_cursor(raster, journal):
+    raster.journal = journal
+    cursors = []
+    raster.vertexReached.connect(
+        lambda t: cursors.append(journal.load()['cursor'])
+        if journal.exists() else None)
+    raster.scan()
+    assert cursors[-1] == len(raster.vertices()) - 2
+
+
+def test_resume_from_checkpoint(pg, journal):
+    scan = RasterScan(polargraph=pg, journal=journal)
+    v = scan.vertices()
+    reached = []
+    scan.vertexReached.connect(lambda t: reached.append(t))
+    scan.vertexReached.connect(
+        lambda t: scan.abandon() if len(reached) == 3 else None)
+    scan.scan()
+    assert scan._state == ScanState.IDLE
+    assert journal.load()['cursor'] == 2
+
+    # A fresh process: new pattern with different geometry
+    restored = RasterScan(polargraph=pg, journal=journal, step=1.)
+    rows = []
+    restored.dataReady.connect(
+        lambda d: rows.append(d) if restored.scanning() else None)
+    restored.resumeFromCheckpoint()
+    assert restored._state == ScanState.IDLE
+    assert restored.step == scan.step
+    assert not journal.exists()
+    assert rows[0][:2] == pytest.approx(v[2], abs=1e-3)
+
+
+def test_checkpoint_skips_index_query_when_not_due(tmp_path):
+    from QPolargraph.lib.ScanJournal import ScanJournal
+
+    class Counting(FakePolargraph):
+        queries = 0
+
+        @property
+        def indexes(self):
+            Counting.queries += 1
+            return super().indexes
+
+    raster = RasterScan(polargraph=Counting(step_delay=0.),
+                        journal=ScanJournal(tmp_path / 'scan.json',
+                                            interval=60.))
+    raster.journal.record({})
+    raster._plan = raster.vertices()
+    raster._checkpoint()
+    assert Counting.queries == 0
+    raster._checkpoint(force=True)
+    assert Counting.queries == 1
+
+
+def test_subclass_parameters_are_journaled(pg, journal):
+    scan = TarzanScan(polargraph=pg, journal=journal)
+    scan.x0 = scan.rect[0] + 0.03
+    scan.stateChanged.connect(
+        lambda s: scan.pause() if s == ScanState.SCANNING else None)
+    scan.scan()
+    assert journal.load()['geometry']['x0'] == pytest.approx(scan.x0)
+    assert {'dwell', 'averages', 'window'} <= set(
+        PointScan.JOURNAL_PROPERTIES)
+
+
+def test_resume_rehome_zeroes_counters(pg, journal):
+    journal.record({'pattern': 'QScanPattern',
+                    'geometry': {}, 'vertices': [[0., 0.3], [0.1, 0.3]],
+                    'cursor': 0, 'indexes': [123, 456]})
+    scan = QScanPattern(polargraph=pg, journal=journal)
+    zeroed = []
+    scan.stateChanged.connect(
+        lambda s: zeroed.append(tuple(pg.indexes[:2]))
+        if s == ScanState.MOVING and not zeroed else None)
+    scan.resumeFromCheckpoint(rehome=True)
+    assert zeroed == [(0, 0)]
+
+
+def test_resume_rejects_other_pattern(raster, journal):
+    journal.record({'pattern': 'PolarScan', 'geometry': {},
+                    'vertices': [[0., 0.3]], 'cursor': 0, 'indexes': [0, 0]})
+    raster.journal = journal
+    with pytest.raises(ValueError):
+        raster.resumeFromCheckpoint()
+
+
+def test_resume_without_journal(raster):
+    with pytest.raises(ValueError):
+        raster.resumeFromCheckpoint()
+
+
+# --- serial link recovery ---
+
+class FlakyPolargraph(FakePolargraph):
+    '''Fake polargraph whose link drops after a number of polls.'''
+
+    def __init__(self, dropAfter, attempts, **kwargs):
+        super().__init__(**kwargs)
+        self.dropAfter = dropAfter
+        self.attempts = attempts
+        self.polls = 0
+        self.reconnects = 0
+        self.lost = False
+
+    @property
+    def position(self):
+        self.polls += 1
+        if self.polls == self.dropAfter:
+            self.lost = True
+        return super().position
+
+    @property
+    def linkLost(self):
+        return self.lost
+
+    def reconnect(self):
+        self.reconnects += 1
+        if self.reconnects >= self.attempts:
+            self.lost = False
+        return not self.lost
+
+
+@pytest.fixture
+def flaky():
+    return FlakyPolargraph(dropAfter=20, attempts=2, step_delay=0.)
+
+
+def test_scan_recovers_from_link_loss(flaky):
+    scan = RasterScan(polargraph=flaky, step=100.)
+    scan.RECONNECT_INTERVAL = 0.
+    down, recovered = [], []
+    scan.linkDown.connect(lambda: down.append(True))
+    scan.linkRecovered.connect(recovered.append)
+    scan.scan()
+    assert scan._state == ScanState.IDLE
+    assert down == [True]
+    assert len(recovered) == 1
+    assert scan.recoveryTime == pytest.approx(recovered[0])
+    assert flaky.position[:2] == pytest.approx((0., flaky.y0), abs=1e-3)
+
+
+def test_lost_link_is_not_sampled(flaky):
+    scan = RasterScan(polargraph=flaky, step=100.)
+    scan.RECONNECT_INTERVAL = 0.
+    polls = []
+    scan.dataReady.connect(lambda d: polls.append(flaky.lost))
+    scan.scan()
+    assert not any(polls)
+
+
+def test_unrecovered_link_pauses_scan(flaky):
+    flaky.attempts = 10 ** 6
+    scan = RasterScan(polargraph=flaky, step=100., reconnectTimeout=0.)
+    scan.RECONNECT_INTERVAL = 0.
+    scan.scan()
+    assert scan._state == ScanState.PAUSED
+    assert scan.recoveryTime == 0.
+    flaky.attempts = 0
+    scan.resume()
+    assert scan._state == ScanState.IDLE
+
+
+class StalePolargraph(FakePolargraph):
+    '''Fake polargraph whose position reads fail for a burst of polls.'''
+
+    def __init__(self, failAfter, failures, **kwargs):
+        super().__init__(**kwargs)
+        self.failAfter = failAfter
+        self.failures = failures
+        self.polls = 0
+        self.last = None
+
+    @property
+    def pollFailed(self):
+        return self.failAfter < self.polls <= self.failAfter + self.failures
+
+    @property
+    def position(self):
+        self.polls += 1
+        if self.pollFailed and self.last is not None:
+            time.sleep(1e-3)
+            return np.array([*self.last[:2], 1.])
+        self.last = super().position
+        return self.last
+
+
+def test_failed_polls_are_skipped():
+    stale = StalePolargraph(failAfter=20, failures=50, step_delay=0.)
+    scan = RasterScan(polargraph=stale, step=100., stallAction='pause')
+    scan.watchdog.window = 0.02
+    polls, reasons = [], []
+    scan.dataReady.connect(lambda d: polls.append(stale.pollFailed))
+    scan.stalled.connect(reasons.append)
+    scan.scan()
+    assert scan._state == ScanState.IDLE
+    assert reasons == []
+    assert polls and not any(polls)
+
+
+# --- motion watchdog ---
+
+class StuckPolargraph(FakePolargraph):
+    '''Fake polargraph that stops moving after a number of polls.'''
+
+    def __init__(self, stickAfter, **kwargs):
+        super().__init__(**kwargs)
+        self.stickAfter = stickAfter
+        self.polls = 0
+        self.stuck = False
+        self.jammed = False
+
+    def moveTo(self, x, y):
+        self.stuck = self.jammed
+        super().moveTo(x, y)
+
+    @property
+    def position(self):
+        self.polls += 1
+        if self.polls == self.stickAfter:
+            self.stuck = True
+        if self.stuck and self._cartesian_trajectory:
+            time.sleep(1e-3)
+            x, y = self._cartesian_trajectory[0]
+            return np.array([x, y, 1.])
+        return super().position
+
+
+@pytest.fixture
+def stuck():
+    return StuckPolargraph(stickAfter=20, step_delay=0.)
+
+
+def stall_scan(stuck, action):
+    scan = RasterScan(polargraph=stuck, step=100., stallAction=action)
+    scan.watchdog.window = 0.02
+    reasons = []
+    scan.stalled.connect(reasons.append)
+    scan.scan()
+    return scan, reasons
+
+
+def test_stall_pauses_scan(stuck):
+    scan, reasons = stall_scan(stuck, 'pause')
+    assert scan._state == ScanState.PAUSED
+    assert reasons == ['stall']
+
+
+def test_stall_aborts_scan(stuck):
+    scan, reasons = stall_scan(stuck, 'abort')
+    assert scan._state == ScanState.IDLE
+    assert reasons == ['stall']
+    assert scan._plan is not None
+
+
+def test_stall_retry_reissues_move(stuck):
+    scan, reasons = stall_scan(stuck, 'retry')
+    assert scan._state == ScanState.IDLE
+    assert reasons == ['stall']
+    assert stuck.position[:2] == pytest.approx((0., stuck.y0), abs=1e-3)
+
+
+def test_stall_retries_are_limited(stuck):
+    stuck.jammed = True
+    scan, reasons = stall_scan(stuck, 'retry')
+    assert scan._state == ScanState.PAUSED
+    assert reasons == ['stall'] * (QScanPattern.STALL_RETRIES + 1)
+
+
+def test_watchdog_disabled(stuck):
+    stuck.stickAfter = 10 ** 9
+    scan, reasons = stall_scan(stuck, None)
+    assert scan._state == ScanState.IDLE
+    assert reasons == []
+
+
+def test_stall_action_rejects_unknown(scan):
+    with pytest.raises(ValueError):
+        scan.stallAction = 'panic'
@@ -5,6 +5,8 @@ from QPolargraph.patterns.TarzanScanWidget import TarzanScanWidget
 from QPolargraph.patterns.RasterScan import RasterScan
 from QPolargraph.patterns.PolarScan import PolarScan
 from QPolargraph.patterns.TarzanScan import TarzanScan
+from QPolargraph.patterns.PointScan import PointScan
+from QPolargraph.patterns.PointScanWidget import PointScanWidget
 
 
 @pytest.fixture
@@ -117,3 +119,26 @@ def test_tarzan_settings_setter_restores_x0(tarzan_widget):
 def test_tarzan_pattern_changed_emitted_on_x0_change(tarzan_widget, qtbot):
     with qtbot.waitSignal(tarzan_widget.patternChanged, timeout=1000):
         tarzan_widget.x0.setValue(tarzan_widget.x0.value() + 0.01)
+
+
+# --- PointScanWidget ---
+
+@pytest.fixture
+def point_widget(qtbot):
+    pg = FakePolargraph(step_delay=0.)
+    w = PointScanWidget(pattern=PointScan(polargraph=pg))
+    qtbot.addWidget(w)
+    return w
+
+
+def test_point_widget_has_dwell_and_averages(point_widget):
+    assert point_widget.dwell.value() == pytest.approx(0.1)
+    assert point_widget.averages.value() == 1
+    assert not hasattr(point_widget, 'sampleSpacing')
+
+
+def test_point_widget_updates_pattern(point_widget):
+    point_widget.averages.setValue(8)
+    point_widget.dwell.setValue(0.5)
+    assert point_widget.pattern.averages == 8
+    assert point_widget.pattern.dwell == pytest.approx(0.5)
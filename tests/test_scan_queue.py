@@ -0,0 +1,157 @@
+import numpy as np
+import pytest
+from QPolargraph.hardware.fake import FakePolargraph
+from QPolargraph.patterns.QScanPattern import QScanPattern, ScanState
+from QPolargraph.patterns.RasterScan import RasterScan
+from QPolargraph.patterns.PolarScan import PolarScan
+from QPolargraph.patterns.ScanQueue import ScanQueue
+
+
+@pytest.fixture
+def pg():
+    return FakePolargraph(step_delay=0.)
+
+
+@pytest.fixture
+def jobs():
+    return [(RasterScan, {'step': 100., 'dy': 0.1}),
+            (RasterScan, {'step': 100., 'dy': 0.3}),
+            (PolarScan, {'step': 100., 'optimize': True})]
+
+
+def run(qtbot, queue):
+    queue.start()
+    qtbot.waitUntil(lambda: not queue.running(), timeout=30000)
+
+
+def test_rejects_non_pattern(pg):
+    with pytest.raises(TypeError):
+        ScanQueue(pg, [(dict, {})])
+
+
+def test_bad_parameters_fail_before_moving(pg):
+    queue = ScanQueue(pg, [(RasterScan, {}), (RasterScan, {'nope': 1})])
+    with pytest.raises(TypeError):
+        queue.start()
+    assert not queue.running()
+    assert pg.position[:2] == pytest.approx((0., pg.y0))
+
+
+def test_runs_all_jobs(qtbot, pg, jobs):
+    queue = ScanQueue(pg, jobs)
+    started, done = [], []
+    queue.jobStarted.connect(started.append)
+    queue.jobFinished.connect(done.append)
+    with qtbot.waitSignal(queue.finished, timeout=30000):
+        queue.start()
+    assert started == [0, 1, 2]
+    assert done == [0, 1, 2]
+    assert [type(p) for p in queue.patterns] == [RasterScan, RasterScan,
+                                                 PolarScan]
+    assert queue.current == -1
+    assert queue.pattern is None
+
+
+def test_results_are_kept_per_job(qtbot, pg, jobs):
+    queue = ScanQueue(pg, jobs)
+    run(qtbot, queue)
+    assert len(queue.results) == 3
+    assert all(len(result) > 0 for result in queue.results)
+    for pattern, result in zip(queue.patterns[:2], queue.results):
+        x1, y1, x2, y2 = pattern.rect
+        assert np.all(result['y'] >= y1 - 1e-3)
+        assert np.all(result['y'] <= y2 + 1e-3)
+
+
+def test_jobs_chain_without_homing(qtbot, pg, jobs):
+    queue = ScanQueue(pg, jobs)
+    queue.start()
+    first = queue.patterns[0]
+    assert not first.returnHome
+    assert first.nearestStart
+    qtbot.waitUntil(lambda: not queue.running(), timeout=30000)
+    assert queue.patterns[-1].returnHome
+    assert pg.position[:2] == pytest.approx((0., pg.y0), abs=1e-3)
+
+
+def test_queue_may_end_in_place(qtbot, pg, jobs):
+    queue = ScanQueue(pg, jobs[:1], returnHome=False)
+    run(qtbot, queue)
+    end = queue.patterns[0].plan()[-1]
+    assert pg.position[:2] == pytest.approx(tuple(end), abs=1e-3)
+
+
+def test_plans_start_where_previous_job_ends(qtbot, pg, jobs):
+    queue = ScanQueue(pg, jobs)
+    run(qtbot, queue)
+    plans = [f.result() for f in queue._plans]
+    for pattern, previous, plan in zip(queue.patterns[1:], plans, plans[1:]):
+        np.testing.assert_array_equal(plan, pattern.plan(previous[-1]))
+
+
+def test_append(pg):
+    queue = ScanQueue(pg)
+    queue.append(RasterScan, step=50.)
+    assert queue.jobs == [(RasterScan, {'step': 50.})]
+
+
+def test_abort_stops_queue(qtbot, pg, jobs):
+    queue = ScanQueue(pg, jobs)
+    queue.jobStarted.connect(lambda n: queue.abort())
+    started = []
+    queue.jobStarted.connect(started.append)
+    with qtbot.waitSignal(queue.finished, timeout=30000):
+        queue.start()
+    assert started == [0]
+    assert queue.patterns[0]._state == ScanState.IDLE
+
+
+def test_failed_job_stops_queue(qtbot, pg, jobs):
+    queue = ScanQueue(pg, jobs)
+    queue.jobStarted.connect(
+        lambda n: queue.pattern.dataReady.connect(
+            lambda data: queue.pattern.abandon()))
+    started, finished, failed = [], [], []
+    queue.jobStarted.connect(started.append)
+    queue.jobFinished.connect(finished.append)
+    queue.jobFailed.connect(failed.append)
+    run(qtbot, queue)
+    assert started == [0]
+    assert finished == []
+    assert failed == [0]
+    assert not queue.patterns[0].completed
+
+
+def test_completed_jobs_are_marked(qtbot, pg, jobs):
+    queue = ScanQueue(pg, jobs)
+    states = []
+    queue.stateChanged.connect(states.append)
+    run(qtbot, queue)
+    assert all(p.completed for p in queue.patterns)
+    assert ScanState.SCANNING in states
+    assert ScanState.IDLE not in states
+
+
+def test_pause_and_resume(qtbot, pg):
+    queue = ScanQueue(pg, [(QScanPattern, {}), (QScanPattern, {})])
+
+    paused = []
+
+    def pauseOnce(state):
+        if state == ScanState.SCANNING and not paused:
+            paused.append(state)
+            queue.toggle()
+
+    queue.jobStarted.connect(
+        lambda n: queue.pattern.stateChanged.connect(pauseOnce))
+    queue.start()
+    assert queue.pattern._state == ScanState.PAUSED
+    queue.toggle()
+    qtbot.waitUntil(lambda: not queue.running(), timeout=30000)
+    assert all(p._state == ScanState.IDLE for p in queue.patterns)
+
+
+def test_toggle_does_not_start_idle_job(pg):
+    queue = ScanQueue(pg, [(QScanPattern, {})])
+    queue.toggle()
+    assert not queue.running()
@@ -0,0 +1,146 @@
+import json
+import subprocess
+import sys
+import numpy as np
+import pytest
+from QPolargraph.ScanRunner import ScanRunner, main
+from QPolargraph.lib.SamplePublisher import SampleSubscriber
+from QPolargraph.lib.SampleWriter import SampleWriter
+from QPolargraph.patterns.RasterScan import RasterScan
+from QPolargraph.patterns.QScanPattern import QScanPattern
+
+
+PARAMS = {'pattern': 'RasterScan',
+          'scan': {'width': 0.1, 'height': 0.1, 'step': 20.},
+          'polargraph': {'step_delay': 0.}}
+
+
+@pytest.fixture
+def params(tmp_path):
+    path = tmp_path / 'params.json'
+    path.write_text(json.dumps(PARAMS))
+    return path
+
+
+# --- SampleWriter ---
+
+def test_writer_streams_rows(tmp_path):
+    path = tmp_path / 'out.csv'
+    with SampleWriter(path, ('x', 'y', 't'), chunk=2) as writer:
+        writer.write(np.array([1., 2., 3.]))
+        writer.write(np.array([4., 5., 6.]))
+        assert len(path.read_text().splitlines()) == 3
+        writer.write(np.array([7., 8., 9.]))
+    data = np.genfromtxt(path, delimiter=',', names=True)
+    assert data.dtype.names == ('x', 'y', 't')
+    np.testing.assert_array_equal(data['y'], [2., 5., 8.])
+    assert writer.count == 3
+
+
+def test_writer_keeps_time_resolution(tmp_path):
+    path = tmp_path / 'out.csv'
+    t = 1e7 + 0.123456
+    with SampleWriter(path, ('x', 'y', 't')) as writer:
+        writer.write(np.array([0.1, 0.2, t]))
+    data = np.genfromtxt(path, delimiter=',', names=True)
+    assert data['t'] == pytest.approx(t, abs=1e-6)
+
+
+# --- parameters ---
+
+def test_pattern_class_by_name():
+    assert ScanRunner.patternClass('RasterScan') is RasterScan
+    assert ScanRunner.patternClass(
+        'QPolargraph.patterns.RasterScan:RasterScan') is RasterScan
+
+
+@pytest.mark.parametrize('name', ['NoScan', 'json:dumps', 'nosuch:Thing'])
+def test_unknown_pattern_is_rejected(name):
+    with pytest.raises(ValueError):
+        ScanRunner.patternClass(name)
+
+
+def test_from_parameters(tmp_path):
+    params = PARAMS | {'polargraph': {'step_delay': 0., 'ell': 1.5}}
+    runner = ScanRunner.fromParameters(params, tmp_path / 'out.csv',
+                                       fake=True)
+    assert isinstance(runner.pattern, RasterScan)
+    assert runner.pattern.width == 0.1
+    assert runner.pattern.polargraph.ell == 1.5
+    runner.writer.close()
+
+
+def test_bad_setting_is_rejected(tmp_path):
+    with pytest.raises(ValueError):
+        ScanRunner.fromParameters(PARAMS | {'polargraph': {'nope': 1}},
+                                  tmp_path / 'out.csv', fake=True)
+    with pytest.raises(ValueError):
+        ScanRunner.fromParameters(PARAMS | {'scan': {'nope': 1}},
+                                  tmp_path / 'out.csv', fake=True)
+
+
+@pytest.mark.parametrize('name', ['moveTo', 'indexes', 'step_delay'])
+def test_only_settings_are_accepted(tmp_path, name):
+    with pytest.raises(ValueError):
+        ScanRunner.fromParameters(PARAMS | {'polargraph': {name: 1}},
+                                  tmp_path / 'out.csv',
+                                  fake=name != 'step_delay')
+
+
+# --- running ---
+
+def test_main_runs_scan_to_disk(qapp, params, tmp_path):
+    output = tmp_path / 'scan.csv'
+    assert main([str(params), '-o', str(output), '--fake']) == 0
+    data = np.genfromtxt(output, delimiter=',', names=True)
+    assert len(data) > 0
+    assert np.all(np.diff(data['t']) >= 0)
+    assert np.all(np.abs(data['x']) <= 0.05 + 1e-6)
+
+
+def test_main_reports_bad_parameter_file(qapp, tmp_path, capsys):
+    assert main([str(tmp_path / 'missing.json'), '-o', '-', '--fake']) == 1
+    assert 'qpolargraph-scan' in capsys.readouterr().err
+
+
+def test_paused_scan_is_interrupted(qtbot, tmp_path, monkeypatch):
+    runner = ScanRunner.fromParameters(PARAMS, tmp_path / 'out.csv',
+                                       fake=True)
+    pattern = runner.pattern
+    pauses = []
+
+    def pauseOnce(state):
+        if state.name == 'SCANNING' and not pauses:
+            pauses.append(state)
+            pattern.pause()
+
+    pattern.stateChanged.connect(pauseOnce)
+    with qtbot.waitSignal(runner.finished, timeout=10000) as blocker:
+        runner.start()
+    assert blocker.args == [ScanRunner.INTERRUPTED]
+
+
+def test_runner_avoids_widgets(params, tmp_path):
+    code = ('import sys\n'
+            'from QPolargraph.ScanRunner import main\n'
+            f'status = main([{str(params)!r}, "-o", "-", "--fake"])\n'
+            'loaded = [m for m in sys.modules\n'
+            '          if m.endswith(("QtWidgets", "QtGui", "pyqtgraph"))]\n'
+            'print(status, loaded, file=sys.stderr)\n')
+    result = subprocess.run([sys.executable, '-c', code], cwd=tmp_path,
+                            capture_output=True, text=True, timeout=60)
+    assert result.stderr.strip().splitlines()[-1] == '0 []'
+    assert result.stdout.startswith('x,y,t\n')
+
+
+def test_runner_publishes_samples(qtbot, tmp_path):
+    address = str(tmp_path / 'scan.sock')
+    runner = ScanRunner.fromParameters(PARAMS | {'publish': address},
+                                       tmp_path / 'out.csv', fake=True)
+    feed = SampleSubscriber(address, timeout=10.)
+    qtbot.waitUntil(lambda: runner.publisher.subscribers == 1)
+    with qtbot.waitSignal(runner.finished, timeout=10000):
+        runner.start()
+    rows = sum(len(batch) for _, batch in feed)
+    feed.close()
+    assert rows == runner.writer.count > 0
@@ -1,6 +1,7 @@
+import threading
 import numpy as np
 import pytest
-from qtpy import QtCore
+from qtpy import QtCore, QtWidgets
 from QPolargraph.QScanner import QScanner
 from QPolargraph.hardware.fake import FakePolargraph
 from QPolargraph.patterns.QScanPattern import ScanState
@@ -237,3 +238,240 @@ def test_sync_pattern_thread_moves_pattern_to_device_thread(scanner, qtbot):
         fake_device.deleteLater()
         worker.quit()
         worker.wait()
+
+
+# --- sample store / decimated data plot ---
+
+def test_data_ready_rows_stored(scanner):
+    scanner.scanner.pattern._state = ScanState.SCANNING
+    scanner._onDataReady(np.array([0.1, 0.2, 1.5]))
+    assert len(scanner.samples) == 1
+    assert scanner.samples['x'][0] == pytest.approx(0.1)
+
+
+def test_scan_fills_sample_store(fake_scanner, qtbot):
+    fake_scanner.toggleScan()
+    assert len(fake_scanner.samples) > 0
+
+
+def test_new_scan_clears_previous_data(fake_scanner, qtbot):
+    fake_scanner.plotData(0.1, 0.2, 0.5)
+    fake_scanner.samples.append({'t': 0., 'x': 0., 'y': 0.})
+    QtCore.QTimer.singleShot(0, fake_scanner.scanner.pattern.abandon)
+    fake_scanner.toggleScan()
+    assert fake_scanner.dataPlot.nbins() == 0
+
+
+def test_plot_data_is_decimated(scanner):
+    x = np.full(100, 0.1)
+    y = np.full(100, 0.3)
+    scanner.plotData(x, y, np.linspace(0., 1., 100))
+    assert len(scanner.dataPlot.data) == 1
+
+
+def test_plot_data_full_resolution(scanner):
+    scanner.plotData(0.1, 0.3, 0.5)
+    scanner.decimate = False
+    assert len(scanner.dataPlot.data) == 0
+    x = np.full(100, 0.1)
+    y = np.full(100, 0.3)
+    scanner.plotData(x, y, np.linspace(0., 1., 100))
+    assert len(scanner.dataPlot.data) == 100
+
+
+# --- live image ---
+
+def test_grid_tracks_pattern_geometry(scanner):
+    pattern = scanner.scanner.pattern
+    assert scanner.grid.rect == pytest.approx(tuple(pattern.rect))
+    assert scanner.grid.spacing == pytest.approx(pattern.step * 1e-3)
+
+
+def test_plot_image_accumulates(scanner):
+    x1, y1, _, _ = scanner.scanner.pattern.rect
+    scanner.plotImage([x1 + 1e-4] * 3, [y1 + 1e-4] * 3, [1., 2., 3.])
+    scanner.refreshImage()
+    assert scanner.dataImage.image[0, 0] == pytest.approx(2.)
+
+
+def test_plot_image_complex_shows_magnitude(scanner):
+    x1, y1, _, _ = scanner.scanner.pattern.rect
+    scanner.plotImage(x1 + 1e-4, y1 + 1e-4, 3. + 4j)
+    scanner.refreshImage()
+    assert scanner.dataImage.image[0, 0] == pytest.approx(5.)
+
+
+def test_pattern_change_resets_grid(scanner):
+    scanner.scanner.step.setValue(20.)
+    assert scanner.grid.spacing == pytest.approx(0.02)
+
+
+def test_clear_data_clears_image(scanner):
+    x1, y1, _, _ = scanner.scanner.pattern.rect
+    scanner.plotImage(x1 + 1e-4, y1 + 1e-4, 1.)
+    scanner.clearData()
+    assert scanner.grid.count.sum() == 0
+
+
+# --- lock-in fields ---
+
+def test_demodulated_fields_in_rows_and_image(scanner):
+    from QPolargraph.processing.LockIn import LockIn
+    pattern = scanner.scanner.pattern
+    pattern.demodulator = LockIn(100., 1e4, timeconstant=1e-3)
+    pattern._state = ScanState.SCANNING
+    x1, y1, _, _ = pattern.rect
+    rows = []
+    scanner.dataReady.connect(rows.append)
+    scanner._onDataReady(np.array([x1 + 1e-4, y1 + 1e-4, 1., 3., 4.]))
+    assert rows[0]['I'] == pytest.approx(3.)
+    assert rows[0]['Q'] == pytest.approx(4.)
+    scanner.refreshImage()
+    assert scanner.dataImage.image[0, 0] == pytest.approx(5.)
+
+
+def test_image_component_phase(scanner):
+    x1, y1, _, _ = scanner.scanner.pattern.rect
+    scanner.plotImage(x1 + 1e-4, y1 + 1e-4, 1j)
+    scanner.imageComponent = 'phase'
+    assert scanner.dataImage.image[0, 0] == pytest.approx(np.pi / 2.)
+
+
+def test_image_component_rejects_unknown(scanner):
+    with pytest.raises(ValueError):
+        scanner.imageComponent = 'power'
+
+
+# --- job queue ---
+
+def test_run_jobs(fake_scanner, qtbot):
+    rows = []
+    fake_scanner.dataReady.connect(rows.append)
+    jobs = [(RasterScan, {'step': 100.}), (RasterScan, {'step': 100.,
+                                                        'dy': 0.3})]
+    queue = fake_scanner.runJobs(jobs)
+    qtbot.waitUntil(lambda: fake_scanner.queue is None, timeout=30000)
+    assert len(rows) == sum(len(r) for r in queue.results)
+    assert len(fake_scanner.samples) == len(queue.results[-1])
+    assert fake_scanner.scan.isEnabled()
+    assert fake_scanner.scanner.isEnabled()
+
+
+def test_scan_button_pauses_queue(fake_scanner, qtbot):
+    button = []
+
+    def pauseOnce(row):
+        if not button:
+            button.append((fake_scanner.scan.text(),
+                           fake_scanner.scan.isEnabled()))
+            fake_scanner.toggleScan()
+
+    fake_scanner.dataReady.connect(pauseOnce)
+    queue = fake_scanner.runJobs([(RasterScan, {'step': 100.}),
+                                  (RasterScan, {'step': 100.})])
+    assert button == [('Pause', True)]
+    assert queue.pattern._state == ScanState.PAUSED
+    assert fake_scanner.scan.text() == 'Resume'
+    fake_scanner.toggleScan()
+    qtbot.waitUntil(lambda: fake_scanner.queue is None, timeout=30000)
+    assert all(p.completed for p in queue.patterns)
+
+
+def test_failed_job_is_reported(fake_scanner, qtbot):
+    fake_scanner.dataReady.connect(
+        lambda row: fake_scanner.queue.pattern.abandon())
+    queue = fake_scanner.runJobs([(RasterScan, {'step': 100.}),
+                                  (RasterScan, {'step': 100.})])
+    qtbot.waitUntil(lambda: fake_scanner.queue is None, timeout=30000)
+    assert not queue.patterns[0].completed
+    assert len(queue.results[1]) == 0
+    assert 'Job 1 failed' in fake_scanner.statusBar().currentMessage()
+
+
+def test_run_jobs_refuses_while_busy(fake_scanner, qtbot):
+    fake_scanner.runJobs([(RasterScan, {'step': 100.})])
+    with pytest.raises(RuntimeError):
+        fake_scanner.runJobs([(RasterScan, {'step': 100.})])
+    qtbot.waitUntil(lambda: fake_scanner.queue is None, timeout=30000)
+
+
+# --- checkpoint ---
+
+def test_scanner_has_journal(scanner, tmp_path):
+    journal = scanner.scanner.pattern.journal
+    assert journal.path == tmp_path / 'config' / 'checkpoint.json'
+
+
+def test_resume_scan_without_checkpoint(scanner):
+    scanner.resumeScan()
+    assert not scanner.scanner.pattern.active()
+
+
+def test_resume_scan_restores_settings(fake_scanner):
+    pattern = fake_scanner.scanner.pattern
+    pattern.journal.record({'pattern': 'PolarScan',
+                            'geometry': {'step': 50.},
+                            'vertices': pattern.vertices()[4:].tolist(),
+                            'cursor': 0,
+                            'indexes': [0, 0]},
+                           force=True)
+    rows = []
+    fake_scanner.dataReady.connect(rows.append)
+    fake_scanner.resumeScan(rehome=False)
+    assert pattern.step == 50.
+    assert fake_scanner.scanner.step.value() == 50.
+    assert len(rows) > 0
+    assert not pattern.journal.exists()
+
+
+def test_resume_scan_asks_about_rehoming(fake_scanner, monkeypatch):
+    pattern = fake_scanner.scanner.pattern
+    pattern.journal.record({'pattern': 'PolarScan',
+                            'geometry': {'step': 50.},
+                            'vertices': pattern.vertices()[4:].tolist(),
+                            'cursor': 0,
+                            'indexes': [123, -45]},
+                           force=True)
+    buttons = QtWidgets.QMessageBox.StandardButton
+    answers = [buttons.Cancel, buttons.Yes]
+    monkeypatch.setattr(QtWidgets.QMessageBox, 'question',
+                        lambda *args: answers.pop(0))
+    rehome = []
+    fake_scanner._resumeCheckpoint.connect(rehome.append)
+    fake_scanner.resumeScan()
+    assert rehome == []
+    assert pattern.journal.exists()
+    fake_scanner.resumeScan()
+    assert rehome == [True]
+    assert not pattern.journal.exists()
+
+
+def test_link_recovery_status(scanner):
+    scanner._onLinkRecovered(2.5)
+    assert '2.5 s' in scanner.statusBar().currentMessage()
+
+
+def test_stall_status(scanner):
+    scanner._onStalled('timeout')
+    assert 'timeout' in scanner.statusBar().currentMessage()
+
+
+# --- background discovery ---
+
+def test_scanner_swaps_in_found_device(qtbot, tmp_path, monkeypatch):
+    from QPolargraph.hardware.PortScanner import PortScanner
+    found = FakePolargraph()
+    release = threading.Event()
+    monkeypatch.setattr(PortScanner, 'search',
+                        lambda self: release.wait(5) and found)
+    w = QScanner(configdir=str(tmp_path))
+    qtbot.addWidget(w)
+    assert w.polargraph.connecting
+    assert not w.scan.isEnabled()
+    with pytest.raises(RuntimeError):
+        w.runJobs([(RasterScan, {})])
+    with qtbot.waitSignal(w.polargraph.deviceChanged, timeout=5000):
+        release.set()
+    assert w.scanner.pattern.polargraph is found
+    assert w.scanner.pattern.watchdog.polargraph is found
+    assert w.scan.isEnabled()
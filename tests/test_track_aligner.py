@@ -0,0 +1,125 @@
+import numpy as np
+import pytest
+from QPolargraph.hardware.fake import FakePolargraph
+from QPolargraph.patterns.QScanPattern import QScanPattern
+from QPolargraph.processing.TrackAligner import TrackAligner, align
+
+
+@pytest.fixture
+def geometry():
+    return FakePolargraph(step_delay=0.)
+
+
+def motor_track(geometry, npts=11):
+    '''Track with both motors running at constant rates.'''
+    t = np.linspace(0., 1., npts)
+    m = np.linspace(0., 2000., npts)
+    n = np.linspace(0., -1500., npts)
+    x, y = geometry.i2r(m, n)
+    return t, x, y, m, n
+
+
+def test_interpolates_along_arc(geometry):
+    t, x, y, m, n = motor_track(geometry)
+    ti = np.linspace(0., 1., 101)
+    expected = geometry.i2r(np.interp(ti, t, m), np.interp(ti, t, n))
+    xy = align(t, x, y, ti, polargraph=geometry)
+    np.testing.assert_allclose(xy, expected, atol=1e-12)
+
+
+def test_linear_without_geometry():
+    xy = align([0., 1.], [0., 1.], [0., 2.], [0.25, 0.5])
+    np.testing.assert_allclose(xy, [[0.25, 0.5], [0.5, 1.]])
+
+
+def test_outside_track_is_nan():
+    xy = align([0., 1.], [0., 1.], [0., 1.], [-0.1, 1.1])
+    assert np.isnan(xy).all()
+
+
+def test_holds_position_at_segment_boundary():
+    xy = align([0., 1., 2.], [0., 1., 2.], [0., 0., 0.],
+               [0.5, 1.5], boundaries=[1.])
+    np.testing.assert_allclose(xy[0], [0.5, 1.])
+
+
+def test_streamed_chunks_match_batch(geometry):
+    t, x, y, _, _ = motor_track(geometry)
+    ti = np.linspace(0., 1., 101)
+    aligner = TrackAligner(geometry)
+    results = []
+    for k in range(0, len(t), 3):
+        aligner.addTrack(t[k:k + 3], x[k:k + 3], y[k:k + 3])
+        aligner.addSamples(ti[10 * k:10 * (k + 3)], ti[10 * k:10 * (k + 3)])
+        results.append(aligner.aligned())
+    results.append(aligner.aligned(flush=True))
+    ts, xs, ys, values = (np.concatenate(r) for r in zip(*results))
+    np.testing.assert_array_equal(ts, ti)
+    np.testing.assert_array_equal(values, ti)
+    expected = align(t, x, y, ti, polargraph=geometry)
+    np.testing.assert_allclose([xs, ys], expected, atol=1e-12)
+    assert aligner.pending == 0
+
+
+def test_samples_wait_for_track():
+    aligner = TrackAligner()
+    aligner.addTrack([0., 1.], [0., 1.], [0., 1.])
+    aligner.addSamples([0.5, 1.5], [1., 2.])
+    t, x, y, values = aligner.aligned()
+    np.testing.assert_array_equal(t, [0.5])
+    assert aligner.pending == 1
+    aligner.addTrack(2., 2., 2.)
+    t, x, y, values = aligner.aligned()
+    assert x[0] == pytest.approx(1.5)
+    assert values[0] == 2.
+
+
+def test_history_is_trimmed():
+    aligner = TrackAligner()
+    for k in range(100):
+        aligner.addTrack(float(k), float(k), 0.)
+        aligner.addSamples(k - 0.5, k)
+        aligner.aligned()
+    assert aligner.span == (99., 99.)
+
+
+def test_add_position_accepts_data_ready(geometry):
+    aligner = TrackAligner()
+    aligner.addPosition(np.array([0.1, 0.2, 5., 1., 2.]))
+    assert aligner.span == (5., 5.)
+
+
+def test_mismatched_samples_raise():
+    with pytest.raises(ValueError):
+        TrackAligner().addSamples([0., 1.], [1., 2., 3.])
+
+
+def test_mismatched_trailing_shape_raises():
+    aligner = TrackAligner()
+    aligner.addSamples([0., 1.], np.zeros((2, 3)))
+    with pytest.raises(ValueError):
+        aligner.addSamples([2.], np.zeros((1, 2)))
+    assert aligner.pending == 2
+
+
+def test_many_polls_between_reads():
+    aligner = TrackAligner()
+    n = 10000
+    for k in range(n):
+        aligner.addTrack(float(k), float(k), 0.)
+        aligner.addSamples(k + 0.5, k)
+    assert aligner.pending == n
+    t, x, y, values = aligner.aligned()
+    np.testing.assert_array_equal(t, np.arange(n - 1) + 0.5)
+    np.testing.assert_allclose(x, t)
+    assert aligner.pending == 1
+    assert aligner.span == (n - 1., n - 1.)
+
+
+def test_pattern_emits_vertex_reached(geometry):
+    pattern = QScanPattern(polargraph=geometry)
+    times = []
+    pattern.vertexReached.connect(times.append)
+    pattern.scan()
+    assert len(times) >= len(pattern.vertices())
+    assert times == sorted(times)